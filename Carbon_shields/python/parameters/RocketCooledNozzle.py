@@ -1,23 +1,158 @@
 # -*- coding: utf-8 -*-
 import FreeCAD as App
-import Part, math
+import Part, math, bisect
+import os, sys
 from FreeCAD import Base
 
+# Shared helical channel and mesh export subsystems (tools/), when running from the repo
+_TOOLS_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(globals().get("__file__", "."))), "..", "..", "..", "tools"))
+if os.path.isdir(_TOOLS_DIR) and _TOOLS_DIR not in sys.path:
+    sys.path.append(_TOOLS_DIR)
+try:
+    from tool_imports import optional
+except ImportError:
+    optional = None
+helix_channels = optional("helix_channels") if optional else None
+nozzle_contour = optional("nozzle_contour") if optional else None
+mesh_export, tessellation_policy = optional("mesh_export", "tessellation_policy") if optional else (None, None)
+
 # ------------------------------------------------------------
 # DOCUMENTO
 # ------------------------------------------------------------
 doc = App.newDocument("RocketNozzle_Param")
 
+# ------------------------------------------------------------
+# CONTEXTO DE EVALUACIÓN (MEMOIZACIÓN CON DEPENDENCIAS)
+# ------------------------------------------------------------
+# Valor registrado para una clave leída que no estaba en P
+_MISSING = object()
+
+
+class ParamDict(dict):
+    """
+    dict de parámetros que registra las claves leídas por la cantidad en evaluación.
+
+    Cuentan como lectura P[key], P.get(key) y `key in P`; una clave ausente se
+    registra como _MISSING, así añadirla después también invalida la caché.
+    """
+
+    def _read(self, key):
+        value = dict.get(self, key, _MISSING)
+        if CALC_GRAPH.frames:
+            CALC_GRAPH.frames[-1]["params"][key] = value
+        return value
+
+    def __getitem__(self, key):
+        self._read(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        value = self._read(key)
+        return default if value is _MISSING else value
+
+    def __contains__(self, key):
+        return self._read(key) is not _MISSING
+
+
+class EvalGraph:
+    """
+    Grafo de cantidades calculate_*.
+
+    Cada cantidad se evalúa una vez por instantánea de parámetros: la caché
+    guarda el valor junto con las claves de P leídas (directa o
+    transitivamente) y sus valores. Si alguna de esas claves cambia en P, la
+    entrada se recalcula en el siguiente acceso. Las aristas cantidad ->
+    cantidad y cantidad -> parámetro quedan disponibles para inspección.
+    """
+
+    def __init__(self):
+        self.functions = {}
+        self.cache = {}
+        self.edges = {}
+        self.frames = []
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, fn):
+        self.functions[fn.__name__] = fn
+
+    def _valid(self, entry):
+        # Lectura directa del dict: comprobar la caché no es una dependencia
+        return all(dict.get(P, key, _MISSING) == val for key, val in entry["params"].items())
+
+    def evaluate(self, name):
+        entry = self.cache.get(name)
+        if entry is None or not self._valid(entry):
+            self.misses += 1
+            self.frames.append({"params": {}, "quantities": set()})
+            try:
+                value = self.functions[name]()
+            finally:
+                frame = self.frames.pop()
+            entry = {"value": value, "params": frame["params"]}
+            self.cache[name] = entry
+            self.edges[name] = {"quantities": sorted(frame["quantities"]), "params": sorted(frame["params"])}
+        else:
+            self.hits += 1
+        if self.frames:
+            parent = self.frames[-1]
+            parent["quantities"].add(name)
+            parent["params"].update(entry["params"])
+        return entry["value"]
+
+    def invalidate(self, key=None):
+        """Vaciar la caché completa o solo las cantidades que dependen de `key`."""
+        if key is None:
+            self.cache.clear()
+        else:
+            self.cache = {n: e for n, e in self.cache.items() if key not in e["params"]}
+
+    def dependencies(self, name):
+        """Cantidades llamadas directamente y parámetros leídos (transitivos) por `name`."""
+        if name not in self.edges:
+            self.evaluate(name)
+        return self.edges[name]
+
+    def graph(self):
+        """Grafo completo {cantidad: {'quantities': [...], 'params': [...]}}; los errores de evaluación se propagan."""
+        for name in self.functions:
+            if name not in self.edges:
+                self.evaluate(name)
+        return dict(self.edges)
+
+    def snapshot(self):
+        """Valores válidos en caché para los parámetros actuales."""
+        return {n: e["value"] for n, e in self.cache.items() if self._valid(e)}
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "cached": len(self.cache)}
+
+
+CALC_GRAPH = EvalGraph()
+
+
+def quantity(fn):
+    """Registrar una función calculate_* en CALC_GRAPH y memoizarla."""
+    CALC_GRAPH.register(fn)
+
+    def wrapper():
+        return CALC_GRAPH.evaluate(fn.__name__)
+    wrapper.__name__ = fn.__name__
+    wrapper.__doc__ = fn.__doc__
+    wrapper.uncached = fn
+    return wrapper
+
 # ------------------------------------------------------------
 # PARÁMETROS PRINCIPALES (EDITABLES)
 # ------------------------------------------------------------
-P = {
+P = ParamDict({
     # Geometría base
     "throat_diameter": 50.0,           # Ø garganta [mm]
     "exit_diameter": 150.0,            # Ø salida [mm]
     "convergent_angle": 45.0,          # grados
     "divergent_angle": 15.0,           # grados
     "nozzle_length": 200.0,            # [mm]
+    "rao_contour": False,              # perfil interior de campana de Rao (tools/nozzle_contour.py)
 
     # Espesores pared (variable por tramo)
     "wall_thickness_throat": 3.2,      # [mm]
@@ -53,7 +188,7 @@ P = {
     "fillet_radius": 1.0,              # filetes en transiciones [mm]
     "min_feature": 0.6,                # mínimo rasgo imprimible [mm]
     "clearance_channels": 0.05,        # holgura numérica para booleanas [mm]
-}
+})
 
 # ------------------------------------------------------------
 # UTILIDADES GEOMÉTRICAS
@@ -105,91 +240,134 @@ def radius_profile_points():
 # ------------------------------------------------------------
 # CREACIÓN DE PERFIL Y REVOLUCIÓN
 # ------------------------------------------------------------
-def make_nozzle_surface():
-    """Create nozzle surface using simpler extrusion approach"""
-    try:
-        # Create a simple conical frustum instead of complex revolved surface
-        throat_r = P["throat_diameter"] / 2.0
-        exit_r = P["exit_diameter"] / 2.0
-        L = P["nozzle_length"]
-
-        # Create outer cylinder
-        outer = Part.makeCylinder(exit_r, L)
-
-        # Create inner cylinder (throat area)
-        inner = Part.makeCylinder(throat_r, L)
+def profile_bspline(points):
+    """B-spline interpolating (x, r) profile points in the XY plane"""
+    curve = Part.BSplineCurve()
+    curve.interpolate([Base.Vector(p[0], p[1], 0.0) for p in points])
+    return curve
+
+def nozzle_profile():
+    """Gas-side (x, r) profile points of the nozzle
+
+    The five radius_profile_points(), or with P["rao_contour"] a dense Rao
+    bell contour from tools/nozzle_contour.py (throat at x = 0, chamber
+    radius = exit radius). Falls back to radius_profile_points() when
+    nozzle_contour is not available.
+    """
+    if P["rao_contour"]:
+        if nozzle_contour is not None:
+            x, r, _ = nozzle_contour.contour_from_params(P, n=200)
+            return list(zip(x.tolist(), r.tolist()))
+        print("nozzle_profile: tools/nozzle_contour.py not available, using radius_profile_points()")
+    return [(p.x, p.y) for p in radius_profile_points()]
+
+def profile_radius_function(profile=None, samples=512):
+    """Inner radius r(x) of the interpolated profile B-spline (defaults to nozzle_profile())"""
+    if profile is None:
+        profile = nozzle_profile()
+    curve = profile_bspline(profile)
+    u0, u1 = curve.FirstParameter, curve.LastParameter
+    pts = [curve.value(u0 + (u1 - u0) * i / (samples - 1)) for i in range(samples)]
+    xs = [p.x for p in pts]
+    rs = [p.y for p in pts]
+
+    def r_of_x(x):
+        if x <= xs[0]:
+            return rs[0]
+        if x >= xs[-1]:
+            return rs[-1]
+        j = bisect.bisect_right(xs, x)
+        t = (x - xs[j - 1]) / (xs[j] - xs[j - 1])
+        return lerp(rs[j - 1], rs[j], t)
+
+    return r_of_x, xs[0], xs[-1]
+
+def polyline_radius_function(profile=None):
+    """Inner radius r(x) linear between the profile points (no B-spline interpolation)"""
+    if profile is None:
+        profile = nozzle_profile()
+    xs = [p[0] for p in profile]
+    rs = [p[1] for p in profile]
+
+    def r_of_x(x):
+        j = min(max(bisect.bisect_right(xs, x), 1), len(xs) - 1)
+        t = max(0.0, min(1.0, (x - xs[j - 1]) / (xs[j] - xs[j - 1])))
+        return lerp(rs[j - 1], rs[j], t)
+
+    return r_of_x, xs[0], xs[-1]
+
+def adaptive_samples(funcs, x0, x1, tol=0.01, min_segments=8, max_points=2000):
+    """Axial stations where every f(x) deviates less than tol [mm] from its chord
+
+    Segments are bisected while the midpoint sag |f(m) - chord(m)| exceeds tol;
+    the sag of a smooth curve is ~ curvature * h^2 / 8, so stations concentrate
+    where the profile bends (throat) and stay sparse on straight stretches.
+    """
+    xs = [x0 + (x1 - x0) * i / min_segments for i in range(min_segments + 1)]
+    vals = [[f(x) for f in funcs] for x in xs]
+    i = 0
+    while i < len(xs) - 1 and len(xs) < max_points:
+        a, b = xs[i], xs[i + 1]
+        m = 0.5 * (a + b)
+        vm = [f(m) for f in funcs]
+        sag = max(abs(v - 0.5 * (va + vb)) for v, va, vb in zip(vm, vals[i], vals[i + 1]))
+        if sag > tol and b - a > 1e-6:
+            xs.insert(i + 1, m)
+            vals.insert(i + 1, vm)
+        else:
+            i += 1
+    return xs
+
+def make_revolved_wall(r_inner, r_outer, x0, x1, tol=0.01, smooth=True):
+    """Solid of revolution between r_inner(x) and r_outer(x) for x in [x0, x1]
+
+    One closed meridional profile (two interpolated B-splines plus the end
+    lines) revolved once around X: four faces regardless of smoothness,
+    which is controlled by the adaptive sample count. With smooth=False the
+    meridian is a polygon through the same stations.
+    """
+    xs = adaptive_samples((r_inner, r_outer), x0, x1, tol)
+    if not smooth:
+        pts = [(x, r_inner(x)) for x in xs] + [(x, r_outer(x)) for x in reversed(xs)]
+        face = Part.Face(Part.makePolygon([Base.Vector(x, r, 0) for x, r in pts + pts[:1]]))
+        return Part.makeSolid(face.revolve(Base.Vector(0, 0, 0), Base.Vector(1, 0, 0), 360))
+    inner = profile_bspline([(x, r_inner(x)) for x in xs]).toShape()
+    outer = profile_bspline([(x, r_outer(x)) for x in xs]).toShape()
+    cap0 = Part.makeLine(Base.Vector(x0, r_inner(x0), 0), Base.Vector(x0, r_outer(x0), 0))
+    cap1 = Part.makeLine(Base.Vector(x1, r_inner(x1), 0), Base.Vector(x1, r_outer(x1), 0))
+    face = Part.Face(Part.Wire(Part.__sortEdges__([inner, cap1, outer, cap0])))
+    return Part.makeSolid(face.revolve(Base.Vector(0, 0, 0), Base.Vector(1, 0, 0), 360))
+
+def make_variable_thickness_solid(profile=None, tol=0.01):
+    """Create solid nozzle wall of variable thickness as a single revolved profile
+
+    The gas side follows the B-spline through nozzle_profile() (or profile);
+    the outer side adds wall_thickness_at_x, evaluated on [0, nozzle_length]
+    stretched over the profile like the thermal tools do. If the B-spline
+    wall fails, the same wall is built over straight segments between the
+    profile points; if that fails too, RuntimeError is raised.
+    """
+    L = P["nozzle_length"]
 
-        # Create conical transition
-        cone_outer = Part.makeCone(exit_r, throat_r, L/2)
-        cone_inner = Part.makeCone(throat_r, throat_r, L/2)
+    def wall(radius_function, smooth):
+        r_inner, x0, x1 = radius_function(profile)
 
-        # Combine shapes
-        surf = outer.fuse(cone_outer).cut(inner).cut(cone_inner)
+        def r_outer(x):
+            return r_inner(x) + wall_thickness_at_x((x - x0) / (x1 - x0) * L, L)
 
-        return surf
+        solid = make_revolved_wall(r_inner, r_outer, x0, x1, tol, smooth)
+        if solid.isNull() or solid.Volume <= 0:
+            raise ValueError("revolved wall has no volume")
+        return solid
 
+    try:
+        return wall(profile_radius_function, True)
     except Exception as e:
-        print(f"Error in make_nozzle_surface: {e}")
-        # Fallback: simple cylinder
-        return Part.makeCylinder(P["exit_diameter"]/2, P["nozzle_length"])
-
-def make_variable_thickness_solid(surf):
-    """Create solid nozzle with variable wall thickness using extrusion approach"""
+        print(f"Error in make_variable_thickness_solid: {e}; retrying with a polyline profile")
     try:
-        # Instead of problematic offset, create wall by extruding thickened profile
-        L = P["nozzle_length"]
-        sections = 20  # More sections for smoother thickness variation
-
-        # Create multiple rings along the length with varying thickness
-        rings = []
-        for i in range(sections):
-            x = i * L / (sections - 1)
-            t_inner = wall_thickness_at_x(x, L)
-
-            # Get radius at this position
-            if x <= P["throat_diameter"]/2 / math.tan(math.radians(P["convergent_angle"])):
-                # Convergent section
-                r_outer = P["exit_diameter"]/2
-            elif x <= P["throat_diameter"]/2 + (P["exit_diameter"]/2 - P["throat_diameter"]/2) / math.tan(math.radians(P["divergent_angle"])) * math.tan(math.radians(P["divergent_angle"])):
-                # Throat
-                r_outer = P["throat_diameter"]/2 + t_inner
-            else:
-                # Divergent section
-                r_outer = P["throat_diameter"]/2 + t_inner
-
-            # Create ring at this position
-            ring_outer = Part.makeCylinder(r_outer, 1.0)  # Thin ring
-            ring_inner = Part.makeCylinder(r_outer - t_inner, 1.0)
-
-            if ring_outer.Volume > ring_inner.Volume:
-                ring = ring_outer.cut(ring_inner)
-                ring.Placement = Base.Placement(Base.Vector(x, 0, 0), Base.Rotation())
-                rings.append(ring)
-
-        # Fuse all rings into solid
-        if rings:
-            solid = rings[0]
-            for ring in rings[1:]:
-                solid = solid.fuse(ring)
-
-            # Add end caps
-            cap_up = Part.makeCylinder(P["exit_diameter"]/2, 2.0)
-            cap_up.Placement = Base.Placement(Base.Vector(-2.0, 0, 0), Base.Rotation())
-
-            cap_down = Part.makeCylinder(P["throat_diameter"]/2, 2.0)
-            cap_down.Placement = Base.Placement(Base.Vector(L, 0, 0), Base.Rotation())
-
-            solid = solid.fuse(cap_up).fuse(cap_down)
-
-            return solid
-        else:
-            # Fallback: simple cylinder
-            return Part.makeCylinder(P["exit_diameter"]/2, L)
-
+        return wall(polyline_radius_function, False)
     except Exception as e:
-        print(f"Error in make_variable_thickness_solid: {e}")
-        # Ultimate fallback
-        return Part.makeCylinder(P["exit_diameter"]/2, L)
+        raise RuntimeError(f"make_variable_thickness_solid: cannot build the nozzle wall ({e})") from e
 
 # ------------------------------------------------------------
 # CANALES HELICOIDALES (DOBLE HÉLICE CONTRARROTANTE)
@@ -211,28 +389,97 @@ def trapezoid_section():
         # Fallback to rectangular section
         return Part.makeBox(P["channel_top"], P["channel_height"], 1.0)
 
-# Removed complex helical path function - using simplified straight channels instead
-
-def sweep_channel_along(path_wire):
-    """Create channel by extruding trapezoid along path"""
-    try:
-        section = trapezoid_section()
-        # Use simpler extrusion approach instead of complex sweep
-        # Approximate helical channel as straight extruded section
-        channel = section.extrude(Base.Vector(0, 0, P["nozzle_length"]))
-        return channel
-    except Exception as e:
-        print(f"Error in sweep_channel_along: {e}")
-        # Fallback: simple rectangular channel
-        return Part.makeBox(P["channel_top"], P["channel_height"], P["nozzle_length"])
+def channel_profile(height=None):
+    """Trapezoid channel section for helix_channels: (radial, transverse) points, base on the hot side
+
+    height: clamped channel height; the top width follows the trapezoid flanks.
+    """
+    b = P["channel_base"]
+    H = P["channel_height"]
+    h = H if height is None else height
+    w = b + (P["channel_top"] - b) * h / H
+    return ("polygon", ((-h/2, -b/2), (-h/2, b/2), (h/2, w/2), (h/2, -w/2)))
+
+def channel_ligament(x, L):
+    """Hot-side ligament at x: ligament_min_throat at the throat, blending to ligament_min_other over 0.1 L"""
+    return lerp(P["ligament_min_throat"], P["ligament_min_other"], min(1.0, abs(x) / (0.1 * L)))
+
+def channel_section(x_end, stations=None):
+    """Channel stations from the throat (x = 0) towards x_end on the wall profile
+
+    At each station the room for the channel is the local wall thickness
+    minus the hot-side ligament and a min_feature closeout under the outer
+    surface. The section stops at the first station where not even a
+    min_feature channel fits, and the height is clamped to the smallest room
+    left along it. Returns (xs, center radii, pitches, height).
+    Raises ValueError when no channel fits at the throat.
+    """
+    L = P["nozzle_length"]
+    r_inner, x0, x1 = profile_radius_function()
+    n = stations or max(16, int(abs(x_end) / 0.5))
+
+    def room(x):
+        s = (x - x0) / (x1 - x0) * L
+        return wall_thickness_at_x(s, L) - channel_ligament(x, L) - P["min_feature"]
+
+    xs = []
+    for i in range(n + 1):
+        x = x_end * i / n
+        if room(x) < P["min_feature"]:
+            break
+        xs.append(x)
+    if len(xs) < 2:
+        raise ValueError(f"Channels do not fit at the throat: ligament {channel_ligament(0.0, L):.2f} + "
+                         f"min_feature {P['min_feature']:.2f} + closeout {P['min_feature']:.2f} mm "
+                         f"> wall {room(0.0) + channel_ligament(0.0, L) + P['min_feature']:.2f} mm")
+    h = min(P["channel_height"], min(room(x) for x in xs))
+    radii = [r_inner(x) + channel_ligament(x, L) + h / 2.0 for x in xs]
+    pitches = [pitch_at_x((x - x0) / (x1 - x0) * L, L) for x in xs]
+    return xs, radii, pitches, h
+
+def sweep_channel_along(xs, radii, pitches, height, direction=1.0):
+    """Double counter-rotating helical channels over one wall section
+
+    The helices start in the throat plane and follow the channel centre
+    radius and local pitch of every station along +X (direction=1) or -X
+    (direction=-1). Sweeps are cached and the working strategy is
+    remembered by tools/helix_channels.py; returns None when it is not available.
+    """
+    if helix_channels is None:
+        return None
+    return helix_channels.variable_helix_channels(
+        [abs(x) for x in xs], radii, pitches, channel_profile(height),
+        starts=P["num_helices"], counter_rotating=True,
+        origin=(0.0, 0.0, 0.0), direction=(direction, 0.0, 0.0))
 
 def place_channels(nozzle_solid):
-    """Place simplified cooling channels"""
+    """Cut the A/B counter-rotating helical cooling channels with a single boolean
+
+    Channels start at the throat and follow the wall profile (channel_section),
+    ending end_caps_thickness short of the wall ends at the latest, so they stay
+    closed by the ligament, the closeout and the wall itself; no caps are returned.
+    Raises ValueError when the channels do not fit the wall.
+    Falls back to straight channels when tools/helix_channels.py is missing.
+    """
     try:
         L = P["nozzle_length"]
         throat_r = P["throat_diameter"] / 2.0
-        base_r = throat_r + P["ligament_min_throat"] + P["channel_height"]
+        cap = P["end_caps_thickness"]
+
+        if helix_channels is not None:
+            _, x0, x1 = profile_radius_function()
+            sections = []
+            for x_end, direction in ((x1 - cap, 1.0), (x0 + cap, -1.0)):
+                name = "divergent" if direction > 0 else "convergent"
+                xs, radii, pitches, h = channel_section(x_end)
+                ch = sweep_channel_along(xs, radii, pitches, h, direction)
+                note = f"height {h:.2f} mm" + (f" (clamped from {P['channel_height']:.2f})" if h < P["channel_height"] else "")
+                print(f"Channels {name}: strategy {ch['strategy']}, {note}, "
+                      f"length {abs(xs[-1]):.1f} of {abs(x_end):.1f} mm")
+                sections.append(ch)
+            return helix_channels.cut_channels(nozzle_solid, sections), []
 
+        base_r = throat_r + P["ligament_min_throat"] + P["channel_height"]
         channels = []
         num_channels = P["num_helices"] * 4  # More channels but simpler
 
@@ -247,16 +494,12 @@ def place_channels(nozzle_solid):
 
             channels.append(ch)
 
-        # Cut channels from solid
-        solid = nozzle_solid
-        for ch in channels:
-            try:
-                solid = solid.cut(ch)
-            except Exception as e:
-                print(f"Warning: Could not cut channel {len(channels)}: {e}")
-
+        # Cut all channels at once
+        solid = nozzle_solid.cut(Part.makeCompound(channels))
         return solid, channels
 
+    except ValueError:
+        raise
     except Exception as e:
         print(f"Error in place_channels: {e}")
         return nozzle_solid, []
@@ -318,8 +561,7 @@ def add_global_fillet(solid, r):
 # ENSAMBLAJE FINAL
 # ------------------------------------------------------------
 def build_nozzle():
-    surf = make_nozzle_surface()
-    nozzle_solid = make_variable_thickness_solid(surf)
+    nozzle_solid = make_variable_thickness_solid()
     # Canales
     nozzle_solid, channels = place_channels(nozzle_solid)
 
@@ -356,6 +598,7 @@ def build_nozzle():
 # FUNCIONES DE ANÁLISIS DE RENDIMIENTO EXPANDIDAS
 # ------------------------------------------------------------
 
+@quantity
 def calculate_thrust():
     """Calculate total thrust"""
     Pc = 50e5  # Chamber pressure (Pa)
@@ -370,6 +613,7 @@ def calculate_thrust():
     F = Cf * Pc * At * 1000  # N
     return F
 
+@quantity
 def calculate_specific_impulse():
     """Calculate specific impulse"""
     F = calculate_thrust()
@@ -378,10 +622,12 @@ def calculate_specific_impulse():
     Isp = F / (m_dot * g0)
     return Isp
 
+@quantity
 def calculate_expansion_ratio():
     """Calculate nozzle expansion ratio"""
     return (P["exit_diameter"] / P["throat_diameter"])**2
 
+@quantity
 def calculate_characteristic_velocity():
     """Calculate characteristic velocity (c*)"""
     Tc = 3500  # Chamber temperature (K)
@@ -390,15 +636,17 @@ def calculate_characteristic_velocity():
     c_star = math.sqrt(k * R * Tc / (k + 1)) * ((k + 1)/(2*(k-1)))**((k-1)/(2*(k+1)))
     return c_star
 
+@quantity
 def calculate_heat_transfer():
     """Calculate heat transfer to nozzle wall"""
     Tc = 3500  # Hot gas temperature (K)
     Tw = 800   # Wall temperature (K)
     h = 1000   # Heat transfer coefficient (W/m²·K)
-    A = math.pi * P["throat_diameter"] * P["nozzle_length"] / 1000  # Surface area (m²)
+    A = math.pi * P["throat_diameter"] * P["nozzle_length"] / 1e6  # Surface area (m²)
     q = h * (Tc - Tw) * A  # Total heat transfer (W)
     return q
 
+@quantity
 def calculate_cooling_requirement():
     """Calculate required coolant flow rate"""
     q = calculate_heat_transfer()
@@ -407,14 +655,20 @@ def calculate_cooling_requirement():
     m_dot_c = q / (cp * dT)
     return m_dot_c
 
+@quantity
 def calculate_thermal_stress():
-    """Calculate thermal stress in nozzle wall"""
-    E = 200e9  # Young's modulus (Pa)
-    alpha = 16.5e-6  # Thermal expansion coefficient (1/K)
-    delta_T = 1000  # Temperature difference (K)
-    sigma = E * alpha * delta_T
+    """Calculate thermal stress in the throat wall from the temperature drop across it"""
+    q = calculate_heat_transfer() / (math.pi * P["throat_diameter"] * P["nozzle_length"] / 1e6)  # W/m²
+    E = 130e9  # Young's modulus, copper alloy (Pa)
+    alpha = 17e-6  # Thermal expansion coefficient (1/K)
+    nu = 0.34  # Poisson's ratio
+    k = 320  # Wall conductivity, copper alloy (W/m·K)
+    delta_T = q * P["wall_thickness_throat"] / 1000 / k  # Temperature difference across the wall (K)
+    # Restrained plate with a linear temperature profile
+    sigma = E * alpha * delta_T / (2 * (1 - nu))
     return sigma
 
+@quantity
 def calculate_structural_margin():
     """Calculate structural safety margin"""
     sigma_max = calculate_thermal_stress()
@@ -422,6 +676,7 @@ def calculate_structural_margin():
     margin = sigma_yield / sigma_max - 1
     return margin
 
+@quantity
 def calculate_nozzle_volume():
     """Calculate nozzle material volume"""
     # More accurate volume calculation considering wall thickness
@@ -434,13 +689,70 @@ def calculate_nozzle_volume():
 
     return volume
 
-
-
+def shell_segment_volume(r0, r1, t0, t1, length):
+    """Volume of a conical shell segment with linear inner radius and thickness"""
+    # 2*r*t + t² es cuadrático en x: Simpson es exacto
+    rm = (r0 + r1) / 2
+    tm = (t0 + t1) / 2
+    f0 = 2 * r0 * t0 + t0**2
+    fm = 2 * rm * tm + tm**2
+    f1 = 2 * r1 * t1 + t1**2
+    return math.pi * length * (f0 + 4 * fm + f1) / 6
+
+def helix_channel_volume(L, throat_r, exit_r, n=64):
+    """Volume cut by the 2 * num_helices helical channels of place_channels
+
+    The channels run from end_caps_thickness to L - end_caps_thickness over the
+    calculate_wall_volume wall (inner radius linear per segment), centred at
+    ligament + height/2 and at the local pitch_at_x pitch. Per unit axial
+    length they remove the channel section times the helix length, at most
+    the channel band annulus where neighbouring helices overlap. Trapezoid
+    rule over n intervals.
+    """
+    cap = P["end_caps_thickness"]
+    h = P["channel_height"]
+    n_channels = 2 * P["num_helices"]
+    area = (P["channel_base"] + P["channel_top"]) / 2 * h
+    span = L - 2 * cap
+    total = 0.0
+    for i in range(n + 1):
+        s = cap + span * i / n
+        t = s / L
+        r = lerp(exit_r, throat_r, t / 0.2) if t < 0.2 else lerp(throat_r, exit_r, (t - 0.2) / 0.8)
+        rc = r + P["ligament_min_throat"] + h / 2
+        per_length = min(n_channels * area * math.sqrt(1 + (2 * math.pi * rc / pitch_at_x(s, L))**2),
+                         2 * math.pi * rc * h)
+        total += per_length / 2 if i in (0, n) else per_length
+    return total * span / n
+
+@quantity
+def calculate_wall_volume():
+    """Calculate wall material volume (variable thickness shell minus cooling channels)"""
+    L = P["nozzle_length"]
+    throat_r = P["throat_diameter"] / 2
+    exit_r = P["exit_diameter"] / 2
+    # Mismos tramos que wall_thickness_at_x: convergente 0–0.2 L, divergente 0.2–1 L
+    conv = shell_segment_volume(exit_r, throat_r, P["wall_thickness_convergent"], P["wall_thickness_throat"], 0.2 * L)
+    div = shell_segment_volume(throat_r, exit_r, P["wall_thickness_div_start"], P["wall_thickness_div_end"], 0.8 * L)
+    # Canales helicoidales de place_channels (sección trapezoidal a lo largo de la hélice)
+    volume = conv + div - helix_channel_volume(L, throat_r, exit_r)
+    return max(volume, 0.0)
+
+@quantity
+def calculate_material_cost():
+    """Estimate raw material cost"""
+    rho = 8960  # Copper alloy density (kg/m³)
+    cost_per_kg = 15.0  # USD/kg
+    mass = calculate_wall_volume() * rho / 1e9  # kg
+    return mass * cost_per_kg
+
+@quantity
 def calculate_nozzle_efficiency():
     """Calculate nozzle efficiency"""
     eta = 0.95  # Typical value
     return eta
 
+@quantity
 def calculate_overall_efficiency():
     """Calculate overall system efficiency"""
     eta_nozzle = calculate_nozzle_efficiency()
@@ -449,6 +761,7 @@ def calculate_overall_efficiency():
     eta_overall = eta_nozzle * eta_combustion * eta_cooling
     return eta_overall
 
+@quantity
 def calculate_payload_capacity():
     """Calculate maximum payload capacity"""
     F = calculate_thrust()
@@ -457,6 +770,7 @@ def calculate_payload_capacity():
     m_payload = (F / (9.81 * Isp)) * (math.exp(9.81 * Isp * 300 / F) - 1) - m_dry
     return max(0, m_payload)
 
+@quantity
 def calculate_fatigue_life():
     """Estimate fatigue life"""
     sigma_max = calculate_thermal_stress()
@@ -464,6 +778,7 @@ def calculate_fatigue_life():
     N = (sigma_endurance / sigma_max)**2
     return N
 
+@quantity
 def calculate_pressure_drop():
     """Calculate pressure drop in cooling channels"""
     m_dot_c = calculate_cooling_requirement()
@@ -477,6 +792,7 @@ def calculate_pressure_drop():
     delta_P = f * L / D * (m_dot_c / (math.pi * D**2 / 4))**2 / (2 * rho)
     return delta_P
 
+@quantity
 def calculate_channel_velocity():
     """Calculate coolant velocity in channels"""
     m_dot_c = calculate_cooling_requirement()
@@ -485,6 +801,7 @@ def calculate_channel_velocity():
     v = m_dot_c / (rho * A)
     return v
 
+@quantity
 def calculate_reynolds_number():
     """Calculate Reynolds number for cooling channels"""
     v = calculate_channel_velocity()
@@ -494,6 +811,7 @@ def calculate_reynolds_number():
     Re = rho * v * D / mu
     return Re
 
+@quantity
 def calculate_nusselt_number():
     """Calculate Nusselt number for heat transfer"""
     Re = calculate_reynolds_number()
@@ -501,6 +819,7 @@ def calculate_nusselt_number():
     Nu = 0.023 * Re**0.8 * Pr**0.4  # Dittus-Boelter correlation
     return Nu
 
+@quantity
 def calculate_heat_transfer_coefficient():
     """Calculate convective heat transfer coefficient"""
     Nu = calculate_nusselt_number()
@@ -509,23 +828,26 @@ def calculate_heat_transfer_coefficient():
     h = Nu * k / D
     return h
 
+@quantity
 def calculate_wall_temperature():
     """Calculate maximum wall temperature"""
-    q = calculate_heat_transfer() / (math.pi * P["throat_diameter"] * P["nozzle_length"] / 1000)  # W/m²
+    q = calculate_heat_transfer() / (math.pi * P["throat_diameter"] * P["nozzle_length"] / 1e6)  # W/m²
     h = calculate_heat_transfer_coefficient()
     T_gas = 3500  # K
     T_coolant = 400  # K (bulk temperature)
     T_wall = T_gas - (T_gas - T_coolant) * (h / (h + 1000))  # Simplified
     return T_wall
 
+@quantity
 def calculate_thermal_conductance():
     """Calculate thermal conductance of nozzle wall"""
     k = 16.3  # W/m·K (copper)
     t = P["wall_thickness_throat"] / 1000  # m
-    A = math.pi * P["throat_diameter"] * P["nozzle_length"] / 1000  # m²
+    A = math.pi * P["throat_diameter"] * P["nozzle_length"] / 1e6  # m²
     C = k * A / t
     return C
 
+@quantity
 def calculate_bolt_stress():
     """Calculate stress in flange bolts"""
     F = calculate_thrust()
@@ -535,6 +857,7 @@ def calculate_bolt_stress():
     sigma = F / (n_bolts * A_bolt)
     return sigma
 
+@quantity
 def calculate_vibration_frequency():
     """Calculate fundamental vibration frequency"""
     E = 200e9  # Pa
@@ -544,18 +867,22 @@ def calculate_vibration_frequency():
     f = 0.5 / L * math.sqrt(E / rho)
     return f
 
+@quantity
 def calculate_acoustic_efficiency():
     """Calculate acoustic efficiency"""
     return 0.99
 
+@quantity
 def calculate_boundary_layer_loss():
     """Calculate boundary layer loss"""
     return 0.02
 
+@quantity
 def calculate_divergence_loss():
     """Calculate divergence loss"""
     return 0.01
 
+@quantity
 def calculate_mass_flow_rate():
     """Calculate mass flow rate"""
     Pc = 50e5  # Pa
@@ -566,6 +893,7 @@ def calculate_mass_flow_rate():
     m_dot = Pc * At / math.sqrt(R * Tc) * math.sqrt(k) * (k/2)**((k+1)/(2*(k-1)))
     return m_dot
 
+@quantity
 def calculate_power_consumption():
     """Calculate total power consumption"""
     m_dot_c = calculate_cooling_requirement()
@@ -577,14 +905,15 @@ def calculate_power_consumption():
 def optimize_design_parameters():
     """Optimize design parameters for performance vs. weight"""
     # Simple optimization: minimize weight while maintaining performance
-    current_weight = calculate_nozzle_volume() * 8960 / 1e9  # kg
+    # (búsqueda completa con restricciones: tools/nozzle_optimizer.py)
+    current_weight = calculate_wall_volume() * 8960 / 1e9  # kg
     current_thrust = calculate_thrust()
 
     # Try reducing wall thickness
     original_thickness = P["wall_thickness_throat"]
     P["wall_thickness_throat"] = max(2.0, original_thickness * 0.8)  # 20% reduction
 
-    new_weight = calculate_nozzle_volume() * 8960 / 1e9
+    new_weight = calculate_wall_volume() * 8960 / 1e9
     new_thrust = calculate_thrust()
     weight_savings = current_weight - new_weight
     thrust_loss = current_thrust - new_thrust
@@ -623,7 +952,7 @@ def generate_design_report():
     report.append("")
     report.append("=== STRUCTURAL ANALYSIS ===")
     report.append(f"Structural Margin: {calculate_structural_margin():.2f}")
-    report.append(f"Material Volume: {calculate_nozzle_volume():.0f} mm³")
+    report.append(f"Material Volume: {calculate_wall_volume():.0f} mm³")
     report.append(f"Material Cost: ${calculate_material_cost():.0f}")
     report.append("")
     report.append("=== COOLING SYSTEM ===")
@@ -643,6 +972,7 @@ def export_design_report(filename="RocketNozzle_Report.txt"):
         f.write(report)
     print(f"Design report exported to {filename}")
 
+@quantity
 def calculate_manufacturing_complexity():
     """Calculate manufacturing complexity score"""
     # Factors: number of channels, wall thickness variation, surface finish requirements
@@ -660,6 +990,14 @@ def validate_design():
     if P['ligament_min_throat'] < P['min_feature']:
         issues.append(f"Ligament too small: {P['ligament_min_throat']} < {P['min_feature']} mm")
 
+    # Check that the channels fit under the closeout
+    try:
+        *_, h = channel_section(profile_radius_function()[2] - P["end_caps_thickness"])
+        if h < P['channel_height']:
+            issues.append(f"Channel height clamped to the wall: {h:.2f} < {P['channel_height']} mm")
+    except ValueError as e:
+        issues.append(str(e))
+
     # Check thermal limits
     if calculate_wall_temperature() > 1200:
         issues.append("Wall temperature too high for copper alloy")
@@ -684,11 +1022,19 @@ def validate_manifold(obj):
     ok_feature = min_dim > P["min_feature"]
     return ok_feature
 
-def export_stl(obj, path="./RocketNozzle_STL/", deflection=0.3):
+def export_stl(obj, path="./RocketNozzle_STL/", deflection=None, fmt="stl", triangle_budget=2000000):
+    """deflection=None: relative to the part size and its smallest feature (tools/tessellation_policy.py)."""
     import Mesh
     import os
     os.makedirs(path, exist_ok=True)
-    m = Mesh.Mesh(obj.Shape.tessellate(deflection))
+    if mesh_export is not None:
+        # Binary STL / 3MF writer with manifest (triangles, bytes, timings)
+        if deflection is None:
+            deflection = tessellation_policy.TessellationPolicy(relative=5e-4, budget=triangle_budget)
+        result = mesh_export.export_parts([("Solid", obj)], path, fmt=fmt, prefix="RocketNozzle_",
+                                          deflection=deflection)
+        return not result["failed"]
+    m = Mesh.Mesh(obj.Shape.tessellate(0.3 if deflection is None else deflection))
     m.write(os.path.join(path, "RocketNozzle_Solid.stl"))
     return True
 
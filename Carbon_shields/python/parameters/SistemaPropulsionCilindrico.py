@@ -191,6 +191,8 @@ class SpaceshipComponent:
             self.build()
         obj = doc.addObject("Part::Feature", self.name)
         obj.Shape = self.shape
+        obj.addProperty("App::PropertyString", "MaterialKey", "Material", "Clave en MATERIALS")
+        obj.MaterialKey = self.material
         if self.material in MATERIALS:
             obj.ViewObject.ShapeColor = MATERIALS[self.material]['color']
         return obj
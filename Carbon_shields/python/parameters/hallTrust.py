@@ -6,9 +6,19 @@ Parametric solid design of a Hall Effect Thruster optimized for 3D printing.
 Includes separate parts, alignment pins, tolerances, print orientations, and STL export.
 """
 
-import FreeCAD as App, Part, Mesh, math, os
+import FreeCAD as App, Part, Mesh, math, os, sys
 from FreeCAD import Base
 
+# Parallel, incremental per-part mesh export (tools/), when running from the repo
+_TOOLS_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(globals().get("__file__", "."))), "..", "..", "..", "tools"))
+if os.path.isdir(_TOOLS_DIR) and _TOOLS_DIR not in sys.path:
+    sys.path.append(_TOOLS_DIR)
+try:
+    from tool_imports import optional
+except ImportError:
+    optional = None
+mesh_export, tessellation_policy, incremental_export = optional("mesh_export", "tessellation_policy", "incremental_export") if optional else (None, None, None)
+
 # -------------------------------
 # Document and global parameters
 # -------------------------------
@@ -43,7 +53,9 @@ params = {
     'countersink_top': 5.0,
 
     # STL export
-    'mesh_deflection': 0.1,            # tessellation
+    'mesh_deflection': 0.1,            # tessellation (absolute, fallback path)
+    'mesh_relative': 1e-3,             # deflection / part bounding-box diagonal
+    'mesh_triangle_budget': 500000,    # per part
 }
 
 # -------------------------------
@@ -286,7 +298,7 @@ def assemble_preview(parts):
 # -------------------------------
 # STL export per part
 # -------------------------------
-def export_stl_parts(parts, path="./HallThruster_STL/"):
+def export_stl_parts(parts, path="./HallThruster_STL/", fmt="stl"):
     if not os.path.exists(path):
         os.makedirs(path)
     export_list = [
@@ -297,6 +309,19 @@ def export_stl_parts(parts, path="./HallThruster_STL/"):
         ('mount', parts['mount']),
     ] + [(f"coil_{i+1}", c) for i, c in enumerate(parts['coils'])]
 
+    if mesh_export is not None:
+        # Parallel tessellation sized per part, binary STL / 3MF writers; only parts whose
+        # geometry hash or export settings changed are rewritten (export_manifest.json)
+        policy = tessellation_policy.TessellationPolicy(relative=params['mesh_relative'],
+                                                        budget=params['mesh_triangle_budget'])
+        result = incremental_export.export_meshes(export_list, path, fmt=fmt, prefix="HallThruster_",
+                                                  deflection=policy)
+        for row in (result['export'] or {}).get('parts', []):
+            if 'error' in row:
+                App.Console.PrintError(f"[ERROR] Export {row['name']}: {row['error']}\n")
+        App.Console.PrintMessage(f"STL: {len(result['exported'])} exported, {len(result['skipped'])} unchanged\n")
+        return result
+
     for name, obj in export_list:
         try:
             mesh = Mesh.Mesh(obj.Shape.tessellate(params['mesh_deflection']))
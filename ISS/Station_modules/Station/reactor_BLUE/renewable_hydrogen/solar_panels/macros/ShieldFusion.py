@@ -1,6 +1,17 @@
 # -*- coding: utf-8 -*-
 import FreeCAD as App, FreeCADGui as Gui, Part, math
 
+# Fuselajes de revolución de una sola operación (tools/fuselage.py), si está en el repo
+import os, sys
+_TOOLS_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(globals().get("__file__", "."))), *([".."] * 7), "tools"))
+if os.path.isdir(_TOOLS_DIR) and _TOOLS_DIR not in sys.path:
+    sys.path.append(_TOOLS_DIR)
+try:
+    from tool_imports import optional
+except ImportError:
+    optional = None
+fuselage = optional("fuselage") if optional else None
+
 DOC_NAME = "Ship_Solid_Unified"
 if App.ActiveDocument is None or App.ActiveDocument.Label != DOC_NAME:
     App.newDocument(DOC_NAME)
@@ -10,7 +21,7 @@ P = {
     # Dimensiones ampliadas para nave espacial de largo alcance
     "nose_len": 1200.0, "nose_base_d": 1650.0, "nose_cap_d": 780.0,
     "mid_len": 3450.0, "mid_d": 2700.0,
-    "rear_len": 2550.0, "rear_d": 3300.0,
+    "rear_len": 2550.0, "rear_d": 3300.0, "body_blend_r": 0.0,
     "cockpit_w": 1470.0, "cockpit_h": 780.0, "cockpit_l": 1290.0,
     "cockpit_x0": 930.0, "cockpit_blend_r": 180.0,
     "reactor_d": 2250.0, "reactor_l": 3150.0, "reactor_cx": 5100.0,
@@ -48,6 +59,13 @@ def make_nose():
 # Fuselaje medio y trasero
 # -----------------------------
 def make_body():
+    if fuselage is not None:
+        # Medio + popa como meridiano: una revolución, escalón empalmado con body_blend_r
+        b = P["body_blend_r"]
+        x1 = P["nose_len"] + P["mid_len"]
+        stations = [(P["nose_len"], P["mid_d"]/2.0, 0.0), (x1, P["mid_d"]/2.0, b),
+                    (x1, P["rear_d"]/2.0, b), (x1 + P["rear_len"], P["rear_d"]/2.0, 0.0)]
+        return fuselage.make_fuselage(stations)
     mid = Part.makeCylinder(P["mid_d"]/2.0, P["mid_len"])
     mid.Placement = App.Placement(App.Vector(P["nose_len"],0,0), rot_to_x())
     rear = Part.makeCylinder(P["rear_d"]/2.0, P["rear_len"])
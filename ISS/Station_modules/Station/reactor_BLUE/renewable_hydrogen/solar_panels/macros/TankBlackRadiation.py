@@ -21,6 +21,17 @@ Esta macro genera un modelo 3D paramétrico de una nave espacial avanzada con:
 
 import FreeCAD as App, FreeCADGui as Gui, Part, math
 
+# Fuselajes de revolución de una sola operación (tools/fuselage.py), si está en el repo
+import os, sys
+_TOOLS_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(globals().get("__file__", "."))), *([".."] * 7), "tools"))
+if os.path.isdir(_TOOLS_DIR) and _TOOLS_DIR not in sys.path:
+    sys.path.append(_TOOLS_DIR)
+try:
+    from tool_imports import optional
+except ImportError:
+    optional = None
+fuselage = optional("fuselage") if optional else None
+
 DOC_NAME = "TankBlackRadiation_Spaceship"
 if App.ActiveDocument is None or App.ActiveDocument.Label != DOC_NAME:
     App.newDocument(DOC_NAME)
@@ -76,6 +87,7 @@ P = {
     "rad_shield_layers": 5,   # Número de capas de blindaje
     "rad_layer_t": 50.0,      # Grosor por capa
     "rad_materials": ["LEAD", "TUNGSTEN", "BORON", "WATER", "CARBON"],  # Materiales por capa
+    "rad_layer_ts": None,     # Grosores por capa (lista); None = rad_layer_t en todas (ver tools/shield_optimizer.py)
 
     # Compartimentos internos
     "cockpit_len": 2000.0, "cockpit_w": 1500.0, "cockpit_h": 1200.0,
@@ -107,14 +119,17 @@ P = {
     "fillet_r": 50.0,         # Radio de fileteado para suavizado
 }
 
-# Materiales con propiedades físicas (densidad en kg/m³, colores RGB)
+# Materiales con propiedades físicas (densidad en kg/m³, colores RGB,
+# mu_rho = coeficiente de atenuación másico en cm²/g, referencia gamma 1 MeV)
 MATERIALS = {
-    'TITANIUM': {'name': 'Ti-6Al-4V', 'rho': 4430.0, 'color': (0.7, 0.7, 0.8)},
-    'CARBON_FIBER': {'name': 'Carbon Fiber Composite', 'rho': 1600.0, 'color': (0.2, 0.2, 0.2)},
-    'LEAD': {'name': 'Lead Shield', 'rho': 11340.0, 'color': (0.3, 0.3, 0.3)},
-    'TUNGSTEN': {'name': 'Tungsten Alloy', 'rho': 19300.0, 'color': (0.4, 0.4, 0.4)},
-    'BORON': {'name': 'Boron Carbide', 'rho': 2500.0, 'color': (0.1, 0.1, 0.1)},
-    'WATER': {'name': 'Water/Anti-Radiation Tank', 'rho': 1000.0, 'color': (0.0, 0.5, 1.0)},
+    'TITANIUM': {'name': 'Ti-6Al-4V', 'rho': 4430.0, 'color': (0.7, 0.7, 0.8), 'mu_rho': 0.0589},
+    'CARBON_FIBER': {'name': 'Carbon Fiber Composite', 'rho': 1600.0, 'color': (0.2, 0.2, 0.2), 'mu_rho': 0.0636},
+    'LEAD': {'name': 'Lead Shield', 'rho': 11340.0, 'color': (0.3, 0.3, 0.3), 'mu_rho': 0.0710},
+    'TUNGSTEN': {'name': 'Tungsten Alloy', 'rho': 19300.0, 'color': (0.4, 0.4, 0.4), 'mu_rho': 0.0657},
+    'BORON': {'name': 'Boron Carbide', 'rho': 2500.0, 'color': (0.1, 0.1, 0.1), 'mu_rho': 0.0627},
+    'WATER': {'name': 'Water/Anti-Radiation Tank', 'rho': 1000.0, 'color': (0.0, 0.5, 1.0), 'mu_rho': 0.0707},
+    'CARBON': {'name': 'Graphite Shield', 'rho': 1800.0, 'color': (0.15, 0.15, 0.15), 'mu_rho': 0.0636},
+    'POLYETHYLENE': {'name': 'HDPE Radiation Shield', 'rho': 950.0, 'color': (0.8, 0.8, 0.9), 'mu_rho': 0.0727},
     'STEEL': {'name': 'Stainless Steel 316L', 'rho': 8000.0, 'color': (0.6, 0.6, 0.6)},
     'ABLATIVE': {'name': 'Ablative TPS', 'rho': 1200.0, 'color': (0.8, 0.4, 0.0)},
     'ALUMINUM': {'name': 'Aluminum 6061', 'rho': 2700.0, 'color': (0.9, 0.9, 0.9)},
@@ -134,6 +149,10 @@ def rot_to_x():
 def add_obj(shape, label, material=None):
     obj = doc.addObject("Part::Feature", label)
     obj.Shape = shape
+    if material:
+        # Clave de material para el análisis de blindaje (tools/shielding_raycast.py)
+        obj.addProperty("App::PropertyString", "MaterialKey", "Material", "Clave en MATERIALS")
+        obj.MaterialKey = material
     if material and material in MATERIALS:
         obj.ViewObject.ShapeColor = MATERIALS[material]['color']
     return obj
@@ -174,6 +193,15 @@ def fillet_shape(shape, r):
 
 def make_hull():
     """Crear el casco principal con volumen interno hueco"""
+    if fuselage is not None:
+        # Nariz, medio, popa y cola como meridiano: una revolución, costuras empalmadas en el perfil
+        stations = [(0.0, P["hull_inner_d"]/2.0, 0.0),
+                    (P["nose_len"], P["hull_outer_d"]/2.0, P["fillet_r"]),
+                    (P["nose_len"] + P["mid_len"] + P["rear_len"], P["hull_outer_d"]/2.0, P["fillet_r"]),
+                    (P["total_length"], P["hull_outer_d"]*0.5/2.0, 0.0)]
+        hull = fuselage.make_fuselage(stations, (P["hull_outer_d"] - P["hull_inner_d"])/2.0, closed=False)
+        return add_obj(hull, "Hull", "TITANIUM")
+
     # Nariz cónica hueca
     outer_nose = Part.makeCone(P["hull_outer_d"]/2.0, P["hull_inner_d"]/2.0, P["nose_len"])
     inner_nose = Part.makeCone(P["hull_inner_d"]/2.0, P["hull_inner_d"]/2.0, P["nose_len"] + 100)
@@ -204,11 +232,16 @@ def make_hull():
 def make_radiation_shields():
     """Sistema de blindaje multi-capa para radiación extrema"""
     shields = []
+    ts = list(P.get("rad_layer_ts") or [])
+    inner_d = P["hull_outer_d"]
     for i in range(P["rad_shield_layers"]):
-        layer_d = P["hull_outer_d"] + (i+1) * P["rad_layer_t"] * 2
+        # Capas sin grosor propio (lista más corta que rad_shield_layers) usan rad_layer_t
+        t = ts[i] if i < len(ts) else P["rad_layer_t"]
+        layer_d = inner_d + t * 2
         layer = make_cylinder(layer_d, P["total_length"], cx=P["total_length"]/2.0)
-        inner_cut = make_cylinder(layer_d - P["rad_layer_t"]*2, P["total_length"] + 100, cx=P["total_length"]/2.0)
+        inner_cut = make_cylinder(inner_d, P["total_length"] + 100, cx=P["total_length"]/2.0)
         layer = layer.cut(inner_cut)
+        inner_d = layer_d
         mat = P["rad_materials"][i] if i < len(P["rad_materials"]) else "LEAD"
         shields.append(add_obj(layer, f"Rad_Shield_Layer_{i+1}", mat))
     return shields
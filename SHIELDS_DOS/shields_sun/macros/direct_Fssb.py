@@ -5,6 +5,18 @@
 
 import FreeCAD as App, FreeCADGui as Gui, Part, math
 
+# Cascos y fuselajes de revolución analíticos (tools/revolved_shell.py, tools/fuselage.py), si están en el repo
+import os, sys
+_TOOLS_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(globals().get("__file__", "."))), "..", "..", "..", "tools"))
+if os.path.isdir(_TOOLS_DIR) and _TOOLS_DIR not in sys.path:
+    sys.path.append(_TOOLS_DIR)
+try:
+    from tool_imports import optional
+except ImportError:
+    optional = None
+revolved_shell = optional("revolved_shell") if optional else None
+fuselage = optional("fuselage") if optional else None
+
 doc_name = "Direct_Fusion_Drive"
 if App.ActiveDocument is None or App.ActiveDocument.Label != doc_name:
     App.newDocument(doc_name)
@@ -94,7 +106,12 @@ def make_box(w, d, h, cx=0.0, cy=0.0, cz=0.0, label="Box"):
     b.Placement = App.Placement(App.Vector(cx - w/2.0, cy - d/2.0, cz - h/2.0), App.Rotation())
     return add_obj(b, label)
 
-def make_hollow_from_offset(outer_shape, t, label="Shell"):
+def make_hollow_from_offset(outer_shape, t, label="Shell", sections=None):
+    # sections [(x0, L, r0, r1)]: cuerpo de revolución en X -> casco desde el meridiano (una revolución)
+    if revolved_shell is not None:
+        if sections is not None:
+            return add_obj(revolved_shell.hollow(sections, t, label, fallback_shape=outer_shape), label)
+        return add_obj(revolved_shell.thicken(outer_shape, t, label), label)
     try:
         inner = outer_shape.makeOffsetShape(-t, 0.01, join=2, fill=True)
         shell = outer_shape.cut(inner)
@@ -103,11 +120,24 @@ def make_hollow_from_offset(outer_shape, t, label="Shell"):
         return add_obj(outer_shape, label + "_fallback")
 
 def create_hull():
-    nose = make_cone_x(P["nose_base_d"], 0.0, P["nose_len"], cx=P["nose_len"]/2.0, label="Nose")
-    mid  = make_cyl_x(P["mid_d"], P["mid_len"], cx=P["nose_len"] + P["mid_len"]/2.0, label="Mid")
-    rear = make_cyl_x(P["rear_d"], P["rear_len"], cx=P["nose_len"] + P["mid_len"] + P["rear_len"]/2.0, label="Rear")
-    fuse_fuselage_shape = nose.Shape.fuse(mid.Shape).fuse(rear.Shape)
-    hull = make_hollow_from_offset(fuse_fuselage_shape, P["hull_t"], label="Hull_Shell")
+    if fuselage is not None:
+        # Nariz/medio/popa como meridiano: el sólido exterior en una revolución, sin fusiones
+        stations = fuselage.stations_from_sections([(P["nose_len"], P["nose_base_d"], 0.0),
+                                                    (P["mid_len"], P["mid_d"]),
+                                                    (P["rear_len"], P["rear_d"])])
+        fuse_fuselage_shape = fuselage.make_fuselage(stations)
+    else:
+        nose = make_cone_x(P["nose_base_d"], 0.0, P["nose_len"], cx=P["nose_len"]/2.0, label="Nose")
+        mid  = make_cyl_x(P["mid_d"], P["mid_len"], cx=P["nose_len"] + P["mid_len"]/2.0, label="Mid")
+        rear = make_cyl_x(P["rear_d"], P["rear_len"], cx=P["nose_len"] + P["mid_len"] + P["rear_len"]/2.0, label="Rear")
+        fuse_fuselage_shape = nose.Shape.fuse(mid.Shape).fuse(rear.Shape)
+    # El casco sale siempre del meridiano (revolved_shell), con el sólido como respaldo
+    hull_sections = [(0.0, P["nose_len"], P["nose_base_d"]/2.0, 0.0),
+                     (P["nose_len"], P["mid_len"], P["mid_d"]/2.0, P["mid_d"]/2.0),
+                     (P["nose_len"] + P["mid_len"], P["rear_len"], P["rear_d"]/2.0, P["rear_d"]/2.0)]
+    hull = make_hollow_from_offset(fuse_fuselage_shape, P["hull_t"], label="Hull_Shell", sections=hull_sections)
+    if revolved_shell is not None:
+        revolved_shell.print_report()
 
     # Añadir estructuras internas para volumen y soporte de impresión
     internal_bulkheads = []
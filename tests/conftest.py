@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de tools/: se importan los módulos como lo hacen las macros, con tools/ en sys.path."""
+
+import os
+import sys
+import types
+
+import pytest
+
+TOOLS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tools")
+if TOOLS_DIR not in sys.path:
+    sys.path.insert(0, TOOLS_DIR)
+
+NOZZLE_MACRO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                            "Carbon_shields", "python", "parameters", "RocketCooledNozzle.py")
+
+
+@pytest.fixture
+def nozzle_macro(monkeypatch):
+    """
+    Globals de RocketCooledNozzle.py cargado sin FreeCAD.
+
+    Fuera de __main__ la macro solo crea el documento y define funciones:
+    basta un FreeCAD mínimo para usar P, CALC_GRAPH, las calculate_* y los
+    perfiles (Base.Vector con x, y, z).
+    """
+    fc = types.ModuleType("FreeCAD")
+    fc.newDocument = lambda name: types.SimpleNamespace(Name=name, Label=name, Objects=[])
+    fc.Base = types.ModuleType("FreeCAD.Base")
+    fc.Base.Vector = lambda x=0.0, y=0.0, z=0.0: types.SimpleNamespace(x=x, y=y, z=z)
+    monkeypatch.setitem(sys.modules, "FreeCAD", fc)
+    monkeypatch.setitem(sys.modules, "Part", types.ModuleType("Part"))
+    ns = {"__name__": "RocketCooledNozzle", "__file__": NOZZLE_MACRO}
+    with open(NOZZLE_MACRO, encoding="utf-8") as f:
+        exec(compile(f.read(), NOZZLE_MACRO, "exec"), ns)
+    return ns
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import zlib
+
+import pytest
+
+import artifact_store
+
+STEP = (b"ISO-10303-21;\nHEADER;\nFILE_NAME('a.step','2025-10-17T03:52:50',(''),(''),'','','');\n"
+        b"ENDSEC;\nDATA;\n#1=CARTESIAN_POINT('',(0.,0.,0.));\nENDSEC;\nEND-ISO-10303-21;\n")
+
+
+def _edit_in_place(path, data):
+    # Como Part.export sobre una ruta existente: se trunca y reescribe el mismo inodo
+    with open(path, "r+b") as f:
+        f.truncate(0)
+        f.write(data)
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_step_digest_ignores_file_name_date():
+    other = STEP.replace(b"2025-10-17T03:52:50", b"2026-01-01T00:00:00")
+    assert artifact_store.digest_bytes(STEP, "step") == artifact_store.digest_bytes(other, "step")
+    assert artifact_store.digest_bytes(STEP, "step") != artifact_store.digest_bytes(STEP.replace(b"0.,0.,0.", b"1.,0.,0."), "step")
+
+
+def test_default_outputs_are_independent(tmp_path):
+    store = artifact_store.ArtifactStore(str(tmp_path / "store"))
+    a, b = str(tmp_path / "a.step"), str(tmp_path / "b.step")
+    d = store.write(a, STEP)["digest"]
+    assert store.write(b, STEP)["action"] in ("reflink", "copy")
+    _edit_in_place(a, b"otro contenido")
+    assert _read(b) == STEP
+    c = str(tmp_path / "c.step")
+    store.materialize(d, c)
+    assert _read(c) == STEP
+
+
+def test_publish_unchanged_keeps_file(tmp_path):
+    store = artifact_store.ArtifactStore(str(tmp_path / "store"))
+    out = str(tmp_path / "a.step")
+    store.write(out, STEP)
+    ino = os.stat(out).st_ino
+    res = store.write(out, STEP.replace(b"2025-10-17T03:52:50", b"2026-01-01T00:00:00"))
+    assert res["action"] == "unchanged"
+    assert os.stat(out).st_ino == ino
+
+
+def test_hard_link_blob_verified_before_reuse(tmp_path):
+    store = artifact_store.ArtifactStore(str(tmp_path / "store"), link="hard")
+    a = str(tmp_path / "a.step")
+    res = store.write(a, STEP)
+    d = res["digest"]
+    if res["action"] != "hard":
+        pytest.skip("el sistema de ficheros no admite enlaces duros")
+    # La escritura en el sitio alcanza a la copia compartida del almacén...
+    _edit_in_place(a, b"otro contenido")
+    # ...pero no se reutiliza: se rehace desde el objeto comprimido
+    b = str(tmp_path / "b.step")
+    assert store.materialize(d, b) == "hard"
+    assert _read(b) == STEP
+    assert not os.path.samefile(a, b)
+
+
+def test_damaged_object_rejected(tmp_path):
+    store = artifact_store.ArtifactStore(str(tmp_path / "store"), link="copy")
+    d = store.write(str(tmp_path / "a.step"), STEP)["digest"]
+    store._atomic_write(store._object_path(d), zlib.compress(b"basura"))
+    with pytest.raises(ValueError):
+        store.materialize(d, str(tmp_path / "b.step"))
+
+
+def test_invalid_link_mode():
+    with pytest.raises(ValueError):
+        artifact_store.ArtifactStore(link="soft")
+
+
+def _blobs(store_dir):
+    root = os.path.join(store_dir, "files")
+    return [n for _, _, names in os.walk(root) for n in names]
+
+
+def test_reflink_probed_once_and_no_blob_left_on_copy(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(artifact_store, "_reflink", lambda src, dst: calls.append(src) or False)
+    store = artifact_store.ArtifactStore(str(tmp_path / "store"))
+    actions = [store.write(str(tmp_path / f"{n}.step"), STEP)["action"] for n in "abc"]
+    assert actions == ["copy"] * 3 and len(calls) == 1
+    assert _blobs(str(tmp_path / "store")) == []
+
+
+def test_reflink_keeps_blob_when_cloned(tmp_path, monkeypatch):
+    def fake_reflink(src, dst):
+        shutil.copyfile(src, dst)
+        return True
+
+    monkeypatch.setattr(artifact_store, "_reflink", fake_reflink)
+    store = artifact_store.ArtifactStore(str(tmp_path / "store"))
+    assert store.write(str(tmp_path / "a.step"), STEP)["action"] == "reflink"
+    assert len(_blobs(str(tmp_path / "store"))) == 1
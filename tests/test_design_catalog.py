@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from design_catalog import DesignCatalog
+
+UNITS = {"m": b"SI_UNIT($,.METRE.)", "mm": b"SI_UNIT(.MILLI.,.METRE.)"}
+
+
+def _step(tmp_path, name, unit, extent):
+    path = tmp_path / name
+    path.write_bytes(
+        b"ISO-10303-21;\nHEADER;\nFILE_NAME('" + name.encode() + b"','',(''),(''),'','','');\nENDSEC;\nDATA;\n"
+        b"#1=PRODUCT('" + name.encode() + b"','','',(#2));\n"
+        b"#5=( LENGTH_UNIT() NAMED_UNIT(*) " + UNITS[unit] + b" );\n"
+        b"#10=CARTESIAN_POINT('',(0.,0.,0.));\n"
+        b"#11=CARTESIAN_POINT('',(" + repr(float(extent)).encode() + b",1.,2.));\n"
+        b"ENDSEC;\nEND-ISO-10303-21;\n")
+    return str(path)
+
+
+@pytest.fixture
+def cat():
+    with DesignCatalog(":memory:") as c:
+        yield c
+
+
+def test_metre_with_mm_coordinates_is_flagged(cat, tmp_path):
+    # Exportado en mm pero declarado METRE: 37 km, no se escala ni se mezcla en las consultas
+    path = _step(tmp_path, "grande.step", "m", 37000)
+    assert cat.ingest_artifact(path)
+    row = cat._row(path)
+    assert row["unit_suspect"] == 1
+    assert row["unit_m"] == 1.0
+    assert row["raw_max_dim"] == pytest.approx(37000)
+    assert row["max_dim"] is None and row["dx"] is None
+
+
+def test_metre_ship_with_mm_coordinates_is_flagged(cat, tmp_path):
+    # Nave de 5.8 m escrita en mm con METRE: 5.8 km, muy por encima de cualquier diseño del repo
+    path = _step(tmp_path, "nave.step", "m", 5800)
+    cat.ingest_artifact(path)
+    row = cat._row(path)
+    assert row["unit_suspect"] == 1
+    assert row["max_dim"] is None
+
+
+def test_milli_declared_is_not_rescaled(cat, tmp_path):
+    path = _step(tmp_path, "pieza.step", "mm", 37000)
+    cat.ingest_artifact(path)
+    row = cat._row(path)
+    assert row["unit_suspect"] == 0
+    assert row["unit_m"] == pytest.approx(1e-3)
+    assert row["max_dim"] == pytest.approx(37000)
+
+
+def test_small_metre_file_is_scaled_to_mm(cat, tmp_path):
+    path = _step(tmp_path, "metros.step", "m", 3.5)
+    cat.ingest_artifact(path)
+    row = cat._row(path)
+    assert row["unit_suspect"] == 0
+    assert row["max_dim"] == pytest.approx(3500)
+    assert row["raw_max_dim"] == pytest.approx(3.5)
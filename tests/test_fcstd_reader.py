@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import os
+import zipfile
+
+import pytest
+
+import fcstd_reader
+
+DOCUMENT = """<?xml version='1.0' encoding='utf-8'?>
+<Document SchemaVersion="4" ProgramVersion="0.21" FileVersion="1">
+    <Properties Count="1">
+        <Property name="Label" type="App::PropertyString"><String value="Sat"/></Property>
+    </Properties>
+    <Objects Count="2" Dependencies="1">
+        <ObjectDeps Name="Bus" Count="0"/>
+        <Object type="Part::Feature" name="Bus" id="1"/>
+        <Object type="App::Part" name="Part" id="2"/>
+    </Objects>
+    <ObjectData Count="2">
+        <Object name="Bus">
+            <Properties Count="5">
+                <Property name="Label" type="App::PropertyString"><String value="Bus &amp; frame"/></Property>
+                <Property name="Visibility" type="App::PropertyBool"><Bool value="{visible}"/></Property>
+                <Property name="Placement" type="App::PropertyPlacement">
+                    <PropertyPlacement Px="1" Py="2" Pz="3" Q0="0" Q1="0" Q2="0" Q3="1" A="0" Ox="0" Oy="0" Oz="1"/>
+                </Property>
+                <Property name="Shape" type="Part::PropertyPartShape"><Part file="PartShape.brp"/></Property>
+                <Property name="Count" type="App::PropertyInteger"><Integer value="4"/></Property>
+            </Properties>
+        </Object>
+        <Object name="Part">
+            <Extensions Count="1"><Extension type="App::GroupExtension" name="GroupExtension"/></Extensions>
+            <Properties Count="2">
+                <Property name="Label" type="App::PropertyString"><String value="SPACECRAFT"/></Property>
+                <Property name="Group" type="App::PropertyLinkList"><LinkList count="1"><Link value="Bus"/></LinkList></Property>
+            </Properties>
+        </Object>
+    </ObjectData>
+</Document>
+"""
+
+
+def _fcstd(path, visible="true", brep=b"DBRep_DrawableShape\nCASCADE Topology V1\n"):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("Document.xml", DOCUMENT.replace("{visible}", visible))
+        z.writestr("PartShape.brp", brep)
+    return str(path)
+
+
+def test_objects_and_properties(tmp_path):
+    with fcstd_reader.FCStdFile(_fcstd(tmp_path / "a.FCStd")) as f:
+        assert f.names() == [("Bus", "Part::Feature"), ("Part", "App::Part")]
+        bus = f.get("Bus & frame")
+        assert bus.name == "Bus" and bus.type_id == "Part::Feature" and bus.id == 1
+        assert bus.value("Visibility") is True and bus.value("Count") == 4
+        assert bus.value("Placement")["base"] == (1.0, 2.0, 3.0)
+        assert bus.shape_file == "PartShape.brp"
+        part = f.get("Part")
+        assert part.extensions == ["App::GroupExtension"] and part.value("Group") == ["Bus"]
+        assert f.document_properties()["Label"] == ("App::PropertyString", "Sat")
+        with pytest.raises(KeyError):
+            f.get("missing")
+        with pytest.raises(KeyError):
+            f.brep_stream("SPACECRAFT")
+
+
+def test_extract_and_summary(tmp_path):
+    brep = b"DBRep_DrawableShape\n" + b"0 " * 5000
+    with fcstd_reader.FCStdFile(_fcstd(tmp_path / "a.FCStd", brep=brep)) as f:
+        out = str(tmp_path / "bus.brp")
+        assert f.extract("Bus", out) == len(brep)
+        with open(out, "rb") as g:
+            assert g.read() == brep
+        s = f.summary()
+        assert s["objects"] == 2 and s["shapes"] == 1 and s["brep_bytes"] == len(brep)
+        assert s["types"] == {"Part::Feature": 1, "App::Part": 1}
+
+
+def test_diff(tmp_path):
+    a = _fcstd(tmp_path / "a.FCStd")
+    b = _fcstd(tmp_path / "b.FCStd", visible="false", brep=b"otra forma")
+    d = fcstd_reader.diff(a, b)
+    assert d["changed"] == {"Bus": ["Visibility"]} and d["shape_changed"] == ["Bus"]
+    assert d["added"] == d["removed"] == []
+    assert fcstd_reader.diff(a, a)["shape_changed"] == []
+
+
+def test_repo_fcstd_reads():
+    root = os.path.join(os.path.dirname(fcstd_reader.__file__), "..")
+    path = os.path.join(root, "MACRO_02", "new_ideas", "macros", "freeCAD", "ParkerProbe_Printable.FCStd")
+    if not os.path.exists(path):
+        pytest.skip("fichero de ejemplo no disponible")
+    with fcstd_reader.FCStdFile(path) as f:
+        objs = f.objects()
+        assert objs and len(f.names()) == len(objs)
+        assert all(o.shape_file in f.members() for o in objs.values() if o.shape_file)
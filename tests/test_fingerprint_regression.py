@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import copy
+
+import pytest
+
+import fingerprint_regression as fr
+
+BOX = {"digest": "d1", "volume": 1000.0, "area": 600.0, "bbox": [0.0, 0.0, 0.0, 10.0, 10.0, 10.0],
+       "cg": [5.0, 5.0, 5.0], "inertia": [1.0, 1.0, 1.0], "solids": 1, "shells": 1, "faces": 6,
+       "edges": 12, "vertexes": 8}
+
+
+def _result(build_s=10.0, status="ok", **objects):
+    return {"status": status, "error": None, "build_s": build_s, "objects": objects or {"Box": BOX}}
+
+
+@pytest.mark.parametrize("now, before, expected", [
+    (None, 10.0, "ok"), (10.0, None, "ok"),
+    (10.4, 10.0, "ok"),      # dentro de TIME_ABS
+    (12.0, 10.0, "ok"),      # +2 s sobre 10 s: dentro de TIME_REL
+    (13.0, 10.0, "slower"),
+    (0.9, 0.2, "slower"),    # +350 % y +0.7 s
+    (0.5, 0.2, "ok"),        # relativo grande pero por debajo de TIME_ABS
+    (7.0, 10.0, "faster"),
+])
+def test_time_status(now, before, expected):
+    assert fr._time_status(now, before) == expected
+
+
+def test_compare_statuses():
+    moved = copy.deepcopy(BOX)
+    moved.update(digest="d2", cg=[5.0, 5.0, 6.0])
+    # Mismo digest: no se miden campos (solo cuenta el tiempo)
+    same_digest = dict(BOX, volume=2000.0)
+    # Digest distinto pero dentro de tolerancia: no es deriva
+    tiny = dict(BOX, digest="d3", volume=1000.0 + 1e-6)
+    golden = {"a": _result(), "b": _result(), "c": _result(), "d": _result(), "e": _result(),
+              "f": _result(), "gone": _result()}
+    results = {
+        "a": _result(),
+        "b": _result(Box=moved),
+        "c": _result(Box=BOX, Extra=BOX),
+        "d": _result(status="error"),
+        "e": _result(build_s=20.0, Box=same_digest),
+        "f": _result(Box=tiny),
+        "new": _result(),
+    }
+    rows = {r["macro"]: r for r in fr.compare(results, golden)}
+    assert {k: r["status"] for k, r in rows.items()} == {
+        "a": "ok", "b": "drift", "c": "drift", "d": "error", "e": "slower", "f": "ok",
+        "gone": "missing", "new": "new"}
+    assert rows["b"]["drift"] == {"Box": {"cg": ([5.0, 5.0, 5.0], [5.0, 5.0, 6.0])}}
+    assert rows["c"]["added"] == ["Extra"] and rows["c"]["removed"] == []
+    assert rows["e"]["build_s"] == 20.0 and rows["e"]["golden_s"] == 10.0
+    assert rows["gone"]["build_s"] is None
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import math
+
+import numpy as np
+import pytest
+
+import fuselage
+import revolved_shell as rs
+
+STEP = [(0.0, 100.0, 0.0), (100.0, 100.0, 0.0), (100.0, 105.0, 0.0), (200.0, 105.0, 0.0)]
+BLENDED = [(0.0, 100.0, 0.0), (100.0, 100.0, 30.0), (100.0, 140.0, 30.0), (200.0, 140.0, 0.0)]
+
+
+def _revolve(f, a, b, n=200001):
+    x = np.linspace(a, b, n)
+    y = f(x) ** 2
+    return math.pi * float(np.sum(0.5 * (y[1:] + y[:-1]) * np.diff(x)))
+
+
+def test_step_hull_matches_revolved_shell():
+    # Mismo casco que revolved_shell sobre la polilínea (antes 3.232e6 con el vértice recortado)
+    pieces = rs.polyline(*rs.envelope([(0.0, 100.0, 100.0, 100.0), (100.0, 100.0, 105.0, 105.0)]))
+    vol = fuselage.fuselage_volume(STEP, 20.0)
+    assert vol == pytest.approx(rs.shell_volume(pieces, 20.0), rel=1e-9)
+    assert vol == pytest.approx(3204496.39, abs=1.0)
+
+
+def test_blended_step_open_tube_is_exact():
+    # Los empalmes de 30 no caben en el escalón de 40: se reducen a 20 y el
+    # interior sigue el arco concéntrico de radio 40 del empalme cóncavo
+    c = lambda R, cx, sign: (lambda x: 120.0 + sign * np.sqrt(np.maximum(R * R - (x - cx) ** 2, 0.0)))
+    outer = (_revolve(lambda x: 100.0 + 0 * x, 0.0, 80.0) + _revolve(c(20.0, 80.0, -1), 80.0, 100.0)
+             + _revolve(c(20.0, 120.0, 1), 100.0, 120.0) + _revolve(lambda x: 140.0 + 0 * x, 120.0, 200.0))
+    inner = (_revolve(lambda x: 80.0 + 0 * x, 0.0, 80.0) + _revolve(c(40.0, 80.0, -1), 80.0, 120.0)
+             + _revolve(lambda x: 120.0 + 0 * x, 120.0, 200.0))
+    assert fuselage.fuselage_volume(BLENDED, 20.0, closed=False) == pytest.approx(outer - inner, rel=1e-6)
+    chain, = fuselage.meridian(BLENDED, 20.0, closed=False)["inner"]
+    assert [p[0] for p in chain] == ["line", "carc", "line"]
+    assert chain[0][1] == 0.0 and chain[-1][2] == 200.0
+
+
+def test_closed_hull_is_smaller_than_solid():
+    solid = fuselage.fuselage_volume(BLENDED)
+    hull = fuselage.fuselage_volume(BLENDED, 20.0)
+    assert 0.0 < hull < solid
+    # El interior cerrado arranca a t de las caras planas de los extremos
+    chain, = fuselage.meridian(BLENDED, 20.0)["inner"]
+    assert chain[0][1] == pytest.approx(20.0) and chain[-1][2] == pytest.approx(180.0)
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        fuselage.fuselage_volume(BLENDED, 300.0)
+    with pytest.raises(ValueError):
+        fuselage.fuselage_volume(BLENDED, closed=False)
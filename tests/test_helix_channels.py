@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+import helix_channels as hc
+
+
+class _Shape:
+    """Forma mínima con la interfaz que usan las validaciones."""
+
+    def __init__(self, shape_type="Solid", volume=1.0, valid=True, children=()):
+        self.ShapeType = shape_type
+        self.Volume = volume
+        self._valid = valid
+        self._children = list(children)
+        self.Solids = [c for c in self._children if c.ShapeType == "Solid"] if children else \
+            ([self] if shape_type == "Solid" else [])
+
+    def isValid(self):
+        return self._valid
+
+    def isNull(self):
+        return False
+
+    def childShapes(self):
+        return self._children
+
+
+def test_segments_need_every_prism_valid():
+    good = _Shape("Compound", 3.0, children=[_Shape(), _Shape(), _Shape()])
+    assert hc._valid_sweep(good, "segments")
+    assert not hc._valid_sweep(_Shape("Compound", 0.0), "segments")
+    assert not hc._valid_sweep(None, "segments")
+    broken = _Shape("Compound", 2.0, children=[_Shape(), _Shape(valid=False)])
+    assert not hc._valid_sweep(broken, "segments")
+    flat = _Shape("Compound", 1.0, children=[_Shape(), _Shape("Face", 0.0)])
+    assert not hc._valid_sweep(flat, "segments")
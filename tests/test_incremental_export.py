@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import sys
+import types
+
+import pytest
+
+import incremental_export as ie
+
+
+class FakeShape:
+    def __init__(self, brep):
+        self.brep = brep
+
+    def exportBrepToString(self):
+        return self.brep
+
+
+def _obj(label, brep):
+    return types.SimpleNamespace(Label=label, Shape=FakeShape(brep))
+
+
+@pytest.fixture
+def part_module(monkeypatch):
+    """Part mínimo: export y compound escriben las piezas recibidas en el 'STEP'."""
+    calls = []
+
+    class Shape:
+        def importBrep(self, path):
+            with open(path, encoding="utf-8") as f:
+                self.brep = f.read()
+
+    def export(objs, path):
+        calls.append(("export", [o.Label for o in objs]))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("|".join(o.Shape.brep for o in objs))
+
+    def make_compound(shapes):
+        calls.append(("compound", [s.brep for s in shapes]))
+        return types.SimpleNamespace(exportStep=lambda path: open(path, "w").write("|".join(s.brep for s in shapes)))
+
+    part = types.ModuleType("Part")
+    part.Shape, part.export, part.makeCompound = Shape, export, make_compound
+    monkeypatch.setitem(sys.modules, "Part", part)
+    return calls
+
+
+def test_document_objects_use_part_export_without_brep_cache(tmp_path, part_module):
+    step = str(tmp_path / "sat.step")
+    objs = [_obj("Bus", "a"), _obj("Panel", "b")]
+    r = ie.export_step(objs, step)
+    assert r["written"] and r["changed"] == ["Bus", "Panel"]
+    assert part_module == [("export", ["Bus", "Panel"])]
+    assert not os.path.exists(os.path.join(str(tmp_path / "sat.cache"), "parts"))
+    # Sin cambios: ni se reescribe ni se vuelve a exportar
+    r = ie.export_step(objs, step)
+    assert not r["written"] and r["reused"] == ["Bus", "Panel"] and len(part_module) == 1
+    objs[1] = _obj("Panel", "b2")
+    r = ie.export_step(objs, step)
+    assert r["written"] and r["changed"] == ["Panel"] and r["reused"] == ["Bus"]
+    assert open(step).read() == "a|b2"
+
+
+def test_single_compound_reads_cached_breps(tmp_path, part_module):
+    step = str(tmp_path / "sat.step")
+    parts = [("Bus", FakeShape("a")), ("Panel", FakeShape("b"))]
+    ie.export_step(parts, step, single_compound=True)
+    cache = tmp_path / "sat.cache" / "parts"
+    assert len(os.listdir(cache)) == 2
+    # Si falta el BREP de una pieza se vuelve a escribir aunque el hash no cambie
+    os.remove(ie._brep_path(str(tmp_path / "sat.cache"), hashlib.sha1(b"a").hexdigest()))
+    parts[1] = ("Panel", FakeShape("b2"))
+    r = ie.export_step(parts, step, single_compound=True)
+    assert r["written"] and r["changed"] == ["Bus", "Panel"]
+    assert part_module[-1] == ("compound", ["a", "b2"])
+    assert open(step).read() == "a|b2"
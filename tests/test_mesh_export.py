@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+import xml.etree.ElementTree as ET
+import zipfile
+
+import numpy as np
+
+import mesh_export
+
+TETRA_V = np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0], [0.0, 10.0, 0.0], [0.0, 0.0, 10.0]])
+TETRA_T = np.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]])
+NS = "{http://schemas.microsoft.com/3dmanufacturing/core/2015/02}"
+
+
+def test_stl_round_trip(tmp_path):
+    path = tmp_path / "tetra.stl"
+    size = mesh_export.write_stl(str(path), TETRA_V, TETRA_T, "tetra")
+    assert size == 84 + 50 * len(TETRA_T)
+    v, t = mesh_export.read_stl(str(path))
+    assert np.allclose(v[t], TETRA_V[TETRA_T])
+
+
+def test_3mf_round_trip_escapes_names(tmp_path):
+    path = tmp_path / "parts.3mf"
+    names = ['Hull & "Shell" <1>', "Nariz'"]
+    mesh_export.write_3mf(str(path), [(n, TETRA_V + i, TETRA_T) for i, n in enumerate(names)])
+    with zipfile.ZipFile(path) as z:
+        assert {"[Content_Types].xml", "_rels/.rels", "3D/3dmodel.model"} <= set(z.namelist())
+        root = ET.fromstring(z.read("3D/3dmodel.model"))
+    objects = root.findall(f"{NS}resources/{NS}object")
+    assert [o.get("name") for o in objects] == names
+    assert len(root.findall(f"{NS}build/{NS}item")) == 2
+    for i, o in enumerate(objects):
+        v = np.array([[float(e.get(k)) for k in "xyz"] for e in o.iter(f"{NS}vertex")])
+        t = np.array([[int(e.get(k)) for k in ("v1", "v2", "v3")] for e in o.iter(f"{NS}triangle")])
+        assert np.allclose(v, TETRA_V + i) and np.array_equal(t, TETRA_T)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import math
+import os
+import types
+
+import numpy as np
+
+import mesh_lod
+
+
+def _sphere(R, k):
+    """Esfera UV de k paralelos y 2k meridianos."""
+    v = [(0.0, 0.0, R)]
+    for i in range(1, k):
+        th = math.pi * i / k
+        v += [(R * math.sin(th) * math.cos(ph), R * math.sin(th) * math.sin(ph), R * math.cos(th))
+              for ph in np.linspace(0.0, 2.0 * math.pi, 2 * k, endpoint=False)]
+    v.append((0.0, 0.0, -R))
+    m = 2 * k
+    ring = lambda i, j: 1 + (i - 1) * m + j % m
+    t = [(0, ring(1, j), ring(1, j + 1)) for j in range(m)]
+    for i in range(1, k - 1):
+        for j in range(m):
+            t += [(ring(i, j), ring(i + 1, j), ring(i + 1, j + 1)), (ring(i, j), ring(i + 1, j + 1), ring(i, j + 1))]
+    t += [(len(v) - 1, ring(k - 1, j + 1), ring(k - 1, j)) for j in range(m)]
+    return v, t
+
+
+class FakeSphere:
+    """Esfera con la caché de triangulación de OCC: tessellate(d) reutiliza una malla más fina."""
+
+    def __init__(self, R=100.0, brep="esfera"):
+        self.R = R
+        self.brep = brep
+        self.cached = None
+        self.calls = []
+        self.BoundBox = types.SimpleNamespace(DiagonalLength=2.0 * math.sqrt(3.0) * R)
+
+    def tessellate(self, d, force=False):
+        self.calls.append((d, force))
+        if force or self.cached is None or self.cached > d:
+            self.cached = d
+        k = max(4, int(math.ceil(math.pi / math.acos(1.0 - self.cached / self.R) / 2.0)))
+        v, t = _sphere(self.R, k)
+        return [types.SimpleNamespace(x=x, y=y, z=z) for x, y, z in v], t
+
+    def exportBrepToString(self):
+        return self.brep
+
+
+def test_decimate_keeps_a_valid_smaller_mesh():
+    v, t = _sphere(100.0, 40)
+    dv, dt = mesh_lod.decimate(v, t, cell=20.0)
+    assert 0 < len(dt) < len(t) and dt.max() < len(dv)
+    assert np.all((dt[:, 0] != dt[:, 1]) & (dt[:, 1] != dt[:, 2]) & (dt[:, 0] != dt[:, 2]))
+    # Área proyectada de la esfera: pi R² (aprox. por exceso de la cuerda)
+    assert abs(mesh_lod.projected_area(dv, dt, (0.0, 0.0, 1.0)) / (math.pi * 1e4) - 1.0) < 0.15
+
+
+def test_build_levels_get_coarser():
+    shape = FakeSphere()
+    lod = mesh_lod.LODCache(persist=False).build(shape, key="k")
+    tris = lod.triangles()
+    assert len(tris) == len(mesh_lod.LEVELS)
+    # Los teselados bajan de nivel en nivel; el decimado no añade triángulos
+    assert all(a > b for a, b in zip(tris[:-2], tris[1:-1])) and tris[-1] <= tris[-2]
+    # Cada nivel teselado rehace la malla en vez de reutilizar la del nivel fino
+    assert [f for _, f in shape.calls] == [True] * (len(mesh_lod.LEVELS) - 1)
+
+
+def test_cache_hits_and_disk_round_trip(tmp_path):
+    cache = mesh_lod.LODCache(directory=str(tmp_path))
+    lod = cache.get(FakeSphere())
+    assert cache.get(FakeSphere()) is lod and cache.stats == {"hits": 1, "disk_hits": 0, "misses": 1}
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and files[0].startswith(mesh_lod.shape_key(FakeSphere()))
+    again = mesh_lod.LODCache(directory=str(tmp_path))
+    loaded = again.get(FakeSphere())
+    assert again.stats["disk_hits"] == 1 and loaded.triangles() == lod.triangles()
+    assert np.allclose(loaded.deflections, lod.deflections)
+    again.clear(disk=True)
+    assert os.listdir(tmp_path) == []
+
+
+def test_select_coarser_level_when_far():
+    lod = mesh_lod.LODCache(persist=False).build(FakeSphere(), key="k")
+    near = lod.select(500.0)
+    far = lod.select(1e7)
+    assert near < far == len(lod) - 1
+    assert lod.for_view(1e7)[1].shape == lod.level(far)[1].shape
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import nozzle_contour
+import nozzle_model
+
+
+def test_rao_contour_endpoints():
+    P = nozzle_model.load_nozzle_params()
+    x, r, info = nozzle_contour.contour_from_params(P, n=300)
+    throat_r, exit_r = P["throat_diameter"] / 2.0, P["exit_diameter"] / 2.0
+    assert np.all(np.diff(x) > 0)
+    assert r[np.argmin(r)] == pytest.approx(throat_r, rel=1e-3)
+    assert abs(x[np.argmin(r)]) < 1.0
+    assert r[0] == pytest.approx(exit_r) and r[-1] == pytest.approx(exit_r)
+    assert x[-1] == pytest.approx(info["bell_length"])
+
+
+def test_macro_profile_defaults_to_profile_points(nozzle_macro):
+    pts = nozzle_macro["nozzle_profile"]()
+    assert pts == [(p.x, p.y) for p in nozzle_macro["radius_profile_points"]()]
+    r_of_x, x0, x1 = nozzle_macro["polyline_radius_function"]()
+    assert (x0, x1) == (pts[0][0], pts[-1][0])
+
+
+def test_macro_profile_uses_rao_contour(nozzle_macro):
+    P = nozzle_macro["P"]
+    P["rao_contour"] = True
+    pts = nozzle_macro["nozzle_profile"]()
+    x, r, _ = nozzle_contour.contour_from_params(P, n=200)
+    assert np.allclose(pts, np.column_stack([x, r]))
+    # Canales y pared leen el perfil por profile_radius_function / polyline_radius_function
+    r_of_x, x0, x1 = nozzle_macro["polyline_radius_function"]()
+    assert (x0, x1) == (x[0], x[-1])
+    assert r_of_x(0.0) == pytest.approx(P["throat_diameter"] / 2.0, rel=1e-3)
+
+
+def test_macro_profile_without_nozzle_contour(nozzle_macro, capsys):
+    nozzle_macro["P"]["rao_contour"] = True
+    nozzle_macro["nozzle_contour"] = None
+    assert nozzle_macro["nozzle_profile"]() == [(p.x, p.y) for p in nozzle_macro["radius_profile_points"]()]
+    assert "not available" in capsys.readouterr().out
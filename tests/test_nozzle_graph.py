@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+
+def test_cached_until_a_read_parameter_changes(nozzle_macro):
+    g, P = nozzle_macro["CALC_GRAPH"], nozzle_macro["P"]
+    thrust = nozzle_macro["calculate_thrust"]()
+    misses = g.stats()["misses"]
+    assert nozzle_macro["calculate_thrust"]() == thrust
+    assert g.stats()["misses"] == misses
+    # Clave que thrust no lee: sigue en caché
+    P["channel_height"] = P["channel_height"] + 1.0
+    nozzle_macro["calculate_thrust"]()
+    assert g.stats()["misses"] == misses
+    P["throat_diameter"] = P["throat_diameter"] * 1.1
+    assert nozzle_macro["calculate_thrust"]() != thrust
+    assert g.stats()["misses"] == misses + 1
+
+
+def test_transitive_dependencies_invalidate(nozzle_macro):
+    P = nozzle_macro["P"]
+    isp = nozzle_macro["calculate_specific_impulse"]()
+    assert "calculate_thrust" in nozzle_macro["CALC_GRAPH"].dependencies("calculate_specific_impulse")["quantities"]
+    P["exit_diameter"] = P["exit_diameter"] * 1.2
+    assert nozzle_macro["calculate_specific_impulse"]() != pytest.approx(isp)
+
+
+def test_get_and_contains_are_tracked(nozzle_macro):
+    P, quantity = nozzle_macro["P"], nozzle_macro["quantity"]
+
+    @quantity
+    def calculate_test_scale():
+        return P.get("test_scale", 1.0) * (2.0 if "test_flag" in P else 1.0)
+
+    assert calculate_test_scale() == 1.0
+    assert set(nozzle_macro["CALC_GRAPH"].dependencies("calculate_test_scale")["params"]) == {"test_scale", "test_flag"}
+    P["test_scale"] = 3.0
+    assert calculate_test_scale() == 3.0
+    P["test_flag"] = True
+    assert calculate_test_scale() == 6.0
+    del P["test_scale"]
+    assert calculate_test_scale() == 2.0
+
+
+def test_graph_propagates_errors(nozzle_macro):
+    graph = nozzle_macro["CALC_GRAPH"].graph()
+    assert "throat_diameter" in graph["calculate_thrust"]["params"]
+
+    @nozzle_macro["quantity"]
+    def calculate_broken():
+        return nozzle_macro["P"]["no_such_key"]
+
+    with pytest.raises(KeyError):
+        nozzle_macro["CALC_GRAPH"].graph()
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import nozzle_model
+
+
+def test_defaults_match_macro_scalars(nozzle_macro):
+    out = nozzle_model.evaluate(dict(nozzle_macro["P"]))
+    for key, fn in nozzle_model.SCALAR_FUNCTIONS.items():
+        assert float(out[key]) == pytest.approx(nozzle_macro[fn](), rel=1e-14), key
+
+
+def test_random_grid_matches_macro_scalars(nozzle_macro):
+    err = nozzle_model.compare_with_macro(nozzle_macro, n=60)
+    assert max(err.values()) <= 1e-14
+    # compare_with_macro restaura P
+    assert nozzle_macro["P"]["throat_diameter"] == nozzle_model.load_nozzle_params()["throat_diameter"]
+
+
+def _passing(out):
+    # Solo cuentan las comprobaciones geométricas
+    out = dict(out)
+    out["wall_temperature"] = np.zeros_like(out["thrust"])
+    out["structural_margin"] = np.full_like(out["thrust"], 10.0)
+    out["coolant_velocity"] = np.zeros_like(out["thrust"])
+    return out
+
+
+def test_feasible_reads_ligament_and_channel_height_from_grid():
+    P = nozzle_model.load_nozzle_params()
+    P.update(channel_height=0.5, ligament_min_throat=0.8)
+    grid = {"ligament_min_throat": np.array([0.8, 0.2, 0.8, 0.8]),
+            "channel_height": np.array([0.5, 0.5, 3.0, 0.5]),
+            "wall_thickness_div_end": np.array([3.0, 3.0, 3.0, 1.5])}
+    out = _passing(nozzle_model.evaluate(P, **grid))
+    ok = nozzle_model.feasible(out, P, grid=grid)
+    # ligamento de la malla < min_feature; canal que no cabe; pared final demasiado fina
+    assert ok.tolist() == [True, False, False, False]
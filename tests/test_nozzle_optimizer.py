@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import nozzle_model
+import nozzle_optimizer as no
+
+SMALL = dict(n_restarts=2, n_candidates=2000, rounds=3, use_processes=False)
+
+
+def test_macro_constants_give_feasible_design():
+    res = no.optimize_nozzle(**SMALL)
+    assert res["feasible"] is True
+    assert not any(v > 0 for v in res["violations"].values())
+    assert res["pareto"]
+    # El diseño de la macro solo falla porque sus canales no caben en la pared
+    assert [k for k, v in res["baseline_violations"].items() if v > 0] == ["channel_fit"]
+    built = []
+    namespace = {"P": {}, "build_nozzle": lambda: built.append(True)}
+    no.build_final(res, namespace)
+    assert built and namespace["P"] == res["design"]
+
+
+def test_impossible_limits_are_labelled_and_not_built(capsys):
+    # El refrigerante entra a 400 K: ninguna pared puede quedar por debajo
+    res = no.optimize_nozzle(limits={"max_wall_temperature": 350.0}, **SMALL)
+    assert res["feasible"] is False
+    assert res["violations"]["wall_temperature"] > 0
+    no.print_result(res)
+    out = capsys.readouterr().out
+    assert "óptima" not in out and "mínima violación" in out
+    namespace = {"P": {}, "build_nozzle": lambda: pytest.fail("no debe construirse")}
+    with pytest.raises(ValueError, match="Ningún candidato"):
+        no.build_final(res, namespace)
+    assert namespace["P"] == {}
+
+
+def test_structural_margin_falls_with_wall_thickness():
+    out = nozzle_model.evaluate(wall_thickness_throat=np.array([2.0, 6.0, 20.0]))
+    margin = out["structural_margin"]
+    assert np.all(np.diff(margin) < 0)
+    assert margin[1] > 1.5 > margin[2]
+
+
+def test_wall_volume_uses_helix_length():
+    # Paso mayor -> hélice más corta -> menos volumen de canal y más pared
+    P = nozzle_model.load_nozzle_params()
+    fine = nozzle_model.evaluate(P, channel_height=1.0)["wall_volume"]
+    P.update(pitch_throat=40.0, pitch_mid=70.0, pitch_exit=100.0)
+    coarse = nozzle_model.evaluate(P, channel_height=1.0)["wall_volume"]
+    assert coarse > fine
+
+
+def test_partial_bounds_mix_scalar_and_array_walls():
+    res = no.optimize_nozzle(bounds={"channel_height": (0.6, 2.0), "wall_thickness_throat": (1.0, 4.0)}, **SMALL)
+    assert set(res["design"]) == {"channel_height", "wall_thickness_throat"}
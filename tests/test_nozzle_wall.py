@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import math
+import types
+
+import pytest
+
+
+def test_adaptive_samples_follow_curvature(nozzle_macro):
+    samples = nozzle_macro["adaptive_samples"]
+    # Recta: sin subdivisión
+    assert len(samples((lambda x: 2.0 * x + 1.0,), 0.0, 10.0, tol=0.01)) == 9
+    # Curva con codo en x = 0: las estaciones se concentran en él
+    f = lambda x: math.sqrt(x * x + 0.25)
+    xs = samples((f,), -10.0, 10.0, tol=0.01)
+    assert xs == sorted(xs) and xs[0] == -10.0 and xs[-1] == 10.0
+    near = sum(1 for x in xs if abs(x) < 2.0)
+    assert near > sum(1 for x in xs if abs(x) > 8.0)
+    # Ninguna flecha por encima de la tolerancia
+    for a, b in zip(xs, xs[1:]):
+        m = 0.5 * (a + b)
+        assert abs(f(m) - 0.5 * (f(a) + f(b))) <= 0.01
+
+
+def _fake_wall(calls, results):
+    def make_revolved_wall(r_inner, r_outer, x0, x1, tol=0.01, smooth=True):
+        calls.append((r_inner, r_outer, x0, x1, smooth))
+        res = results.pop(0)
+        if isinstance(res, Exception):
+            raise res
+        return types.SimpleNamespace(isNull=lambda: False, Volume=res)
+    return make_revolved_wall
+
+
+@pytest.fixture
+def wall_macro(nozzle_macro):
+    # Sin Part.BSplineCurve: la B-spline se sustituye por la poligonal
+    nozzle_macro["profile_radius_function"] = nozzle_macro["polyline_radius_function"]
+    return nozzle_macro
+
+
+def test_wall_thickness_over_profile(wall_macro):
+    calls = []
+    wall_macro["make_revolved_wall"] = _fake_wall(calls, [100.0])
+    assert wall_macro["make_variable_thickness_solid"]().Volume == 100.0
+    r_inner, r_outer, x0, x1, smooth = calls[0]
+    P = wall_macro["P"]
+    assert smooth
+    # El espesor de wall_thickness_at_x se reparte sobre [x0, x1]
+    assert r_outer(x0) - r_inner(x0) == pytest.approx(P["wall_thickness_convergent"])
+    assert r_outer(x1) - r_inner(x1) == pytest.approx(P["wall_thickness_div_end"])
+    x = x0 + 0.2 * (x1 - x0)
+    assert r_outer(x) - r_inner(x) == pytest.approx(P["wall_thickness_div_start"])
+
+
+def test_wall_falls_back_to_polygon_then_raises(wall_macro, capsys):
+    calls = []
+    # B-spline sin volumen: se reintenta con meridiano poligonal
+    wall_macro["make_revolved_wall"] = _fake_wall(calls, [0.0, 50.0])
+    assert wall_macro["make_variable_thickness_solid"]().Volume == 50.0
+    assert [c[-1] for c in calls] == [True, False]
+    assert "retrying with a polyline profile" in capsys.readouterr().out
+    # Si también falla, error en vez de una superficie sin volumen
+    wall_macro["make_revolved_wall"] = _fake_wall(calls, [RuntimeError("occ"), 0.0])
+    with pytest.raises(RuntimeError, match="cannot build the nozzle wall"):
+        wall_macro["make_variable_thickness_solid"]()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+
+import op_profiler
+
+
+def test_source_maps_compiled_files_to_py():
+    assert op_profiler._source("a/op_profiler.pyc") == os.path.abspath("a/op_profiler.py")
+    assert op_profiler._source("a/op_profiler.pyo") == os.path.abspath("a/op_profiler.py")
+    # Antes rstrip("co") recortaba también nombres que terminan así
+    assert op_profiler._source("a/disco") == os.path.abspath("a/disco")
+    assert op_profiler._THIS.endswith("op_profiler.py")
+
+
+def test_caller_skips_profiler_frames():
+    name, fname, line = op_profiler._caller(sys._getframe())
+    assert name == "test_caller_skips_profiler_frames"
+    assert fname == os.path.basename(__file__)
+
+
+def test_builders_off_by_default():
+    assert op_profiler.OpProfiler().builders is False
+
+
+MACRO = """
+import sys
+
+def refine_shape():
+    return probe()
+
+def fuse_list():
+    return refine_shape()
+
+def make_flange_and_bolts():
+    return fuse_list()
+
+def main():
+    return make_flange_and_bolts()
+"""
+
+
+def _macro(probe, filename="Station.FCMacro"):
+    ns = {"probe": probe}
+    exec(compile(MACRO, filename, "exec"), ns)
+    return ns
+
+
+def test_caller_walks_up_to_macro_builder():
+    prof = op_profiler.OpProfiler()
+    ns = _macro(lambda: (op_profiler._caller(sys._getframe(1), prof._is_source),
+                         op_profiler._caller(sys._getframe(1))))
+    # main() desde el nivel de módulo no es el constructor
+    builder, immediate = eval(compile("main()", "Station.FCMacro", "eval"), ns)
+    assert builder[:2] == ("make_flange_and_bolts", "Station.FCMacro")
+    assert immediate[0] == "refine_shape"
+    # Constructor llamado directamente desde el nivel de módulo
+    builder, _ = eval(compile("make_flange_and_bolts()", "Station.FCMacro", "eval"), ns)
+    assert builder[0] == "make_flange_and_bolts"
+    # Si main() hace la operación él mismo, es el constructor
+    single = {"probe": ns["probe"]}
+    exec(compile("def main():\n    return probe()\n", "Single.FCMacro", "exec"), single)
+    builder, _ = eval(compile("main()", "Single.FCMacro", "eval"), single)
+    assert builder[:2] == ("main", "Single.FCMacro")
+    # Fuera de una macro: la primera función fuera del perfilador
+    assert op_profiler._caller(sys._getframe(), prof._is_source)[0] == "test_caller_walks_up_to_macro_builder"
+
+
+def test_recorded_operation_keeps_builder_and_caller():
+    prof = op_profiler.OpProfiler(counts=False)
+    prof.active = True
+    loft = prof._wrap_function(lambda *a: "loft", "makeLoft")
+    ns = _macro(loft)
+    assert eval(compile("main()", "Station.FCMacro", "eval"), ns) == "loft"
+    ev, = prof.events
+    assert ev["builder"] == "make_flange_and_bolts" and ev["caller"] == "refine_shape"
+    assert ev["cat"] == "loft" and ev["ok"]
+    assert prof.trace()["traceEvents"][-1]["args"]["caller"] == "refine_shape"
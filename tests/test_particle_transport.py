@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import particle_transport as ptr
+
+
+def _layer(material, t, rho):
+    return {"name": material, "material": material, "t": t, "rho": rho}
+
+
+def test_range_table_roundtrip_and_validation():
+    tab = ptr.range_tables(["ALUMINUM"])["ALUMINUM"]
+    e = np.geomspace(0.2, 900.0, 50)
+    assert np.allclose(tab.energy(tab.range(e)), e, rtol=1e-9)
+    assert tab.energy(0.0) == 0.0
+    with pytest.raises(ValueError):
+        ptr.RangeTable([1.0, 2.0, 3.0], [1.0, 0.5, 2.0])
+
+
+def test_spe_spectrum_integrates_to_fluence():
+    edges, _ = ptr.energy_grid(1.0, 1e4, 200)
+    assert ptr.spe_spectrum(edges, e0=30.0, fluence=1e9).sum() == pytest.approx(1e9, rel=1e-6)
+    assert ptr.spe_spectrum(edges, fluence=1e9, gamma=2.5).sum() == pytest.approx(1e9, rel=1e-3)
+
+
+def test_split_layer_equals_single_layer():
+    one = ptr.stack_arrays([[_layer("WATER", 20.0, 1000.0)]])
+    two = ptr.stack_arrays([[_layer("WATER", 8.0, 1000.0), _layer("WATER", 12.0, 1000.0)]])
+    e = np.array([5.0, 30.0, 100.0])
+    e1, w1 = ptr.transport(*one, e)
+    e2, w2 = ptr.transport(*two, e)
+    assert np.allclose(e1, e2) and np.allclose(w1, w2)
+    # 20 mm de agua = 2 g/cm²: 5 MeV se detiene, 100 MeV sale con ~85 MeV (R 7.72 -> 5.72 g/cm²)
+    assert e1[0, 0] == 0.0 and w1[0, 0] == 0.0
+    assert 80.0 < e1[0, 2] < 90.0
+
+
+def test_thicker_stack_transmits_less_and_cuts_higher():
+    stacks = [[_layer("ALUMINUM", t, 2700.0)] for t in (2.0, 10.0, 40.0)]
+    res = ptr.evaluate_stacks(stacks, "proton")
+    assert np.all(np.diff(res["transmitted_fraction"]) < 0)
+    assert np.all(np.diff(res["cutoff_energy"]) > 0)
+    assert np.allclose(res["areal_density"], [0.54, 2.7, 10.8])
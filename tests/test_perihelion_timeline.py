@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import math
+
+import numpy as np
+import pytest
+
+import perihelion_timeline as pt
+
+
+def test_kepler_solution_satisfies_equation():
+    M = np.linspace(-math.pi, math.pi, 41)
+    for e in (0.0, 0.3, 0.88):
+        E = pt.solve_kepler(M, e)
+        assert np.allclose(E - e * np.sin(E), M, atol=1e-10)
+
+
+def test_distance_is_perihelion_at_zero_and_aphelion_at_half_period():
+    r_p = np.array([pt.PARKER_PERIHELION_RS * pt.R_SUN, 0.3 * pt.AU])
+    r_a = np.array([pt.PARKER_APHELION_AU * pt.AU, 1.0 * pt.AU])
+    _, _, period = pt.orbit_elements(r_p, r_a)
+    r0 = pt.heliocentric_distance(np.array([0.0]), r_p, r_a)[:, 0]
+    assert np.allclose(r0, r_p, rtol=1e-9)
+    for k in range(2):
+        r_half = pt.heliocentric_distance(np.array([0.5 * period[k]]), r_p[k], r_a[k])[0, 0]
+        assert r_half == pytest.approx(r_a[k], rel=1e-9)
+
+
+def test_flux_scales_with_inverse_square_and_pointing():
+    assert pt.solar_flux(pt.AU) == pytest.approx(pt.tps_thermal.SOLAR_CONSTANT)
+    assert pt.solar_flux(0.5 * pt.AU) == pytest.approx(4.0 * pt.tps_thermal.SOLAR_CONSTANT)
+    assert pt.solar_flux(pt.AU, 60.0) == pytest.approx(0.5 * pt.tps_thermal.SOLAR_CONSTANT)
+    assert pt.solar_flux(pt.AU, 120.0) == 0.0
+
+
+def test_aphelion_below_perihelion_is_rejected():
+    with pytest.raises(ValueError):
+        pt.orbit_elements(2.0 * pt.AU, 1.0 * pt.AU)
+
+
+def test_thicker_foam_keeps_back_face_cooler():
+    base = pt.tps_stack.parker_tps_stack(pt.tps_stack.PARKER_SPAR)
+    stacks = pt.tps_stack.thickness_sweep(base, "TPS_Foam", [40.0, 160.0])
+    r_p = np.array([pt.PARKER_PERIHELION_RS * pt.R_SUN])
+    out = pt.heat_load_sweep(stacks, r_p, np.array([pt.PARKER_APHELION_AU * pt.AU]), window_days=1.0, dt=600.0)
+    assert out["back_peak"].shape == (2, 1)
+    assert out["back_peak"][1, 0] < out["back_peak"][0, 0]
+    assert np.all(out["front_peak"] > out["back_peak"])
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+import nozzle_model
+import regen_cooling as rc
+
+
+def test_profile_passes_through_macro_points():
+    P = nozzle_model.load_nozzle_params()
+    px, pr = rc.radius_profile_points(P)
+    xs, rs = rc.profile_curve(P, samples=4001)
+    assert np.all(np.diff(xs[0]) > 0)
+    assert np.allclose(np.interp(px[0], xs[0], rs[0]), pr[0], atol=1e-2)
+
+
+def test_callable_profile_matches_default():
+    P = nozzle_model.load_nozzle_params()
+    xs, rs = rc.profile_curve(P, samples=2048)
+    res = rc.solve(P, n_stations=200)
+    alt = rc.solve(P, n_stations=200,
+                   profile=(lambda x: float(np.interp(x, xs[0], rs[0])), xs[0, 0], xs[0, -1]))
+    assert np.allclose(alt["r"], res["r"], atol=1e-3)
+
+
+def test_coolant_state_varies_per_station():
+    P = nozzle_model.load_nozzle_params()
+    fixed = {"coolant_fraction": 0.2}
+    res = rc.solve(P, n_stations=200, conditions=fixed)
+    on = res["cooled"][0]
+    # Una altura por tramo, dentro de la pared; convergente y divergente difieren
+    wall = res["wall_thickness"][0]
+    assert np.all(res["channel_height"][0] <= wall + 1e-9)
+    assert np.ptp(res["hydraulic_diameter"][0][on]) > 0
+    # Con la misma geometría y caudal, el agua más caliente es menos viscosa: Re sube
+    hot = rc.solve(P, n_stations=200, conditions=dict(fixed, T_coolant_in=350.0))
+    assert np.all(hot["reynolds"][0][on] > res["reynolds"][0][on])
+    assert np.all(res["T_coolant"][0][:-1] >= res["T_coolant"][0][1:])
+
+
+def test_channel_height_clamped_and_reported():
+    P = nozzle_model.load_nozzle_params()
+    res = rc.solve(P, n_stations=200)
+    x, h, on = res["x"][0], res["channel_height"][0], res["cooled"][0]
+    h_conv, h_div = res["channel_height_convergent"][0], res["channel_height_divergent"][0]
+    # Como channel_section: altura única por tramo, recortada y avisada
+    assert res["channel_clamped"][0]
+    assert max(h_conv, h_div) < P["channel_height"]
+    assert np.allclose(h[on & (x < 0)], h_conv) and np.allclose(h[on & (x >= 0)], h_div)
+    assert h_div >= P["min_feature"] - 1e-9
+    # El divergente fino se queda sin canal: sin calor retirado, pared a T_aw
+    assert 0.0 < res["cooled_fraction"][0] < 1.0
+    off = ~on
+    assert np.all(res["heat_flux"][0][off] == 0.0)
+    assert np.allclose(res["T_wall_gas"][0][off], res["T_aw"][0][off])
+    # Un canal que cabe no se recorta
+    low = rc.solve(P, n_stations=200, channel_height=0.5)
+    assert not low["channel_clamped"][0]
+    assert np.allclose(low["channel_height"][0][low["cooled"][0]], 0.5)
+
+
+def test_channel_that_does_not_fit_is_infeasible():
+    P = nozzle_model.load_nozzle_params()
+    walls = {k: 2.0 for k in nozzle_model.WALL_KEYS}
+    res = rc.solve(P, n_stations=200, **walls)
+    assert not res["cooled"][0].any()
+    assert res["violations"]["channel_fit"][0]
+    assert not res["feasible"][0]
+
+
+def test_coolant_flow_sized_from_temperature_rise():
+    P = nozzle_model.load_nozzle_params()
+    res = rc.solve(P, n_stations=200)
+    c = rc.DEFAULT_CONDITIONS
+    rise = res["coolant_outlet_temperature"][0] - c["T_coolant_in"]
+    assert abs(rise - c["coolant_dT"]) < 0.05 * c["coolant_dT"]
+    assert res["coolant_flow"][0] < 0.5 * rc.solve(P, n_stations=50, conditions={"coolant_fraction": 1.0})["coolant_flow"][0]
+
+
+def test_velocity_and_pressure_drop_limits_flagged():
+    P = nozzle_model.load_nozzle_params()
+    # Canales de la macro recortados a < 1 mm: velocidad y caída de presión fuera de límites
+    res = rc.solve(P, n_stations=200)
+    assert res["max_coolant_velocity"][0] > rc.DEFAULT_LIMITS["max_coolant_velocity"]
+    assert res["violations"]["coolant_velocity"][0] and res["violations"]["pressure_drop"][0]
+    assert not res["violations"]["channel_fit"][0]
+    assert not res["feasible"][0]
+    relaxed = rc.solve(P, n_stations=200, limits={"max_coolant_velocity": 1e3, "max_pressure_drop_ratio": 1e3})
+    assert relaxed["feasible"][0]
+    # Pared gruesa, más hélices y paso largo: dentro de los límites
+    w = 6.0
+    walls = {k: w for k in nozzle_model.WALL_KEYS}
+    pitch = {k: 10.0 * P[k] for k in ("pitch_throat", "pitch_mid", "pitch_exit")}
+    ok = rc.solve(P, n_stations=200, num_helices=8, channel_height=w - 2.0, **walls, **pitch)
+    assert ok["feasible"][0]
+    assert ok["max_coolant_velocity"][0] < rc.DEFAULT_LIMITS["max_coolant_velocity"]
+    assert ok["total_pressure_drop"][0] < rc.DEFAULT_LIMITS["max_pressure_drop_ratio"] * rc.DEFAULT_CONDITIONS["Pc"]
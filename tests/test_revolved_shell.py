@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import math
+
+import pytest
+
+import revolved_shell as rs
+
+
+def _step_volume(r0, r1, L, t):
+    """Casco exacto de dos cilindros cerrados (r0 y r1, r0 < r1 < r0 + t, longitud L), espesor t."""
+    outer = math.pi * L * (r0 ** 2 + r1 ** 2)
+    # Interior: r0 - t hasta L; después el arco r = r0 - sqrt(t² - (x - L)²) del vértice
+    # (L, r0) hasta que alcanza la paralela r1 - t en L + d
+    d = math.sqrt(t ** 2 - (r0 - r1 + t) ** 2)
+    u = lambda x: x * t * t - x ** 3 / 3.0
+    # ∫ (r0 - sqrt(t² - s²))² ds sobre [0, d]
+    w = math.sqrt(t * t - d * d)
+    sq = 0.5 * (d * w + t * t * math.asin(d / t))
+    arc = r0 ** 2 * d - 2.0 * r0 * sq + u(d)
+    inner = (L - t) * (r0 - t) ** 2 + arc + (L - t - d) * (r1 - t) ** 2
+    return outer - math.pi * inner
+
+
+def test_envelope_steps_are_vertical():
+    px, pr = rs.envelope([(0.0, 100.0, 100.0, 100.0), (100.0, 100.0, 105.0, 105.0)])
+    assert list(px) == [0.0, 0.0, 100.0, 100.0, 200.0, 200.0]
+    assert list(pr) == [0.0, 100.0, 100.0, 105.0, 105.0, 0.0]
+
+
+def test_step_shell_volume_is_exact():
+    # Escalón de 5 mm con t = 20: el interior redondea el vértice con un arco de radio t
+    pieces = rs.polyline(*rs.envelope([(0.0, 100.0, 100.0, 100.0), (100.0, 100.0, 105.0, 105.0)]))
+    vol = rs.shell_volume(pieces, 20.0)
+    assert vol == pytest.approx(_step_volume(100.0, 105.0, 100.0, 20.0), rel=1e-6)
+    assert vol == pytest.approx(3204496.39, abs=1.0)
+    chains = rs.inner_profile(pieces, 20.0)
+    assert len(chains) == 1
+    assert [p[0] for p in chains[0]] == ["line", "arc", "line"]
+
+
+def test_arc_meridian_uses_concentric_arc():
+    # Semiesfera de R = 50 seguida de un cilindro: interior de radio R - t
+    R, t = 50.0, 10.0
+    pieces = [("arc", (0.0, 0.0), (R - R / math.sqrt(2), R / math.sqrt(2)), (R, R)),
+              ("line", (R, R), (2 * R, R)), ("line", (2 * R, R), (2 * R, 0.0))]
+    solid = 2.0 / 3.0 * math.pi * R ** 3 + math.pi * R ** 3
+    inner = 2.0 / 3.0 * math.pi * (R - t) ** 3 + math.pi * (R - t) ** 2 * (R - t)
+    assert rs.solid_volume(pieces) == pytest.approx(solid, rel=1e-12)
+    assert rs.shell_volume(pieces, t) == pytest.approx(solid - inner, rel=1e-9)
+    kind, xs, xe, (cx, cy, radius, s) = rs.inner_profile(pieces, t)[0][0]
+    assert kind == "carc" and xs == pytest.approx(t)
+    assert radius - s * t == pytest.approx(R - t)
+
+
+def test_too_thick_leaves_no_inner_profile():
+    pieces = rs.polyline(*rs.envelope([(0.0, 100.0, 30.0, 30.0)]))
+    assert rs.inner_profile(pieces, 40.0) == []
+    assert rs.shell_volume(pieces, 40.0) == pytest.approx(rs.solid_volume(pieces))
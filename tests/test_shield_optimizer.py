@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import math
+
+import numpy as np
+import pytest
+
+import shield_optimizer as so
+
+SMALL = dict(n_candidates=5000, rounds=4)
+
+
+def _problem(**kwargs):
+    kwargs.setdefault("target_transmission", 1e-3)
+    return so.ShieldStackProblem(1000.0, 2000.0, ["LEAD", "WATER", "POLYETHYLENE"], **kwargs)
+
+
+def test_optimum_meets_target():
+    problem = _problem()
+    best = so.optimize_shield_stack(problem, **SMALL)
+    assert best["transmission"] <= problem.target_transmission * (1 + 1e-9)
+    assert all(problem.t_min - 1e-9 <= t <= problem.t_max + 1e-9 for t in best["thicknesses"])
+    # No pesa más que el mismo objetivo con capas uniformes
+    t = np.full(3, problem.required_depth / problem.k.sum())
+    assert best["mass_kg"] <= problem.design(np.arange(3), t)["mass_kg"] * (1 + 1e-6)
+
+
+def test_unreachable_target_raises():
+    # Transmisión 1e-300 con capas de 5 mm como máximo: ningún candidato es factible
+    problem = _problem(t_max=5.0, target_transmission=1e-300)
+    with pytest.raises(ValueError, match="Ningún candidato"):
+        so.optimize_shield_stack(problem, **SMALL)
+
+
+def test_invalid_target_rejected():
+    with pytest.raises(ValueError):
+        _problem(target_transmission=1.0)
+
+
+def test_short_layer_list_padded_from_macro():
+    problem, baseline = so.problem_from_macro(overrides={"rad_layer_ts": [10.0]})
+    n = problem.n_layers
+    assert len(baseline["thicknesses"]) == n
+    assert baseline["thicknesses"][0] == 10.0
+    assert all(math.isclose(t, baseline["thicknesses"][-1]) for t in baseline["thicknesses"][1:])
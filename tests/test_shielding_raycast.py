@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import math
+
+import numpy as np
+import pytest
+
+import shielding_raycast as sr
+
+_QUADS = ((0, 2, 3, 1), (4, 5, 7, 6), (0, 1, 5, 4), (2, 6, 7, 3), (0, 4, 6, 2), (1, 3, 7, 5))
+
+
+def _box(half, offset=0):
+    pts = [(x, y, z) for x in (-half, half) for y in (-half, half) for z in (-half, half)]
+    facets = []
+    for a, b, c, d in _QUADS:
+        facets += [(a + offset, b + offset, c + offset), (a + offset, c + offset, d + offset)]
+    return pts, facets
+
+
+def _hollow_box(outer, inner):
+    p_out, f_out = _box(outer)
+    p_in, f_in = _box(inner, offset=8)
+    return p_out + p_in, f_out + f_in
+
+
+def test_fibonacci_directions_are_unit_and_balanced():
+    d = sr.fibonacci_directions(500)
+    assert np.allclose(np.linalg.norm(d, axis=1), 1.0)
+    assert np.all(np.abs(d.mean(axis=0)) < 0.01)
+
+
+def test_hollow_water_box_areal_density():
+    # Pared de agua de 50 mm alrededor del punto: 5 g/cm² en los ejes, 5·√3 en las diagonales
+    scene = sr.ShieldingScene()
+    scene.add_mesh("Hull", "WATER", *_hollow_box(100.0, 50.0))
+    res = sr.analyze_dose_points(scene, [{"label": "Cockpit", "point": (0.0, 0.0, 0.0)}], n_rays=400, workers=1)[0]
+    assert res["min_areal_density"] == pytest.approx(5.0, rel=1e-2)
+    assert res["max_areal_density"] <= 5.0 * math.sqrt(3.0) + 1e-6
+    assert 5.0 < res["mean_areal_density"] < 5.0 * math.sqrt(3.0)
+    assert res["by_material"]["WATER"] == pytest.approx(res["mean_areal_density"])
+
+
+def test_excluded_compartment_does_not_shield_itself():
+    scene = sr.ShieldingScene()
+    scene.add_mesh("Hull", "LEAD", *_hollow_box(100.0, 90.0))
+    scene.add_mesh("Cockpit", "WATER", *_box(40.0))
+    point = {"label": "Cockpit", "point": (0.0, 0.0, 0.0)}
+    with_self = sr.analyze_dose_points(scene, [point], n_rays=200, workers=1)[0]
+    without = sr.analyze_dose_points(scene, [dict(point, exclude=["Cockpit"])], n_rays=200, workers=1)[0]
+    assert without["by_material"]["WATER"] == 0.0
+    assert with_self["by_material"]["WATER"] > 0.0
+    assert without["by_material"]["LEAD"] == pytest.approx(with_self["by_material"]["LEAD"])
+
+
+def test_parallel_batches_match_serial():
+    scene = sr.ShieldingScene()
+    scene.add_mesh("Hull", "ALUMINUM", *_hollow_box(100.0, 70.0))
+    dirs = sr.fibonacci_directions(300)
+    origins = np.zeros_like(dirs)
+    serial = sr.trace_rays(scene.bvh, origins, dirs, workers=1)
+    threaded = sr.trace_rays(scene.bvh, origins, dirs, batch_size=64, workers=4)
+    a = sr.path_lengths(*serial, len(dirs), 1)
+    b = sr.path_lengths(*threaded, len(dirs), 1)
+    assert np.allclose(a, b)
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import types
+
+import pytest
+
+import step_assembly as sa
+
+
+class Vector(tuple):
+    def __new__(cls, x=0.0, y=0.0, z=0.0):
+        return super().__new__(cls, (float(x), float(y), float(z)))
+
+    x = property(lambda self: self[0])
+    y = property(lambda self: self[1])
+    z = property(lambda self: self[2])
+
+    def __add__(self, o):
+        return Vector(*(a + b for a, b in zip(self, o)))
+
+    def __sub__(self, o):
+        return Vector(*(a - b for a, b in zip(self, o)))
+
+
+class Placement:
+    def __init__(self, base=None, rotation=None):
+        self.Base = base or Vector()
+        self.Rotation = rotation
+
+
+class FakeShape:
+    """Forma de puntos locales desplazados por Placement.Base (sin giros)."""
+
+    def __init__(self, geom, pts, base=(0.0, 0.0, 0.0)):
+        self.geom = geom
+        self.pts = [Vector(*p) for p in pts]
+        self.Placement = Placement(Vector(*base))
+
+    def _world(self):
+        return [p + self.Placement.Base for p in self.pts]
+
+    def copy(self):
+        s = FakeShape(self.geom, self.pts)
+        s.Placement = Placement(self.Placement.Base, self.Placement.Rotation)
+        return s
+
+    def exportBrepToString(self):
+        return repr((self.geom, self._world()))
+
+    def isNull(self):
+        return False
+
+    Solids = property(lambda self: [self])
+    Vertexes = property(lambda self: [types.SimpleNamespace(Point=p) for p in self._world()])
+    Edges = property(lambda self: self.pts)
+    Faces = property(lambda self: self.pts[:1])
+    Volume = property(lambda self: 1.0)
+    Area = property(lambda self: 6.0)
+
+    @property
+    def CenterOfMass(self):
+        w = self._world()
+        return Vector(*(sum(c) / len(w) for c in zip(*w)))
+
+
+class Obj:
+    def __init__(self, name, shape=None, type_id="Part::Feature", group=None):
+        self.Name = self.Label = name
+        self.TypeId = type_id
+        self.Document = None
+        if shape is not None:
+            self.Shape = shape
+        if group is not None:
+            self.Group = group
+        # DocumentObjectGroup no tiene Placement
+        if type_id != "App::DocumentObjectGroup":
+            self.Placement = Placement()
+
+    def addObject(self, o):
+        self.Group = getattr(self, "Group", []) + [o]
+
+
+@pytest.fixture
+def freecad(monkeypatch):
+    docs = []
+
+    def new_document(name, hidden=False):
+        doc = types.SimpleNamespace(Name=name, Objects=[], recompute=lambda: None)
+
+        def add_object(type_id, name):
+            o = Obj(name, type_id=type_id)
+            doc.Objects.append(o)
+            return o
+
+        doc.addObject = add_object
+        docs.append(doc)
+        return doc
+
+    app = types.ModuleType("FreeCAD")
+    app.Vector, app.Placement = Vector, Placement
+    app.newDocument = new_document
+    app.closeDocument = lambda name: docs.append(("closed", name))
+    app.Version = lambda: ["1", "0"]
+    imp = types.ModuleType("Import")
+    imp.export = lambda roots, path: open(path, "w").write(",".join(r.Label for r in roots))
+    monkeypatch.setitem(sys.modules, "FreeCAD", app)
+    monkeypatch.setitem(sys.modules, "Import", imp)
+    return docs
+
+
+BOLT = [(0, 0, 0), (1, 0, 0), (0, 0, 5)]
+
+
+def _tree():
+    placed = [Obj(f"Bolt{i}", FakeShape("bolt", BOLT, (10.0 * i, 0, 0))) for i in range(3)]
+    # Mismo tornillo con la traslación "horneada" en la geometría
+    baked = Obj("BoltBaked", FakeShape("bolt", [(x + 50.0, y, z) for x, y, z in BOLT]))
+    plate = Obj("Plate", FakeShape("plate", [(0, 0, 0), (100, 0, 0), (0, 100, 0), (0, 0, 2)]))
+    fasteners = Obj("PART_Fasteners", type_id="App::Part", group=placed + [baked])
+    layers = Obj("LAYERS", type_id="App::DocumentObjectGroup", group=[plate])
+    return Obj("SPACECRAFT", type_id="App::Part", group=[fasteners, layers])
+
+
+def test_instance_groups(freecad):
+    root = _tree()
+    groups = sa.instance_groups([root])
+    sizes = sorted(len(m) for m in groups.values())
+    assert sizes == [1, 4]
+    bolts = max(groups.values(), key=len)
+    # El tornillo horneado queda colocado a +50 mm del primer miembro
+    assert bolts[-1][0].Name == "BoltBaked" and tuple(bolts[-1][1].Base) == (50.0, 0.0, 0.0)
+    assert sorted(len(m) for m in sa.instance_groups([root], by_translation=False).values()) == [1, 1, 3]
+
+
+def test_build_export_document_links_repeated_parts(freecad):
+    doc, roots, stats = sa.build_export_document([_tree()])
+    assert stats["leaves"] == 5 and stats["links"] == 4 and stats["unique"] == 2
+    root, = roots
+    assert root.TypeId == "App::Part" and [c.Label for c in root.Group] == ["PART_Fasteners", "LAYERS"]
+    links = [o for o in doc.Objects if o.TypeId == "App::Link"]
+    assert {id(l.LinkedObject) for l in links} == {id(links[0].LinkedObject)}
+    # El grupo sin Placement se copia como App::Part en la identidad
+    layers = root.Group[1]
+    assert tuple(layers.Placement.Base) == (0.0, 0.0, 0.0)
+
+
+def test_export_step_wraps_flat_leaves(freecad, tmp_path):
+    path = str(tmp_path / "Bolts.step")
+    leaves = [Obj(f"Bolt{i}", FakeShape("bolt", BOLT, (10.0 * i, 0, 0))) for i in range(2)]
+    stats = sa.export_step(leaves, path)
+    assert open(path).read() == "Bolts" and stats["bytes"] == os.path.getsize(path)
+    assert freecad[-1] == ("closed", "STEP_Bolts")
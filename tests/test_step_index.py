@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import step_index as si
+
+STEP = b"""ISO-10303-21;
+HEADER;
+FILE_DESCRIPTION(('FreeCAD Model'),'2;1');
+FILE_NAME('Sat.step','2024-01-01T00:00:00',('Autor'),(''),'Open CASCADE','FreeCAD','Unknown');
+FILE_SCHEMA(('AUTOMOTIVE_DESIGN { 1 0 10303 214 1 1 1 1 }'));
+ENDSEC;
+DATA;
+#1 = APPLICATION_PROTOCOL_DEFINITION('international standard','automotive_design',2000,#2);
+#2 = APPLICATION_CONTEXT('core data for automotive mechanical design processes');
+#3 = PRODUCT('Bus''s frame','Bus','',(#4));
+#4 = PRODUCT_CONTEXT('',#2,'mechanical');
+#5 = MANIFOLD_SOLID_BREP('',#6);
+#6 = CLOSED_SHELL('',(#7,#8));
+#7 = ADVANCED_FACE('',(),#20,.T.);
+#8 = ADVANCED_FACE('',(),#20,.F.);
+#9 = FACE('x');
+#10 = CARTESIAN_POINT('',(-5.,0.,2.5E+01));
+#11 = CARTESIAN_POINT('',(10.,-3.,1.));
+#12 = CARTESIAN_POINT('',(1.E+03,0.));
+#13 = ( LENGTH_UNIT() NAMED_UNIT(*) SI_UNIT(.MILLI.,.METRE.) );
+#20 = PLANE('',#21);
+#21 = AXIS2_PLACEMENT_3D('',#10,$,*);
+ENDSEC;
+END-ISO-10303-21;
+"""
+
+
+@pytest.fixture
+def step(tmp_path):
+    path = tmp_path / "Sat.step"
+    path.write_bytes(STEP)
+    with si.StepFile(str(path)) as s:
+        yield s
+
+
+def test_parse_params():
+    p = si.parse_params(b"CARTESIAN_POINT('it''s',(1.,-2.5E+01,3),#7,.T.,$,*)")
+    assert p[0] == "it's" and p[1] == [1.0, -25.0, 3] and p[2] == 7 and isinstance(p[2], si.Ref)
+    assert isinstance(p[3], si.Enum) and p[3] == "T" and p[4] is None and p[5] == "*"
+    complex_ = si.parse_params(b"( LENGTH_UNIT() NAMED_UNIT(*) SI_UNIT(.MILLI.,.METRE.) )")
+    assert [t.name for t in complex_] == ["LENGTH_UNIT", "NAMED_UNIT", "SI_UNIT"]
+    assert complex_[2].args == ["MILLI", "METRE"]
+
+
+def test_summary_without_index(step):
+    assert step.header()["FILE_NAME"][0] == "Sat.step"
+    assert step.products() == ["Bus's frame"]
+    assert step.unit_scale() == 1e-3
+    # FACE( no cuenta las ADVANCED_FACE
+    assert step.counts(["ADVANCED_FACE", "FACE", "CLOSED_SHELL"]) == {"ADVANCED_FACE": 2, "FACE": 1, "CLOSED_SHELL": 1}
+    lo, hi = step.bbox()
+    # El punto 2D (1000, 0) no entra en la caja
+    assert np.allclose(lo, [-5.0, -3.0, 1.0]) and np.allclose(hi, [10.0, 0.0, 25.0])
+    s = step.summary()
+    assert s["solids"] == 1 and s["shells"] == 1 and s["faces"] == 2 and s["unit_m"] == 1e-3
+    assert step._offsets is None
+
+
+def test_entity_index(step):
+    assert sorted(step.index()) == list(range(1, 14)) + [20, 21]
+    assert step.entity(21) == ("AXIS2_PLACEMENT_3D", ["", 10, None, "*"])
+    kind, params = step.entity(13)
+    assert kind is None and params[2].name == "SI_UNIT"
+    assert step.entity_type(6) == "CLOSED_SHELL"
+    assert step.entity_counts()["CARTESIAN_POINT"] == 3
+
+
+def test_repo_step_files_are_scanned():
+    files = si.repo_step_files(si.os.path.join(si.os.path.dirname(si.__file__), ".."))
+    assert files and all(f.lower().endswith((".step", ".stp")) for f in files)
+    row, = si.scan(files[:1])
+    assert row["bytes"] > 0 and row["faces"] >= 0
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import math
+import sys
+import types
+
+import pytest
+
+import tessellation_policy as tp
+
+
+class FakeShape:
+    """Forma con la caché de triangulación de OCC: tessellate(d) reutiliza una malla más fina."""
+
+    def __init__(self, cached=None):
+        self.cached = cached
+        self.calls = []
+        self.Edges = [types.SimpleNamespace(Length=L) for L in (0.0, 2.0, 50.0)]
+        self.BoundBox = types.SimpleNamespace(DiagonalLength=1000.0)
+
+    def _mesh(self, d):
+        n = int(round(1000.0 / d))
+        pts = [types.SimpleNamespace(x=float(i), y=0.0, z=0.0) for i in range(3)]
+        return pts, [(0, 1, 2)] * n
+
+    def tessellate(self, d, force=False):
+        self.calls.append((d, force))
+        if force or self.cached is None or self.cached > d:
+            self.cached = d
+        return self._mesh(self.cached)
+
+    def copy(self):
+        return FakeShape()
+
+
+def test_settings_follow_size_and_feature():
+    policy = tp.TessellationPolicy(relative=1e-3, feature_fraction=0.1)
+    s = policy.settings(1000.0)
+    assert s["linear"] == pytest.approx(1.0)
+    # El rasgo de 2 mm limita la deflexión a 0.2 mm y la angular a sqrt(8 d / r)
+    s = policy.settings(1000.0, feature=2.0)
+    assert s["linear"] == pytest.approx(0.2)
+    assert s["angular"] == pytest.approx(min(math.sqrt(8 * 0.2 / 1.0), policy.max_angular))
+    assert tp.smallest_feature(FakeShape()) == 2.0
+
+
+def test_budget_pass_recomputes_cached_mesh(monkeypatch):
+    monkeypatch.setitem(sys.modules, "MeshPart", None)
+    # La forma ya tiene una malla fina de 0.1 mm (p. ej. de la vista 3D)
+    shape = FakeShape(cached=0.1)
+    v, t, d, passes = tp.tessellate(shape, {"linear": 1.0, "budget": 500, "max_passes": 4})
+    assert passes > 1 and len(t) <= 500 and d >= 2.0
+    assert shape.calls[0][1] is False and all(force for _, force in shape.calls[1:])
+
+
+def test_budget_pass_meshes_a_copy_with_meshpart(monkeypatch):
+    shapes = []
+
+    def mesh_from_shape(Shape, LinearDeflection, AngularDeflection, Relative):
+        shapes.append(Shape)
+        pts, facets = Shape._mesh(LinearDeflection)
+        return types.SimpleNamespace(Topology=(pts, facets))
+
+    monkeypatch.setitem(sys.modules, "MeshPart", types.SimpleNamespace(meshFromShape=mesh_from_shape))
+    shape = FakeShape()
+    v, t, d, passes = tp.tessellate(shape, {"linear": 1.0, "angular": 0.2, "budget": 500})
+    assert passes == 2 and len(t) <= 500
+    assert shapes[0] is shape and shapes[1] is not shape
+
+
+def test_report_rows():
+    rows = tp.report([("Casco", FakeShape())], tp.TessellationPolicy(budget=None))
+    row, = rows
+    assert row["name"] == "Casco" and row["passes"] == 1
+    assert row["stl_bytes"] == 84 + row["triangles"] * tp.STL_TRIANGLE_BYTES
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+from tool_imports import optional
+
+
+def test_single_module():
+    import geometry_fingerprint
+    assert optional("geometry_fingerprint") is geometry_fingerprint
+    assert optional("no_existe_en_tools") is None
+
+
+def test_group_is_all_or_nothing():
+    a, b = optional("macro_params", "geometry_fingerprint")
+    assert a is not None and b is not None
+    assert optional("macro_params", "no_existe_en_tools") == (None, None)
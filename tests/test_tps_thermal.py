@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import tps_thermal as tt
+
+
+def _layer(name, t, k, rho=1500.0, cp=900.0):
+    return {"name": name, "t": t, "k": k, "rho": rho, "cp": cp}
+
+
+def _stack(foam=60.0):
+    return [_layer("CC", 2.0, 40.0, 1800.0, 700.0), _layer("Foam", foam, 0.05, 80.0, 1000.0),
+            _layer("CC2", 1.0, 40.0, 1800.0, 700.0)]
+
+
+def test_thomas_matches_dense_solver():
+    rng = np.random.default_rng(3)
+    S, N = 4, 12
+    a, c = rng.uniform(-1, 0, (S, N)), rng.uniform(-1, 0, (S, N))
+    b = 3.0 + rng.uniform(0, 1, (S, N))
+    d = rng.normal(size=(S, N))
+    x = tt.thomas(a, b, c, d)
+    for s in range(S):
+        A = np.diag(b[s]) + np.diag(a[s, 1:], -1) + np.diag(c[s, :-1], 1)
+        assert np.allclose(A @ x[s], d[s])
+
+
+def test_interface_conductance_is_harmonic():
+    grid = tt.build_grid([[_layer("A", 1.0, 10.0), _layer("B", 1.0, 1.0)]], max_dz=1.0)
+    # 0.5 mm de cada material entre centros
+    assert tt.conductances(grid)[0, 0] == pytest.approx(1.0 / (0.5e-3 / 10.0 + 0.5e-3 / 1.0))
+
+
+def test_steady_state_balances_absorbed_and_radiated_flux():
+    q = 650e3
+    T = tt.steady_state([_stack()], q)
+    o = tt.DEFAULT_OPTICS
+    emitted = (o["eps_front"] * tt.SIGMA * (T[0, 0] ** 4 - o["T_space"] ** 4)
+               + o["eps_back"] * tt.SIGMA * (T[0, -1] ** 4 - o["T_back_env"] ** 4))
+    assert emitted == pytest.approx(o["alpha"] * q, rel=1e-6)
+    assert T[0, 0] > T[0, -1]
+
+
+def test_batch_rows_are_independent():
+    stacks = [_stack(40.0), _stack(40.0)]
+    flux = np.vstack([tt.step_flux(650e3, 50, 10), tt.step_flux(300e3, 50, 10)])
+    both = tt.solve_transient(stacks, flux, 10.0)
+    alone = tt.solve_transient(stacks[:1], flux[1], 10.0)
+    assert np.allclose(both["front_T"][1], alone["front_T"][0])
+    assert both["front_peak"][0] > both["front_peak"][1]
+    with pytest.raises(ValueError):
+        tt.build_grid([_stack(), _stack()[:2]])
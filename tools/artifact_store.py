@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+"""
+Almacén por contenido de los artefactos generados (STEP, FCStd, STL...).
+
+Los mismos ficheros están versionados en varias carpetas
+(Ship_Solid_Unified-Ship_Solid_Unified3D.step y
+BlenderStyle_Ship_CAD_EnhancedDOmm.step en Macro/freeCAD/python_files/ y en
+UPDATE_FILES/python/macros/Macros_02/, HybridSolarWaterworld_Probe.step en
+SHIELDS y UpdateMaterials...) y cada reconstrucción por lotes vuelve a
+escribirlos aunque no cambien. Aquí:
+
+- digest(): sha256 del contenido normalizado. En STEP se anula la fecha de
+  FILE_NAME; en FCStd (zip) se hashean los miembros por nombre, sin las
+  fechas del zip y con CreationDate, LastModifiedDate, Uid, FileName y
+  TransientDir de Document.xml en blanco.
+- Cada artefacto único se guarda una vez comprimido (objects/ab/<digest>.z;
+  los zip ya comprimidos se guardan tal cual).
+- Las salidas con nombre se materializan por defecto como clon
+  copy-on-write (reflink, FICLONE en Btrfs/XFS...) de una copia
+  descomprimida (files/<digest><ext>) y, si el sistema no lo admite, como
+  copia normal: se prueba una vez por sistema de ficheros de salida y, sin
+  reflink, no se deja copia en files/. Cada salida es un fichero independiente: reescribirla en
+  el sitio (Part.export sobre la misma ruta) no toca el almacén ni las
+  demás salidas.
+- link="hard" / "symbolic" comparten los datos entre salidas y ahorran
+  disco, pero una escritura en el sitio en cualquiera de ellas cambia
+  todas; solo para árboles que se sustituyen siempre por renombrado.
+- Antes de enlazar o clonar se comprueba el digest de la copia
+  descomprimida (y el del objeto al descomprimirlo); si no coincide se
+  rehace desde el objeto.
+- publish() no reescribe una salida cuyo contenido normalizado ya es el
+  mismo: conserva su fecha y ahorra la escritura.
+
+Uso:
+    import artifact_store
+    store = artifact_store.ArtifactStore()
+    store.export("Solar_Barge.step", lambda tmp: Part.export(objs, tmp))
+    artifact_store.print_duplicates(artifact_store.duplicates(paths))
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+import zlib
+
+DEFAULT_STORE_DIR = os.environ.get(
+    "ARTIFACT_STORE", os.path.join(os.path.expanduser("~"), ".cache", "artifact_store"))
+
+ARTIFACT_EXTENSIONS = (".step", ".stp", ".fcstd", ".stl", ".3mf", ".brep", ".brp")
+
+_FILE_NAME_DATE = re.compile(rb"(FILE_NAME\s*\(\s*'(?:[^']|'')*'\s*,\s*)'[^']*'")
+_VOLATILE_PROPERTIES = ("CreationDate", "LastModifiedDate", "Uid", "FileName", "TransientDir")
+_XML_VOLATILE = re.compile(
+    rb'(<Property name="(?:' + "|".join(_VOLATILE_PROPERTIES).encode() + rb')"[^>]*>\s*<\w+ value=")[^"]*(")')
+
+_CHUNK = 1 << 20
+
+LINK_MODES = ("reflink", "copy", "hard", "symbolic")
+
+# ioctl FICLONE de Linux (clon copy-on-write de un fichero completo)
+_FICLONE = 0x40049409
+
+
+# ========================
+# Normalización y hash
+# ========================
+def kind_of(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".step", ".stp"):
+        return "step"
+    if ext in (".fcstd", ".3mf"):
+        return "zip"
+    return "raw"
+
+
+def normalize_step(data):
+    """Texto STEP con la fecha de FILE_NAME anulada."""
+    head = data[:4096]
+    norm = _FILE_NAME_DATE.sub(rb"\1''", head, count=1)
+    return norm + data[4096:] if norm != head else data
+
+
+def _zip_digest(data):
+    h = hashlib.sha256()
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        for name in sorted(z.namelist()):
+            member = z.read(name)
+            if name == "Document.xml":
+                member = _XML_VOLATILE.sub(rb"\1\2", member)
+            h.update(name.encode("utf-8") + b"\0" + str(len(member)).encode() + b"\0")
+            h.update(member)
+    return h.hexdigest()
+
+
+def digest_bytes(data, kind="raw"):
+    """sha256 del contenido normalizado según el tipo ("step", "zip" o "raw")."""
+    if kind == "step":
+        return hashlib.sha256(normalize_step(data)).hexdigest()
+    if kind == "zip":
+        try:
+            return _zip_digest(data)
+        except zipfile.BadZipFile:
+            pass
+    return hashlib.sha256(data).hexdigest()
+
+
+def digest_file(path, kind=None):
+    kind = kind or kind_of(path)
+    if kind == "raw":
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_CHUNK), b""):
+                h.update(block)
+        return h.hexdigest()
+    with open(path, "rb") as f:
+        return digest_bytes(f.read(), kind)
+
+
+def _reflink(src, dst):
+    """Clonar src en dst sin copiar datos; False si el sistema de ficheros no lo admite."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        return True
+    except OSError:
+        if os.path.exists(dst):
+            os.remove(dst)
+        return False
+
+
+# ========================
+# Almacén
+# ========================
+class ArtifactStore:
+    """Objetos comprimidos por digest + salidas clonadas, copiadas o enlazadas desde ellos."""
+
+    def __init__(self, directory=DEFAULT_STORE_DIR, link="reflink"):
+        if link not in LINK_MODES:
+            raise ValueError(f"link debe ser uno de {LINK_MODES}")
+        self.directory = directory
+        self.link = link
+        self._digests = {}
+        # {st_dev del directorio de salida: bool}: si reflink/enlace funcionó allí (se prueba una vez)
+        self._linkable = {}
+        self.stats = {"stored": 0, "deduplicated": 0, "unchanged": 0, "materialized": 0,
+                      "bytes_in": 0, "bytes_stored": 0, "bytes_skipped": 0}
+
+    # --- Rutas ---
+    def _object_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2], digest + ".z")
+
+    def _raw_object_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2], digest)
+
+    def _file_path(self, digest, ext):
+        return os.path.join(self.directory, "files", digest[:2], digest + ext.lower())
+
+    def has(self, digest):
+        return os.path.exists(self._object_path(digest)) or os.path.exists(self._raw_object_path(digest))
+
+    # --- Hash con caché por (tamaño, mtime) ---
+    def digest(self, path, kind=None):
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+        d = self._digests.get(key)
+        if d is None:
+            d = digest_file(path, kind)
+            self._digests[key] = d
+        return d
+
+    # --- Escritura de objetos ---
+    def put(self, path, kind=None):
+        """Guardar el fichero si su contenido no está ya; devuelve el digest."""
+        kind = kind or kind_of(path)
+        d = self.digest(path, kind)
+        size = os.path.getsize(path)
+        self.stats["bytes_in"] += size
+        if self.has(d):
+            self.stats["deduplicated"] += 1
+            return d
+        with open(path, "rb") as f:
+            data = f.read()
+        if kind == "zip":
+            # Los miembros ya van comprimidos: se guarda el zip tal cual
+            target, blob = self._raw_object_path(d), data
+        else:
+            target, blob = self._object_path(d), zlib.compress(data, 6)
+        self._atomic_write(target, blob)
+        self.stats["stored"] += 1
+        self.stats["bytes_stored"] += len(blob)
+        return d
+
+    def read(self, digest, kind=None):
+        """Contenido del objeto; con kind se comprueba que su digest sigue siendo el mismo."""
+        p = self._object_path(digest)
+        if os.path.exists(p):
+            with open(p, "rb") as f:
+                data = zlib.decompress(f.read())
+        else:
+            with open(self._raw_object_path(digest), "rb") as f:
+                data = f.read()
+        if kind is not None and digest_bytes(data, kind) != digest:
+            raise ValueError(f"Objeto {digest[:12]} dañado en {self.directory}")
+        return data
+
+    @staticmethod
+    def _atomic_write(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    # --- Salidas ---
+    def _blob(self, digest, ext, kind):
+        """
+        (ruta, creada): copia descomprimida del objeto con su digest comprobado
+        (se rehace si no coincide); creada indica si se escribió ahora.
+        """
+        src = self._file_path(digest, ext)
+        if os.path.exists(src) and self.digest(src, kind) == digest:
+            return src, False
+        # Ausente o modificada en el sitio: os.replace deja una copia nueva y
+        # desliga las salidas que compartían la anterior
+        self._atomic_write(src, self.read(digest, kind))
+        return src, True
+
+    def materialize(self, digest, out_path):
+        """
+        Escribir out_path con el contenido del objeto según self.link.
+        Devuelve "reflink", "copy", "hard" o "symbolic" (lo que se hizo).
+        """
+        ext = os.path.splitext(out_path)[1]
+        kind = kind_of(out_path)
+        out_dir = os.path.dirname(os.path.abspath(out_path))
+        os.makedirs(out_dir, exist_ok=True)
+        tmp = os.path.join(out_dir, f".{os.path.basename(out_path)}.{digest[:8]}.tmp")
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+        how = None
+        dev = os.stat(out_dir).st_dev
+        # Sin reflink (o enlace) en ese sistema de ficheros no se crea la copia en files/
+        if self.link != "copy" and self._linkable.get(dev, True):
+            src, created = self._blob(digest, ext, kind)
+            try:
+                if self.link == "hard":
+                    os.link(src, tmp)
+                    how = "hard"
+                elif self.link == "symbolic":
+                    os.symlink(os.path.abspath(src), tmp)
+                    how = "symbolic"
+                elif _reflink(src, tmp):
+                    how = "reflink"
+            except OSError:
+                how = None
+            self._linkable[dev] = how is not None
+            if how is None and created:
+                os.remove(src)
+        if how is None:
+            with open(tmp, "wb") as f:
+                f.write(self.read(digest, kind))
+            how = "copy"
+        os.replace(tmp, out_path)
+        self.stats["materialized"] += 1
+        return how
+
+    def publish(self, src_path, out_path, keep_src=False):
+        """
+        Guardar src_path y dejar out_path enlazado a él.
+
+        Si out_path ya tiene el mismo contenido normalizado no se toca.
+        Devuelve {"digest", "action": "unchanged" | "reflink" | "copy" | "hard" | "symbolic"}.
+        """
+        kind = kind_of(out_path)
+        d = self.put(src_path, kind)
+        if os.path.exists(out_path) and self.digest(out_path, kind) == d:
+            self.stats["unchanged"] += 1
+            self.stats["bytes_skipped"] += os.path.getsize(src_path)
+            action = "unchanged"
+        else:
+            action = self.materialize(d, out_path)
+        if not keep_src and os.path.abspath(src_path) != os.path.abspath(out_path):
+            os.remove(src_path)
+        return {"digest": d, "action": action}
+
+    def write(self, out_path, data):
+        """publish() de unos bytes en memoria."""
+        fd, tmp = tempfile.mkstemp(suffix=os.path.splitext(out_path)[1])
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return self.publish(tmp, out_path)
+
+    def export(self, out_path, writer):
+        """
+        writer(ruta_temporal) escribe el artefacto (Part.export, exportStep,
+        doc.saveAs...); después se publica en out_path.
+        """
+        tmp_dir = tempfile.mkdtemp(prefix="artifact_")
+        tmp = os.path.join(tmp_dir, os.path.basename(out_path))
+        try:
+            writer(tmp)
+            return self.publish(tmp, out_path)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def gc(self):
+        """
+        Borrar copias descomprimidas sin otro enlace duro (se rehacen desde los
+        objetos cuando hacen falta). No se hace con link="symbolic": las
+        salidas apuntan a ellas.
+        """
+        if self.link == "symbolic":
+            return 0
+        removed = 0
+        root = os.path.join(self.directory, "files")
+        for d, _, names in os.walk(root):
+            for name in names:
+                p = os.path.join(d, name)
+                if os.stat(p).st_nlink <= 1:
+                    os.remove(p)
+                    removed += 1
+        return removed
+
+    def save_stats(self, path=None):
+        path = path or os.path.join(self.directory, "stats.json")
+        self._atomic_write(path, json.dumps(self.stats, indent=1).encode("utf-8"))
+
+
+# ========================
+# Duplicados
+# ========================
+def duplicates(paths):
+    """{digest: [rutas]} de los grupos con más de un fichero de contenido equivalente."""
+    by_size = {}
+    for p in paths:
+        by_size.setdefault((kind_of(p), os.path.getsize(p)), []).append(p)
+    groups = {}
+    for (kind, _), same in by_size.items():
+        # Solo se hashean los candidatos (STEP normalizado puede variar de tamaño en la fecha)
+        if len(same) < 2 and kind != "step":
+            continue
+        for p in same:
+            groups.setdefault(digest_file(p, kind), []).append(p)
+    return {d: ps for d, ps in groups.items() if len(ps) > 1}
+
+
+def repo_artifacts(root=".", extensions=ARTIFACT_EXTENSIONS):
+    files = []
+    for d, dirs, names in os.walk(root):
+        dirs[:] = [x for x in dirs if not x.startswith(".")]
+        files.extend(os.path.join(d, n) for n in names if n.lower().endswith(extensions))
+    return sorted(files)
+
+
+def dedup_tree(root=".", store=None, apply=False):
+    """
+    Duplicados bajo root y bytes recuperables; con apply=True cada grupo
+    pasa al almacén y sus rutas se rehacen desde él según store.link. Solo
+    con reflink (en un sistema que lo admita) o enlaces se recupera espacio;
+    con enlaces duros, editar en el sitio una ruta cambia todo el grupo.
+    """
+    groups = duplicates(repo_artifacts(root))
+    saved = sum(os.path.getsize(ps[0]) * (len(ps) - 1) for ps in groups.values())
+    if apply:
+        store = store or ArtifactStore()
+        for d, ps in groups.items():
+            store.put(ps[0])
+            for p in ps:
+                store.materialize(d, p)
+    return {"groups": groups, "bytes_saved": saved}
+
+
+def print_duplicates(result, root="."):
+    for d, ps in result["groups"].items():
+        print(f"{d[:12]}  {os.path.getsize(ps[0]) / 1024:>8.0f} KB x{len(ps)}")
+        for p in ps:
+            print(f"    {os.path.relpath(p, root)}")
+    print(f"{len(result['groups'])} grupos duplicados, {result['bytes_saved'] / 2**20:.1f} MB recuperables")
+
+
+if __name__ == "__main__":
+    import sys
+    root = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    print_duplicates(dedup_tree(root), root)
@@ -0,0 +1,567 @@
+# -*- coding: utf-8 -*-
+"""
+Catálogo SQLite de diseños: macros, construcciones y artefactos STEP/FCStd.
+
+Hay decenas de variantes (NaveXXL3D, NaveGrandeXLDFXL, TestNave00012,
+DirectTestdrve...) y muchos STEP/FCStd generados, sin forma de buscarlos
+por tamaño, masa o número de piezas. Aquí cada diseño es una fila de
+`designs` (una por fuente: ruta de la macro o del artefacto) con:
+
+    parámetros (tabla `parameters`, clave aplanada -> número o texto),
+    caja envolvente y dimensiones [mm], volumen [mm³], área [mm²],
+    sólidos/caras/aristas, nº de piezas, masas por material (`materials`),
+    tiempo de construcción y huella geométrica (geometry_fingerprint)
+
+Fuentes:
+- ingest_macro(): parámetros leídos estáticamente con macro_params (sin FreeCAD).
+- ingest_document(): tras construir en FreeCAD, medidas de las piezas; la
+  masa usa la propiedad Density [kg/m³] que ponen las macros (set_material).
+- ingest_artifact(): STEP con step_index (caja, caras, sólidos, productos) y
+  FCStd con fcstd_reader (objetos, materiales, masas guardadas); con
+  measure=True y FreeCAD disponible se cargan las formas para el volumen.
+
+Unidades de los STEP: se guardan la unidad declarada (unit_m, metros por
+unidad del fichero) y la dimensión máxima en unidades del fichero
+(raw_max_dim). Muchos STEP del repositorio declaran METRE con coordenadas en
+mm; si la extensión declarada supera UNIT_SUSPECT_M se marca unit_suspect y
+las columnas en mm (caja, volumen, área) quedan vacías en lugar de
+reescalarse en silencio: find(unit_suspect=1) los lista para revisarlos.
+
+La ingesta es incremental: cada fila guarda una clave de su fuente
+(tamaño y fecha del fichero, o hash de la macro y sus parámetros) y no se
+vuelve a procesar si no cambia. Las consultas van por índices:
+
+    cat = DesignCatalog()
+    cat.find(mass_kg=("<", 500), params={"TPS_D": (">", 2000)})
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+DEFAULT_DB = os.environ.get(
+    "DESIGN_CATALOG", os.path.join(os.path.expanduser("~"), ".cache", "design_catalog.sqlite"))
+
+MACRO_EXTENSIONS = (".fcmacro", ".py")
+ARTIFACT_EXTENSIONS = (".step", ".stp", ".fcstd")
+
+# Propiedades de material que ponen las macros en los objetos
+DENSITY_PROPERTIES = ("Density",)
+MATERIAL_PROPERTIES = ("MaterialName", "Material", "MaterialKey")
+MASS_PROPERTIES = ("TotalMass", "Total_Mass_kg", "Mass_kg")
+
+# Extensión [m] por encima de la cual una unidad declarada se considera
+# sospechosa (mm escritos como METRE): el diseño más grande del repositorio,
+# la estación tipo ISS, mide 73 m
+UNIT_SUSPECT_M = 500.0
+
+# Profundidad máxima al aplanar parámetros (listas de secciones, dicts de materiales)
+FLATTEN_DEPTH = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS designs (
+    id          INTEGER PRIMARY KEY,
+    source      TEXT NOT NULL UNIQUE,
+    name        TEXT NOT NULL,
+    kind        TEXT NOT NULL,
+    source_key  TEXT,
+    macro_key   TEXT,
+    geometry_key TEXT,
+    ingested    REAL,
+    build_s     REAL,
+    mass_kg     REAL,
+    volume_mm3  REAL,
+    area_mm2    REAL,
+    xmin REAL, ymin REAL, zmin REAL, xmax REAL, ymax REAL, zmax REAL,
+    dx REAL, dy REAL, dz REAL, max_dim REAL,
+    parts       INTEGER,
+    solids      INTEGER,
+    faces       INTEGER,
+    edges       INTEGER,
+    fingerprint TEXT,
+    unit_m      REAL,
+    raw_max_dim REAL,
+    unit_suspect INTEGER
+);
+CREATE INDEX IF NOT EXISTS designs_mass ON designs(mass_kg);
+CREATE INDEX IF NOT EXISTS designs_volume ON designs(volume_mm3);
+CREATE INDEX IF NOT EXISTS designs_max_dim ON designs(max_dim);
+CREATE INDEX IF NOT EXISTS designs_parts ON designs(parts);
+CREATE INDEX IF NOT EXISTS designs_faces ON designs(faces);
+CREATE INDEX IF NOT EXISTS designs_fingerprint ON designs(fingerprint);
+CREATE INDEX IF NOT EXISTS designs_kind ON designs(kind);
+
+CREATE TABLE IF NOT EXISTS parameters (
+    design_id INTEGER NOT NULL REFERENCES designs(id) ON DELETE CASCADE,
+    key       TEXT NOT NULL,
+    num       REAL,
+    text      TEXT,
+    PRIMARY KEY (design_id, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS parameters_num ON parameters(key, num);
+CREATE INDEX IF NOT EXISTS parameters_text ON parameters(key, text);
+
+CREATE TABLE IF NOT EXISTS parts (
+    design_id  INTEGER NOT NULL REFERENCES designs(id) ON DELETE CASCADE,
+    name       TEXT NOT NULL,
+    label      TEXT,
+    material   TEXT,
+    density    REAL,
+    volume_mm3 REAL,
+    mass_kg    REAL,
+    faces      INTEGER,
+    fingerprint TEXT,
+    PRIMARY KEY (design_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS parts_fingerprint ON parts(fingerprint);
+
+CREATE TABLE IF NOT EXISTS materials (
+    design_id INTEGER NOT NULL REFERENCES designs(id) ON DELETE CASCADE,
+    material  TEXT NOT NULL,
+    mass_kg   REAL,
+    PRIMARY KEY (design_id, material)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS materials_mass ON materials(material, mass_kg);
+"""
+
+_OPS = {"<": "<", "<=": "<=", ">": ">", ">=": ">=", "=": "=", "==": "=", "!=": "!="}
+
+_GEOMETRY_COLUMNS = ("mass_kg", "volume_mm3", "area_mm2", "xmin", "ymin", "zmin", "xmax", "ymax", "zmax",
+                     "dx", "dy", "dz", "max_dim", "parts", "solids", "faces", "edges", "fingerprint",
+                     "unit_m", "raw_max_dim", "unit_suspect")
+
+# Columnas añadidas después de la primera versión del esquema
+_ADDED_COLUMNS = {"unit_m": "REAL", "raw_max_dim": "REAL", "unit_suspect": "INTEGER"}
+
+
+# ========================
+# Utilidades
+# ========================
+def flatten_params(params, prefix="", depth=FLATTEN_DEPTH):
+    """{clave aplanada: número o texto}: dicts con '.', listas/tuplas con [i]."""
+    out = {}
+    for k, v in params.items():
+        key = f"{prefix}.{k}" if prefix else str(k)
+        _flatten_value(out, key, v, depth)
+    return out
+
+
+def _flatten_value(out, key, v, depth):
+    if isinstance(v, bool):
+        out[key] = int(v)
+    elif isinstance(v, (int, float)):
+        out[key] = float(v)
+    elif isinstance(v, str):
+        out[key] = v
+    elif depth > 0 and isinstance(v, dict):
+        for k, x in v.items():
+            _flatten_value(out, f"{key}.{k}", x, depth - 1)
+    elif depth > 0 and isinstance(v, (list, tuple)) and len(v) <= 64:
+        for i, x in enumerate(v):
+            _flatten_value(out, f"{key}[{i}]", x, depth - 1)
+
+
+def _file_key(path):
+    st = os.stat(path)
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _text_key(*parts):
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(json.dumps(p, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def _first(props, names, cast=None):
+    for n in names:
+        v = props.get(n)
+        if v not in (None, ""):
+            try:
+                return cast(v) if cast else v
+            except (TypeError, ValueError):
+                continue
+    return None
+
+
+def step_unit(summary):
+    """
+    Columnas de unidad de un resumen de step_index: unit_m declarada, dimensión
+    máxima en unidades del fichero y unit_suspect (1 si esa dimensión con la
+    unidad declarada pasa de UNIT_SUSPECT_M, p. ej. mm declarados como METRE).
+    """
+    unit_m = summary.get("unit_m")
+    raw = None
+    if summary.get("bbox"):
+        (x0, y0, z0), (x1, y1, z1) = summary["bbox"]
+        raw = max(x1 - x0, y1 - y0, z1 - z0)
+    suspect = int(bool(unit_m and raw is not None and raw * unit_m > UNIT_SUSPECT_M))
+    return {"unit_m": unit_m, "raw_max_dim": raw, "unit_suspect": suspect}
+
+
+def _bbox_columns(bbox):
+    if not bbox:
+        return dict.fromkeys(("xmin", "ymin", "zmin", "xmax", "ymax", "zmax", "dx", "dy", "dz", "max_dim"))
+    x0, y0, z0, x1, y1, z1 = bbox
+    d = (x1 - x0, y1 - y0, z1 - z0)
+    return {"xmin": x0, "ymin": y0, "zmin": z0, "xmax": x1, "ymax": y1, "zmax": z1,
+            "dx": d[0], "dy": d[1], "dz": d[2], "max_dim": max(d)}
+
+
+# ========================
+# Catálogo
+# ========================
+class DesignCatalog:
+    """Base SQLite de diseños con ingesta incremental y consultas por índice."""
+
+    def __init__(self, path=DEFAULT_DB):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        have = {r["name"] for r in self.db.execute("PRAGMA table_info(designs)")}
+        missing = {c: t for c, t in _ADDED_COLUMNS.items() if c not in have}
+        for col, typ in missing.items():
+            self.db.execute(f"ALTER TABLE designs ADD COLUMN {col} {typ}")
+        if missing:
+            # Los STEP ingeridos antes se reescalaron con la unidad declarada: reingestarlos
+            self.db.execute("UPDATE designs SET source_key = NULL WHERE kind = 'step'")
+            self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.db.commit()
+        self.close()
+
+    # --- Escritura ---
+    def _row(self, source):
+        return self.db.execute("SELECT * FROM designs WHERE source = ?", (os.path.abspath(source),)).fetchone()
+
+    def _upsert(self, source, kind, name=None, **columns):
+        source = os.path.abspath(source)
+        columns.update(kind=kind, name=name or os.path.splitext(os.path.basename(source))[0],
+                       ingested=time.time())
+        row = self._row(source)
+        if row is None:
+            keys = ["source"] + list(columns)
+            cur = self.db.execute(f"INSERT INTO designs ({','.join(keys)}) VALUES ({','.join('?' * len(keys))})",
+                                  [source] + list(columns.values()))
+            return cur.lastrowid
+        sets = ",".join(f"{k} = ?" for k in columns)
+        self.db.execute(f"UPDATE designs SET {sets} WHERE id = ?", list(columns.values()) + [row["id"]])
+        return row["id"]
+
+    def _set_params(self, design_id, params):
+        self.db.execute("DELETE FROM parameters WHERE design_id = ?", (design_id,))
+        rows = [(design_id, k, v if isinstance(v, float) else None, v if isinstance(v, str) else None)
+                for k, v in flatten_params(params).items()]
+        self.db.executemany("INSERT INTO parameters VALUES (?, ?, ?, ?)", rows)
+
+    def _set_parts(self, design_id, parts):
+        self.db.execute("DELETE FROM parts WHERE design_id = ?", (design_id,))
+        self.db.execute("DELETE FROM materials WHERE design_id = ?", (design_id,))
+        self.db.executemany(
+            "INSERT OR REPLACE INTO parts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(design_id, p["name"], p.get("label"), p.get("material"), p.get("density"), p.get("volume_mm3"),
+              p.get("mass_kg"), p.get("faces"), p.get("fingerprint")) for p in parts])
+        masses = {}
+        for p in parts:
+            if p.get("mass_kg") is not None:
+                m = p.get("material") or "?"
+                masses[m] = masses.get(m, 0.0) + p["mass_kg"]
+        self.db.executemany("INSERT INTO materials VALUES (?, ?, ?)",
+                            [(design_id, m, v) for m, v in masses.items()])
+        return sum(masses.values()) if masses else None
+
+    def ingest_macro(self, path, force=False):
+        """Parámetros de nivel superior de una macro (P = {...}, TPS_D = ...); False si no cambió."""
+        from macro_params import load_macro_params
+        key = _file_key(path)
+        row = self._row(path)
+        if row is not None and row["macro_key"] == key and not force:
+            return False
+        params = load_macro_params(path)
+        if row is not None:
+            # Ya construida: se conservan tipo y nombre de la construcción
+            design_id = self._upsert(path, row["kind"], row["name"], macro_key=key)
+        else:
+            design_id = self._upsert(path, "macro", macro_key=key)
+        self._set_params(design_id, params)
+        self.db.commit()
+        return True
+
+    def ingest_document(self, doc, source, parameters=None, build_s=None, name=None, force=False):
+        """
+        Medidas de un documento recién construido (en FreeCAD).
+
+        source es la macro que lo generó (su fila reúne parámetros y geometría).
+        Las piezas son los objetos con Density; si no hay ninguno, todos los
+        Part::Feature con sólidos. Devuelve False si macro, parámetros y
+        geometría (hash de las formas) no han cambiado.
+        """
+        import Part
+        import geometry_fingerprint as gf
+        objs = [o for o in doc.Objects if hasattr(o, "Shape") and not o.Shape.isNull() and o.Shape.Solids]
+        with_density = [o for o in objs if any(p in o.PropertiesList for p in DENSITY_PROPERTIES)]
+        objs = with_density or objs
+        geometry_key = _text_key(sorted((o.Name, o.Shape.hashCode()) for o in objs))
+        row = self._row(source)
+        macro_key = _file_key(source) if os.path.isfile(source) else None
+        source_key = _text_key(macro_key, parameters)
+        if (row is not None and not force and row["source_key"] == source_key
+                and row["geometry_key"] == geometry_key):
+            return False
+
+        parts = []
+        for o in objs:
+            props = {p: getattr(o, p) for p in DENSITY_PROPERTIES + MATERIAL_PROPERTIES if p in o.PropertiesList}
+            density = _first(props, DENSITY_PROPERTIES, float)
+            vol = o.Shape.Volume
+            parts.append({"name": o.Name, "label": o.Label, "material": _first(props, MATERIAL_PROPERTIES, str),
+                          "density": density, "volume_mm3": vol,
+                          "mass_kg": density * vol * 1e-9 if density is not None else None,
+                          "faces": len(o.Shape.Faces), "fingerprint": gf.fingerprint(o.Shape)["digest"]})
+        whole = Part.makeCompound([o.Shape for o in objs]) if objs else None
+        cols = {"parts": len(parts), "build_s": build_s, "geometry_key": geometry_key, "source_key": source_key}
+        if whole is not None:
+            fp = gf.fingerprint(whole)
+            cols.update(volume_mm3=fp["volume"], area_mm2=fp["area"], solids=fp["solids"], faces=fp["faces"],
+                        edges=fp["edges"], fingerprint=fp["digest"], **_bbox_columns(fp["bbox"]))
+        design_id = self._upsert(source, "build", name or doc.Label, **cols)
+        if parameters is not None:
+            self._set_params(design_id, parameters)
+        mass = self._set_parts(design_id, parts)
+        self.db.execute("UPDATE designs SET mass_kg = ? WHERE id = ?", (mass, design_id))
+        self.db.commit()
+        return True
+
+    def ingest_artifact(self, path, measure=False, force=False):
+        """STEP o FCStd; False si el fichero no ha cambiado desde la última ingesta."""
+        key = _file_key(path) + (":m" if measure else "")
+        row = self._row(path)
+        if row is not None and row["source_key"] == key and not force:
+            return False
+        ext = os.path.splitext(path)[1].lower()
+        if ext in (".step", ".stp"):
+            self._ingest_step(path, key, measure)
+        elif ext == ".fcstd":
+            self._ingest_fcstd(path, key, measure)
+        else:
+            raise ValueError(f"Tipo de artefacto no soportado: {path}")
+        self.db.commit()
+        return True
+
+    def _ingest_step(self, path, key, measure):
+        import step_index
+        with step_index.StepFile(path) as s:
+            summ = s.summary()
+        unit = step_unit(summ)
+        bbox = None
+        if summ["bbox"] and not unit["unit_suspect"]:
+            # Caja en mm con la unidad declarada (mm si el fichero no declara ninguna)
+            scale = unit["unit_m"] / 1e-3 if unit["unit_m"] else 1.0
+            bbox = [v * scale for v in summ["bbox"][0] + summ["bbox"][1]]
+        cols = {"source_key": key, "parts": len(summ["products"]), "solids": summ["solids"],
+                "faces": summ["faces"], **unit, **_bbox_columns(bbox)}
+        parts = [{"name": p} for p in dict.fromkeys(summ["products"])]
+        if measure:
+            try:
+                import Part
+                import geometry_fingerprint as gf
+                fp = gf.fingerprint(Part.read(path))
+                cols.update(edges=fp["edges"], fingerprint=fp["digest"])
+                # OCC convierte con la unidad declarada: mismas dudas que la caja
+                if not unit["unit_suspect"]:
+                    cols.update(volume_mm3=fp["volume"], area_mm2=fp["area"], **_bbox_columns(fp["bbox"]))
+                else:
+                    cols.update(volume_mm3=None, area_mm2=None)
+            except ImportError:
+                pass
+        design_id = self._upsert(path, "step", summ["products"][0] if summ["products"] else None, **cols)
+        self._set_parts(design_id, parts)
+
+    def _ingest_fcstd(self, path, key, measure):
+        import fcstd_reader
+        part_mod = None
+        if measure:
+            try:
+                import Part as part_mod
+                import geometry_fingerprint as gf
+            except ImportError:
+                part_mod = None
+        parts, params, shapes = [], {}, []
+        with fcstd_reader.FCStdFile(path) as f:
+            for o in f.objects().values():
+                props = {k: v for k, (_, v) in o.properties.items()}
+                stored_mass = _first(props, MASS_PROPERTIES, float)
+                if stored_mass is not None:
+                    params[f"{o.name}.mass_kg"] = stored_mass
+                if o.shape_file is None:
+                    continue
+                density = _first(props, DENSITY_PROPERTIES, float)
+                p = {"name": o.name, "label": o.label, "material": _first(props, MATERIAL_PROPERTIES, str),
+                     "density": density}
+                if part_mod is not None:
+                    shape = f.load_shape(o.name)
+                    p.update(volume_mm3=shape.Volume, faces=len(shape.Faces),
+                             fingerprint=gf.fingerprint(shape)["digest"])
+                    if density is not None:
+                        p["mass_kg"] = density * shape.Volume * 1e-9
+                    shapes.append(shape)
+                parts.append(p)
+        cols = {"source_key": key, "parts": len(parts)}
+        if shapes:
+            fp = gf.fingerprint(part_mod.makeCompound(shapes))
+            cols.update(volume_mm3=fp["volume"], area_mm2=fp["area"], solids=fp["solids"], faces=fp["faces"],
+                        edges=fp["edges"], fingerprint=fp["digest"], **_bbox_columns(fp["bbox"]))
+        design_id = self._upsert(path, "fcstd", **cols)
+        self._set_params(design_id, params)
+        mass = self._set_parts(design_id, parts)
+        if mass is None and params:
+            # Sin formas medidas: la mayor masa guardada por la macro (TotalMass del conjunto)
+            mass = max(params.values())
+        self.db.execute("UPDATE designs SET mass_kg = ? WHERE id = ?", (mass, design_id))
+
+    def ingest_tree(self, root=".", macros=True, artifacts=True, measure=False):
+        """Ingesta incremental de macros y artefactos bajo root; {"ingested", "skipped", "failed"}."""
+        exts = (MACRO_EXTENSIONS if macros else ()) + (ARTIFACT_EXTENSIONS if artifacts else ())
+        result = {"ingested": 0, "skipped": 0, "failed": {}}
+        tools_dir = os.path.dirname(os.path.abspath(__file__))
+        for d, dirs, names in os.walk(root):
+            dirs[:] = [x for x in dirs if not x.startswith(".") and x != "__pycache__"]
+            if os.path.abspath(d) == tools_dir:
+                continue
+            for n in sorted(names):
+                ext = os.path.splitext(n)[1].lower()
+                if ext not in exts:
+                    continue
+                p = os.path.join(d, n)
+                try:
+                    done = (self.ingest_macro(p) if ext in MACRO_EXTENSIONS
+                            else self.ingest_artifact(p, measure=measure))
+                    result["ingested" if done else "skipped"] += 1
+                except Exception as e:
+                    result["failed"][p] = f"{type(e).__name__}: {e}"
+        return result
+
+    def remove_missing(self):
+        """Borrar filas cuya fuente ya no existe; devuelve cuántas."""
+        gone = [r["id"] for r in self.db.execute("SELECT id, source FROM designs") if not os.path.exists(r["source"])]
+        self.db.executemany("DELETE FROM designs WHERE id = ?", [(i,) for i in gone])
+        self.db.commit()
+        return len(gone)
+
+    # --- Consultas ---
+    def _query(self, params=None, materials=None, kind=None, order_by="mass_kg", limit=None, **columns):
+        where, args = [], []
+        for col, cond in columns.items():
+            if col not in _GEOMETRY_COLUMNS + ("build_s", "name"):
+                raise ValueError(f"Columna desconocida: {col}")
+            op, val = cond if isinstance(cond, tuple) else ("=", cond)
+            where.append(f"d.{col} {_OPS[op]} ?")
+            args.append(val)
+        if kind:
+            where.append("d.kind = ?")
+            args.append(kind)
+        for key, cond in (params or {}).items():
+            op, val = cond if isinstance(cond, tuple) else ("=", cond)
+            field = "text" if isinstance(val, str) else "num"
+            # Claves con * -> GLOB (p. ej. "P.tps_*"); el índice (key, num) cubre la subconsulta
+            match = "GLOB" if "*" in key else "="
+            where.append(f"d.id IN (SELECT design_id FROM parameters WHERE key {match} ? AND {field} {_OPS[op]} ?)")
+            args += [key, val]
+        for mat, cond in (materials or {}).items():
+            op, val = cond if isinstance(cond, tuple) else (">", cond)
+            where.append(f"d.id IN (SELECT design_id FROM materials WHERE material = ? AND mass_kg {_OPS[op]} ?)")
+            args += [mat, val]
+        sql = "SELECT d.* FROM designs d"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if order_by:
+            desc = order_by.startswith("-")
+            col = order_by.lstrip("-")
+            if col not in _GEOMETRY_COLUMNS + ("build_s", "name", "ingested"):
+                raise ValueError(f"Columna desconocida: {col}")
+            sql += f" ORDER BY d.{col} {'DESC' if desc else 'ASC'}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return sql, args
+
+    def find(self, params=None, materials=None, kind=None, order_by="mass_kg", limit=None, **columns):
+        """
+        Diseños que cumplen todas las condiciones.
+
+        columns  : columna=(op, valor) o columna=valor, p. ej. mass_kg=("<", 500), max_dim=(">", 5000)
+        params   : {clave: (op, valor)}; la clave admite * (GLOB), p. ej. {"P.tps_*": (">", 1000)}
+        materials: {material: (op, masa kg)}
+        """
+        sql, args = self._query(params, materials, kind, order_by, limit, **columns)
+        return [dict(r) for r in self.db.execute(sql, args)]
+
+    def explain(self, **kwargs):
+        """Plan de SQLite de una consulta de find() (para comprobar que usa índices)."""
+        sql, args = self._query(**kwargs)
+        return [r[-1] for r in self.db.execute("EXPLAIN QUERY PLAN " + sql, args)]
+
+    def parameters(self, source):
+        row = self._row(source)
+        if row is None:
+            return {}
+        return {r["key"]: r["num"] if r["num"] is not None else r["text"]
+                for r in self.db.execute("SELECT * FROM parameters WHERE design_id = ?", (row["id"],))}
+
+    def same_geometry(self, fingerprint):
+        """Diseños y piezas con la misma huella."""
+        designs = [dict(r) for r in self.db.execute("SELECT * FROM designs WHERE fingerprint = ?", (fingerprint,))]
+        parts = [dict(r) for r in self.db.execute(
+            "SELECT d.source, p.* FROM parts p JOIN designs d ON d.id = p.design_id WHERE p.fingerprint = ?",
+            (fingerprint,))]
+        return designs, parts
+
+    def stats(self):
+        return {r["kind"]: r["n"] for r in self.db.execute("SELECT kind, COUNT(*) AS n FROM designs GROUP BY kind")}
+
+
+def print_designs(rows, root=None):
+    print(f"{'Diseño':<40}{'Tipo':<7}{'Masa kg':>10}{'Dim. máx. mm':>14}{'Piezas':>8}{'Caras':>8}")
+    for r in rows:
+        name = os.path.relpath(r["source"], root) if root else r["name"]
+        name = name if len(name) <= 38 else "..." + name[-35:]
+        mass = f"{r['mass_kg']:.1f}" if r["mass_kg"] is not None else "-"
+        if r["max_dim"] is not None:
+            dim = f"{r['max_dim']:.0f}"
+        elif r["unit_suspect"]:
+            dim = f"¿{r['raw_max_dim']:.0f}?"
+        else:
+            dim = "-"
+        print(f"{name:<40}{r['kind']:<7}{mass:>10}{dim:>14}{r['parts'] or 0:>8}{r['faces'] or 0:>8}")
+
+
+if __name__ == "__main__":
+    import sys
+    root = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    with DesignCatalog() as cat:
+        t0 = time.perf_counter()
+        res = cat.ingest_tree(root)
+        print(f"Ingesta: {res['ingested']} nuevos/cambiados, {res['skipped']} sin cambios, "
+              f"{len(res['failed'])} fallidos ({time.perf_counter() - t0:.2f} s)")
+        print_designs(cat.find(max_dim=(">", 5000), order_by="-max_dim"), root)
+        suspect = cat.find(unit_suspect=1, order_by="-raw_max_dim")
+        if suspect:
+            print(f"\n{len(suspect)} STEP con unidad sospechosa (¿mm declarados como metros?):")
+            print_designs(suspect, root)
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""
+Lectura de ficheros .FCStd a nivel de zip, sin abrir el documento en FreeCAD.
+
+Para ver una pieza de Destiny_HeavyArmor_CAD_Complete.FCStd o
+Metallic_Spacecraft_Optic_Reactor.FCStd hay que abrir y recomputar el
+documento entero. Un .FCStd es un zip con Document.xml (objetos y
+propiedades), GuiDocument.xml y un .brp por forma. Aquí:
+
+- Document.xml se recorre con iterparse sobre el miembro comprimido (sin
+  cargarlo entero); cada <Object> se libera tras leerlo.
+- objects() da nombre, tipo, etiqueta y propiedades decodificadas
+  (cadenas, números, booleanos, Placement, enlaces, fichero de forma...).
+- brep_stream() / extract() sacan un .brp concreto en streaming;
+  load_shape() lo convierte en Part.Shape sin recomputar nada.
+- diff() compara dos versiones por objetos, propiedades y CRC de las
+  formas (el CRC sale del directorio del zip, sin descomprimir).
+
+Uso:
+    import fcstd_reader
+    with fcstd_reader.FCStdFile("Destiny_HeavyArmor_CAD_Complete.FCStd") as f:
+        print([o.label for o in f.objects().values()])
+        shape = f.load_shape("Tanks_Complete")   # en FreeCAD
+"""
+
+import os
+import shutil
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+
+DOCUMENT = "Document.xml"
+
+
+# ========================
+# Propiedades
+# ========================
+def _number(text):
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        try:
+            return float(text)
+        except (TypeError, ValueError):
+            return text
+
+
+def decode_property(prop):
+    """Valor Python de un elemento <Property>: el de su primer hijo según el tipo."""
+    children = list(prop)
+    if not children:
+        return None
+    c = children[0]
+    tag, a = c.tag, c.attrib
+    if tag in ("String", "Uuid"):
+        return a.get("value")
+    if tag == "Bool":
+        return a.get("value") == "true"
+    if tag in ("Integer", "Float", "Enum"):
+        return _number(a.get("value"))
+    if tag == "PropertyPlacement":
+        return {"base": tuple(float(a[k]) for k in ("Px", "Py", "Pz")),
+                "rotation": tuple(float(a[k]) for k in ("Q0", "Q1", "Q2", "Q3")),
+                "angle": float(a.get("A", 0.0)),
+                "axis": tuple(float(a.get(k, 0.0)) for k in ("Ox", "Oy", "Oz"))}
+    if tag in ("PropertyVector", "PropertyPosition"):
+        return tuple(float(a[k]) for k in ("valueX", "valueY", "valueZ"))
+    if tag == "Link":
+        return a.get("value") or None
+    if tag in ("LinkList", "LinkSubList"):
+        return [x.get("value") or x.get("obj") for x in c]
+    if tag == "Map":
+        return {x.get("key"): x.get("value") for x in c}
+    if tag in ("Part", "PropertyMaterial", "PropertyColor"):
+        return dict(a)
+    if tag == "ExpressionEngine":
+        return {x.get("path"): x.get("expression") for x in c}
+    if tag == "StringList":
+        return [x.get("value") for x in c]
+    return dict(a) or None
+
+
+class FCObject:
+    """Objeto del documento: nombre, tipo, id y {propiedad: (tipo, valor)}."""
+
+    def __init__(self, name, type_id=None, ident=None):
+        self.name = name
+        self.type_id = type_id
+        self.id = ident
+        self.properties = {}
+        self.extensions = []
+
+    @property
+    def label(self):
+        return self.value("Label", self.name)
+
+    def value(self, prop, default=None):
+        p = self.properties.get(prop)
+        return p[1] if p is not None else default
+
+    @property
+    def shape_file(self):
+        """Miembro del zip con la forma (Shape.brp / .bin) o None."""
+        for ptype, val in self.properties.values():
+            if ptype == "Part::PropertyPartShape" and isinstance(val, dict) and val.get("file"):
+                return val["file"]
+        return None
+
+    def __repr__(self):
+        return f"<FCObject {self.name} ({self.type_id}) '{self.label}'>"
+
+
+# ========================
+# Fichero
+# ========================
+class FCStdFile:
+    """Zip .FCStd abierto; Document.xml se analiza al pedir objetos."""
+
+    def __init__(self, path):
+        self.path = path
+        self.zip = zipfile.ZipFile(path)
+        self._objects = None
+        self._document = None
+
+    def close(self):
+        self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def members(self):
+        """{nombre: (tamaño comprimido, tamaño, CRC32)} del directorio del zip."""
+        return {i.filename: (i.compress_size, i.file_size, i.CRC) for i in self.zip.infolist()}
+
+    # --- Document.xml ---
+    def _iterparse(self):
+        with self.zip.open(DOCUMENT) as f:
+            yield from ET.iterparse(f, events=("start", "end"))
+
+    def names(self):
+        """[(nombre, tipo)] de la sección <Objects>; se deja de leer al terminarla."""
+        out = []
+        for event, el in self._iterparse():
+            if el.tag == "Objects":
+                if event == "end":
+                    break
+                continue
+            if event == "start" and el.tag == "Object" and "type" in el.attrib:
+                out.append((el.get("name"), el.get("type")))
+            elif event == "end" and el.tag == "ObjectDeps":
+                el.clear()
+        return out
+
+    def objects(self):
+        """{nombre: FCObject} con tipos y propiedades decodificadas (se analiza una vez)."""
+        if self._objects is not None:
+            return self._objects
+        objs = {}
+        doc = {}
+        in_data = False
+        current = None
+        for event, el in self._iterparse():
+            tag = el.tag
+            if event == "start":
+                if tag == "ObjectData":
+                    in_data = True
+                elif tag == "Object":
+                    name = el.get("name")
+                    if in_data:
+                        current = objs.setdefault(name, FCObject(name))
+                    else:
+                        objs[name] = FCObject(name, el.get("type"), _number(el.get("id")))
+                elif tag == "Extension" and current is not None:
+                    current.extensions.append(el.get("type"))
+                continue
+            if tag == "Property":
+                val = decode_property(el)
+                if current is not None:
+                    current.properties[el.get("name")] = (el.get("type"), val)
+                elif not in_data:
+                    doc[el.get("name")] = (el.get("type"), val)
+                el.clear()
+            elif tag == "Object" and in_data:
+                current = None
+                el.clear()
+            elif tag == "ObjectDeps":
+                el.clear()
+        self._objects = objs
+        self._document = doc
+        return objs
+
+    def document_properties(self):
+        self.objects()
+        return self._document
+
+    def get(self, name_or_label):
+        objs = self.objects()
+        if name_or_label in objs:
+            return objs[name_or_label]
+        for o in objs.values():
+            if o.label == name_or_label:
+                return o
+        raise KeyError(name_or_label)
+
+    # --- Formas ---
+    def brep_stream(self, name_or_label):
+        """Flujo binario del .brp del objeto (cerrarlo al terminar)."""
+        member = self.get(name_or_label).shape_file
+        if member is None:
+            raise KeyError(f"{name_or_label}: sin forma guardada")
+        return self.zip.open(member)
+
+    def extract(self, name_or_label, path):
+        """Copiar la forma del objeto a path en bloques; devuelve los bytes escritos."""
+        with self.brep_stream(name_or_label) as src, open(path, "wb") as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        return os.path.getsize(path)
+
+    def load_shape(self, name_or_label):
+        """Part.Shape del objeto leída del zip, con la colocación guardada en el BREP."""
+        import Part
+        obj = self.get(name_or_label)
+        shape = Part.Shape()
+        if obj.shape_file and obj.shape_file.lower().endswith(".bin"):
+            # Formato binario: importBinary solo acepta rutas
+            import tempfile
+            fd, tmp = tempfile.mkstemp(suffix=".bin")
+            os.close(fd)
+            try:
+                self.extract(name_or_label, tmp)
+                shape.importBinary(tmp)
+            finally:
+                os.remove(tmp)
+            return shape
+        with self.brep_stream(name_or_label) as f:
+            shape.importBrepFromString(f.read().decode("latin-1"))
+        return shape
+
+    def summary(self):
+        objs = self.objects()
+        info = self.members()
+        types = {}
+        for o in objs.values():
+            types[o.type_id] = types.get(o.type_id, 0) + 1
+        shapes = [o.shape_file for o in objs.values() if o.shape_file in info]
+        return {
+            "file": self.path,
+            "bytes": os.path.getsize(self.path),
+            "objects": len(objs),
+            "types": types,
+            "shapes": len(shapes),
+            "brep_bytes": sum(info[s][1] for s in shapes),
+        }
+
+
+# ========================
+# Comparación entre versiones
+# ========================
+def diff(path_a, path_b, ignore=("Label2", "ExpressionEngine")):
+    """
+    {"added", "removed", "changed": {nombre: [propiedades]}, "shape_changed"}.
+
+    Una forma cuenta como cambiada si difieren el CRC32 o el tamaño de su .brp.
+    """
+    with FCStdFile(path_a) as a, FCStdFile(path_b) as b:
+        oa, ob = a.objects(), b.objects()
+        ma, mb = a.members(), b.members()
+        changed, shape_changed = {}, []
+        for name in sorted(set(oa) & set(ob)):
+            pa, pb = oa[name].properties, ob[name].properties
+            props = [p for p in sorted(set(pa) | set(pb))
+                     if p not in ignore and pa.get(p) != pb.get(p)
+                     and (pa.get(p) or ("",))[0] != "Part::PropertyPartShape"]
+            fa, fb = oa[name].shape_file, ob[name].shape_file
+            if (fa or fb) and ma.get(fa, (0, 0, 0))[1:] != mb.get(fb, (0, 0, 0))[1:]:
+                shape_changed.append(name)
+            if props:
+                changed[name] = props
+        return {"added": sorted(set(ob) - set(oa)), "removed": sorted(set(oa) - set(ob)),
+                "changed": changed, "shape_changed": shape_changed}
+
+
+def print_objects(f):
+    print(f"{os.path.basename(f.path)}")
+    members = f.members()
+    for o in f.objects().values():
+        size = members.get(o.shape_file, (0, 0, 0))[1]
+        print(f"    {o.name:<32}{o.type_id or '-':<22}{o.label:<32}{size / 1024:>8.0f} KB")
+
+
+if __name__ == "__main__":
+    import sys
+    root = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    paths = sorted(os.path.join(d, n) for d, dirs, ns in os.walk(root) if ".git" not in d
+                   for n in ns if n.lower().endswith(".fcstd"))
+    t0 = time.perf_counter()
+    rows = []
+    for p in paths:
+        with FCStdFile(p) as f:
+            rows.append(f.summary())
+    dt = time.perf_counter() - t0
+    print(f"{'Fichero':<48}{'Objetos':>8}{'Formas':>8}{'BREP MB':>9}")
+    for r in rows:
+        print(f"{os.path.basename(r['file']):<48}{r['objects']:>8}{r['shapes']:>8}{r['brep_bytes'] / 2**20:>9.1f}")
+    print(f"{len(rows)} ficheros analizados en {dt:.3f} s")
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+Regresión de huellas geométricas de todas las macros.
+
+Al tocar un ayudante compartido (make_cyl_x, rot_to_x, fuse_safely...) no
+hay forma rápida de saber qué macros cambian su salida. Aquí:
+
+- Cada macro se ejecuta en su propio proceso FreeCADCmd (en paralelo, un
+  proceso por núcleo); este mismo fichero hace de script hijo: ejecuta la
+  macro como __main__, mide el tiempo y guarda en JSON la huella
+  (geometry_fingerprint) de cada objeto con forma de cada documento.
+- Las huellas se comparan con las doradas (fingerprints_golden.json) con
+  la tolerancia de geometry_fingerprint.drift(), y junto a la deriva
+  geométrica se informa del cambio de tiempo de construcción.
+
+Estados: ok, drift (geometría), slower / faster (tiempo), new, missing,
+error (la macro lanzó una excepción; se conservan los objetos ya creados).
+Las macros que tocan ViewObject o FreeCADGui fallan en FreeCADCmd: con
+--gui se usa el ejecutable FreeCAD (p. ej. bajo xvfb-run).
+
+Uso:
+    python tools/fingerprint_regression.py                 # comparar
+    python tools/fingerprint_regression.py --update        # regrabar doradas
+    python tools/fingerprint_regression.py -k Nave -j 8    # filtrar / procesos
+    python tools/fingerprint_regression.py --profile trazas/   # + op_profiler por macro
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TOOLS_DIR)
+GOLDEN = os.path.join(TOOLS_DIR, "fingerprints_golden.json")
+
+FREECAD_CMD = ("FreeCADCmd", "freecadcmd", "FreeCADCmd.exe")
+FREECAD_GUI = ("FreeCAD", "freecad", "FreeCAD.exe")
+
+# Deriva de tiempo que cuenta como regresión: relativa y absoluta [s] a la vez
+TIME_REL = 0.25
+TIME_ABS = 0.5
+
+TIMEOUT_S = 600
+
+
+# ========================
+# Proceso hijo (dentro de FreeCAD)
+# ========================
+def _run_child(macro, out):
+    """
+    Ejecutar la macro y guardar su resultado en `out`.
+
+    Se ejecuta con un directorio temporal propio como cwd: las macros que
+    exportan con rutas relativas (STEP, FCStd...) no ensucian el repositorio
+    ni se pisan entre procesos paralelos. La macro y sus __file__ van en
+    ruta absoluta para que sigan encontrando sus ficheros vecinos.
+    """
+    macro = os.path.abspath(macro)
+    sys.path.insert(0, TOOLS_DIR)
+    import FreeCAD as App
+    import geometry_fingerprint as gf
+    result = {"macro": macro, "status": "ok", "error": None}
+    prof = None
+    if os.environ.get("FP_PROFILE"):
+        import op_profiler
+        prof = op_profiler.OpProfiler(builders=True, sources=[macro]).enable()
+    t0 = time.perf_counter()
+    cwd = os.getcwd()
+    try:
+        with open(macro, encoding="utf-8", errors="replace") as f:
+            code = compile(f.read(), macro, "exec")
+        with tempfile.TemporaryDirectory(prefix="fp_") as work:
+            os.chdir(work)
+            try:
+                exec(code, {"__name__": "__main__", "__file__": macro})
+            finally:
+                os.chdir(cwd)
+    except SystemExit:
+        pass
+    except BaseException as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["build_s"] = round(time.perf_counter() - t0, 4)
+    if prof is not None:
+        prof.disable()
+        name = os.path.relpath(macro, REPO_DIR).replace(os.sep, "__")
+        result["trace"] = prof.save_trace(os.path.join(os.environ["FP_PROFILE"], name + ".trace.json"))
+    objects = {}
+    for doc in App.listDocuments().values():
+        for o in doc.Objects:
+            shape = getattr(o, "Shape", None)
+            if shape is None or shape.isNull() or not shape.Faces:
+                continue
+            try:
+                objects[f"{doc.Name}/{o.Name}"] = gf.fingerprint(shape)
+            except Exception as e:
+                objects[f"{doc.Name}/{o.Name}"] = {"error": f"{type(e).__name__}: {e}"}
+    result["objects"] = objects
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+# ========================
+# Macros y ejecución
+# ========================
+def find_macros(root=REPO_DIR, pattern=None):
+    """.FCMacro y .py que importan FreeCAD, fuera de tools/."""
+    out = []
+    for d, dirs, names in os.walk(root):
+        dirs[:] = [x for x in dirs if not x.startswith(".") and x != "__pycache__"]
+        if os.path.abspath(d) == TOOLS_DIR:
+            continue
+        for n in sorted(names):
+            if not n.lower().endswith((".fcmacro", ".py")):
+                continue
+            p = os.path.join(d, n)
+            if pattern and pattern.lower() not in p.lower():
+                continue
+            with open(p, encoding="utf-8", errors="replace") as f:
+                head = f.read()
+            if "import FreeCAD" in head or "import Part" in head:
+                out.append(p)
+    return out
+
+
+def find_freecad(gui=False):
+    for name in FREECAD_GUI if gui else FREECAD_CMD:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def run_macro(macro, freecad, timeout=TIMEOUT_S):
+    """Ejecutar una macro en un FreeCAD propio; devuelve el resultado del hijo."""
+    fd, out = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    env = dict(os.environ, FP_MACRO=os.path.abspath(macro), FP_OUT=out)
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.run([freecad, os.path.abspath(__file__)], env=env, capture_output=True,
+                              text=True, timeout=timeout)
+        try:
+            with open(out, encoding="utf-8") as f:
+                res = json.load(f)
+        except (OSError, ValueError):
+            tail = (proc.stderr or proc.stdout or "").strip().splitlines()[-3:]
+            res = {"macro": macro, "status": "error", "objects": {},
+                   "error": f"sin resultado (código {proc.returncode}): {' | '.join(tail)}"}
+    except subprocess.TimeoutExpired:
+        res = {"macro": macro, "status": "error", "objects": {}, "error": f"tiempo agotado ({timeout} s)"}
+    finally:
+        if os.path.exists(out):
+            os.remove(out)
+    res["wall_s"] = round(time.perf_counter() - t0, 3)
+    res.setdefault("build_s", None)
+    return res
+
+
+def run_all(macros, freecad, jobs=None, timeout=TIMEOUT_S, progress=None):
+    """{ruta relativa: resultado} ejecutando `jobs` FreeCAD a la vez."""
+    jobs = jobs or os.cpu_count() or 2
+    results = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(run_macro, m, freecad, timeout): m for m in macros}
+        for fut in as_completed(futures):
+            m = futures[fut]
+            res = fut.result()
+            results[os.path.relpath(m, REPO_DIR).replace(os.sep, "/")] = res
+            if progress:
+                progress(m, res)
+    return results
+
+
+# ========================
+# Comparación
+# ========================
+def compare(results, golden):
+    """Filas por macro: estado, objetos con deriva, tiempos dorado/actual."""
+    import geometry_fingerprint as gf
+    rows = []
+    for key in sorted(set(results) | set(golden)):
+        cur, ref = results.get(key), golden.get(key)
+        row = {"macro": key, "drift": {}, "added": [], "removed": [],
+               "build_s": cur.get("build_s") if cur else None,
+               "golden_s": ref.get("build_s") if ref else None,
+               "error": cur.get("error") if cur else None}
+        if cur is None:
+            row["status"] = "missing"
+        elif ref is None:
+            row["status"] = "new"
+        else:
+            co, ro = cur.get("objects", {}), ref.get("objects", {})
+            row["added"] = sorted(set(co) - set(ro))
+            row["removed"] = sorted(set(ro) - set(co))
+            for name in sorted(set(co) & set(ro)):
+                if co[name].get("digest") == ro[name].get("digest"):
+                    continue
+                d = gf.drift(co[name], ro[name])
+                if d:
+                    row["drift"][name] = d
+            if cur.get("status") == "error" and ref.get("status") != "error":
+                row["status"] = "error"
+            elif row["drift"] or row["added"] or row["removed"]:
+                row["status"] = "drift"
+            else:
+                row["status"] = _time_status(row["build_s"], row["golden_s"])
+        rows.append(row)
+    return rows
+
+
+def _time_status(now, before):
+    if now is None or before is None:
+        return "ok"
+    delta = now - before
+    if delta > TIME_ABS and delta > TIME_REL * before:
+        return "slower"
+    if -delta > TIME_ABS and -delta > TIME_REL * before:
+        return "faster"
+    return "ok"
+
+
+def load_golden(path=GOLDEN):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_golden(results, path=GOLDEN, merge=True):
+    """Regrabar las doradas (fusionando con las existentes si solo se corrió un subconjunto)."""
+    data = load_golden(path) if merge else {}
+    for key, res in results.items():
+        data[key] = {k: res.get(k) for k in ("status", "error", "build_s", "objects")}
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def print_report(rows):
+    print(f"{'Macro':<70}{'Estado':<9}{'Dorado s':>9}{'Actual s':>9}{'Δ s':>8}")
+    for r in rows:
+        name = r["macro"] if len(r["macro"]) <= 68 else "..." + r["macro"][-65:]
+        g, c = r["golden_s"], r["build_s"]
+        delta = f"{c - g:+.2f}" if g is not None and c is not None else "-"
+        print(f"{name:<70}{r['status']:<9}{g if g is not None else '-':>9}{c if c is not None else '-':>9}{delta:>8}")
+        for obj, d in r["drift"].items():
+            print(f"      {obj}: " + ", ".join(f"{k} {a} -> {b}" for k, (a, b) in d.items()))
+        for obj in r["added"]:
+            print(f"      + {obj}")
+        for obj in r["removed"]:
+            print(f"      - {obj}")
+        if r["status"] == "error" and r["error"]:
+            print(f"      {r['error']}")
+    counts = {}
+    for r in rows:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    print(", ".join(f"{k}: {v}" for k, v in sorted(counts.items())))
+
+
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(description="Regresión de huellas geométricas de las macros")
+    ap.add_argument("-k", dest="pattern", help="solo macros cuya ruta contenga este texto")
+    ap.add_argument("-j", dest="jobs", type=int, default=None, help="procesos FreeCAD en paralelo")
+    ap.add_argument("--update", action="store_true", help="regrabar las huellas doradas")
+    ap.add_argument("--golden", default=GOLDEN)
+    ap.add_argument("--freecad", default=None, help="ejecutable de FreeCAD")
+    ap.add_argument("--gui", action="store_true", help="usar FreeCAD con interfaz (macros con ViewObject)")
+    ap.add_argument("--timeout", type=float, default=TIMEOUT_S)
+    ap.add_argument("--profile", metavar="DIR", help="traza Chrome de operaciones de Part por macro (op_profiler; "
+                    "alarga los tiempos de construcción)")
+    args = ap.parse_args(argv)
+    if args.profile:
+        os.makedirs(args.profile, exist_ok=True)
+        os.environ["FP_PROFILE"] = os.path.abspath(args.profile)
+
+    freecad = args.freecad or find_freecad(args.gui)
+    if freecad is None:
+        print("No se encuentra FreeCADCmd en el PATH (usar --freecad)")
+        return 2
+    macros = find_macros(pattern=args.pattern)
+    t0 = time.perf_counter()
+    results = run_all(macros, freecad, args.jobs, args.timeout,
+                      progress=lambda m, r: print(f"  {r['status']:<6}{r['wall_s']:>8.1f} s  "
+                                                  f"{os.path.relpath(m, REPO_DIR)}", flush=True))
+    print(f"{len(macros)} macros en {time.perf_counter() - t0:.1f} s")
+    if args.update:
+        save_golden(results, args.golden)
+        print(f"Huellas doradas guardadas en {args.golden}")
+        return 0
+    golden = load_golden(args.golden)
+    if args.pattern:
+        golden = {k: v for k, v in golden.items() if args.pattern.lower() in k.lower()}
+    rows = compare(results, golden)
+    print_report(rows)
+    return 1 if any(r["status"] in ("drift", "error", "slower", "missing") for r in rows) else 0
+
+
+if __name__ == "__main__":
+    if os.environ.get("FP_MACRO") and os.environ.get("FP_OUT"):
+        _run_child(os.environ["FP_MACRO"], os.environ["FP_OUT"])
+    else:
+        sys.exit(main())
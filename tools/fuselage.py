@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+Fuselajes de revolución de una sola operación a partir de estaciones.
+
+Las macros de naves (make_hull en TankBlackRadiation.py, create_hull en
+direct_Fssb.py, make_body en ShieldFusion, Nose/Mid/Rear en
+TestSolarFlares) construyen el fuselaje fusionando un cono y dos cilindros
+y después filetean las costuras. Aquí el fuselaje es un meridiano:
+
+    stations = [(x, r, blend), ...]    (como body_sections de BaseTestPark)
+
+- Estaciones consecutivas con la misma x forman un escalón (cara plana).
+- blend es el radio del empalme tangente en la esquina de esa estación:
+  el filete de la costura pasa a ser parte del perfil (arco exacto). Si
+  no cabe en la mitad de los tramos vecinos se reduce.
+- thickness: casco hueco de espesor uniforme. El perfil interior es la
+  erosión del meridiano por un disco de radio t de revolved_shell
+  (inner_profile): paralelas de las rectas, arcos concéntricos de los
+  empalmes y arcos de radio t en los vértices, también donde un escalón
+  es más corto que t.
+- closed: extremos cerrados (caras planas hasta el eje) o abiertos
+  (tubo con caras anulares), como los cortes pasantes de make_hull. En
+  un tubo abierto los tramos extremos se prolongan más allá de los cortes,
+  así el interior es la paralela cortada por los planos de los extremos.
+- Una estación intermedia con r = 0 (la nariz invertida de direct_Fssb,
+  cuyo vértice toca el tramo medio) parte el meridiano en componentes que
+  se revolucionan por separado y se devuelven juntas en un compound.
+
+make_fuselage() devuelve el sólido de UNA revolución del meridiano, sin
+booleanas ni pasadas de filete.
+
+Unidades: mm, eje X por el origen.
+"""
+
+import math
+
+import revolved_shell
+
+__all__ = ["make_fuselage", "fuselage_faces", "meridian", "fuselage_volume",
+           "stations_from_sections", "stations_nose_mid_rear"]
+
+
+# ========================
+# Estaciones
+# ========================
+def stations_from_sections(sections, blend=0.0, x0=0.0):
+    """
+    Estaciones a partir de tramos cilíndricos (L, D) consecutivos
+    (body_sections de HybridPlasmaPropulsion) o cónicos (L, D0, D1).
+    """
+    st = []
+    x = float(x0)
+    for sec in sections:
+        L = float(sec[0])
+        d0 = float(sec[1])
+        d1 = float(sec[2]) if len(sec) > 2 else d0
+        st.append((x, d0 / 2.0, blend))
+        x += L
+        st.append((x, d1 / 2.0, blend))
+    return _dedupe(st)
+
+
+def stations_nose_mid_rear(P, blend=0.0, nose_tip_d=0.0, x0=0.0):
+    """
+    Estaciones del patrón nariz/medio/popa (nose_len, nose_base_d, mid_len,
+    mid_d, rear_len, rear_d): nariz cónica de nose_tip_d a nose_base_d.
+    """
+    sections = [(P["nose_len"], nose_tip_d, P["nose_base_d"]),
+                (P["mid_len"], P["mid_d"]),
+                (P["rear_len"], P["rear_d"])]
+    return stations_from_sections(sections, blend, x0)
+
+
+def _components(stations, closed):
+    """Trozos del meridiano separados por estaciones intermedias sobre el eje."""
+    st = _dedupe(stations)
+    _validate(st)
+    cuts = [k for k in range(1, len(st) - 1) if st[k][1] <= 1e-9]
+    if cuts and not closed:
+        raise ValueError("un tubo abierto no puede tocar el eje")
+    out = []
+    start = 0
+    for k in cuts + [len(st) - 1]:
+        if k - start >= 1:
+            out.append(st[start:k + 1])
+        start = k
+    return out
+
+
+def _dedupe(stations):
+    out = []
+    for x, r, b in stations:
+        if out and abs(out[-1][0] - x) < 1e-9 and abs(out[-1][1] - r) < 1e-9:
+            out[-1] = (x, r, max(out[-1][2], b))
+        else:
+            out.append((float(x), float(r), float(b)))
+    return out
+
+
+def _validate(stations):
+    if len(stations) < 2:
+        raise ValueError("se necesitan al menos dos estaciones")
+    for (xa, ra, _), (xb, rb, _) in zip(stations, stations[1:]):
+        if xb < xa:
+            raise ValueError(f"estaciones no ordenadas en x ({xa} > {xb})")
+    if any(r < 0 for _, r, _ in stations):
+        raise ValueError("radio negativo")
+
+
+# ========================
+# Geometría 2D
+# ========================
+def _chain(stations, closed):
+    """Cadena (x, r) con radios de empalme; cerrada = añade los extremos sobre el eje."""
+    st = _dedupe(stations)
+    _validate(st)
+    if closed:
+        if st[0][1] > 0:
+            st.insert(0, (st[0][0], 0.0, 0.0))
+        if st[-1][1] > 0:
+            st.append((st[-1][0], 0.0, 0.0))
+    pts = [(x, r) for x, r, _ in st]
+    blends = [b for _, _, b in st]
+    blends[0] = blends[-1] = 0.0
+    return pts, blends
+
+
+def _unit(a, b):
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    L = math.hypot(dx, dy)
+    if L < 1e-12:
+        raise ValueError("segmento de longitud nula en el perfil")
+    return dx / L, dy / L, L
+
+
+def _fillet(pts, radii):
+    """
+    Piezas ("line", p0, p1) / ("arc", p0, pm, p1) de la cadena con empalmes
+    tangentes. El radio se reduce si no cabe en la mitad de los tramos vecinos.
+    """
+    n = len(pts)
+    tangents = {}
+    for k in range(1, n - 1):
+        R = radii[k]
+        if R <= 0:
+            continue
+        ux, uy, Lin = _unit(pts[k - 1], pts[k])
+        vx, vy, Lout = _unit(pts[k], pts[k + 1])
+        cos_t = max(-1.0, min(1.0, ux * vx + uy * vy))
+        theta = math.acos(cos_t)
+        if theta < 1e-9 or theta > math.pi - 1e-9:
+            continue
+        d = min(R * math.tan(theta / 2.0), 0.5 * Lin, 0.5 * Lout)
+        R = d / math.tan(theta / 2.0)
+        p = pts[k]
+        t1 = (p[0] - ux * d, p[1] - uy * d)
+        t2 = (p[0] + vx * d, p[1] + vy * d)
+        bx, by = vx - ux, vy - uy
+        bl = math.hypot(bx, by)
+        bx, by = bx / bl, by / bl
+        dist = R / math.cos(theta / 2.0)
+        center = (p[0] + bx * dist, p[1] + by * dist)
+        mid = (center[0] - bx * R, center[1] - by * R)
+        tangents[k] = (t1, mid, t2)
+
+    pieces = []
+    cur = pts[0]
+    for k in range(1, n):
+        if k in tangents:
+            t1, mid, t2 = tangents[k]
+            pieces.append(("line", cur, t1))
+            pieces.append(("arc", t1, mid, t2))
+            cur = t2
+        else:
+            pieces.append(("line", cur, pts[k]))
+            cur = pts[k]
+    return [p for p in pieces if p[0] == "arc" or math.hypot(p[2][0] - p[1][0], p[2][1] - p[1][1]) > 1e-9]
+
+
+def _extended(pieces, t):
+    """Tubo abierto: rectas extremas prolongadas 2t en x más allá de los cortes."""
+    out = list(pieces)
+    for end in (0, -1):
+        kind, a, b = out[end][:3]
+        if kind != "line" or b[0] == a[0]:
+            continue
+        m = (b[1] - a[1]) / (b[0] - a[0])
+        e = 2.0 * t
+        if end == 0:
+            out.insert(0, ("line", (a[0] - e, a[1] - m * e), a))
+        else:
+            out.append(("line", b, (b[0] + e, b[1] + m * e)))
+    return out
+
+
+def meridian(stations, thickness=None, closed=True):
+    """
+    Meridiano del fuselaje: dict con las piezas "outer" ordenadas de proa a
+    popa, sus puntos extremos y, si es hueco, las cadenas "inner" de
+    revolved_shell.inner_profile() (una sola en un tubo abierto).
+    """
+    pts, blends = _chain(stations, closed)
+    outer = _fillet(pts, blends)
+    result = {"outer": outer, "inner": None, "closed": closed,
+              "outer_ends": (pts[0], pts[-1]), "thickness": None}
+    if thickness:
+        t = float(thickness)
+        if closed:
+            inner = revolved_shell.inner_profile(outer, t)
+        else:
+            x0, x1 = pts[0][0], pts[-1][0]
+            inner = revolved_shell.inner_profile(_extended(outer, t), t, x_range=(x0, x1))
+            if len(inner) != 1 or inner[0][0][1] > x0 + 1e-9 or inner[0][-1][2] < x1 - 1e-9:
+                raise ValueError(f"espesor {t} demasiado grande: el perfil interior toca el eje")
+        if not inner:
+            raise ValueError(f"espesor {t} demasiado grande: no queda hueco")
+        result["inner"] = inner
+        result["thickness"] = t
+    return result
+
+
+def fuselage_volume(stations, thickness=None, closed=True):
+    """Volumen [mm³] exacto del sólido o del casco (rectas y arcos integrados por pieza)."""
+    if not closed and not thickness:
+        raise ValueError("un fuselaje macizo necesita closed=True")
+    total = 0.0
+    for comp in _components(stations, closed):
+        m = meridian(comp, thickness, closed)
+        total += revolved_shell.solid_volume(m["outer"])
+        if m["inner"] is not None:
+            total -= revolved_shell.chain_volume(m["inner"], m["thickness"])
+    return total
+
+
+# ========================
+# Geometría OCC
+# ========================
+def fuselage_faces(stations, thickness=None, closed=True):
+    """Caras meridionales (plano XY, y = r) listas para revolucionar, una por componente."""
+    faces = []
+    for comp in _components(stations, closed):
+        faces.extend(_component_faces(comp, thickness, closed))
+    return faces
+
+
+def _component_faces(stations, thickness, closed):
+    import Part
+    from FreeCAD import Vector
+    m = meridian(stations, thickness, closed)
+    if m["inner"] is not None and closed:
+        return revolved_shell.meridian_faces(m["outer"], m["thickness"], chains=m["inner"])
+    edges = revolved_shell.outer_edges(m["outer"])
+    (ox0, or0), (ox1, or1) = m["outer_ends"]
+
+    def link(a, b):
+        if math.hypot(b[0] - a[0], b[1] - a[1]) > 1e-9:
+            edges.append(Part.LineSegment(Vector(*a, 0), Vector(*b, 0)).toShape())
+
+    if m["inner"] is None:
+        if not closed:
+            raise ValueError("un fuselaje macizo necesita closed=True")
+        link((ox1, or1), (ox0, or0))
+    else:
+        # Tubo abierto: caras anulares en los cortes hasta el interior
+        t, chain = m["thickness"], m["inner"][0]
+        ix0, ix1 = chain[0][1], chain[-1][2]
+        ir0 = revolved_shell.piece_radius(chain[0][0], ix0, chain[0][3], t)
+        ir1 = revolved_shell.piece_radius(chain[-1][0], ix1, chain[-1][3], t)
+        link((ox1, or1), (ix1, ir1))
+        edges.extend(reversed(revolved_shell.chain_edges(chain, t, axis=False)))
+        link((ix0, ir0), (ox0, or0))
+    return [Part.Face(Part.Wire(Part.__sortEdges__(edges)))]
+
+
+def make_fuselage(stations, thickness=None, closed=True, angle=360.0):
+    """
+    Sólido del fuselaje (macizo o hueco) en una sola revolución alrededor de X.
+
+    stations : [(x, r, blend), ...]
+    thickness: espesor del casco (None = macizo)
+    closed   : extremos cerrados hasta el eje; False = tubo abierto
+    """
+    return revolved_shell.revolve_faces(fuselage_faces(stations, thickness, closed), angle)
+
+
+if __name__ == "__main__":
+    # Fuselaje de direct_Fssb con empalmes de 40 mm y casco de 20 mm
+    P = {"nose_len": 1500.0, "nose_base_d": 1200.0, "mid_len": 2700.0, "mid_d": 1800.0,
+         "rear_len": 1500.0, "rear_d": 2250.0}
+    st = stations_nose_mid_rear(P, blend=40.0)
+    m = meridian(st, thickness=20.0)
+    print(f"{len(st)} estaciones -> {len(m['outer'])} piezas exteriores, "
+          f"{sum(len(c) for c in m['inner'])} interiores")
+    v_solid = fuselage_volume(st)
+    v_shell = fuselage_volume(st, 20.0)
+    print(f"Volumen macizo {v_solid/1e9:.4f} m³, casco {v_shell/1e9:.4f} m³")
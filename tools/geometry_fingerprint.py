@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Huella geométrica compacta de una forma, cuantizada con tolerancia.
+
+Sirve para reconocer la misma geometría entre ejecuciones y plataformas
+sin comparar BREP (cuyo texto cambia con el orden de las operaciones):
+
+    volumen, área, caja envolvente, centro de masas, momentos principales
+    de inercia (respecto al CG, ordenados) y número de sólidos, láminas,
+    caras, aristas y vértices
+
+Las longitudes se redondean a length_tol [mm] y volumen, área e inercia a
+`digits` cifras significativas; digest es el sha1 (16 hex) de esos valores.
+
+Uso en FreeCAD con tools/ en sys.path:
+    import geometry_fingerprint as gf
+    fp = gf.fingerprint(obj.Shape)
+    gf.drift(fp, golden)          # {} si coinciden dentro de la tolerancia
+"""
+
+import hashlib
+import json
+
+import numpy as np
+
+LENGTH_TOL = 1e-3   # mm
+DIGITS = 6
+
+COUNT_KEYS = ("solids", "shells", "faces", "edges", "vertexes")
+
+
+# ========================
+# Medidas
+# ========================
+def _principal_moments(shape, cg):
+    """Momentos principales [kg·mm² con densidad 1] del conjunto de sólidos respecto al CG global."""
+    solids = shape.Solids
+    if not solids:
+        return [0.0, 0.0, 0.0]
+    total = np.zeros((3, 3))
+    for s in solids:
+        m = s.MatrixOfInertia
+        inertia = np.array([[m.A11, m.A12, m.A13], [m.A21, m.A22, m.A23], [m.A31, m.A32, m.A33]])
+        # Steiner: del CG de cada sólido al CG del conjunto
+        d = np.array([s.CenterOfMass.x - cg[0], s.CenterOfMass.y - cg[1], s.CenterOfMass.z - cg[2]])
+        total += inertia + s.Volume * (d @ d * np.eye(3) - np.outer(d, d))
+    return sorted(np.linalg.eigvalsh(0.5 * (total + total.T)).tolist())
+
+
+def measure(shape):
+    """Medidas sin cuantizar de una forma (volumen y CG de sus sólidos si los tiene)."""
+    bb = shape.BoundBox
+    solids = shape.Solids
+    volume = sum(s.Volume for s in solids) if solids else 0.0
+    if solids and volume > 0:
+        cg = sum((np.array([s.CenterOfMass.x, s.CenterOfMass.y, s.CenterOfMass.z]) * s.Volume for s in solids),
+                 np.zeros(3)) / volume
+    else:
+        c = bb.Center
+        cg = np.array([c.x, c.y, c.z])
+    return {
+        "volume": float(volume),
+        "area": float(shape.Area),
+        "bbox": [bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax],
+        "cg": cg.tolist(),
+        "inertia": _principal_moments(shape, cg),
+        "solids": len(solids),
+        "shells": len(shape.Shells),
+        "faces": len(shape.Faces),
+        "edges": len(shape.Edges),
+        "vertexes": len(shape.Vertexes),
+    }
+
+
+# ========================
+# Cuantización y huella
+# ========================
+def _sig(x, digits=DIGITS):
+    return float(f"{x:.{digits}g}")
+
+
+def _len(x, tol=LENGTH_TOL):
+    q = round(x / tol) * tol
+    return round(q, max(0, -int(np.floor(np.log10(tol))))) + 0.0
+
+
+def quantize(m, length_tol=LENGTH_TOL, digits=DIGITS):
+    out = {
+        "volume": _sig(m["volume"], digits),
+        "area": _sig(m["area"], digits),
+        "bbox": [_len(v, length_tol) for v in m["bbox"]],
+        "cg": [_len(v, length_tol) for v in m["cg"]],
+        "inertia": [_sig(v, digits) for v in m["inertia"]],
+    }
+    out.update({k: int(m[k]) for k in COUNT_KEYS})
+    return out
+
+
+def digest(q):
+    return hashlib.sha1(json.dumps(q, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def fingerprint(shape, length_tol=LENGTH_TOL, digits=DIGITS):
+    """Medidas cuantizadas + "digest"."""
+    q = quantize(measure(shape), length_tol, digits)
+    q["digest"] = digest(q)
+    return q
+
+
+def drift(current, golden, rel_tol=10 ** -(DIGITS - 1), length_tol=10 * LENGTH_TOL):
+    """
+    {campo: (dorado, actual)} de lo que se sale de la tolerancia.
+
+    Relativa en volumen, área e inercia; absoluta [mm] en caja y CG; exacta en conteos.
+    """
+    out = {}
+    for k in ("volume", "area"):
+        a, b = golden.get(k, 0.0), current.get(k, 0.0)
+        if abs(a - b) > rel_tol * max(abs(a), abs(b), 1e-12):
+            out[k] = (a, b)
+    for k in ("bbox", "cg"):
+        a, b = golden.get(k) or [], current.get(k) or []
+        if len(a) != len(b) or any(abs(x - y) > length_tol for x, y in zip(a, b)):
+            out[k] = (a, b)
+    a, b = golden.get("inertia") or [], current.get("inertia") or []
+    scale = max([abs(x) for x in a + b] + [1e-12])
+    if len(a) != len(b) or any(abs(x - y) > rel_tol * scale for x, y in zip(a, b)):
+        out["inertia"] = (a, b)
+    for k in COUNT_KEYS:
+        if golden.get(k) != current.get(k):
+            out[k] = (golden.get(k), current.get(k))
+    return out
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+"""
+Canales helicoidales con caché de barridos y estrategia recordada.
+
+helix_channel_cut() de BaseTestPark (HybridPlasmaPropulsion) prueba
+makePipeShell, luego makePipe y, como último recurso, fusiona uno a uno
+cientos de cilindros de helix.discretize; el corte contra la camisa también
+es secuencial. Aquí:
+
+- El barrido de UNA vuelta se construye una vez por clave
+  (paso, radio, ángulo de cono, perfil, estrategia) y se replica por
+  traslación (vueltas) y rotación (entradas múltiples). Las hélices
+  contrarrotantes son la simetría especular de la misma vuelta.
+- Estrategias en orden: "pipe_shell" (makePipeShell Frenet), "pipe"
+  (makePipe) y "segments" (prismas del perfil sobre la hélice discretizada
+  reunidos en UN compound, sin fusiones). La que funciona se guarda por
+  clave en strategies.json y las ejecuciones siguientes van directas a ella.
+  Todas se validan antes de guardarse: sólidos con volumen y, en
+  "segments", cada prisma un sólido válido.
+- Los barridos válidos se guardan como BREP en el directorio de caché
+  (memoria + disco), así que reconstruir la macro no vuelve a barrer.
+- cut_channels() resta todos los canales con un único cut() contra el
+  compound.
+
+Las hélices cónicas (angle != 0, tobera) no se pueden replicar por
+traslación: se barren completas, pero igualmente cacheadas. Para paredes de
+perfil curvo, variable_helix_channels() barre sobre una hélice de radio y
+paso variables por estaciones (B-spline que interpola la hélice muestreada).
+
+Perfiles (en el plano normal a la hélice en su punto inicial):
+    ("circle", r)
+    ("polygon", ((u, v), ...))  u radial hacia fuera, v transversal [mm]
+
+Uso en FreeCAD con tools/ en sys.path (las macros lo añaden si existe):
+    import helix_channels as hc
+    ch = hc.helix_channels(rp, pitch, turns, ("circle", cr), origin=(0, 0, z0))
+    jacket.Shape = hc.cut_channels(jacket.Shape, ch)
+"""
+
+import hashlib
+import json
+import math
+import os
+
+STRATEGIES = ("pipe_shell", "pipe", "segments")
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "HELIX_CHANNEL_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "helix_channels"))
+
+# Segmentos por vuelta de la estrategia de reserva
+SEGMENTS_PER_TURN = 48
+
+
+# ========================
+# Caché
+# ========================
+class SweepCache:
+    """Barridos por clave (memoria + BREP en disco) y estrategia ganadora por clave."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, persist=True):
+        self.directory = directory
+        self.persist = persist
+        self.shapes = {}
+        self.strategies = {}
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "failures": 0}
+        if persist:
+            try:
+                with open(self._strategy_path(), encoding="utf-8") as f:
+                    self.strategies = json.load(f)
+            except (OSError, ValueError):
+                self.strategies = {}
+
+    def _strategy_path(self):
+        return os.path.join(self.directory, "strategies.json")
+
+    def _brep_path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".brep")
+
+    def get(self, key, validate=None):
+        """Barrido cacheado o None; los leídos de disco que no pasan validate se descartan."""
+        shape = self.shapes.get(key)
+        if shape is not None:
+            self.stats["hits"] += 1
+            return shape
+        if self.persist:
+            path = self._brep_path(key)
+            if os.path.exists(path):
+                import Part
+                shape = Part.Shape()
+                try:
+                    shape.importBrep(path)
+                except Exception:
+                    shape = None
+                if shape is not None and not shape.isNull() and (validate is None or validate(shape)):
+                    self.shapes[key] = shape
+                    self.stats["disk_hits"] += 1
+                    return shape
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key, shape, strategy, family):
+        self.shapes[key] = shape
+        self.strategies[family] = strategy
+        self.strategies["_last"] = strategy
+        if not self.persist:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            shape.exportBrep(self._brep_path(key))
+            with open(self._strategy_path(), "w", encoding="utf-8") as f:
+                json.dump(self.strategies, f, indent=1, sort_keys=True)
+        except OSError:
+            pass
+
+    def order(self, family):
+        """Estrategias a probar: primero la recordada para la familia (o la última que funcionó)."""
+        first = self.strategies.get(family) or self.strategies.get("_last")
+        if first in STRATEGIES:
+            return (first,) + tuple(s for s in STRATEGIES if s != first)
+        return STRATEGIES
+
+    def clear(self, disk=False):
+        self.shapes.clear()
+        if disk and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".brep") or name == "strategies.json":
+                    os.remove(os.path.join(self.directory, name))
+            self.strategies = {}
+
+
+_DEFAULT_CACHE = None
+
+
+def default_cache():
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = SweepCache()
+    return _DEFAULT_CACHE
+
+
+def profile_key(profile):
+    kind, data = profile
+    if kind == "circle":
+        return f"circle:{float(data):.6g}"
+    if kind == "polygon":
+        return "polygon:" + ";".join(f"{float(u):.6g},{float(v):.6g}" for u, v in data)
+    raise ValueError(f"Perfil desconocido: {kind!r}")
+
+
+def sweep_key(pitch, height, radius, angle, profile):
+    return f"p={pitch:.6g}|h={height:.6g}|r={radius:.6g}|a={angle:.6g}|{profile_key(profile)}"
+
+
+# ========================
+# Geometría
+# ========================
+def _frame(point, tangent):
+    """(t, e_r, b): tangente, radial (perpendicular a t) y binormal en un punto de la hélice."""
+    from FreeCAD import Vector
+    t = Vector(tangent)
+    t.normalize()
+    radial = Vector(point.x, point.y, 0.0)
+    if radial.Length < 1e-12:
+        radial = Vector(1, 0, 0)
+    radial = radial - t * radial.dot(t)
+    radial.normalize()
+    b = t.cross(radial)
+    return t, radial, b
+
+
+def profile_face(profile, center, tangent):
+    """Cara del perfil en el plano normal a tangent, centrada en center."""
+    import Part
+    from FreeCAD import Vector
+    t, er, b = _frame(center, tangent)
+    kind, data = profile
+    if kind == "circle":
+        return Part.Face(Part.Wire(Part.makeCircle(float(data), Vector(center), t)))
+    pts = [Vector(center) + er * float(u) + b * float(v) for u, v in data]
+    return Part.Face(Part.makePolygon(pts + [pts[0]]))
+
+
+def _helix_start_tangent(radius, pitch, angle):
+    from FreeCAD import Vector
+    k = pitch / (2.0 * math.pi)
+    return Vector(k * math.tan(math.radians(angle)), radius, k)
+
+
+def _valid_solid(shape):
+    try:
+        return shape is not None and not shape.isNull() and len(shape.Solids) > 0 and shape.Volume > 0
+    except Exception:
+        return False
+
+
+def _valid_segments(shape):
+    """Compound no vacío en el que cada prisma es un sólido válido con volumen."""
+    try:
+        prisms = shape.childShapes()
+        return bool(prisms) and all(p.ShapeType == "Solid" and p.isValid() and p.Volume > 0 for p in prisms)
+    except Exception:
+        return False
+
+
+def _valid_sweep(shape, strategy):
+    if strategy == "segments":
+        return shape is not None and _valid_segments(shape)
+    return _valid_solid(shape)
+
+
+def _sweep(helix, face, strategy, profile, n_segments):
+    import Part
+    if strategy == "pipe_shell":
+        return Part.Wire(helix).makePipeShell([face.OuterWire], True, True)
+    if strategy == "pipe":
+        return Part.Wire(helix).makePipe(face)
+    # Reserva: un prisma del perfil por segmento de la hélice discretizada,
+    # todos en un compound (el corte posterior es único)
+    pts = helix.discretize(Number=n_segments + 1)
+    prisms = []
+    for p0, p1 in zip(pts[:-1], pts[1:]):
+        d = p1 - p0
+        f = profile_face(profile, p0 - d * 0.01, d)
+        prisms.append(f.extrude(d * 1.02))
+    return Part.makeCompound(prisms)
+
+
+def _sweep_cached(key, family, make_path, profile, turns, cache):
+    """
+    Probar las estrategias en el orden recordado para la familia.
+
+    make_path() -> (arista, punto inicial, tangente inicial). Devuelve
+    (forma, estrategia) y guarda solo barridos válidos.
+    """
+    cache = cache or default_cache()
+    for strategy in cache.order(family):
+        skey = key + "|" + strategy
+        shape = cache.get(skey, lambda s, st=strategy: _valid_sweep(s, st))
+        if shape is not None:
+            return shape, strategy
+        try:
+            path, start, tangent = make_path()
+            face = profile_face(profile, start, tangent)
+            shape = _sweep(path, face, strategy, profile,
+                           max(8, int(math.ceil(SEGMENTS_PER_TURN * turns))))
+        except Exception:
+            shape = None
+        if _valid_sweep(shape, strategy):
+            cache.put(skey, shape, strategy, family)
+            return shape, strategy
+        cache.stats["failures"] += 1
+    raise RuntimeError(f"No se pudo barrer la hélice ({key})")
+
+
+def sweep_helix(radius, pitch, height, profile, angle=0.0, cache=None):
+    """
+    Barrido del perfil sobre una hélice dextrógira a lo largo de +Z desde (radius, 0, 0).
+
+    Devuelve (forma, estrategia). Cachea por clave y recuerda la estrategia.
+    """
+    import Part
+
+    def make_path():
+        helix = Part.makeHelix(pitch, height, radius, angle)
+        return helix, helix.Vertexes[0].Point, _helix_start_tangent(radius, pitch, angle)
+
+    return _sweep_cached(sweep_key(pitch, height, radius, angle, profile),
+                         f"a={angle:.6g}|{profile_key(profile)}", make_path, profile, height / pitch, cache)
+
+
+def variable_helix_points(z, r, pitch, points_per_turn=24):
+    """
+    Puntos (x, y, z) de una hélice dextrógira de radio r(z) y paso pitch(z).
+
+    z, r, pitch: estaciones [mm] con z creciente; entre estaciones r y
+    1/paso son lineales y el ángulo es 2π ∫ dz / paso. Se remuestrea para
+    tener al menos points_per_turn puntos por vuelta.
+    """
+    if len(z) < 2 or any(b <= a for a, b in zip(z[:-1], z[1:])):
+        raise ValueError("z debe tener al menos dos estaciones crecientes")
+    if min(r) <= 0 or min(pitch) <= 0:
+        raise ValueError("radio y paso deben ser positivos")
+    pts = []
+    theta = 0.0
+    for i in range(len(z) - 1):
+        dz = z[i + 1] - z[i]
+        dtheta = 2.0 * math.pi * dz * 0.5 * (1.0 / pitch[i] + 1.0 / pitch[i + 1])
+        n = max(1, int(math.ceil(dtheta / (2.0 * math.pi) * points_per_turn)))
+        for k in range(n):
+            f = k / n
+            rr = r[i] + (r[i + 1] - r[i]) * f
+            # Ángulo con el paso interpolado linealmente dentro del tramo
+            th = theta + 2.0 * math.pi * dz * (f / pitch[i] + 0.5 * f * f * (1.0 / pitch[i + 1] - 1.0 / pitch[i]))
+            pts.append((rr * math.cos(th), rr * math.sin(th), z[i] + dz * f))
+        theta += dtheta
+    pts.append((r[-1] * math.cos(theta), r[-1] * math.sin(theta), z[-1]))
+    return pts, theta / (2.0 * math.pi)
+
+
+def _replicate(helix_right, starts, counter_rotating, phase, origin, direction):
+    import Part
+    from FreeCAD import Vector, Rotation, Placement
+    helix_left = None
+    pieces = []
+    for i in range(starts):
+        left = counter_rotating and i % 2 == 1
+        if left:
+            if helix_left is None:
+                helix_left = helix_right.mirror(Vector(0, 0, 0), Vector(0, 1, 0))
+            s = helix_left.copy()
+        else:
+            s = helix_right.copy()
+        s.rotate(Vector(0, 0, 0), Vector(0, 0, 1), phase + 360.0 * i / starts)
+        pieces.append(s)
+
+    shape = Part.makeCompound(pieces)
+    shape.Placement = Placement(Vector(*origin), Rotation(Vector(0, 0, 1), Vector(*direction)))
+    return shape, len(pieces)
+
+
+def helix_channels(radius, pitch, turns, profile, starts=1, counter_rotating=False, angle=0.0,
+                   origin=(0.0, 0.0, 0.0), direction=(0.0, 0.0, 1.0), phase=0.0, cache=None):
+    """
+    Compound con todos los canales helicoidales.
+
+    starts           : número de hélices repartidas en 360°
+    counter_rotating : alterna dextrógira / levógira (hélices A/B)
+    angle            : semiángulo de cono [°] (0 = cilíndrica, se replica por vueltas)
+    origin, direction: inicio y eje de las hélices (por defecto +Z desde el origen)
+
+    Devuelve un dict {"shape", "strategy", "pieces"}.
+    """
+    import Part
+    from FreeCAD import Vector
+    if radius <= 0 or pitch <= 0 or turns <= 0:
+        raise ValueError("radio, paso y vueltas deben ser positivos")
+
+    if abs(angle) < 1e-12:
+        full = int(math.floor(turns + 1e-9))
+        frac = turns - full
+        base = []
+        strategy = None
+        if full:
+            turn, strategy = sweep_helix(radius, pitch, pitch, profile, 0.0, cache)
+            for k in range(full):
+                s = turn.copy()
+                s.translate(Vector(0, 0, k * pitch))
+                base.append(s)
+        if frac > 1e-6:
+            tail, strategy = sweep_helix(radius, pitch, frac * pitch, profile, 0.0, cache)
+            s = tail.copy()
+            s.translate(Vector(0, 0, full * pitch))
+            base.append(s)
+        helix_right = Part.makeCompound(base)
+    else:
+        helix_right, strategy = sweep_helix(radius, pitch, turns * pitch, profile, angle, cache)
+
+    shape, pieces = _replicate(helix_right, starts, counter_rotating, phase, origin, direction)
+    return {"shape": shape, "strategy": strategy, "pieces": pieces}
+
+
+def variable_helix_channels(z, r, pitch, profile, starts=1, counter_rotating=False,
+                            origin=(0.0, 0.0, 0.0), direction=(0.0, 0.0, 1.0), phase=0.0,
+                            cache=None, points_per_turn=24):
+    """
+    Como helix_channels(), con radio y paso por estaciones (variable_helix_points).
+
+    Para canales que siguen una pared de perfil curvo: r es el radio del
+    centro del canal en cada z. La trayectoria es una B-spline que
+    interpola la hélice muestreada; se cachea por sus puntos.
+    """
+    import Part
+    from FreeCAD import Vector
+    pts, turns = variable_helix_points(z, r, pitch, points_per_turn)
+    key = "var=" + hashlib.sha1(";".join(f"{x:.5f},{y:.5f},{w:.5f}" for x, y, w in pts)
+                                .encode("utf-8")).hexdigest() + "|" + profile_key(profile)
+
+    def make_path():
+        curve = Part.BSplineCurve()
+        curve.interpolate([Vector(*p) for p in pts])
+        edge = curve.toShape()
+        return edge, Vector(*pts[0]), edge.tangentAt(edge.FirstParameter)
+
+    helix_right, strategy = _sweep_cached(key, f"var|{profile_key(profile)}", make_path, profile, turns, cache)
+    shape, pieces = _replicate(helix_right, starts, counter_rotating, phase, origin, direction)
+    return {"shape": shape, "strategy": strategy, "pieces": pieces}
+
+
+def cut_channels(target, channels):
+    """Restar los canales con un único cut (channels: dict de helix_channels, forma o lista)."""
+    import Part
+    if isinstance(channels, dict):
+        tool = channels["shape"]
+    elif isinstance(channels, (list, tuple)):
+        tool = Part.makeCompound([c["shape"] if isinstance(c, dict) else c for c in channels])
+    else:
+        tool = channels
+    return target.cut(tool)
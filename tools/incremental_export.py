@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Exportación incremental: solo se re-teselan y reescriben las piezas que cambian.
+
+Cada ejecución de hallTrust.py reescribe todos los STL, y las rutas STEP
+de SateliteTest04 y de las macros HybridPlasmaPropulsion (Part.export(objs,
+export_path)) reescriben el ensamblaje completo aunque solo cambie una
+pieza. Aquí un manifiesto JSON junto a la salida guarda, por pieza:
+
+    hash de geometría (sha1 del BREP) + clave de los ajustes de exportación
+
+- export_meshes(): solo las piezas con hash o ajustes distintos (o cuyo
+  fichero falta) pasan por mesh_export.export_parts; el resto se salta.
+- export_step(): el STEP del ensamblaje solo se regenera si cambia la
+  lista ordenada de (nombre, hash). Con objetos de documento se vuelve a
+  escribir con Part.export (o step_assembly) para conservar etiquetas y
+  colores, así que al regenerar se serializan todas las piezas. Con
+  single_compound o formas sueltas cada pieza deja su BREP en la caché
+  (parts/<hash>.brep) y el compound se arma desde ellos: las piezas sin
+  cambios no se vuelven a serializar.
+
+Uso en FreeCAD con tools/ en sys.path (las macros lo añaden si existe):
+    import incremental_export as ie
+    ie.export_meshes([("anode", obj), ...], "./STL/", deflection=0.1)
+    ie.export_step(objs, export_path)
+"""
+
+import hashlib
+import json
+import os
+import time
+
+import mesh_export
+from mesh_lod import shape_key
+
+MANIFEST = "export_manifest.json"
+
+
+# ========================
+# Manifiesto
+# ========================
+def settings_key(settings):
+    """Clave estable de unos ajustes (números, textos, dicts u objetos con __dict__)."""
+    def plain(x):
+        if isinstance(x, dict):
+            return {str(k): plain(v) for k, v in sorted(x.items())}
+        if isinstance(x, (list, tuple)):
+            return [plain(v) for v in x]
+        if hasattr(x, "__dict__"):
+            return {"class": type(x).__name__, **plain(vars(x))}
+        return x
+    blob = json.dumps(plain(settings), sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+class ExportManifest:
+    """Entradas {nombre: {"hash", "settings", "file", ...}} en un JSON."""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self.entries = data.get("parts", {})
+        self.assemblies = data.get("assemblies", {})
+
+    def unchanged(self, name, geometry_hash, settings, directory=None):
+        e = self.entries.get(name)
+        if not e or e.get("hash") != geometry_hash or e.get("settings") != settings:
+            return False
+        return directory is None or bool(e.get("file")) and os.path.exists(os.path.join(directory, e["file"]))
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"parts": self.entries, "assemblies": self.assemblies}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def _named(parts):
+    """Lista de (nombre, objeto o forma) a partir de pares o de objetos con Label."""
+    out = []
+    for p in parts:
+        if isinstance(p, tuple):
+            out.append(p)
+        elif p is not None and hasattr(p, "Shape"):
+            out.append((p.Label, p))
+    return out
+
+
+# ========================
+# Mallas
+# ========================
+def export_meshes(parts, path, fmt="stl", deflection=0.1, prefix="", manifest=MANIFEST, **kwargs):
+    """
+    mesh_export.export_parts solo para las piezas cambiadas.
+
+    Devuelve {"exported", "skipped", "failed", "hash_s", "export", "wall_s"}.
+    """
+    t0 = time.perf_counter()
+    named = _named(parts)
+    m = ExportManifest(os.path.join(path, manifest))
+    skey = settings_key({"fmt": fmt, "deflection": deflection, "prefix": prefix})
+    hashes = {name: shape_key(mesh_export.shape_of(p)) for name, p in named}
+    t_hash = time.perf_counter() - t0
+    changed = [(name, p) for name, p in named if not m.unchanged(name, hashes[name], skey, path)]
+
+    result = None
+    if changed:
+        result = mesh_export.export_parts(changed, path, fmt=fmt, deflection=deflection,
+                                          prefix=prefix, manifest=None, **kwargs)
+        for row in result["parts"]:
+            if "error" in row:
+                m.entries.pop(row["name"], None)
+                continue
+            m.entries[row["name"]] = {"hash": hashes[row["name"]], "settings": skey, **row}
+        m.save()
+    return {
+        "exported": [name for name, _ in changed if result and name not in result["failed"]],
+        "skipped": [name for name, _ in named if name not in {n for n, _ in changed}],
+        "failed": result["failed"] if result else [],
+        "hash_s": round(t_hash, 4),
+        "export": result,
+        "wall_s": round(time.perf_counter() - t0, 4),
+    }
+
+
+# ========================
+# STEP
+# ========================
+def _brep_path(cache_dir, geometry_hash):
+    return os.path.join(cache_dir, "parts", geometry_hash + ".brep")
+
+
+def export_step(parts, step_path, single_compound=False, cache_dir=None, force=False, structured=False,
+                store=None):
+    """
+    STEP del ensamblaje regenerado solo si cambia alguna pieza.
+
+    parts          : objetos de documento o (nombre, objeto o forma)
+    single_compound: un único compound (como export_as_single_compound)
+    cache_dir      : manifiesto y, en la ruta del compound, BREP por pieza
+                     (por defecto <step>.cache/)
+    structured     : ensamblaje con instancias compartidas (step_assembly)
+    store          : artifact_store.ArtifactStore; el STEP se guarda una vez por
+                     contenido y la salida se rehace desde él (sin reescribirla si es igual)
+
+    Devuelve {"written", "changed", "reused", "wall_s"} (reused: piezas sin
+    cambios respecto al manifiesto); con store, written es
+    False si el STEP regenerado coincide (salvo la fecha) con el existente.
+    """
+    import Part
+    t0 = time.perf_counter()
+    named = _named(parts)
+    objs = [p for _, p in named]
+    if structured and not single_compound and all(hasattr(o, "TypeId") for o in objs):
+        route = "structured"
+    elif not single_compound and all(hasattr(o, "Shape") for o in objs):
+        route = "document"
+    else:
+        route = "compound"
+    cache_dir = cache_dir or os.path.splitext(step_path)[0] + ".cache"
+    # Los BREP por pieza solo se leen al armar el compound
+    from_breps = route == "compound"
+    if from_breps:
+        os.makedirs(os.path.join(cache_dir, "parts"), exist_ok=True)
+    m = ExportManifest(os.path.join(cache_dir, MANIFEST))
+    skey = settings_key({"single_compound": single_compound, "structured": structured})
+
+    changed, reused, hashes = [], [], []
+    for name, p in named:
+        brep = mesh_export.shape_of(p).exportBrepToString()
+        h = hashlib.sha1(brep.encode("utf-8")).hexdigest()
+        hashes.append([name, h])
+        if m.unchanged(name, h, skey, cache_dir if from_breps else None):
+            reused.append(name)
+            continue
+        m.entries[name] = {"hash": h, "settings": skey}
+        if from_breps:
+            bpath = _brep_path(cache_dir, h)
+            with open(bpath, "w", encoding="utf-8") as f:
+                f.write(brep)
+            m.entries[name]["file"] = os.path.relpath(bpath, cache_dir)
+        changed.append(name)
+
+    assembly_key = settings_key({"parts": hashes, "settings": skey})
+    key = os.path.abspath(step_path)
+    written = False
+    if force or m.assemblies.get(key) != assembly_key or not os.path.exists(step_path):
+        def write(path):
+            if route == "structured":
+                import step_assembly
+                step_assembly.export_step(objs, path)
+            elif route == "document":
+                # Objetos de documento: Part.export conserva etiquetas y colores
+                Part.export(objs, path)
+            else:
+                # Compound desde los BREP por pieza (los sin cambios no se vuelven a serializar)
+                shapes = []
+                for _, h in hashes:
+                    s = Part.Shape()
+                    s.importBrep(_brep_path(cache_dir, h))
+                    shapes.append(s)
+                Part.makeCompound(shapes).exportStep(path)
+
+        if store is not None:
+            written = store.export(step_path, write)["action"] != "unchanged"
+        else:
+            write(step_path)
+            written = True
+        m.assemblies[key] = assembly_key
+    m.save()
+    return {"written": written, "changed": changed, "reused": reused,
+            "wall_s": round(time.perf_counter() - t0, 4)}
+
+
+def print_summary(result):
+    if "export" in result:
+        print(f"Exportadas {len(result['exported'])}, sin cambios {len(result['skipped'])}, "
+              f"fallidas {len(result['failed'])} ({result['wall_s']:.2f} s, hash {result['hash_s']:.2f} s)")
+    else:
+        state = "reescrito" if result["written"] else "sin cambios"
+        print(f"STEP {state}: {len(result['changed'])} piezas cambiadas, "
+              f"{len(result['reused'])} sin cambios ({result['wall_s']:.2f} s)")
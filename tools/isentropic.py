@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Relaciones isentrópicas de toberas (gas ideal, gamma constante).
+
+Funciones vectorizadas sobre arrays de NumPy; gamma puede ser escalar o
+array con broadcasting.
+"""
+
+import numpy as np
+
+
+def area_ratio(M, gamma=1.4):
+    """A/A* en función del Mach."""
+    g = gamma
+    return (1.0 / M) * ((2.0 / (g + 1.0)) * (1.0 + 0.5 * (g - 1.0) * M ** 2)) ** ((g + 1.0) / (2.0 * (g - 1.0)))
+
+
+def pressure_ratio(M, gamma=1.4):
+    """p/p0."""
+    return (1.0 + 0.5 * (gamma - 1.0) * M ** 2) ** (-gamma / (gamma - 1.0))
+
+
+def temperature_ratio(M, gamma=1.4):
+    """T/T0."""
+    return 1.0 / (1.0 + 0.5 * (gamma - 1.0) * M ** 2)
+
+
+def mach_from_area_ratio(ar, gamma=1.4, supersonic=True, iters=64):
+    """
+    Mach para A/A* dado, por bisección en cada rama (A/A* es monótona en
+    M < 1 y en M > 1). `supersonic` puede ser un booleano o un array con la
+    rama de cada punto.
+    """
+    ar = np.maximum(np.asarray(ar, dtype=float), 1.0)
+    sup = np.broadcast_to(np.asarray(supersonic, dtype=bool), ar.shape)
+    g = np.broadcast_to(np.asarray(gamma, dtype=float), ar.shape)
+    lo = np.where(sup, 1.0, 1e-8)
+    hi = np.where(sup, 100.0, 1.0)
+    for _ in range(iters):
+        mid = 0.5 * (lo + hi)
+        above = area_ratio(mid, g) > ar
+        # Rama supersónica: A/A* crece con M; subsónica: decrece
+        go_lo = np.where(sup, above, ~above)
+        hi = np.where(go_lo, mid, hi)
+        lo = np.where(go_lo, lo, mid)
+    return 0.5 * (lo + hi)
+
+
+# ========================
+# Tablas precalculadas por gamma
+# ========================
+class IsentropicTable:
+    """
+    Tabla Mach -> (A/A*, p/p0, T/T0) en malla densa, para invertir A/A* por
+    interpolación en lugar de iterar. Una rama subsónica y otra supersónica,
+    ambas monótonas en log(A/A*).
+    """
+
+    def __init__(self, gamma=1.4, n=4096, m_min=1e-3, m_max=20.0):
+        self.gamma = float(gamma)
+        self.mach_sub = np.geomspace(m_min, 1.0, n)
+        self.mach_sup = np.geomspace(1.0, m_max, n)
+        self.log_ar_sub = np.log(area_ratio(self.mach_sub, gamma))[::-1]        # creciente
+        self.log_ar_sup = np.log(area_ratio(self.mach_sup, gamma))
+        self.mach_sub = self.mach_sub[::-1]
+
+    def mach(self, ar, supersonic=True, refine=True):
+        """Mach para A/A* (interpolación + un paso de Newton opcional)."""
+        ar = np.maximum(np.asarray(ar, dtype=float), 1.0)
+        la = np.log(ar)
+        sup = np.broadcast_to(np.asarray(supersonic, dtype=bool), ar.shape)
+        M = np.where(sup, np.interp(la, self.log_ar_sup, self.mach_sup),
+                     np.interp(la, self.log_ar_sub, self.mach_sub))
+        if refine:
+            g = self.gamma
+            f = np.log(area_ratio(M, g)) - la
+            df = (M ** 2 - 1.0) / (M * (1.0 + 0.5 * (g - 1.0) * M ** 2))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                step = np.where(np.abs(df) > 1e-6, f / df, 0.0)
+            M = np.where(sup, np.maximum(M - step, 1.0), np.clip(M - step, 1e-9, 1.0))
+        return M
+
+    def pressure_ratio(self, ar, supersonic=True):
+        return pressure_ratio(self.mach(ar, supersonic), self.gamma)
+
+    def temperature_ratio(self, ar, supersonic=True):
+        return temperature_ratio(self.mach(ar, supersonic), self.gamma)
+
+
+_TABLES = {}
+
+
+def table(gamma=1.4):
+    """Tabla cacheada por gamma (redondeado a 6 decimales)."""
+    key = round(float(gamma), 6)
+    if key not in _TABLES:
+        _TABLES[key] = IsentropicTable(key)
+    return _TABLES[key]
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Lectura estática de parámetros de macros FreeCAD (sin ejecutar FreeCAD).
+
+Las macros del repositorio construyen el documento al importarse, por lo que
+no se pueden importar desde herramientas de análisis. Este módulo recorre el
+AST del archivo y evalúa, de forma restringida, las asignaciones de nivel
+superior (P = {...}, MATERIALS = {...}, TPS_FOAM = TPS_T_TOTAL - ..., etc.).
+
+Soporta: literales, aritmética, nombres ya evaluados, dict/list/tuple,
+comprensiones no, llamadas a funciones de `math`, instancias de clases de
+configuración (self.attr = literal en __init__) y métodos de una sola línea
+`return <expr>` (p. ej. CONFIG.get_scaled_param). Lo que no se pueda evaluar
+se omite; en diccionarios se omiten solo las claves afectadas.
+
+Unidades: las de la macro (mm, kg/m³...).
+"""
+
+import ast
+import math
+import operator
+
+_BINOPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod, ast.Pow: operator.pow,
+}
+_UNARYOPS = {ast.UAdd: operator.pos, ast.USub: operator.neg, ast.Not: operator.not_}
+
+_DEFAULT_CALLS = {
+    "float": float, "int": int, "str": str, "bool": bool, "abs": abs,
+    "min": min, "max": max, "round": round, "len": len,
+    "tuple": tuple, "list": list, "dict": dict,
+    # Vectores de FreeCAD -> tuplas (x, y, z)
+    "App.Vector": lambda *a: tuple(float(v) for v in a),
+    "Base.Vector": lambda *a: tuple(float(v) for v in a),
+    "FreeCAD.Vector": lambda *a: tuple(float(v) for v in a),
+}
+for _name in ("sqrt", "sin", "cos", "tan", "radians", "degrees", "pi", "exp", "log", "atan", "atan2"):
+    _DEFAULT_CALLS["math." + _name] = getattr(math, _name)
+
+
+class _Unresolved(Exception):
+    pass
+
+
+def _dotted(node):
+    """Nombre con puntos de un ast.Name/ast.Attribute (o None)."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+class _Evaluator:
+    def __init__(self, env, calls, methods):
+        self.env = env
+        self.calls = calls
+        self.methods = methods  # "Clase.metodo" -> (args, expr)
+        self.instances = {}     # nombre de instancia -> clase
+
+    def eval(self, node, local=None):
+        local = local or {}
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, (ast.Name, ast.Attribute)):
+            name = _dotted(node)
+            if name is None:
+                raise _Unresolved(ast.dump(node))
+            if name in local:
+                return local[name]
+            if name in self.env:
+                return self.env[name]
+            if name == "math.pi":
+                return math.pi
+            raise _Unresolved(name)
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+            return _BINOPS[type(node.op)](self.eval(node.left, local), self.eval(node.right, local))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARYOPS:
+            return _UNARYOPS[type(node.op)](self.eval(node.operand, local))
+        if isinstance(node, (ast.List, ast.Tuple)):
+            vals = [self.eval(e, local) for e in node.elts]
+            return vals if isinstance(node, ast.List) else tuple(vals)
+        if isinstance(node, ast.Dict):
+            return self.eval_dict(node, local, strict=True)
+        if isinstance(node, ast.IfExp):
+            return self.eval(node.body if self.eval(node.test, local) else node.orelse, local)
+        if isinstance(node, ast.Compare) and len(node.ops) == 1:
+            a, b = self.eval(node.left, local), self.eval(node.comparators[0], local)
+            op = {ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt,
+                  ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge}.get(type(node.ops[0]))
+            if op is None:
+                raise _Unresolved("compare")
+            return op(a, b)
+        if isinstance(node, ast.JoinedStr):
+            raise _Unresolved("f-string")
+        if isinstance(node, ast.Call):
+            return self.eval_call(node, local)
+        raise _Unresolved(type(node).__name__)
+
+    def eval_call(self, node, local):
+        name = _dotted(node.func)
+        if name is None:
+            raise _Unresolved("call")
+        args = [self.eval(a, local) for a in node.args]
+        kwargs = {k.arg: self.eval(k.value, local) for k in node.keywords if k.arg}
+        if name in self.calls:
+            return self.calls[name](*args, **kwargs)
+        # Métodos de instancias de configuración: CONFIG.get_scaled_param(x)
+        if "." in name:
+            inst, meth = name.rsplit(".", 1)
+            cls = self.instances.get(inst)
+            if cls and f"{cls}.{meth}" in self.methods:
+                params, expr = self.methods[f"{cls}.{meth}"]
+                bound = dict(zip(params, args))
+                bound.update(kwargs)
+                for key, val in self.env.items():
+                    if key.startswith(inst + "."):
+                        bound["self." + key[len(inst) + 1:]] = val
+                return self.eval(expr, bound)
+        if name in self.methods:
+            params, expr = self.methods[name]
+            bound = dict(zip(params, args))
+            bound.update(kwargs)
+            return self.eval(expr, bound)
+        raise _Unresolved(name)
+
+    def eval_dict(self, node, local=None, strict=False):
+        out = {}
+        for k, v in zip(node.keys, node.values):
+            if k is None:
+                if strict:
+                    raise _Unresolved("**")
+                continue
+            try:
+                out[self.eval(k, local)] = self.eval(v, local)
+            except (_Unresolved, ArithmeticError, TypeError, ValueError):
+                if strict:
+                    raise
+        return out
+
+
+def _collect_classes(tree, ev):
+    """Registrar atributos de __init__ y métodos `return expr` de cada clase."""
+    class_attrs = {}
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            body = [s for s in node.body if not (isinstance(s, ast.Expr) and isinstance(s.value, ast.Constant))]
+            if len(body) == 1 and isinstance(body[0], ast.Return) and body[0].value is not None:
+                ev.methods[node.name] = ([a.arg for a in node.args.args], body[0].value)
+        if not isinstance(node, ast.ClassDef):
+            continue
+        attrs = {}
+        for item in node.body:
+            if not isinstance(item, ast.FunctionDef):
+                continue
+            params = [a.arg for a in item.args.args]
+            if item.name == "__init__":
+                for stmt in item.body:
+                    if (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1
+                            and isinstance(stmt.targets[0], ast.Attribute)
+                            and _dotted(stmt.targets[0].value) == "self"):
+                        try:
+                            attrs[stmt.targets[0].attr] = ev.eval(stmt.value)
+                        except (_Unresolved, ArithmeticError, TypeError, ValueError):
+                            pass
+            else:
+                body = [s for s in item.body if not (isinstance(s, ast.Expr) and isinstance(s.value, ast.Constant))]
+                if len(body) == 1 and isinstance(body[0], ast.Return) and body[0].value is not None:
+                    ev.methods[f"{node.name}.{item.name}"] = (params[1:], body[0].value)
+        class_attrs[node.name] = attrs
+    return class_attrs
+
+
+def load_macro_params(path, names=None, calls=None, env=None):
+    """
+    Evaluar las asignaciones de nivel superior de una macro.
+
+    path  : ruta del archivo .py/.FCMacro
+    names : iterable de nombres a devolver (None = todos los evaluados)
+    calls : dict extra "nombre.punteado" -> callable para llamadas propias
+            de la macro (p. ej. {"ortho_dict": ...})
+    env   : valores iniciales (sobrescriben constantes de la macro)
+    Devuelve un dict nombre -> valor con lo que se pudo resolver.
+    """
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        source = f.read()
+    tree = ast.parse(source, filename=str(path))
+
+    table = dict(_DEFAULT_CALLS)
+    table.update(calls or {})
+    ev = _Evaluator({}, table, {})
+    class_attrs = _collect_classes(tree, ev)
+    overrides = dict(env or {})
+    ev.env.update(overrides)
+
+    for node in tree.body:
+        if isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets, value = [node.target], node.value
+        elif isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name):
+            name = node.target.id
+            if name in ev.env and type(node.op) in _BINOPS and name not in overrides:
+                try:
+                    ev.env[name] = _BINOPS[type(node.op)](ev.env[name], ev.eval(node.value))
+                except (_Unresolved, ArithmeticError, TypeError, ValueError):
+                    ev.env.pop(name, None)
+            continue
+        else:
+            continue
+
+        # NAME = Clase() -> capturar atributos de instancia (salvo llamadas en `calls`)
+        if (isinstance(value, ast.Call) and isinstance(value.func, ast.Name)
+                and value.func.id in class_attrs and value.func.id not in table and len(targets) == 1
+                and isinstance(targets[0], ast.Name)):
+            inst = targets[0].id
+            ev.instances[inst] = value.func.id
+            for attr, val in class_attrs[value.func.id].items():
+                ev.env.setdefault(f"{inst}.{attr}", val)
+            continue
+
+        for target in targets:
+            if isinstance(target, ast.Name):
+                if target.id in overrides:
+                    continue
+                try:
+                    if isinstance(value, ast.Dict):
+                        ev.env[target.id] = ev.eval_dict(value)
+                    else:
+                        ev.env[target.id] = ev.eval(value)
+                except (_Unresolved, ArithmeticError, TypeError, ValueError):
+                    ev.env.pop(target.id, None)
+            elif isinstance(target, ast.Tuple) and isinstance(value, ast.Tuple) \
+                    and len(target.elts) == len(value.elts):
+                for t, v in zip(target.elts, value.elts):
+                    if isinstance(t, ast.Name) and t.id not in overrides:
+                        try:
+                            ev.env[t.id] = ev.eval(v)
+                        except (_Unresolved, ArithmeticError, TypeError, ValueError):
+                            ev.env.pop(t.id, None)
+
+    if names is None:
+        return {k: v for k, v in ev.env.items() if "." not in k}
+    return {k: ev.env[k] for k in names if k in ev.env}
+
+
+def parse_quantity(value, default=None):
+    """'3900 kg/m^3' -> 3900.0 (número inicial de un texto con unidades)."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip().split()[0])
+    except (ValueError, IndexError):
+        return default
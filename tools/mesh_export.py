@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+Exportación por piezas a STL binario / 3MF en paralelo, con manifiesto.
+
+export_stl_parts() de hallTrust.py y export_stl() de RocketCooledNozzle.py
+teselan pieza a pieza y escriben con Mesh.Mesh(...).write. Aquí:
+
+- El teselado se reparte en procesos trabajadores: cada pieza viaja como
+  BREP (texto) y vuelve como arrays NumPy (vértices float64, triángulos
+  uint32) en un bloque de memoria compartida, sin pasar por pickle.
+  Si el pool de procesos no arranca (p. ej. dentro de la GUI de FreeCAD,
+  donde sys.executable no es un intérprete), se tesela con hilos.
+- La escritura va en un pool de hilos de E/S, solapada con el teselado:
+  STL binario (50 bytes por triángulo, escrito con un array estructurado)
+  o 3MF (XML del modelo comprimido en zip).
+- manifest.json recoge por pieza triángulos, vértices, bytes y tiempos de
+  teselado y escritura, más los totales del lote.
+
+Uso en FreeCAD con tools/ en sys.path (las macros lo añaden si existe):
+    import mesh_export
+    mesh_export.export_parts([("anode", obj), ...], "./STL/", deflection=0.1)
+
+Los escritores (write_stl, write_3mf, read_stl) solo necesitan NumPy.
+"""
+
+import json
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+
+FORMATS = ("stl", "3mf")
+
+# En Windows el bloque compartido muere al cerrarlo el trabajador: allí se devuelve por pickle
+_SHARED = os.name != "nt"
+
+_STL_DTYPE = np.dtype([("normal", "<f4", (3,)), ("v", "<f4", (3, 3)), ("attr", "<u2")])
+
+
+# ========================
+# Escritores
+# ========================
+def triangle_normals(vertices, triangles):
+    """Normales unitarias por triángulo (N, 3); cero en triángulos degenerados."""
+    v = np.asarray(vertices, dtype=float)
+    t = np.asarray(triangles, dtype=np.int64)
+    if not len(t):
+        return np.zeros((0, 3))
+    n = np.cross(v[t[:, 1]] - v[t[:, 0]], v[t[:, 2]] - v[t[:, 0]])
+    L = np.linalg.norm(n, axis=1)
+    L[L == 0] = 1.0
+    return n / L[:, None]
+
+
+def write_stl(path, vertices, triangles, name="part"):
+    """STL binario: cabecera de 80 bytes, número de triángulos y registros de 50 bytes."""
+    v = np.asarray(vertices, dtype=float)
+    t = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    rec = np.zeros(len(t), dtype=_STL_DTYPE)
+    if len(t):
+        rec["normal"] = triangle_normals(v, t)
+        rec["v"] = v[t]
+    header = f"binary STL {name}".encode("ascii", "replace")[:80].ljust(80, b" ")
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(np.uint32(len(t)).tobytes())
+        rec.tofile(f)
+    return os.path.getsize(path)
+
+
+def read_stl(path):
+    """(vértices (3N, 3), triángulos (N, 3)) de un STL binario, sin fusionar vértices."""
+    with open(path, "rb") as f:
+        f.seek(80)
+        n = int(np.frombuffer(f.read(4), dtype="<u4")[0])
+        rec = np.fromfile(f, dtype=_STL_DTYPE, count=n)
+    v = rec["v"].reshape(-1, 3).astype(float)
+    return v, np.arange(len(v), dtype=np.int64).reshape(-1, 3)
+
+
+_3MF_TYPES = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+              '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+              '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+              '</Types>')
+_3MF_RELS = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+             '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+             'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+             '</Relationships>')
+
+
+def _3mf_object(oid, name, vertices, triangles):
+    v = np.asarray(vertices, dtype=float)
+    t = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    vx = "".join(f'<vertex x="{x:.6g}" y="{y:.6g}" z="{z:.6g}"/>' for x, y, z in v.tolist())
+    tx = "".join(f'<triangle v1="{a}" v2="{b}" v3="{c}"/>' for a, b, c in t.tolist())
+    # Las etiquetas de FreeCAD pueden llevar &, < o comillas
+    return (f'<object id="{oid}" name={quoteattr(str(name))} type="model"><mesh>'
+            f'<vertices>{vx}</vertices><triangles>{tx}</triangles></mesh></object>')
+
+
+def write_3mf(path, meshes):
+    """
+    3MF (zip) con un objeto por malla, en mm.
+
+    meshes: lista de (nombre, vértices, triángulos)
+    """
+    objects = [_3mf_object(i + 1, name, v, t) for i, (name, v, t) in enumerate(meshes)]
+    items = "".join(f'<item objectid="{i + 1}"/>' for i in range(len(meshes)))
+    model = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<model unit="millimeter" xml:lang="en-US" '
+             'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">'
+             f'<resources>{"".join(objects)}</resources><build>{items}</build></model>')
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", _3MF_TYPES)
+        z.writestr("_rels/.rels", _3MF_RELS)
+        z.writestr("3D/3dmodel.model", model)
+    return os.path.getsize(path)
+
+
+def write_mesh(path, name, vertices, triangles, fmt="stl"):
+    if fmt == "stl":
+        return write_stl(path, vertices, triangles, name)
+    if fmt == "3mf":
+        return write_3mf(path, [(name, vertices, triangles)])
+    raise ValueError(f"Formato desconocido: {fmt!r} (usar {FORMATS})")
+
+
+# ========================
+# Teselado
+# ========================
+def shape_of(part):
+    """Part.Shape de un objeto de documento o de la propia forma."""
+    return part.Shape if hasattr(part, "Shape") else part
+
+
+def tessellate(shape, deflection, recompute=False):
+    """
+    (vértices (N, 3) float64, triángulos (M, 3) uint32, info).
+
+    deflection: número (shape.tessellate) o ajustes de tessellation_policy
+    (dict con "linear", "angular", "budget"); info anota la deflexión usada.
+    recompute : rehacer la malla aunque la forma guarde una más fina
+                (OCC la reutiliza si no; mesh_lod tesela de fino a grueso).
+    """
+    if isinstance(deflection, dict):
+        import tessellation_policy
+        v, t, d, passes = tessellation_policy.tessellate(shape, deflection)
+        return v, t, {"deflection": round(d, 6), "passes": passes}
+    pts, facets = shape.tessellate(deflection, True) if recompute else shape.tessellate(deflection)
+    v = np.array([(p.x, p.y, p.z) for p in pts], dtype=np.float64).reshape(-1, 3)
+    t = np.array(facets, dtype=np.uint32).reshape(-1, 3)
+    return v, t, {"deflection": deflection}
+
+
+def _to_shared(v, t):
+    from multiprocessing import resource_tracker, shared_memory
+    nbytes = v.nbytes + t.nbytes
+    shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+    buf = np.ndarray(nbytes, dtype=np.uint8, buffer=shm.buf)
+    buf[:v.nbytes] = v.view(np.uint8).ravel()
+    buf[v.nbytes:] = t.view(np.uint8).ravel()
+    del buf
+    name = shm.name
+    shm.close()
+    # El proceso principal hace unlink al leerlo: que el trabajador no lo reclame al salir
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return name
+
+
+def _from_shared(name, nv, nt):
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        v = np.ndarray((nv, 3), dtype=np.float64, buffer=shm.buf).copy()
+        t = np.ndarray((nt, 3), dtype=np.uint32, buffer=shm.buf, offset=nv * 24).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+    return v, t
+
+
+def _tessellate_brep(args):
+    """Trabajador: BREP -> teselado -> bloque compartido (o arrays si no hay memoria compartida)."""
+    name, brep, deflection = args
+    t0 = time.perf_counter()
+    try:
+        import Part
+        shape = Part.Shape()
+        shape.importBrepFromString(brep)
+        v, t, info = tessellate(shape, deflection)
+    except Exception as e:
+        return name, ("error", str(e)), {"tessellate_s": time.perf_counter() - t0}
+    info["tessellate_s"] = time.perf_counter() - t0
+    if _SHARED:
+        return name, ("shm", _to_shared(v, t), len(v), len(t)), info
+    return name, ("arrays", v, t), info
+
+
+def _unpack(payload):
+    if payload[0] == "shm":
+        return _from_shared(*payload[1:]) + (None,)
+    if payload[0] == "arrays":
+        return payload[1], payload[2], None
+    return None, None, payload[1]
+
+
+def _tessellate_local(name, shape, deflection):
+    t0 = time.perf_counter()
+    try:
+        v, t, info = tessellate(shape, deflection)
+    except Exception as e:
+        return name, None, None, {"tessellate_s": time.perf_counter() - t0}, str(e)
+    info["tessellate_s"] = time.perf_counter() - t0
+    return name, v, t, info, None
+
+
+def iter_tessellated(parts, deflection, workers=None, use_processes=True, mode=None):
+    """
+    Generador de (nombre, vértices, triángulos, info, error) en orden de llegada.
+
+    parts     : lista de (nombre, objeto o forma)
+    deflection: número o función(nombre, forma) -> deflexión o ajustes
+                (p. ej. una tessellation_policy.TessellationPolicy)
+    mode      : dict opcional donde se anota "processes", "threads" o "serial"
+
+    Si el pool de procesos se rompe, las piezas pendientes se teselan con hilos.
+    """
+    defl = deflection if callable(deflection) else (lambda name, shape: deflection)
+    jobs = [(name, shape_of(p)) for name, p in parts]
+    workers = workers or os.cpu_count() or 1
+    mode = mode if mode is not None else {}
+    done = set()
+    if use_processes and workers > 1 and len(jobs) > 1:
+        mode["tessellation"] = "processes"
+        try:
+            tasks = [(name, s.exportBrepToString(), defl(name, s)) for name, s in jobs]
+            with ProcessPoolExecutor(min(workers, len(tasks))) as ex:
+                futures = [ex.submit(_tessellate_brep, task) for task in tasks]
+                for fut in as_completed(futures):
+                    name, payload, info = fut.result()
+                    done.add(name)
+                    v, t, err = _unpack(payload)
+                    yield name, v, t, info, err
+        except Exception as e:
+            mode["process_error"] = str(e)
+    jobs = [(name, s) for name, s in jobs if name not in done]
+    if not jobs:
+        return
+    threaded = workers > 1 and len(jobs) > 1
+    mode["tessellation"] = mode.get("tessellation") or ("threads" if threaded else "serial")
+    if not threaded:
+        for name, s in jobs:
+            yield _tessellate_local(name, s, defl(name, s))
+        return
+    with ThreadPoolExecutor(min(workers, len(jobs))) as ex:
+        futures = [ex.submit(_tessellate_local, name, s, defl(name, s)) for name, s in jobs]
+        for fut in as_completed(futures):
+            yield fut.result()
+
+
+# ========================
+# Exportación
+# ========================
+def export_parts(parts, path, fmt="stl", deflection=0.1, prefix="", workers=None,
+                 io_workers=4, use_processes=True, manifest="manifest.json"):
+    """
+    Teselar y escribir cada pieza en su fichero (prefix + nombre + .stl/.3mf).
+
+    parts     : lista de (nombre, objeto o forma)
+    deflection: número [mm] o función(nombre, forma) -> deflexión o ajustes
+                (tessellation_policy.TessellationPolicy: relativa y con presupuesto)
+    manifest  : nombre del JSON en path (None = no escribir)
+
+    Devuelve el manifiesto (dict). Las piezas que fallan quedan con "error".
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato desconocido: {fmt!r} (usar {FORMATS})")
+    os.makedirs(path, exist_ok=True)
+    t_start = time.perf_counter()
+    mode = {}
+    entries = {name: {"name": name} for name, _ in parts}
+
+    def write(name, v, t, info):
+        entry = entries[name]
+        fname = f"{prefix}{name}.{fmt}"
+        t0 = time.perf_counter()
+        size = write_mesh(os.path.join(path, fname), name, v, t, fmt)
+        entry.update(file=fname, triangles=int(len(t)), vertices=int(len(v)), bytes=int(size),
+                     ram_bytes=int(v.nbytes + t.nbytes), deflection=info.get("deflection"),
+                     tessellate_s=round(info["tessellate_s"], 4), write_s=round(time.perf_counter() - t0, 4))
+        if "passes" in info:
+            entry["passes"] = info["passes"]
+
+    with ThreadPoolExecutor(max(1, io_workers)) as io:
+        pending = []
+        for name, v, t, info, err in iter_tessellated(parts, deflection, workers, use_processes, mode):
+            if err is not None:
+                entries[name]["error"] = err
+                continue
+            pending.append((name, io.submit(write, name, v, t, info)))
+        for name, fut in pending:
+            try:
+                fut.result()
+            except Exception as e:
+                entries[name]["error"] = str(e)
+
+    rows = [entries[name] for name, _ in parts]
+    ok = [r for r in rows if "error" not in r]
+    result = {
+        "format": fmt,
+        "deflection": None if callable(deflection) else deflection,
+        "mode": mode.get("tessellation"),
+        "parts": rows,
+        "total_triangles": sum(r["triangles"] for r in ok),
+        "total_bytes": sum(r["bytes"] for r in ok),
+        "tessellate_s": round(sum(r["tessellate_s"] for r in ok), 4),
+        "write_s": round(sum(r["write_s"] for r in ok), 4),
+        "wall_s": round(time.perf_counter() - t_start, 4),
+        "failed": [r["name"] for r in rows if "error" in r],
+    }
+    if "process_error" in mode:
+        result["process_error"] = mode["process_error"]
+    if manifest:
+        with open(os.path.join(path, manifest), "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=1)
+    return result
+
+
+def print_manifest(result):
+    print(f"{'Pieza':<24}{'Defl. mm':>10}{'Triáng.':>10}{'KB':>10}{'Tesel. s':>10}{'Escr. s':>10}")
+    for r in result["parts"]:
+        if "error" in r:
+            print(f"{r['name']:<24}  ERROR {r['error']}")
+            continue
+        print(f"{r['name']:<24}{r['deflection'] or 0:>10.3g}{r['triangles']:>10}{r['bytes'] / 1024:>10.1f}"
+              f"{r['tessellate_s']:>10.3f}{r['write_s']:>10.3f}")
+    print(f"Total {result['total_triangles']} triángulos, {result['total_bytes'] / 1024:.1f} KB, "
+          f"{result['wall_s']:.2f} s ({result['mode']})")
+
+
+if __name__ == "__main__":
+    import tempfile
+    # Comprobación de los escritores con un tetraedro
+    v = np.array([[0, 0, 0], [10, 0, 0], [0, 10, 0], [0, 0, 10]], dtype=float)
+    t = np.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]])
+    d = tempfile.mkdtemp()
+    n = write_stl(os.path.join(d, "tet.stl"), v, t)
+    rv, rt = read_stl(os.path.join(d, "tet.stl"))
+    m = write_3mf(os.path.join(d, "tet.3mf"), [("tet", v, t)])
+    print(f"STL {n} bytes ({len(rt)} triángulos), 3MF {m} bytes en {d}")
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+Mallas con varios niveles de detalle (LOD) cacheadas en disco por hash de forma.
+
+Ver o exportar el ensamblaje completo de Modular_Space_Station_ISS_Style
+(SistemaPropulsionCilindrico.py, TestEstacionM.FCMacro) tesela todo a
+resolución máxima. Aquí cada componente se tesela a varios niveles:
+
+    LEVELS = deflexión relativa a la diagonal de su caja (fino -> grueso)
+
+y los arrays (vértices float32, triángulos uint32) se guardan en un .npz
+por forma, con clave = sha1 del BREP. Reconstruir la macro sin cambios en
+un componente no vuelve a teselarlo.
+
+- El nivel más grueso sale por decimado (agrupación de vértices en una
+  rejilla de celda igual a su deflexión) del nivel anterior, sin volver a
+  teselar; decimate() sirve también para cualquier malla.
+- LODMesh.select() elige el nivel más grueso cuyo error proyectado en
+  pantalla (deflexión / distancia * focal en píxeles) no pasa de
+  max_error_px: la vista previa y los análisis (trazado de rayos de
+  shielding_raycast, áreas proyectadas) trabajan con mallas ligeras.
+
+Uso en FreeCAD con tools/ en sys.path:
+    import mesh_lod
+    lods = mesh_lod.document_lods(App.ActiveDocument)
+    v, t = lods["Truss_Structure"].for_view(distance=80000.0)
+"""
+
+import hashlib
+import math
+import os
+
+import numpy as np
+
+from mesh_export import tessellate, shape_of
+
+# Deflexión relativa a la diagonal de la caja envolvente, de fino a grueso
+LEVELS = (2e-4, 1e-3, 5e-3, 2.5e-2)
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "MESH_LOD_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "mesh_lod"))
+
+# Objetos que son la fusión de todo el ensamblaje (duplicarían la geometría)
+ASSEMBLY_LABELS = ("TankBlackRadiation_Spaceship", "Modular_Space_Station_ISS_Style")
+
+
+# ========================
+# Mallas
+# ========================
+def decimate(vertices, triangles, cell):
+    """
+    Decimado por agrupación de vértices: un vértice (el centroide) por celda
+    de la rejilla de lado `cell`; se eliminan triángulos degenerados y repetidos.
+    """
+    v = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    t = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    if not len(t) or cell <= 0:
+        return v.astype(np.float32), t.astype(np.uint32)
+    q = np.floor((v - v.min(axis=0)) / cell).astype(np.int64)
+    _, cluster, counts = np.unique(q, axis=0, return_inverse=True, return_counts=True)
+    cluster = cluster.ravel()
+    nv = len(counts)
+    centroids = np.zeros((nv, 3))
+    np.add.at(centroids, cluster, v)
+    centroids /= counts[:, None]
+    tt = cluster[t]
+    keep = (tt[:, 0] != tt[:, 1]) & (tt[:, 1] != tt[:, 2]) & (tt[:, 0] != tt[:, 2])
+    tt = tt[keep]
+    # Triángulos repetidos (misma terna en cualquier rotación conservando la orientación)
+    r = np.argmin(tt, axis=1)
+    canon = np.stack([tt[np.arange(len(tt)), (r + k) % 3] for k in range(3)], axis=1)
+    _, first = np.unique(canon, axis=0, return_index=True)
+    tt = tt[np.sort(first)]
+    used = np.unique(tt)
+    remap = np.full(nv, -1, dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    return centroids[used].astype(np.float32), remap[tt].astype(np.uint32)
+
+
+def projected_area(vertices, triangles, direction):
+    """Área proyectada [mm²] de una malla cerrada sobre el plano normal a direction."""
+    v = np.asarray(vertices, dtype=np.float64)
+    t = np.asarray(triangles, dtype=np.int64)
+    d = np.asarray(direction, dtype=float)
+    d = d / np.linalg.norm(d)
+    n = 0.5 * np.cross(v[t[:, 1]] - v[t[:, 0]], v[t[:, 2]] - v[t[:, 0]])
+    # En una superficie cerrada las caras de frente y de espalda se cubren igual
+    return float(0.5 * np.abs(n @ d).sum())
+
+
+def shape_key(shape):
+    """sha1 del BREP de la forma (incluye su colocación)."""
+    return hashlib.sha1(shape.exportBrepToString().encode("utf-8")).hexdigest()
+
+
+# ========================
+# LOD
+# ========================
+class LODMesh:
+    """Niveles de una forma: deflections[i] [mm] y levels[i] = (vértices, triángulos)."""
+
+    def __init__(self, key, diagonal, deflections, levels):
+        self.key = key
+        self.diagonal = float(diagonal)
+        self.deflections = [float(d) for d in deflections]
+        self.levels = levels
+
+    def __len__(self):
+        return len(self.levels)
+
+    def level(self, i):
+        return self.levels[max(0, min(i, len(self.levels) - 1))]
+
+    def triangles(self):
+        return [len(t) for _, t in self.levels]
+
+    def select(self, distance, viewport_px=1080, fov_deg=45.0, max_error_px=1.0):
+        """Índice del nivel más grueso con error proyectado <= max_error_px."""
+        focal = viewport_px / (2.0 * math.tan(math.radians(fov_deg) / 2.0))
+        px_per_mm = focal / max(distance, 1e-9)
+        for i in range(len(self.levels) - 1, -1, -1):
+            if self.deflections[i] * px_per_mm <= max_error_px:
+                return i
+        return 0
+
+    def projected_size(self, distance, viewport_px=1080, fov_deg=45.0):
+        """Tamaño aproximado en píxeles (diagonal proyectada)."""
+        focal = viewport_px / (2.0 * math.tan(math.radians(fov_deg) / 2.0))
+        return self.diagonal * focal / max(distance, 1e-9)
+
+    def for_view(self, distance, viewport_px=1080, fov_deg=45.0, max_error_px=1.0):
+        return self.level(self.select(distance, viewport_px, fov_deg, max_error_px))
+
+    def save(self, path):
+        arrays = {"diagonal": np.array(self.diagonal), "deflections": np.array(self.deflections)}
+        for i, (v, t) in enumerate(self.levels):
+            arrays[f"v{i}"] = np.asarray(v, dtype=np.float32)
+            arrays[f"t{i}"] = np.asarray(t, dtype=np.uint32)
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, key=None):
+        with np.load(path) as z:
+            defl = z["deflections"].tolist()
+            levels = [(z[f"v{i}"], z[f"t{i}"]) for i in range(len(defl))]
+            return cls(key or os.path.splitext(os.path.basename(path))[0], float(z["diagonal"]), defl, levels)
+
+
+class LODCache:
+    """LODMesh por hash de forma: memoria + un .npz por forma en disco."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, levels=LEVELS, decimate_last=True, persist=True):
+        self.directory = directory
+        self.levels = tuple(levels)
+        self.decimate_last = decimate_last
+        self.persist = persist
+        self.meshes = {}
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _path(self, key):
+        tag = "-".join(f"{d:g}" for d in self.levels) + ("-d" if self.decimate_last else "")
+        return os.path.join(self.directory, f"{key}_{hashlib.sha1(tag.encode()).hexdigest()[:8]}.npz")
+
+    def build(self, shape, key=None):
+        """Teselar los niveles (el último por decimado si decimate_last), rehaciendo la malla en cada uno."""
+        diag = shape.BoundBox.DiagonalLength
+        defl = [max(r * diag, 1e-3) for r in self.levels]
+        n_tess = len(defl) - 1 if self.decimate_last and len(defl) > 1 else len(defl)
+        levels = []
+        for d in defl[:n_tess]:
+            v, t, _ = tessellate(shape, d, recompute=True)
+            levels.append((v.astype(np.float32), t.astype(np.uint32)))
+        if n_tess < len(defl):
+            levels.append(decimate(*levels[-1], cell=defl[-1]))
+        return LODMesh(key or shape_key(shape), diag, defl, levels)
+
+    def get(self, part):
+        shape = shape_of(part)
+        key = shape_key(shape)
+        lod = self.meshes.get(key)
+        if lod is not None:
+            self.stats["hits"] += 1
+            return lod
+        path = self._path(key)
+        if self.persist and os.path.exists(path):
+            try:
+                lod = LODMesh.load(path, key)
+                self.stats["disk_hits"] += 1
+            except (OSError, ValueError, KeyError):
+                lod = None
+        if lod is None:
+            self.stats["misses"] += 1
+            lod = self.build(shape, key)
+            if self.persist:
+                try:
+                    os.makedirs(self.directory, exist_ok=True)
+                    lod.save(path)
+                except OSError:
+                    pass
+        self.meshes[key] = lod
+        return lod
+
+    def clear(self, disk=False):
+        self.meshes.clear()
+        if disk and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".npz"):
+                    os.remove(os.path.join(self.directory, name))
+
+
+_DEFAULT_CACHE = None
+
+
+def default_cache():
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = LODCache()
+    return _DEFAULT_CACHE
+
+
+def document_lods(doc, cache=None, skip=ASSEMBLY_LABELS):
+    """{Label: LODMesh} de los Part::Feature con sólidos del documento."""
+    cache = cache or default_cache()
+    out = {}
+    for obj in doc.Objects:
+        if obj.Label in skip or not hasattr(obj, "Shape") or obj.Shape.isNull() or not obj.Shape.Solids:
+            continue
+        out[obj.Label] = cache.get(obj.Shape)
+    return out
+
+
+def add_preview(doc, lods, distance=None, level=None, group="LOD_Preview"):
+    """
+    Objetos Mesh::Feature con el nivel elegido (fijo o según la distancia de
+    cámara) dentro de un grupo, para una vista previa ligera.
+    """
+    import Mesh
+    grp = doc.getObject(group) or doc.addObject("App::DocumentObjectGroup", group)
+    for label, lod in lods.items():
+        i = level if level is not None else lod.select(distance or lod.diagonal * 2.0)
+        v, t = lod.level(i)
+        m = Mesh.Mesh([[tuple(map(float, v[a])), tuple(map(float, v[b])), tuple(map(float, v[c]))]
+                       for a, b, c in t.tolist()])
+        obj = doc.addObject("Mesh::Feature", f"LOD{i}_{label}")
+        obj.Mesh = m
+        grp.addObject(obj)
+    doc.recompute()
+    return grp
+
+
+def print_lods(lods):
+    print(f"{'Componente':<32}" + "".join(f"{'L' + str(i):>10}" for i in range(len(LEVELS))))
+    for label, lod in lods.items():
+        print(f"{label:<32}" + "".join(f"{n:>10}" for n in lod.triangles()))
+
+
+if __name__ == "__main__":
+    # Decimado de una esfera UV fina y su área proyectada (π r²)
+    r, n = 100.0, 200
+    th, ph = np.meshgrid(np.linspace(0, math.pi, n), np.linspace(0, 2 * math.pi, 2 * n, endpoint=False), indexing="ij")
+    v = np.column_stack([(r * np.sin(th) * np.cos(ph)).ravel(), (r * np.sin(th) * np.sin(ph)).ravel(),
+                         (r * np.cos(th)).ravel()])
+    idx = np.arange(n * 2 * n).reshape(n, 2 * n)
+    a, b = idx[:-1], np.roll(idx, -1, axis=1)[:-1]
+    c, d = idx[1:], np.roll(idx, -1, axis=1)[1:]
+    t = np.concatenate([np.stack([a, c, b], -1).reshape(-1, 3), np.stack([b, c, d], -1).reshape(-1, 3)])
+    for cell in (0.0, 2.0, 10.0, 25.0):
+        dv, dt = decimate(v, t, cell)
+        print(f"celda {cell:>5} mm: {len(dt):>7} triángulos, área proyectada "
+              f"{projected_area(dv, dt, (0, 0, 1)) / (math.pi * r * r):.4f} π r²")
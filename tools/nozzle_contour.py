@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Contornos de tobera campana (Rao, parábola de empuje optimizado).
+
+radius_profile_points() de RocketCooledNozzle.py da cinco puntos unidos por
+rectas. Aquí se genera un contorno denso en NumPy:
+
+- convergente: recta con convergent_angle desde el radio de cámara y arco
+  de radio 1.5·Rt hasta la garganta
+- garganta aguas abajo: arco de radio 0.382·Rt hasta el ángulo inicial theta_n
+- campana: Bézier cuadrática de N a la salida E con ángulo final theta_e
+  (aproximación de Rao; theta_n / theta_e interpolados de las curvas de
+  Rao para campana del 80 % salvo que se den explícitamente)
+
+El Mach y p/p0 a lo largo del contorno salen de las tablas isentrópicas
+cacheadas por gamma (isentropic.table). La pared sólida la construye
+RocketCooledNozzle.py con P["rao_contour"] = True: nozzle_profile() toma
+contour_from_params() y make_revolved_wall() revoluciona la B-spline.
+
+Unidades: mm, eje X longitudinal con la garganta en x = 0 (como la macro).
+"""
+
+import math
+
+import numpy as np
+
+import isentropic
+
+# Ángulos de Rao (grados) para campana del 80 % frente a la relación de áreas
+_RAO_EPS = np.array([4.0, 5.0, 10.0, 20.0, 30.0, 40.0, 50.0, 100.0])
+_RAO_THETA_N = np.array([21.5, 23.0, 26.3, 28.8, 30.0, 31.0, 31.5, 33.5])
+_RAO_THETA_E = np.array([14.0, 13.0, 11.0, 9.0, 8.5, 8.0, 7.5, 7.0])
+
+
+def rao_angles(eps):
+    """(theta_n, theta_e) en grados para la relación de áreas eps (campana 80 %)."""
+    le = np.log(np.clip(eps, _RAO_EPS[0], _RAO_EPS[-1]))
+    return (float(np.interp(le, np.log(_RAO_EPS), _RAO_THETA_N)),
+            float(np.interp(le, np.log(_RAO_EPS), _RAO_THETA_E)))
+
+
+def rao_contour(throat_r, exit_r, chamber_r=None, convergent_angle=45.0, length_fraction=0.8,
+                theta_n=None, theta_e=None, n=400):
+    """
+    Contorno interior (x, r) [mm] de una tobera de Rao.
+
+    Los puntos se reparten por longitud de arco con densidad extra en la
+    garganta (donde la curvatura es mayor). Devuelve arrays (n,) y un dict
+    con los puntos característicos.
+    """
+    Rt = float(throat_r)
+    Re = float(exit_r)
+    if Re <= Rt:
+        raise ValueError("exit_r debe ser mayor que throat_r")
+    Rc = float(chamber_r) if chamber_r is not None else Re
+    eps = (Re / Rt) ** 2
+    tn, te = rao_angles(eps)
+    tn = math.radians(theta_n if theta_n is not None else tn)
+    te = math.radians(theta_e if theta_e is not None else te)
+    ca = math.radians(convergent_angle)
+
+    # Arco de entrada (radio 1.5 Rt) desde -90° - ca hasta -90°
+    r1 = 1.5 * Rt
+    a_in = np.linspace(-math.pi / 2 - ca, -math.pi / 2, 4 * n)
+    x_in = r1 * np.cos(a_in)
+    y_in = r1 * np.sin(a_in) + r1 + Rt
+    # Recta convergente desde el radio de cámara hasta el inicio del arco
+    y_start = y_in[0]
+    if Rc > y_start:
+        x_c0 = x_in[0] - (Rc - y_start) / math.tan(ca)
+        x_line = np.linspace(x_c0, x_in[0], 4 * n, endpoint=False)
+        y_line = Rc + (y_start - Rc) * (x_line - x_c0) / (x_in[0] - x_c0)
+    else:
+        x_line = y_line = np.empty(0)
+
+    # Arco de salida (radio 0.382 Rt) hasta theta_n
+    r2 = 0.382 * Rt
+    a_out = np.linspace(-math.pi / 2, tn - math.pi / 2, 4 * n)
+    x_out = r2 * np.cos(a_out)
+    y_out = r2 * np.sin(a_out) + r2 + Rt
+    Nx, Ny = x_out[-1], y_out[-1]
+
+    # Campana: Bézier cuadrática N -> E
+    Ln = length_fraction * ((math.sqrt(eps) - 1.0) * Rt / math.tan(math.radians(15.0)))
+    Ex, Ey = Ln, Re
+    m1, m2 = math.tan(tn), math.tan(te)
+    Qx = (Ey - m2 * Ex - Ny + m1 * Nx) / (m1 - m2)
+    Qy = Ny + m1 * (Qx - Nx)
+    u = np.linspace(0.0, 1.0, 8 * n)
+    x_b = (1 - u) ** 2 * Nx + 2 * (1 - u) * u * Qx + u ** 2 * Ex
+    y_b = (1 - u) ** 2 * Ny + 2 * (1 - u) * u * Qy + u ** 2 * Ey
+
+    x = np.concatenate([x_line, x_in, x_out[1:], x_b[1:]])
+    y = np.concatenate([y_line, y_in, y_out[1:], y_b[1:]])
+    x, y = _resample(x, y, n)
+    info = {"eps": eps, "theta_n": math.degrees(tn), "theta_e": math.degrees(te),
+            "bell_length": Ln, "N": (Nx, Ny), "Q": (Qx, Qy), "E": (Ex, Ey)}
+    return x, y, info
+
+
+def _resample(x, y, n, throat_weight=4.0):
+    """Remuestrear por longitud de arco ponderada por curvatura (más puntos en la garganta)."""
+    ds = np.hypot(np.diff(x), np.diff(y))
+    ang = np.unwrap(np.arctan2(np.diff(y), np.diff(x)))
+    curv = np.abs(np.gradient(ang)) / np.maximum(ds, 1e-12)
+    scale = max(np.max(curv), 1e-12)
+    w = ds * (1.0 + throat_weight * curv / scale)
+    s = np.concatenate(([0.0], np.cumsum(w)))
+    target = np.linspace(0.0, s[-1], n)
+    return np.interp(target, s, x), np.interp(target, s, y)
+
+
+def contour_from_params(P, n=400, **kwargs):
+    """Contorno de Rao para el P de RocketCooledNozzle (radio de cámara = radio de salida, como la macro)."""
+    kwargs.setdefault("convergent_angle", P["convergent_angle"])
+    return rao_contour(P["throat_diameter"] / 2.0, P["exit_diameter"] / 2.0,
+                       chamber_r=kwargs.pop("chamber_r", P["exit_diameter"] / 2.0), n=n, **kwargs)
+
+
+def contour_flow(x, r, gamma=1.4):
+    """Mach, p/p0 y T/T0 a lo largo del contorno con la tabla isentrópica cacheada."""
+    x = np.asarray(x, dtype=float)
+    r = np.asarray(r, dtype=float)
+    rt = r.min()
+    ar = (r / rt) ** 2
+    sup = x > x[np.argmin(r)]
+    tab = isentropic.table(gamma)
+    M = tab.mach(ar, sup)
+    return M, isentropic.pressure_ratio(M, gamma), isentropic.temperature_ratio(M, gamma)
+
+
+def conical_profile(P, n=400):
+    """Perfil de radius_profile_points() muestreado densamente (referencia)."""
+    throat_r = P["throat_diameter"] / 2.0
+    exit_r = P["exit_diameter"] / 2.0
+    conv_len = throat_r / math.tan(math.radians(P["convergent_angle"]))
+    div_end = throat_r + (exit_r - throat_r) / math.tan(math.radians(P["divergent_angle"]))
+    x = np.linspace(-conv_len, div_end, n)
+    r = np.where(x < 0.0, throat_r + (exit_r - throat_r) * (x / -conv_len),
+                 throat_r + (exit_r - throat_r) * (x / div_end))
+    return x, r
+
+
+if __name__ == "__main__":
+    import time
+    from nozzle_model import load_nozzle_params
+    P = load_nozzle_params()
+    t0 = time.perf_counter()
+    x, r, info = contour_from_params(P, n=600)
+    dt = time.perf_counter() - t0
+    M, p, _ = contour_flow(x, r)
+    xc, rc = conical_profile(P)
+    print(f"Contorno Rao: {len(x)} puntos en {dt*1e3:.1f} ms, eps = {info['eps']:.1f}, "
+          f"theta_n = {info['theta_n']:.1f}°, theta_e = {info['theta_e']:.1f}°")
+    print(f"Longitud campana {info['bell_length']:.1f} mm (cónica 15°: {xc[-1]:.1f} mm)")
+    print(f"Mach salida {M[-1]:.2f}, p/p0 salida {p[-1]:.4f}")
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Modelo de prestaciones de la tobera refrigerada vectorizado con NumPy.
+
+Reproduce operación a operación las funciones calculate_* de
+RocketCooledNozzle.py (misma física, mismas constantes, mismo orden de
+operaciones), pero acepta arrays para la geometría y las condiciones de
+cámara. Un mapa de diseño de un millón de puntos se evalúa en una sola
+llamada, sin bucles en Python ni mutar el P global de la macro.
+
+Las constantes que la macro tiene fijas dentro de cada función (Pc = 50 bar,
+Tc = 3500 K, h gas = 1000 W/m²K, agua como refrigerante...) están en
+SCALAR_CONSTANTS; con los valores por defecto los resultados coinciden con
+los escalares.
+
+Unidades: como la macro (diámetros y espesores en mm, SI en el resto).
+"""
+
+import math
+import os
+
+import numpy as np
+
+from macro_params import load_macro_params
+
+NOZZLE_MACRO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                            "Carbon_shields", "python", "parameters", "RocketCooledNozzle.py")
+
+# Constantes fijas de las funciones calculate_* de la macro
+SCALAR_CONSTANTS = {
+    "Pc": 50e5,              # presión de cámara [Pa]
+    "Pe": 0.5e5,             # presión de salida [Pa]
+    "Pa": 101325,            # presión ambiente [Pa]
+    "k": 1.4,                # relación de calores específicos
+    "R": 287,                # constante del gas [J/kg/K]
+    "Tc": 3500,              # temperatura de cámara / gas caliente [K]
+    "Tw_gas": 800,           # temperatura de pared en calculate_heat_transfer [K]
+    "h_gas": 1000,           # coeficiente de película del gas [W/m²K]
+    "m_dot_isp": 5.0,        # caudal usado por calculate_specific_impulse [kg/s]
+    "g0": 9.81,
+    "cp_coolant": 4186,      # [J/kg/K]
+    "dT_coolant": 500,       # salto admisible del refrigerante [K]
+    "mu_coolant": 0.001,     # [Pa·s]
+    "rho_coolant": 1000,     # [kg/m³]
+    "Pr_coolant": 7,
+    "k_coolant": 0.6,        # [W/m/K]
+    "T_coolant": 400,        # temperatura de mezcla del refrigerante [K]
+    "E": 130e9,              # aleación de cobre [Pa]
+    "alpha": 17e-6,          # [1/K]
+    "nu": 0.34,
+    "k_wall": 320,           # conductividad de la pared [W/m/K]
+    "sigma_yield": 400e6,    # [Pa]
+    "eta_pump": 0.7,
+}
+
+# Parámetros de P que admiten arrays
+ARRAY_PARAMS = ("throat_diameter", "exit_diameter", "nozzle_length",
+                "wall_thickness_throat", "wall_thickness_convergent",
+                "wall_thickness_div_start", "wall_thickness_div_end",
+                "channel_base", "channel_height", "channel_top",
+                "ligament_min_throat", "num_helices")
+
+WALL_DENSITY = 8960          # aleación de cobre, como optimize_design_parameters [kg/m³]
+
+
+def load_nozzle_params(path=NOZZLE_MACRO):
+    """Diccionario P de RocketCooledNozzle.py leído sin FreeCAD."""
+    return load_macro_params(path, ["P"], calls={"ParamDict": dict})["P"]
+
+
+def evaluate(params=None, **overrides):
+    """
+    Evaluar el modelo sobre arrays con broadcasting.
+
+    params    : P base (por defecto el de la macro)
+    overrides : claves de P (ARRAY_PARAMS) o de SCALAR_CONSTANTS con
+                escalares o arrays, p. ej. throat_diameter=np.linspace(...), Pc=...
+
+    Devuelve un dict de arrays con la forma común de las entradas.
+    """
+    P = dict(params if params is not None else load_nozzle_params())
+    c = dict(SCALAR_CONSTANTS)
+    for key, val in overrides.items():
+        if key in c:
+            c[key] = val
+        elif key in P:
+            P[key] = val
+        else:
+            raise KeyError(f"Parámetro desconocido: {key}")
+    arrays = np.broadcast_arrays(*[np.asarray(P[k], dtype=float) for k in ARRAY_PARAMS],
+                                 *[np.asarray(v, dtype=float) for v in c.values()])
+    d = dict(zip(ARRAY_PARAMS, arrays[:len(ARRAY_PARAMS)]))
+    c = dict(zip(c.keys(), arrays[len(ARRAY_PARAMS):]))
+    k, Pc, Pe, Pa, R, Tc = c["k"], c["Pc"], c["Pe"], c["Pa"], c["R"], c["Tc"]
+    out = {}
+
+    # calculate_thrust
+    At = math.pi * (d["throat_diameter"]/2)**2 / 1e6
+    Ae = math.pi * (d["exit_diameter"]/2)**2 / 1e6
+    Cf = np.sqrt(2 * k * k / (k - 1) * (1 - (Pe/Pc)**((k-1)/k))) + (Pe - Pa)/Pc * (Ae/At)
+    out["thrust"] = Cf * Pc * At * 1000
+
+    # calculate_specific_impulse
+    out["isp"] = out["thrust"] / (c["m_dot_isp"] * c["g0"])
+
+    # calculate_expansion_ratio
+    out["expansion_ratio"] = (d["exit_diameter"] / d["throat_diameter"])**2
+
+    # calculate_characteristic_velocity
+    out["c_star"] = np.sqrt(k * R * Tc / (k + 1)) * ((k + 1)/(2*(k-1)))**((k-1)/(2*(k+1)))
+
+    # calculate_mass_flow_rate
+    out["mass_flow"] = Pc * At / np.sqrt(R * Tc) * np.sqrt(k) * (k/2)**((k+1)/(2*(k-1)))
+
+    # calculate_heat_transfer
+    A_hot = math.pi * d["throat_diameter"] * d["nozzle_length"] / 1e6
+    q = c["h_gas"] * (Tc - c["Tw_gas"]) * A_hot
+    out["heat_transfer"] = q
+    out["heat_flux"] = q / (math.pi * d["throat_diameter"] * d["nozzle_length"] / 1e6)
+
+    # calculate_cooling_requirement
+    m_dot_c = q / (c["cp_coolant"] * c["dT_coolant"])
+    out["coolant_flow"] = m_dot_c
+
+    # calculate_channel_velocity
+    A_ch = d["channel_base"] * d["channel_height"] / 1e6
+    v = m_dot_c / (c["rho_coolant"] * A_ch)
+    out["coolant_velocity"] = v
+
+    # calculate_reynolds_number / calculate_nusselt_number / calculate_heat_transfer_coefficient
+    D = d["channel_height"] / 1000
+    Re = c["rho_coolant"] * v * D / c["mu_coolant"]
+    Nu = 0.023 * Re**0.8 * c["Pr_coolant"]**0.4
+    h = Nu * c["k_coolant"] / D
+    out["reynolds"] = Re
+    out["nusselt"] = Nu
+    out["h_coolant"] = h
+
+    # calculate_wall_temperature
+    out["wall_temperature"] = Tc - (Tc - c["T_coolant"]) * (h / (h + c["h_gas"]))
+
+    # calculate_thermal_stress / calculate_structural_margin
+    dT_wall = out["heat_flux"] * d["wall_thickness_throat"] / 1000 / c["k_wall"]
+    sigma = c["E"] * c["alpha"] * dT_wall / (2 * (1 - c["nu"]))
+    out["thermal_stress"] = sigma
+    out["structural_margin"] = c["sigma_yield"] / sigma - 1
+
+    # calculate_pressure_drop / calculate_power_consumption
+    L = d["nozzle_length"] / 1000
+    f = 0.316 / np.sqrt(4 * m_dot_c / (math.pi * D * c["mu_coolant"]))
+    dP = f * L / D * (m_dot_c / (math.pi * D**2 / 4))**2 / (2 * c["rho_coolant"])
+    out["pressure_drop"] = dP
+    out["pump_power"] = m_dot_c * dP / c["eta_pump"]
+
+    # calculate_nozzle_volume
+    tr, er = d["throat_diameter"] / 2, d["exit_diameter"] / 2
+    out["volume"] = (math.pi * d["nozzle_length"] / 3) * (tr**2 + tr*er + er**2)
+
+    # calculate_wall_volume
+    Ln = d["nozzle_length"]
+    conv = shell_segment_volume(er, tr, d["wall_thickness_convergent"], d["wall_thickness_throat"], 0.2 * Ln)
+    div = shell_segment_volume(tr, er, d["wall_thickness_div_start"], d["wall_thickness_div_end"], 0.8 * Ln)
+    out["wall_volume"] = np.maximum(conv + div - helix_channel_volume(d, P, Ln, tr, er), 0.0)
+    out["mass"] = out["wall_volume"] * WALL_DENSITY / 1e9
+    return out
+
+
+def shell_segment_volume(r0, r1, t0, t1, length):
+    """Volumen de un tramo de cáscara cónica (Simpson exacto), igual que la macro."""
+    rm = (r0 + r1) / 2
+    tm = (t0 + t1) / 2
+    f0 = 2 * r0 * t0 + t0**2
+    fm = 2 * rm * tm + tm**2
+    f1 = 2 * r1 * t1 + t1**2
+    return math.pi * length * (f0 + 4 * fm + f1) / 6
+
+
+def helix_channel_volume(d, P, L, throat_r, exit_r, n=64):
+    """
+    Volumen de los 2·num_helices canales helicoidales, como la macro.
+
+    Se acumula estación a estación en el mismo orden que el bucle escalar
+    para que la suma coincida bit a bit.
+    """
+    cap = P["end_caps_thickness"]
+    h = d["channel_height"]
+    n_channels = 2 * d["num_helices"]
+    area = (d["channel_base"] + d["channel_top"]) / 2 * h
+    span = L - 2 * cap
+    total = 0.0
+    for i in range(n + 1):
+        s = cap + span * i / n
+        t = s / L
+        r = np.where(t < 0.2, exit_r + (throat_r - exit_r) * (t / 0.2),
+                     throat_r + (exit_r - throat_r) * ((t - 0.2) / 0.8))
+        rc = r + d["ligament_min_throat"] + h / 2
+        tp = np.clip(s / L, 0.0, 1.0)
+        pitch = np.where(tp < 0.3, P["pitch_throat"] + (P["pitch_mid"] - P["pitch_throat"]) * (tp / 0.3),
+                         P["pitch_mid"] + (P["pitch_exit"] - P["pitch_mid"]) * ((tp - 0.3) / 0.7))
+        per_length = np.minimum(n_channels * area * np.sqrt(1 + (2 * math.pi * rc / pitch)**2),
+                                2 * math.pi * rc * h)
+        total = total + (per_length / 2 if i in (0, n) else per_length)
+    return total * span / n
+
+
+# Salida del modelo -> función escalar de la macro
+SCALAR_FUNCTIONS = {
+    "thrust": "calculate_thrust",
+    "isp": "calculate_specific_impulse",
+    "expansion_ratio": "calculate_expansion_ratio",
+    "c_star": "calculate_characteristic_velocity",
+    "mass_flow": "calculate_mass_flow_rate",
+    "heat_transfer": "calculate_heat_transfer",
+    "coolant_flow": "calculate_cooling_requirement",
+    "coolant_velocity": "calculate_channel_velocity",
+    "reynolds": "calculate_reynolds_number",
+    "nusselt": "calculate_nusselt_number",
+    "h_coolant": "calculate_heat_transfer_coefficient",
+    "wall_temperature": "calculate_wall_temperature",
+    "thermal_stress": "calculate_thermal_stress",
+    "structural_margin": "calculate_structural_margin",
+    "pressure_drop": "calculate_pressure_drop",
+    "pump_power": "calculate_power_consumption",
+    "volume": "calculate_nozzle_volume",
+    "wall_volume": "calculate_wall_volume",
+}
+
+
+def compare_with_macro(namespace, n=200, rtol=1e-14, seed=0):
+    """
+    Contrastar el modelo con las funciones escalares de la macro.
+
+    namespace : globals de RocketCooledNozzle ya cargado en FreeCAD
+                (p. ej. vars(RocketCooledNozzle)); se muta su P y se restaura.
+    Las potencias vectorizadas de NumPy pueden diferir en el último bit
+    (Re**0.8), de ahí rtol. Devuelve {salida: error relativo máximo}.
+    """
+    P = namespace["P"]
+    original = dict(P)
+    rng = np.random.default_rng(seed)
+    grid = {
+        "throat_diameter": rng.uniform(20.0, 90.0, n),
+        "exit_diameter": rng.uniform(100.0, 300.0, n),
+        "nozzle_length": rng.uniform(100.0, 400.0, n),
+        "channel_base": rng.uniform(0.8, 3.0, n),
+        "channel_height": rng.uniform(1.0, 5.0, n),
+        "channel_top": rng.uniform(1.0, 4.0, n),
+        "wall_thickness_throat": rng.uniform(1.0, 6.0, n),
+        "wall_thickness_div_end": rng.uniform(1.0, 6.0, n),
+    }
+    out = evaluate(original, **grid)
+    err = {key: 0.0 for key in SCALAR_FUNCTIONS}
+    try:
+        for i in range(n):
+            for key, values in grid.items():
+                P[key] = float(values[i])
+            for key, fn in SCALAR_FUNCTIONS.items():
+                ref = namespace[fn]()
+                err[key] = max(err[key], float(abs(out[key][i] - ref) / max(abs(ref), 1e-300)))
+    finally:
+        P.update(original)
+    bad = {k: v for k, v in err.items() if v > rtol}
+    if bad:
+        raise AssertionError(f"El modelo vectorizado difiere de la macro: {bad}")
+    return err
+
+
+def design_grid(**ranges):
+    """Malla completa (aplanada) de los rangos dados: {nombre: array 1-D}."""
+    names = list(ranges)
+    mesh = np.meshgrid(*[np.asarray(ranges[n], dtype=float) for n in names], indexing="ij")
+    return {n: m.ravel() for n, m in zip(names, mesh)}
+
+
+WALL_KEYS = ("wall_thickness_throat", "wall_thickness_convergent",
+             "wall_thickness_div_start", "wall_thickness_div_end")
+
+
+def feasible(out, P=None, max_wall_temperature=1200.0, min_margin=1.5, max_velocity=50.0, grid=None):
+    """
+    Máscara de las comprobaciones analíticas de validate_design().
+
+    Los espesores, el ligamento y la altura de canal se toman de `grid` si
+    están en él. Canal que cabe: ligamento + altura + min_feature de cierre
+    <= espesor mínimo de pared (la altura que channel_section no recorta).
+    """
+    P = P if P is not None else load_nozzle_params()
+    grid = grid or {}
+    v = {k: np.asarray(grid.get(k, P[k]), dtype=float) for k in WALL_KEYS + ("ligament_min_throat", "channel_height")}
+    mf = P["min_feature"]
+    t_min = np.minimum.reduce(np.broadcast_arrays(*[v[k] for k in WALL_KEYS]))
+    ok = (out["wall_temperature"] <= max_wall_temperature) & (out["structural_margin"] >= min_margin) \
+        & (out["coolant_velocity"] <= max_velocity) & (v["wall_thickness_throat"] >= mf) \
+        & (v["ligament_min_throat"] >= mf) & (v["ligament_min_throat"] + v["channel_height"] + mf <= t_min)
+    return np.broadcast_to(ok, out["thrust"].shape)
+
+
+if __name__ == "__main__":
+    import time
+    P = load_nozzle_params()
+    grid = design_grid(throat_diameter=np.linspace(30, 80, 100),
+                       exit_diameter=np.linspace(100, 250, 100),
+                       channel_height=np.linspace(1.0, 4.0, 100))
+    t0 = time.perf_counter()
+    out = evaluate(P, **grid)
+    dt = time.perf_counter() - t0
+    n = out["thrust"].size
+    print(f"{n} puntos en {dt:.3f} s ({n/dt/1e6:.1f} M puntos/s)")
+    ok = feasible(out, P, grid=grid)
+    print(f"Puntos que pasan validate_design (analítico): {ok.sum()} de {n}")
+    base = evaluate(P)
+    for key in ("thrust", "isp", "mass_flow", "heat_flux", "coolant_velocity", "reynolds",
+                "wall_temperature", "structural_margin"):
+        print(f"  {key}: {float(base[key]):.6g}")
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Optimizador de diseño de la tobera refrigerada (RocketCooledNozzle.py).
+
+Minimiza la masa de pared (calculate_wall_volume * 8960 kg/m³) sujeta a las
+comprobaciones de validate_design():
+
+- rasgo mínimo   : wall_thickness_throat y ligament_min_throat >= min_feature
+- térmica        : calculate_wall_temperature() <= 1200 K
+- estructural    : calculate_structural_margin() >= 1.5
+- refrigeración  : calculate_channel_velocity() <= 50 m/s
+- y además que los canales de place_channels quepan en la pared:
+  ligamento + altura + min_feature de cierre <= espesor mínimo, y
+  num_helices*4 canales en la circunferencia de garganta
+
+Todo se evalúa con el modelo vectorizado (nozzle_model), sin geometría OCC.
+La búsqueda es de entropía cruzada (como shield_optimizer) con varios
+reinicios independientes repartidos en un pool de procesos. Los candidatos
+se ordenan por reglas de factibilidad: primero los factibles por masa,
+después los infactibles por violación total. El frente de Pareto
+masa / potencia de bombeo se acumula con todos los puntos evaluados.
+build_nozzle() solo se llama una vez, con el diseño final.
+"""
+
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+import nozzle_model
+
+# Variables de diseño y límites [mm]
+DESIGN_BOUNDS = {
+    "wall_thickness_throat": (0.6, 6.0),
+    "wall_thickness_convergent": (0.6, 6.0),
+    "wall_thickness_div_start": (0.6, 6.0),
+    "wall_thickness_div_end": (0.6, 6.0),
+    "channel_base": (0.6, 8.0),
+    "channel_height": (0.6, 8.0),
+    "channel_top": (0.6, 10.0),
+    "ligament_min_throat": (0.6, 3.0),
+}
+
+# Límites de validate_design()
+DEFAULT_LIMITS = {
+    "max_wall_temperature": 1200.0,
+    "min_structural_margin": 1.5,
+    "max_channel_velocity": 50.0,
+}
+
+CONSTRAINTS = ("wall_min_feature", "ligament_min_feature", "channel_fit", "channel_spacing",
+               "wall_temperature", "structural_margin", "channel_velocity")
+
+_WALL_KEYS = ("wall_thickness_throat", "wall_thickness_convergent",
+              "wall_thickness_div_start", "wall_thickness_div_end")
+
+
+def constraint_violations(out, d, P, limits=None):
+    """Violaciones normalizadas (>= 0, 0 = cumple), forma (N, len(CONSTRAINTS))."""
+    lim = dict(DEFAULT_LIMITS)
+    lim.update(limits or {})
+    v = {k: d.get(k, P[k]) for k in _WALL_KEYS + ("ligament_min_throat", "channel_height",
+                                                  "channel_base", "channel_top", "throat_diameter",
+                                                  "num_helices")}
+    mf = P["min_feature"]
+    t_min = np.minimum.reduce(np.broadcast_arrays(*[np.asarray(v[k], dtype=float) for k in _WALL_KEYS]))
+    ring = 2 * np.pi * (v["throat_diameter"] / 2 + v["ligament_min_throat"])
+    width = v["num_helices"] * 4 * np.maximum(v["channel_base"], v["channel_top"])
+    cols = [
+        (mf - v["wall_thickness_throat"]) / mf,
+        (mf - v["ligament_min_throat"]) / mf,
+        (v["ligament_min_throat"] + v["channel_height"] + mf - t_min) / mf,
+        width / ring - 1.0,
+        (out["wall_temperature"] - lim["max_wall_temperature"]) / lim["max_wall_temperature"],
+        (lim["min_structural_margin"] - out["structural_margin"]) / lim["min_structural_margin"],
+        out["coolant_velocity"] / lim["max_channel_velocity"] - 1.0,
+    ]
+    n = out["mass"].shape[0]
+    return np.clip(np.stack([np.broadcast_to(c, (n,)) for c in cols], axis=1), 0.0, None)
+
+
+def _evaluate(P, names, X, constants, limits):
+    d = {n: X[:, i] for i, n in enumerate(names)}
+    out = nozzle_model.evaluate(P, **d, **constants)
+    viol = constraint_violations(out, d, P, limits)
+    return out, viol
+
+
+def _rank_key(mass, total_viol):
+    # Factibles primero (por masa), después infactibles por violación
+    return np.where(total_viol > 0, 1e12 + total_viol, mass)
+
+
+def pareto_front(f1, f2):
+    """Índices no dominados minimizando (f1, f2)."""
+    order = np.lexsort((f2, f1))
+    best = np.minimum.accumulate(f2[order])
+    keep = np.concatenate(([True], f2[order][1:] < best[:-1]))
+    return order[keep]
+
+
+def _restart(args):
+    """Un reinicio de entropía cruzada (función de nivel superior para el pool de procesos)."""
+    P, names, bounds, constants, limits, n_candidates, rounds, elite_frac, seed = args
+    rng = np.random.default_rng(seed)
+    lo, hi = bounds[:, 0], bounds[:, 1]
+    n_elite = max(8, int(n_candidates * elite_frac))
+    mean, std = None, None
+    best = None
+    archive_X, archive_f = [], []
+    for rnd in range(rounds):
+        if mean is None:
+            X = rng.uniform(lo, hi, (n_candidates, len(names)))
+        else:
+            X = np.clip(mean + rng.normal(0.0, 1.0, (n_candidates, len(names))) * std, lo, hi)
+        out, viol = _evaluate(P, names, X, constants, limits)
+        total = viol.sum(axis=1)
+        key = _rank_key(out["mass"], total)
+        idx = np.argpartition(key, min(n_elite, len(key) - 1))[:n_elite]
+        elite = X[idx]
+        mean = elite.mean(axis=0)
+        std = np.maximum(elite.std(axis=0), (hi - lo) * 1e-4)
+        i = idx[np.argmin(key[idx])]
+        if best is None or key[i] < best[0]:
+            best = (key[i], X[i].copy(), float(out["mass"][i]), viol[i].copy())
+        # Archivo para Pareto: no dominados de la ronda (masa, bombeo), solo factibles
+        ok = total <= 0
+        if ok.any():
+            sub = np.flatnonzero(ok)
+            keep = sub[pareto_front(out["mass"][sub], out["pump_power"][sub])]
+            archive_X.append(X[keep])
+            archive_f.append(np.stack([out["mass"][keep], out["pump_power"][keep]], axis=1))
+    arch_X = np.concatenate(archive_X) if archive_X else np.empty((0, len(names)))
+    arch_f = np.concatenate(archive_f) if archive_f else np.empty((0, 2))
+    return {"x": best[1], "mass": best[2], "violations": best[3],
+            "evaluated": n_candidates * rounds, "archive_X": arch_X, "archive_f": arch_f}
+
+
+def optimize_nozzle(P=None, bounds=None, constants=None, limits=None, n_restarts=8,
+                    n_candidates=20000, rounds=12, elite_frac=0.02, workers=None,
+                    use_processes=True, seed=0):
+    """
+    Optimizar el diseño con varios reinicios en paralelo.
+
+    P         : parámetros base (por defecto los de la macro)
+    bounds    : {variable: (lo, hi)} (por defecto DESIGN_BOUNDS)
+    constants : sobrescribe SCALAR_CONSTANTS del modelo (Pc, Tc, E...)
+    limits    : sobrescribe DEFAULT_LIMITS
+
+    Devuelve dict con el mejor diseño, violaciones por restricción y el
+    frente de Pareto (masa, potencia de bombeo) de los diseños factibles.
+    Si ningún candidato es factible, "feasible" es False y "design" es el de
+    mínima violación total, no un óptimo.
+    """
+    P = dict(P if P is not None else nozzle_model.load_nozzle_params())
+    bounds = dict(bounds or DESIGN_BOUNDS)
+    names = list(bounds)
+    B = np.array([bounds[n] for n in names], dtype=float)
+    constants = dict(constants or {})
+    tasks = [(P, names, B, constants, limits, n_candidates, rounds, elite_frac, seed + i)
+             for i in range(n_restarts)]
+
+    t0 = time.perf_counter()
+    pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with pool(max_workers=workers) as ex:
+        results = list(ex.map(_restart, tasks))
+    elapsed = time.perf_counter() - t0
+
+    keys = [_rank_key(np.array([r["mass"]]), np.array([r["violations"].sum()]))[0] for r in results]
+    best = results[int(np.argmin(keys))]
+    design = {n: float(v) for n, v in zip(names, best["x"])}
+
+    arch_X = np.concatenate([r["archive_X"] for r in results])
+    arch_f = np.concatenate([r["archive_f"] for r in results])
+    front = []
+    if len(arch_f):
+        for i in pareto_front(arch_f[:, 0], arch_f[:, 1]):
+            row = {n: float(v) for n, v in zip(names, arch_X[i])}
+            row["mass_kg"] = float(arch_f[i, 0])
+            row["pump_power_W"] = float(arch_f[i, 1])
+            front.append(row)
+
+    baseline_X = np.array([[P[n] for n in names]], dtype=float)
+    base_out, base_viol = _evaluate(P, names, baseline_X, constants, limits)
+    evaluated = sum(r["evaluated"] for r in results)
+    return {
+        "design": design,
+        "mass_kg": best["mass"],
+        "feasible": bool(best["violations"].sum() <= 0),
+        "violations": dict(zip(CONSTRAINTS, map(float, best["violations"]))),
+        "baseline_mass_kg": float(base_out["mass"][0]),
+        "baseline_violations": dict(zip(CONSTRAINTS, map(float, base_viol[0]))),
+        "pareto": front,
+        "evaluated": evaluated,
+        "evaluations_per_s": evaluated / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def export_pareto_csv(result, path="RocketNozzle_Pareto.csv"):
+    """Escribir el frente de Pareto (una fila por diseño) en CSV."""
+    front = result["pareto"]
+    if not front:
+        return None
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(front[0]))
+        writer.writeheader()
+        writer.writerows(front)
+    return os.path.abspath(path)
+
+
+def build_final(result, namespace, allow_infeasible=False):
+    """
+    Aplicar el diseño al P de la macro y construir la geometría una única vez.
+    namespace: globals de RocketCooledNozzle cargado en FreeCAD (vars(módulo)).
+    Un diseño infactible solo se construye con allow_infeasible=True.
+    """
+    if not result["feasible"] and not allow_infeasible:
+        bad = ", ".join(k for k, v in result["violations"].items() if v > 0)
+        raise ValueError(f"Ningún candidato cumple las restricciones ({bad}); "
+                         "usar allow_infeasible=True para construir el de mínima violación")
+    namespace["P"].update(result["design"])
+    return namespace["build_nozzle"]()
+
+
+def print_result(result):
+    label = "óptima" if result["feasible"] else "mínima violación (infactible)"
+    print(f"Masa base: {result['baseline_mass_kg']:.3f} kg -> {label}: {result['mass_kg']:.3f} kg")
+    print("Diseño: " + ", ".join(f"{k}={v:.2f}" for k, v in result["design"].items()))
+    if result["feasible"]:
+        print("✓ Cumple todas las restricciones de validate_design")
+    else:
+        bad = {k: v for k, v in result["violations"].items() if v > 0}
+        print("⚠ Ningún diseño factible en los límites; violaciones del mejor candidato:")
+        for k, v in bad.items():
+            print(f"   {k}: {v:.3g}")
+    print(f"Frente de Pareto: {len(result['pareto'])} diseños; "
+          f"{result['evaluated']} evaluaciones ({result['evaluations_per_s']:.0f}/s)")
+
+
+if __name__ == "__main__":
+    res = optimize_nozzle()
+    print_result(res)
+    bad = [k for k, v in res["baseline_violations"].items() if v > 0]
+    if bad:
+        print("El diseño de la macro incumple: " + ", ".join(bad))
+    path = export_pareto_csv(res)
+    if path:
+        print(f"Pareto exportado a {path}")
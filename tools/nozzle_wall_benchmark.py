@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Comparativa de la pared de espesor variable de RocketCooledNozzle.py.
+
+- anillos : método anterior de make_variable_thickness_solid (20 anillos
+            de 1 mm cortados y fusionados uno a uno, con huecos entre ellos)
+- revolución : make_revolved_wall() actual, un perfil meridional cerrado
+            revolucionado una vez, con muestreo adaptativo por curvatura
+
+Para cada método se mide tiempo, número de caras, volumen y validez del
+sólido, y el volumen se compara con la integral π∫(ro² - ri²)dx del perfil.
+Para la revolución se barre la tolerancia de muestreo (la suavidad sale del
+número de estaciones, no de más booleanas).
+
+Uso (FreeCAD o FreeCADCmd, con tools/ en sys.path):
+    import nozzle_wall_benchmark; nozzle_wall_benchmark.main()
+"""
+
+import math
+import os
+import time
+
+MACRO = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                     "Carbon_shields", "python", "parameters", "RocketCooledNozzle.py")
+
+
+def load_macro(path=MACRO):
+    """Ejecutar la macro sin su bloque __main__ y devolver sus globals."""
+    ns = {"__name__": "RocketCooledNozzle", "__file__": path}
+    with open(path, encoding="utf-8") as f:
+        exec(compile(f.read(), path, "exec"), ns)
+    return ns
+
+
+def ring_wall(ns, sections=20):
+    """Reproducción del método de anillos anterior (referencia de la comparativa)."""
+    import Part
+    from FreeCAD import Base
+    P = ns["P"]
+    L = P["nozzle_length"]
+    rings = []
+    for i in range(sections):
+        x = i * L / (sections - 1)
+        t_inner = ns["wall_thickness_at_x"](x, L)
+        if x <= P["throat_diameter"] / 2 / math.tan(math.radians(P["convergent_angle"])):
+            r_outer = P["exit_diameter"] / 2
+        else:
+            r_outer = P["throat_diameter"] / 2 + t_inner
+        ring_outer = Part.makeCylinder(r_outer, 1.0)
+        ring_inner = Part.makeCylinder(r_outer - t_inner, 1.0)
+        if ring_outer.Volume > ring_inner.Volume:
+            ring = ring_outer.cut(ring_inner)
+            ring.Placement = Base.Placement(Base.Vector(x, 0, 0), Base.Rotation())
+            rings.append(ring)
+    solid = rings[0]
+    for ring in rings[1:]:
+        solid = solid.fuse(ring)
+    return solid
+
+
+def wall_volume_reference(ns, n=20000):
+    """π∫(ro² - ri²)dx sobre el perfil (trapecios, mm³)."""
+    r_inner, x0, x1 = ns["profile_radius_function"]()
+    P = ns["P"]
+    L = P["nozzle_length"]
+    h = (x1 - x0) / n
+    total = 0.0
+    for i in range(n + 1):
+        x = x0 + i * h
+        ri = r_inner(x)
+        ro = ri + ns["wall_thickness_at_x"]((x - x0) / (x1 - x0) * L, L)
+        w = 0.5 if i in (0, n) else 1.0
+        total += w * (ro * ro - ri * ri)
+    return math.pi * total * h
+
+
+def _measure(build, repeats):
+    best = float("inf")
+    shape = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        shape = build()
+        best = min(best, time.perf_counter() - t0)
+    return shape, best
+
+
+def run(ns=None, tolerances=(0.1, 0.01, 0.001), repeats=3):
+    """Filas {method, tol, stations, time_s, faces, volume, valid, volume_error}."""
+    ns = ns or load_macro()
+    ref = wall_volume_reference(ns)
+    rows = []
+
+    shape, dt = _measure(lambda: ring_wall(ns), repeats)
+    rows.append({"method": "anillos", "tol": None, "stations": 20, "time_s": dt,
+                 "faces": len(shape.Faces), "volume": shape.Volume, "valid": shape.isValid(),
+                 "volume_error": shape.Volume / ref - 1.0})
+
+    r_inner, x0, x1 = ns["profile_radius_function"]()
+    for tol in tolerances:
+        shape, dt = _measure(lambda: ns["make_variable_thickness_solid"](tol=tol), repeats)
+        L = ns["P"]["nozzle_length"]
+        r_outer = lambda x: r_inner(x) + ns["wall_thickness_at_x"]((x - x0) / (x1 - x0) * L, L)
+        stations = len(ns["adaptive_samples"]((r_inner, r_outer), x0, x1, tol))
+        rows.append({"method": "revolución", "tol": tol, "stations": stations, "time_s": dt,
+                     "faces": len(shape.Faces), "volume": shape.Volume, "valid": shape.isValid(),
+                     "volume_error": shape.Volume / ref - 1.0})
+    return rows
+
+
+def print_rows(rows):
+    print(f"{'método':<11} {'tol':>7} {'est.':>5} {'tiempo':>9} {'caras':>6} {'error vol.':>11} válido")
+    for r in rows:
+        tol = f"{r['tol']:g}" if r["tol"] is not None else "-"
+        print(f"{r['method']:<11} {tol:>7} {r['stations']:>5} {r['time_s']*1e3:>7.1f}ms "
+              f"{r['faces']:>6} {r['volume_error']:>+10.2%} {'sí' if r['valid'] else 'no'}")
+
+
+def main():
+    print_rows(run())
+
+
+if __name__ == "__main__":
+    main()
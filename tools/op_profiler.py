@@ -0,0 +1,406 @@
+# -*- coding: utf-8 -*-
+"""
+Perfilador de operaciones de Part: booleanas, redondeos, offsets, lofts,
+barridos y teselado, con traza para chrome://tracing / Perfetto.
+
+No se ve dónde se va el tiempo de construcción: ¿el fuse de
+build_modular_space_station, el makeFillet de CentralTruss.build o el
+makeOffsetShape de make_hollow_from_offset? Con el perfilador activo cada
+llamada registra:
+
+    operación, categoría, duración, caras/aristas de los operandos y del
+    resultado, éxito o excepción, el constructor de la macro que la hizo
+    (la función de macro más externa, no el ayudante fuse_list o
+    refine_shape) y la función que la llamó directamente
+
+Activación (solo entonces hay coste; desactivado no queda ningún gancho):
+- Métodos de Part.Shape y subclases: se envuelven si el tipo lo permite;
+  si son tipos inmutables se usa sys.setprofile filtrando los eventos
+  c_call/c_return de esos métodos (en ese modo el resultado no es visible
+  y su tamaño queda vacío).
+- Funciones de módulo (Part.makeLoft, Part.makeSweepSurface...,
+  MeshPart.meshFromShape): siempre envueltas.
+- builders=True añade como tramos de la traza las funciones de las macros
+  (.FCMacro y rutas en `sources`), para ver cada operación dentro de su
+  constructor. Desactivado por defecto: obliga a usar sys.setprofile, que
+  se llama en cada función Python y alarga los tiempos medidos.
+- Los ganchos de perfilado previos (sys y threading) se restauran al
+  desactivar.
+
+Uso en FreeCAD con tools/ en sys.path:
+    import op_profiler
+    with op_profiler.OpProfiler() as prof:
+        exec(open(macro).read(), {"__name__": "__main__", "__file__": macro})
+    prof.save_trace("build.trace.json")
+    prof.print_hotspots()
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+# Método u función -> categoría
+OPERATIONS = {
+    "fuse": "boolean", "cut": "boolean", "common": "boolean", "section": "boolean",
+    "multiFuse": "boolean", "generalFuse": "boolean", "slice": "boolean", "slices": "boolean",
+    "makeFillet": "fillet", "makeChamfer": "fillet",
+    "makeOffsetShape": "offset", "makeOffset2D": "offset", "makeThickness": "offset",
+    "makeLoft": "loft", "makeRuledSurface": "loft",
+    "makePipe": "sweep", "makePipeShell": "sweep", "makeSweepSurface": "sweep",
+    "revolve": "sweep", "extrude": "sweep",
+    "tessellate": "tessellate", "meshFromShape": "tessellate",
+    "removeSplitter": "refine",
+}
+
+# Puntos de entrada de las macros: llamados desde el nivel de módulo, no son constructores
+ENTRY_POINTS = ("main",)
+
+SHAPE_CLASSES = ("Shape", "Solid", "CompSolid", "Compound", "Shell", "Face", "Wire", "Edge")
+PART_FUNCTIONS = ("makeLoft", "makeRuledSurface", "makeSweepSurface")
+
+
+def _source(path):
+    """Ruta absoluta del fuente: .pyc/.pyo sin compilar apuntan a su .py."""
+    path = os.path.abspath(path)
+    return path[:-1] if path.endswith((".pyc", ".pyo")) else path
+
+
+_THIS = _source(__file__)
+
+
+# ========================
+# Medidas de operandos
+# ========================
+def _count(shape, kind, attr):
+    try:
+        return shape.countElement(kind)
+    except Exception:
+        try:
+            return len(getattr(shape, attr))
+        except Exception:
+            return None
+
+
+def shape_size(obj, shape_type):
+    """(caras, aristas) de una forma o de las formas de una lista/tupla; None si no hay."""
+    if isinstance(obj, shape_type):
+        return _count(obj, "Face", "Faces") or 0, _count(obj, "Edge", "Edges") or 0
+    if isinstance(obj, (list, tuple)):
+        sizes = [shape_size(o, shape_type) for o in obj[:256]]
+        sizes = [s for s in sizes if s is not None]
+        if sizes:
+            return sum(s[0] for s in sizes), sum(s[1] for s in sizes)
+    return None
+
+
+def _caller(frame, is_source=None):
+    """
+    (nombre, fichero, línea) de la función que hizo la operación.
+
+    Sin is_source es la primera función fuera de este módulo. Con is_source
+    (fichero -> bool) se sube hasta la función de macro más externa por
+    debajo del nivel de módulo: en main() -> make_flange_and_bolts() ->
+    fuse_list() -> refine_shape() el constructor es make_flange_and_bolts,
+    no el ayudante. Un main() (ENTRY_POINTS) cuenta como nivel de módulo si
+    hay otra función de macro dentro. Si no hay marcos de macro, la primera
+    función fuera de este módulo.
+    """
+    while frame is not None and _source(frame.f_code.co_filename) == _THIS:
+        frame = frame.f_back
+    if frame is None:
+        return ("?", "?", 0)
+    if is_source is not None:
+        macro = []
+        f = frame
+        while f is not None:
+            if f.f_code.co_name != "<module>" and is_source(f.f_code.co_filename):
+                macro.append(f)
+            f = f.f_back
+        while len(macro) > 1 and macro[-1].f_code.co_name in ENTRY_POINTS:
+            macro.pop()
+        if macro:
+            frame = macro[-1]
+    return (frame.f_code.co_name, os.path.basename(frame.f_code.co_filename), frame.f_lineno)
+
+
+# ========================
+# Perfilador
+# ========================
+class OpProfiler:
+    """Registro de operaciones de Part mientras está activo (enable/disable o with)."""
+
+    def __init__(self, counts=True, builders=False, sources=(), mode="auto"):
+        self.counts = counts
+        self.builders = builders
+        self.sources = {os.path.abspath(s) for s in sources}
+        self.mode = mode
+        self.events = []
+        self.active = False
+        self._patched = []
+        self._local = threading.local()
+        self._t0 = time.perf_counter_ns()
+        self._tids = {}
+        self._shape_type = None
+        self._hooked = False
+        self._prev_hooks = (None, None)
+        self._methods_patched = False
+
+    # --- Activación ---
+    def enable(self):
+        import Part
+        self._shape_type = Part.Shape
+        self.active = True
+        self._t0 = time.perf_counter_ns()
+        methods_ok = self.mode != "profile" and self._patch_methods(Part)
+        self._methods_patched = methods_ok
+        self._patch_functions(Part)
+        try:
+            import MeshPart
+            self._patch(MeshPart, "meshFromShape", self._wrap_function)
+        except ImportError:
+            pass
+        if not methods_ok or self.builders:
+            self._hooked = True
+            self._prev_hooks = (sys.getprofile(), getattr(threading, "getprofile", lambda: None)())
+            sys.setprofile(self._hook)
+            threading.setprofile(self._hook)
+        return self
+
+    def disable(self):
+        self.active = False
+        if self._hooked:
+            sys.setprofile(self._prev_hooks[0])
+            threading.setprofile(self._prev_hooks[1])
+            self._prev_hooks = (None, None)
+            self._hooked = False
+        for owner, name, orig in reversed(self._patched):
+            setattr(owner, name, orig)
+        self._patched = []
+        self._methods_patched = False
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    def _patch(self, owner, name, wrapper):
+        orig = owner.__dict__.get(name) if isinstance(owner, type) else getattr(owner, name, None)
+        if orig is None:
+            return True
+        try:
+            setattr(owner, name, wrapper(orig, name))
+        except (TypeError, AttributeError):
+            return False
+        self._patched.append((owner, name, orig))
+        return True
+
+    def _patch_methods(self, Part):
+        """Envolver los métodos propios de cada clase de forma; False si algún tipo es inmutable."""
+        ok = True
+        for cls_name in SHAPE_CLASSES:
+            cls = getattr(Part, cls_name, None)
+            if cls is None:
+                continue
+            for name in OPERATIONS:
+                if name in cls.__dict__ and not self._patch(cls, name, self._wrap_method):
+                    ok = False
+        if not ok:
+            # Mezclar modos duplicaría registros: todo por sys.setprofile
+            for owner, name, orig in reversed([p for p in self._patched if isinstance(p[0], type)]):
+                setattr(owner, name, orig)
+            self._patched = [p for p in self._patched if not isinstance(p[0], type)]
+        return ok
+
+    def _patch_functions(self, Part):
+        for name in PART_FUNCTIONS:
+            self._patch(Part, name, self._wrap_function)
+
+    # --- Registro ---
+    def _tid(self):
+        ident = threading.get_ident()
+        if ident not in self._tids:
+            self._tids[ident] = len(self._tids) + 1
+        return self._tids[ident]
+
+    def _record(self, op, t_start, t_end, operands, result, ok, frame, error=None):
+        builder = _caller(frame, self._is_source)
+        ev = {"op": op, "cat": OPERATIONS.get(op, "other"), "ts": t_start, "dur": t_end - t_start,
+              "ok": ok, "builder": builder[0], "file": builder[1], "line": builder[2],
+              "caller": _caller(frame)[0], "tid": self._tid()}
+        if operands is not None:
+            ev["in_faces"], ev["in_edges"] = operands
+        if self.counts and result is not None:
+            size = shape_size(result, self._shape_type)
+            if size is not None:
+                ev["out_faces"], ev["out_edges"] = size
+        if error is not None:
+            ev["error"] = error
+        self.events.append(ev)
+
+    def _operands(self, self_obj, args):
+        if not self.counts:
+            return None
+        return shape_size(((self_obj,) if self_obj is not None else ()) + tuple(args), self._shape_type)
+
+    def _wrap_method(self, orig, op):
+        prof = self
+
+        def wrapper(shape, *args, **kwargs):
+            if not prof.active:
+                return orig(shape, *args, **kwargs)
+            operands = prof._operands(shape, args)
+            t0 = time.perf_counter_ns()
+            try:
+                res = orig(shape, *args, **kwargs)
+            except Exception as e:
+                prof._record(op, t0, time.perf_counter_ns(), operands, None, False, sys._getframe(1),
+                             f"{type(e).__name__}: {e}")
+                raise
+            prof._record(op, t0, time.perf_counter_ns(), operands, res, True, sys._getframe(1))
+            return res
+
+        wrapper.__name__ = op
+        wrapper.__doc__ = getattr(orig, "__doc__", None)
+        return wrapper
+
+    def _wrap_function(self, orig, op):
+        prof = self
+
+        def wrapper(*args, **kwargs):
+            if not prof.active:
+                return orig(*args, **kwargs)
+            operands = prof._operands(None, args + tuple(v for k, v in kwargs.items() if k == "Shape"))
+            t0 = time.perf_counter_ns()
+            try:
+                res = orig(*args, **kwargs)
+            except Exception as e:
+                prof._record(op, t0, time.perf_counter_ns(), operands, None, False, sys._getframe(1),
+                             f"{type(e).__name__}: {e}")
+                raise
+            prof._record(op, t0, time.perf_counter_ns(), operands, res, True, sys._getframe(1))
+            return res
+
+        wrapper.__name__ = op
+        wrapper.__doc__ = getattr(orig, "__doc__", None)
+        return wrapper
+
+    # --- Modo sys.setprofile ---
+    def _is_source(self, filename):
+        if filename.lower().endswith(".fcmacro"):
+            return True
+        return bool(self.sources) and os.path.abspath(filename) in self.sources
+
+    def _hook(self, frame, event, arg):
+        local = self._local
+        if event == "c_call":
+            if self._methods_patched:
+                return
+            if getattr(arg, "__name__", None) in OPERATIONS:
+                target = getattr(arg, "__self__", None)
+                if isinstance(target, self._shape_type):
+                    stack = local.__dict__.setdefault("ops", [])
+                    operands = self._operands(target, ())
+                    stack.append((arg, operands, frame, time.perf_counter_ns()))
+        elif event in ("c_return", "c_exception"):
+            stack = getattr(local, "ops", None)
+            if stack and stack[-1][0] is arg:
+                fn, operands, caller, t0 = stack.pop()
+                self._record(fn.__name__, t0, time.perf_counter_ns(), operands, None,
+                             event == "c_return", caller)
+        elif self.builders and event == "call":
+            if self._is_source(frame.f_code.co_filename):
+                spans = local.__dict__.setdefault("spans", [])
+                spans.append((frame, time.perf_counter_ns()))
+        elif self.builders and event == "return":
+            spans = getattr(local, "spans", None)
+            if spans and spans[-1][0] is frame:
+                _, t0 = spans.pop()
+                self.events.append({"op": frame.f_code.co_name, "cat": "builder", "ts": t0,
+                                    "dur": time.perf_counter_ns() - t0, "ok": True,
+                                    "builder": frame.f_code.co_name,
+                                    "file": os.path.basename(frame.f_code.co_filename),
+                                    "line": frame.f_code.co_firstlineno, "tid": self._tid()})
+
+    # --- Salidas ---
+    def operations(self):
+        return [e for e in self.events if e["cat"] != "builder"]
+
+    def trace(self):
+        """Diccionario Chrome Trace Event Format (eventos completos "X", tiempos en µs)."""
+        pid = os.getpid()
+        out = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": f"hilo {tid}"}}
+               for tid in self._tids.values()]
+        for e in sorted(self.events, key=lambda e: (e["ts"], -e["dur"])):
+            args = {k: e[k] for k in ("builder", "file", "line", "caller", "ok", "in_faces", "in_edges",
+                                      "out_faces", "out_edges", "error") if k in e}
+            out.append({"name": e["op"], "cat": e["cat"], "ph": "X", "pid": pid, "tid": e["tid"],
+                        "ts": (e["ts"] - self._t0) / 1000.0, "dur": e["dur"] / 1000.0, "args": args})
+        return {"traceEvents": out, "displayTimeUnit": "ms"}
+
+    def save_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.trace(), f)
+        return path
+
+    def hotspots(self, by_builder=True):
+        """Filas agregadas por (operación, constructor), de más a menos tiempo."""
+        agg = {}
+        ops = self.operations()
+        total = sum(e["dur"] for e in ops) or 1
+        for e in ops:
+            key = (e["op"], e["builder"] if by_builder else "", e["file"] if by_builder else "")
+            a = agg.setdefault(key, {"op": e["op"], "cat": e["cat"], "builder": key[1], "file": key[2],
+                                     "calls": 0, "total_ms": 0.0, "max_ms": 0.0, "failures": 0,
+                                     "in_faces": 0, "out_faces": 0})
+            ms = e["dur"] / 1e6
+            a["calls"] += 1
+            a["total_ms"] += ms
+            a["max_ms"] = max(a["max_ms"], ms)
+            a["failures"] += 0 if e["ok"] else 1
+            a["in_faces"] += e.get("in_faces", 0)
+            a["out_faces"] += e.get("out_faces", 0)
+        rows = sorted(agg.values(), key=lambda a: -a["total_ms"])
+        for a in rows:
+            a["mean_ms"] = a["total_ms"] / a["calls"]
+            a["share"] = a["total_ms"] * 1e6 / total
+        return rows
+
+    def print_hotspots(self, limit=20, by_builder=True):
+        rows = self.hotspots(by_builder)
+        print(f"{'Operación':<18}{'Constructor':<36}{'Llam.':>7}{'Total ms':>11}{'Media ms':>10}"
+              f"{'Máx ms':>10}{'%':>7}{'Fallos':>8}{'Caras ent.':>12}")
+        for a in rows[:limit]:
+            where = f"{a['builder']} ({a['file']})" if by_builder else "-"
+            where = where if len(where) <= 34 else where[:31] + "..."
+            print(f"{a['op']:<18}{where:<36}{a['calls']:>7}{a['total_ms']:>11.1f}{a['mean_ms']:>10.2f}"
+                  f"{a['max_ms']:>10.1f}{a['share']:>7.1%}{a['failures']:>8}{a['in_faces'] / a['calls']:>12.0f}")
+        ops = self.operations()
+        print(f"{len(ops)} operaciones, {sum(e['dur'] for e in ops) / 1e9:.2f} s en Part")
+
+
+def profile_macro(path, trace_path=None, **kwargs):
+    """Ejecutar una macro como __main__ con el perfilador; guarda la traza junto a ella por defecto."""
+    prof = OpProfiler(sources=[path], **kwargs)
+    with open(path, encoding="utf-8", errors="replace") as f:
+        code = compile(f.read(), path, "exec")
+    with prof:
+        try:
+            exec(code, {"__name__": "__main__", "__file__": path})
+        except SystemExit:
+            pass
+    prof.save_trace(trace_path or os.path.splitext(path)[0] + ".trace.json")
+    return prof
+
+
+if __name__ == "__main__":
+    # FreeCADCmd tools/op_profiler.py <macro> [traza.json]  (o OP_PROFILE_MACRO=<macro>)
+    args = [a for a in sys.argv[1:] if not a.endswith("op_profiler.py")]
+    macro = args[0] if args else os.environ.get("OP_PROFILE_MACRO")
+    if not macro:
+        print("Uso: FreeCADCmd tools/op_profiler.py <macro> [traza.json]")
+    else:
+        p = profile_macro(os.path.abspath(macro), args[1] if len(args) > 1 else None)
+        p.print_hotspots()
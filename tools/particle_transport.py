@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Transporte 1-D de espectros de partículas (protones/electrones) a través de capas.
+
+Modelo de frenado continuo (CSDA): para cada capa de material m y densidad
+areal x [g/cm²] la energía de salida es
+
+    E_out = R_m⁻¹( R_m(E_in) - x )        (0 si la partícula se detiene)
+
+con tablas rango-energía R_m(E). Las tablas de agua (PSTAR/ESTAR, valores
+aproximados) se escalan por material con la relación R_m/R_agua; se pueden
+sustituir por tablas propias con RangeTable.from_points(). Para protones se
+añade opcionalmente la pérdida por interacciones nucleares exp(-x/lambda).
+
+Todo está vectorizado sobre bins de energía y sobre pilas candidatas:
+las capas se aplican en orden (cara solar -> interior) sobre arrays (S, B).
+Las pilas se leen directamente de las macros con tps_stack.
+
+Unidades: MeV, mm, kg/m³; densidad areal en g/cm².
+"""
+
+import math
+
+import numpy as np
+
+import tps_stack
+from tps_stack import thickness_sweep
+
+# Rango CSDA en agua [g/cm²] (PSTAR / ESTAR, redondeado)
+_PROTON_WATER = (
+    (0.1, 1.43e-4), (0.5, 8.9e-4), (1.0, 2.46e-3), (2.0, 7.49e-3), (5.0, 3.62e-2),
+    (10.0, 0.123), (20.0, 0.426), (50.0, 2.22), (100.0, 7.72), (200.0, 25.96),
+    (500.0, 117.0), (1000.0, 325.0),
+)
+_ELECTRON_WATER = (
+    (0.01, 2.5e-4), (0.05, 4.3e-3), (0.1, 1.43e-2), (0.2, 4.49e-2), (0.5, 0.177),
+    (1.0, 0.437), (2.0, 0.979), (5.0, 2.55), (10.0, 4.98), (20.0, 9.32),
+    (50.0, 19.8), (100.0, 32.5),
+)
+
+# Relación de rango R_material / R_agua (en g/cm²)
+RANGE_SCALE = {
+    'proton': {
+        'WATER': 1.00, 'POLYETHYLENE': 0.89, 'CARBON': 1.12, 'CARBON_CARBON': 1.12,
+        'CARBON_FOAM': 1.12, 'BORON': 1.10, 'ALUMINUM': 1.27, 'AL2O3': 1.20,
+        'TITANIUM': 1.40, 'STEEL': 1.48, 'TUNGSTEN': 1.88, 'LEAD': 1.92,
+        'LITHIUM_HYDRIDE': 0.92,
+    },
+    'electron': {
+        'WATER': 1.00, 'POLYETHYLENE': 0.94, 'CARBON': 1.11, 'CARBON_CARBON': 1.11,
+        'CARBON_FOAM': 1.11, 'BORON': 1.09, 'ALUMINUM': 1.20, 'AL2O3': 1.16,
+        'TITANIUM': 1.30, 'STEEL': 1.36, 'TUNGSTEN': 1.55, 'LEAD': 1.60,
+        'LITHIUM_HYDRIDE': 0.98,
+    },
+}
+
+# Longitud de interacción nuclear de protones [g/cm²]
+NUCLEAR_LENGTH = {
+    'WATER': 83.6, 'POLYETHYLENE': 78.5, 'CARBON': 85.8, 'CARBON_CARBON': 85.8,
+    'CARBON_FOAM': 85.8, 'BORON': 86.0, 'ALUMINUM': 107.2, 'AL2O3': 100.0,
+    'TITANIUM': 126.2, 'STEEL': 132.1, 'TUNGSTEN': 191.9, 'LEAD': 199.6,
+    'LITHIUM_HYDRIDE': 80.0,
+}
+
+
+class RangeTable:
+    """Tabla rango-energía log-log con inversión por interpolación."""
+
+    def __init__(self, energies, ranges):
+        self.log_e = np.log(np.asarray(energies, dtype=float))
+        self.log_r = np.log(np.asarray(ranges, dtype=float))
+        if np.any(np.diff(self.log_e) <= 0) or np.any(np.diff(self.log_r) <= 0):
+            raise ValueError("La tabla rango-energía debe ser creciente")
+
+    @classmethod
+    def from_points(cls, points, scale=1.0):
+        e, r = zip(*points)
+        return cls(e, np.asarray(r) * scale)
+
+    def range(self, energy):
+        """R(E) [g/cm²]; extrapolación log-log en los extremos."""
+        le = np.log(np.maximum(energy, 1e-12))
+        return np.exp(self._interp(le, self.log_e, self.log_r))
+
+    def energy(self, rng):
+        """E(R) [MeV]; 0 para rangos no positivos."""
+        r = np.asarray(rng, dtype=float)
+        lr = np.log(np.maximum(r, 1e-300))
+        e = np.exp(self._interp(lr, self.log_r, self.log_e))
+        return np.where(r > 0, e, 0.0)
+
+    @staticmethod
+    def _interp(x, xp, fp):
+        y = np.interp(x, xp, fp)
+        lo_slope = (fp[1] - fp[0]) / (xp[1] - xp[0])
+        hi_slope = (fp[-1] - fp[-2]) / (xp[-1] - xp[-2])
+        y = np.where(x < xp[0], fp[0] + (x - xp[0]) * lo_slope, y)
+        return np.where(x > xp[-1], fp[-1] + (x - xp[-1]) * hi_slope, y)
+
+
+def range_tables(materials, particle="proton"):
+    """RangeTable por material a partir de la tabla de agua escalada."""
+    base = _PROTON_WATER if particle == "proton" else _ELECTRON_WATER
+    scale = RANGE_SCALE[particle]
+    return {m: RangeTable.from_points(base, scale.get(m, 1.0)) for m in materials}
+
+
+# ========================
+# Espectros
+# ========================
+def energy_grid(e_min=1.0, e_max=1000.0, n_bins=120):
+    """Bordes logarítmicos y centros geométricos de los bins."""
+    edges = np.geomspace(e_min, e_max, n_bins + 1)
+    return edges, np.sqrt(edges[:-1] * edges[1:])
+
+
+def spe_spectrum(edges, e0=30.0, fluence=1e9, gamma=None):
+    """
+    Fluencia por bin [part/cm²] de un evento solar de partículas:
+    exponencial J0/E0 exp(-E/E0), o ley de potencias E^-gamma si se da gamma.
+    `fluence` es la fluencia integral por encima de edges[0].
+    """
+    lo, hi = edges[:-1], edges[1:]
+    if gamma is None:
+        cum = np.exp(-lo / e0) - np.exp(-hi / e0)
+        total = math.exp(-edges[0] / e0)
+    else:
+        g = 1.0 - gamma
+        cum = (hi ** g - lo ** g) / g
+        total = -edges[0] ** g / g
+    return fluence * cum / total
+
+
+# ========================
+# Pilas candidatas
+# ========================
+def stack_arrays(stacks):
+    """
+    Lista de pilas (listas de capas) -> (materiales (L,), mat_idx (S, L), areal (S, L) g/cm²).
+    Pilas más cortas se rellenan con capas de espesor cero.
+    """
+    materials = sorted({layer["material"] for st in stacks for layer in st})
+    index = {m: i for i, m in enumerate(materials)}
+    n_layers = max(len(st) for st in stacks)
+    mat = np.zeros((len(stacks), n_layers), dtype=np.int64)
+    areal = np.zeros((len(stacks), n_layers))
+    for s, st in enumerate(stacks):
+        for j, layer in enumerate(st):
+            mat[s, j] = index[layer["material"]]
+            # mm * kg/m³ -> g/cm²: (t/10 cm) * (rho/1000 g/cm³)
+            areal[s, j] = layer["t"] * layer["rho"] * 1e-4
+    return materials, mat, areal
+
+
+# ========================
+# Transporte
+# ========================
+def transport(materials, mat_idx, areal, energies, particle="proton", nuclear=True, tables=None):
+    """
+    Energía de salida y peso superviviente de cada (pila, energía).
+
+    materials : nombres de material (índices de mat_idx)
+    mat_idx   : (S, L) índices de material por capa, en orden
+    areal     : (S, L) densidad areal [g/cm²]
+    energies  : (B,) energías de entrada [MeV]
+    Devuelve (E_out (S, B), weight (S, B)); E_out = 0 si se detiene.
+    """
+    tables = tables or range_tables(materials, particle)
+    tab = [tables[m] for m in materials]
+    S, L = mat_idx.shape
+    e = np.broadcast_to(np.asarray(energies, dtype=float), (S, len(energies))).copy()
+    w = np.ones_like(e)
+    for j in range(L):
+        x = areal[:, j:j + 1]
+        m_col = mat_idx[:, j]
+        for mi in np.unique(m_col):
+            rows = m_col == mi
+            r_left = tab[mi].range(e[rows]) - x[rows]
+            e[rows] = np.where(e[rows] > 0, tab[mi].energy(r_left), 0.0)
+            if nuclear and particle == "proton":
+                lam = NUCLEAR_LENGTH.get(materials[mi], 100.0)
+                w[rows] *= np.exp(-x[rows] / lam)
+    w = np.where(e > 0, w, 0.0)
+    return e, w
+
+
+def transmitted_spectrum(edges, fluence, materials, mat_idx, areal, particle="proton",
+                         nuclear=True, n_sub=4):
+    """
+    Espectro transmitido (S, B) en los mismos bins que el de entrada.
+    Cada bin se submuestrea con n_sub energías para suavizar el re-binning.
+    """
+    B = len(edges) - 1
+    frac = (np.arange(n_sub) + 0.5) / n_sub
+    lo, hi = np.log(edges[:-1]), np.log(edges[1:])
+    e_in = np.exp(lo[:, None] + (hi - lo)[:, None] * frac[None, :]).ravel()      # (B*n_sub,)
+    f_in = np.repeat(np.asarray(fluence, dtype=float) / n_sub, n_sub)
+    e_out, w = transport(materials, mat_idx, areal, e_in, particle, nuclear)
+    S = e_out.shape[0]
+    b = np.searchsorted(edges, e_out, side="right") - 1
+    valid = (b >= 0) & (b < B) & (w > 0)
+    flat = (np.arange(S)[:, None] * B + b)[valid]
+    out = np.bincount(flat, weights=(w * f_in[None, :])[valid], minlength=S * B)
+    return out.reshape(S, B)
+
+
+def evaluate_stacks(stacks, particle="proton", edges=None, fluence=None, nuclear=True):
+    """
+    Resumen por pila: densidad areal total, fluencia transmitida y
+    energía de corte (mínima energía incidente que atraviesa la pila).
+    """
+    if edges is None:
+        edges, _ = energy_grid(1.0, 1000.0, 120) if particle == "proton" else energy_grid(0.01, 100.0, 120)
+    if fluence is None:
+        fluence = spe_spectrum(edges, e0=30.0 if particle == "proton" else 0.5)
+    materials, mat_idx, areal = stack_arrays(stacks)
+    spec = transmitted_spectrum(edges, fluence, materials, mat_idx, areal, particle, nuclear)
+    centers = np.sqrt(edges[:-1] * edges[1:])
+    e_out, _ = transport(materials, mat_idx, areal, centers, particle, nuclear=False)
+    passes = e_out > 0
+    cutoff = np.where(passes.any(axis=1), centers[np.argmax(passes, axis=1)], np.inf)
+    total_in = float(np.sum(fluence))
+    return {
+        "areal_density": areal.sum(axis=1),
+        "transmitted": spec,
+        "transmitted_fraction": spec.sum(axis=1) / total_in,
+        "cutoff_energy": cutoff,
+        "edges": edges,
+    }
+
+
+def stacks_from_macro(name="parker"):
+    """Pila de una macro: 'parker', 'solar_flares' o 'escudos'."""
+    readers = {
+        "parker": tps_stack.parker_tps_stack,
+        "solar_flares": tps_stack.solar_flares_stack,
+        "escudos": tps_stack.escudos_radiacion_stack,
+    }
+    return readers[name]()
+
+
+if __name__ == "__main__":
+    import time
+    base = stacks_from_macro("parker")
+    variants = thickness_sweep(base, "TPS_CC_Solar", np.linspace(5.0, 40.0, 5000))
+    t0 = time.perf_counter()
+    res = evaluate_stacks(variants, "proton")
+    dt = time.perf_counter() - t0
+    print(f"{len(variants)} diseños en {dt:.3f} s ({len(variants)/dt:.0f}/s)")
+    for name in ("parker", "solar_flares", "escudos"):
+        r = evaluate_stacks([stacks_from_macro(name)], "proton")
+        print(f"{name}: {r['areal_density'][0]:.2f} g/cm², transmitido {r['transmitted_fraction'][0]:.3e}, "
+              f"corte {r['cutoff_energy'][0]:.1f} MeV")
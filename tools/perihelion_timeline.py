@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Entorno térmico de perihelio a partir de una órbita kepleriana.
+
+Las macros del escudo solar (EscudoSolarParkerProbe.FCMacro,
+ParkerSondaSpar.FCMacro, SondaParkerProbe.py) suponen un flujo pico fijo.
+Aquí el flujo sale de la trayectoria:
+
+1. Órbita heliocéntrica con perihelio y afelio como parámetros; la ecuación
+   de Kepler se resuelve por Newton sobre arrays (órbitas × instantes).
+2. Flujo incidente en la normal del disco TPS: q = S0 * (1 AU / r)² * cos(theta),
+   con theta el desapuntado respecto a la dirección al Sol.
+3. Las series temporales se pasan en lote a tps_thermal.solve_transient
+   (pilas × órbitas) para obtener temperaturas pico y carga térmica integrada.
+
+Todas las órbitas de un barrido comparten la misma malla temporal centrada
+en el perihelio (ventana de ±window_days con paso dt), que es lo que necesita
+el solver en lote.
+"""
+
+import math
+
+import numpy as np
+
+import tps_stack
+import tps_thermal
+
+AU = 1.495978707e11                # m
+R_SUN = 6.957e8                    # m
+MU_SUN = 1.32712440018e20          # m³/s²
+DAY = 86400.0
+
+# Órbita final de Parker Solar Probe (referencia)
+PARKER_PERIHELION_RS = 9.86
+PARKER_APHELION_AU = 0.73
+
+
+def orbit_elements(r_peri, r_apo):
+    """Semieje mayor [m], excentricidad y periodo [s] a partir de r_p, r_a [m]."""
+    r_peri = np.asarray(r_peri, dtype=float)
+    r_apo = np.asarray(r_apo, dtype=float)
+    if np.any(r_apo < r_peri):
+        raise ValueError("El afelio debe ser mayor o igual que el perihelio")
+    a = 0.5 * (r_peri + r_apo)
+    e = (r_apo - r_peri) / (r_apo + r_peri)
+    period = 2.0 * math.pi * np.sqrt(a ** 3 / MU_SUN)
+    return a, e, period
+
+
+def solve_kepler(M, e, iters=30, tol=1e-12):
+    """Anomalía excéntrica E de M = E - e sin E (Newton vectorizado, broadcasting)."""
+    M = np.asarray(M, dtype=float)
+    e = np.asarray(e, dtype=float)
+    E = M + e * np.sin(M)
+    for _ in range(iters):
+        f = E - e * np.sin(E) - M
+        dE = f / (1.0 - e * np.cos(E))
+        E = E - dE
+        if np.max(np.abs(dE)) < tol:
+            break
+    return E
+
+
+def heliocentric_distance(t, r_peri, r_apo):
+    """
+    Distancia al Sol r(t) [m] para tiempos t [s] relativos al perihelio.
+    t: (T,), r_peri/r_apo: (O,) -> (O, T).
+    """
+    a, e, period = orbit_elements(np.atleast_1d(r_peri), np.atleast_1d(r_apo))
+    n = 2.0 * math.pi / period
+    M = np.mod(n[:, None] * np.asarray(t, dtype=float)[None, :] + math.pi, 2.0 * math.pi) - math.pi
+    E = solve_kepler(M, e[:, None])
+    return a[:, None] * (1.0 - e[:, None] * np.cos(E))
+
+
+def solar_flux(r, off_pointing_deg=0.0):
+    """Flujo sobre la normal del disco [W/m²]; off_pointing en grados (escalar o array)."""
+    cos_t = np.clip(np.cos(np.radians(off_pointing_deg)), 0.0, None)
+    return tps_thermal.SOLAR_CONSTANT * (AU / np.asarray(r)) ** 2 * cos_t
+
+
+def perihelion_timeline(r_peri, r_apo, window_days=5.0, dt=60.0, off_pointing_deg=0.0):
+    """
+    Series de flujo centradas en el perihelio.
+    Devuelve (t [s] (T,), r [m] (O, T), q [W/m²] (O, T)).
+    """
+    half = window_days * DAY
+    t = np.arange(-half, half + 0.5 * dt, dt)
+    r = heliocentric_distance(t, r_peri, r_apo)
+    return t, r, solar_flux(r, off_pointing_deg)
+
+
+def heat_load_sweep(stacks, r_peri, r_apo, window_days=5.0, dt=60.0, off_pointing_deg=0.0,
+                    optics=None, max_dz=5.0, T0=None):
+    """
+    Barrido pilas × órbitas.
+
+    stacks : lista de pilas (mismo número de capas)
+    r_peri, r_apo : arrays (O,) [m]
+    T0     : temperatura inicial [K]; por defecto el perfil estacionario con
+             el flujo del inicio de la ventana de cada órbita
+
+    Devuelve dict con arrays (S, O): flujo pico, temperatura pico de cara
+    solar y trasera, energía absorbida e irradiada por la cara trasera [J/m²].
+    """
+    t, r, q = perihelion_timeline(r_peri, r_apo, window_days, dt, off_pointing_deg)
+    S, O = len(stacks), q.shape[0]
+    cases, flux = tps_thermal.product_cases(stacks, q)
+    opt = dict(tps_thermal.DEFAULT_OPTICS)
+    opt.update(optics or {})
+    if T0 is None:
+        T0 = tps_thermal.steady_state(cases, flux[:, 0], opt, max_dz)
+    # El solver avanza n_steps = len(t) - 1 pasos: flujo al final de cada paso
+    res = tps_thermal.solve_transient(cases, flux[:, 1:], dt, T0=T0, optics=opt, max_dz=max_dz)
+    absorbed = opt["alpha"] * 0.5 * ((q[:, 1:] + q[:, :-1]) * np.diff(t)).sum(axis=1)
+    back_rad = opt["eps_back"] * tps_thermal.SIGMA * (res["back_T"] ** 4 - opt["T_back_env"] ** 4)
+    back_energy = back_rad[:, :-1].sum(axis=1) * dt
+    return {
+        "time": t,
+        "distance": r,
+        "flux": q,
+        "peak_flux": np.broadcast_to(q.max(axis=1), (S, O)),
+        "front_peak": res["front_peak"].reshape(S, O),
+        "back_peak": res["back_peak"].reshape(S, O),
+        "absorbed_J_m2": np.broadcast_to(absorbed, (S, O)),
+        "back_energy_J_m2": back_energy.reshape(S, O),
+        "front_T": res["front_T"].reshape(S, O, -1),
+        "back_T": res["back_T"].reshape(S, O, -1),
+    }
+
+
+def print_grid(label, values, rows, cols, fmt="{:7.0f}"):
+    print(label)
+    print("          " + " ".join(f"{c:>7}" for c in cols))
+    for name, row in zip(rows, values):
+        print(f"{name:>9} " + " ".join(fmt.format(v) for v in row))
+
+
+if __name__ == "__main__":
+    import time
+    base = tps_stack.parker_tps_stack(tps_stack.PARKER_SPAR)
+    foams = np.linspace(40.0, 200.0, 9)
+    stacks = tps_stack.thickness_sweep(base, "TPS_Foam", foams)
+    perihelia_rs = np.array([9.86, 12.0, 15.0, 20.0, 35.0])
+    r_p = perihelia_rs * R_SUN
+    r_a = np.full_like(r_p, PARKER_APHELION_AU * AU)
+    t0 = time.perf_counter()
+    out = heat_load_sweep(stacks, r_p, r_a, window_days=4.0, dt=120.0)
+    elapsed = time.perf_counter() - t0
+    print(f"{len(stacks)} pilas × {len(r_p)} órbitas × {len(out['time'])} instantes en {elapsed:.2f} s")
+    cols = [f"{p:.1f}Rs" for p in perihelia_rs]
+    rows = [f"{f:.0f}mm" for f in foams]
+    print("Flujo pico [kW/m²]: " + ", ".join(f"{v/1e3:.0f}" for v in out["peak_flux"][0]))
+    print_grid("Cara trasera máx [°C] (filas: espuma)", tps_thermal.to_celsius(out["back_peak"]), rows, cols)
+    print_grid("Energía trasera [MJ/m²]", out["back_energy_J_m2"] / 1e6, rows, cols, "{:7.1f}")
@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+"""
+Solver de refrigeración regenerativa por marcha axial a lo largo del contorno.
+
+Las funciones térmicas de RocketCooledNozzle.py son un punto concentrado
+(h = 1000, Tw = 800, área de garganta × longitud). Aquí se resuelve estación
+a estación a lo largo del perfil de la macro (la B-spline que interpola
+radius_profile_points(), como profile_radius_function), con el espesor y el
+paso de hélice de wall_thickness_at_x / pitch_at_x:
+
+- Mach local del área isentrópica (subsónico antes de la garganta,
+  supersónico después) -> temperatura adiabática de pared con recuperación.
+- Coeficiente gas-pared de Bartz (con corrección sigma por temperatura de pared).
+- Conducción por el ligamento (ligament_min_throat / ligament_min_other)
+  y convección del refrigerante en los 2·num_helices canales helicoidales
+  A/B (Dittus-Boelter, longitud de hélice según el paso).
+- Canales como channel_section() de la macro: desde la garganta hacia cada
+  extremo (hasta end_caps_thickness del borde) mientras quepa un canal de
+  min_feature bajo el cierre exterior, con una altura por tramo recortada al
+  menor hueco del tramo. El recorte y la parte sin canal se informan
+  (channel_clamped, cooled, cooled_fraction); sin canal la pared no se
+  refrigera (q = 0, pared a la temperatura adiabática) y el pico de
+  temperatura se busca en las estaciones con canal.
+- Propiedades del refrigerante (agua líquida) a la temperatura local:
+  viscosidad de Vogel, densidad y conductividad lineales en T, Pr = mu·cp/k.
+  Velocidad, Re, Nu, h y fricción se recalculan en cada estación.
+- El refrigerante entra por la salida de la tobera y avanza hacia la cámara
+  (contracorriente); su temperatura y presión se integran estación a estación.
+  Por defecto el caudal se dimensiona para un salto coolant_dT con el calor
+  de la pasada anterior; coolant_fraction lo fija como fracción del caudal
+  de gas.
+- Velocidad del refrigerante y caída de presión se comparan con
+  DEFAULT_LIMITS: flags por diseño y máscara feasible.
+
+Cada estación se calcula a la vez para todo el lote de diseños (arrays (B,)),
+y las propiedades geométricas se vectorizan sobre (B, N). El pico de
+temperatura de pared se localiza con interpolación parabólica alrededor de
+la estación máxima.
+
+Unidades de entrada: mm como la macro; resultados en SI (K, W/m², Pa).
+"""
+
+import math
+
+import numpy as np
+
+import isentropic
+import nozzle_model
+
+# Pared de aleación de cobre, como calculate_thermal_stress
+WALL_K = nozzle_model.SCALAR_CONSTANTS["k_wall"]
+
+DEFAULT_CONDITIONS = {
+    "Pc": nozzle_model.SCALAR_CONSTANTS["Pc"],
+    "Tc": nozzle_model.SCALAR_CONSTANTS["Tc"],
+    "k": nozzle_model.SCALAR_CONSTANTS["k"],
+    "R": nozzle_model.SCALAR_CONSTANTS["R"],
+    "cp_coolant": nozzle_model.SCALAR_CONSTANTS["cp_coolant"],
+    "mu_coolant": nozzle_model.SCALAR_CONSTANTS["mu_coolant"],
+    "rho_coolant": nozzle_model.SCALAR_CONSTANTS["rho_coolant"],
+    "k_coolant": nozzle_model.SCALAR_CONSTANTS["k_coolant"],
+    "T_ref_coolant": 293.15,       # temperatura de mu/rho/k_coolant [K]
+    "beta_coolant": 2.1e-4,        # dilatación térmica [1/K]
+    "dk_coolant": 1.5e-3,          # variación relativa de k por K [1/K]
+    "T_coolant_in": 300.0,         # entrada del refrigerante [K]
+    "coolant_dT": 80.0,            # salto de temperatura de diseño del refrigerante [K]
+    "coolant_fraction": None,      # caudal / caudal de gas; None: dimensionado con coolant_dT
+    "k_wall": WALL_K,
+}
+
+# Límites por diseño (velocidad como validate_design; caída de presión
+# relativa a la presión de cámara)
+DEFAULT_LIMITS = {
+    "max_coolant_velocity": 50.0,   # m/s
+    "max_pressure_drop_ratio": 0.2,  # dP / Pc
+}
+
+
+# ========================
+# Geometría vectorizada (réplica de la macro)
+# ========================
+def _col(P, key):
+    # Parámetro escalar o (B,) -> columna que difunde contra estaciones (B, N)
+    return np.asarray(P[key], dtype=float)[..., None]
+
+
+def wall_thickness_at_x(x, L, P):
+    t = np.clip(x / L, 0.0, 1.0)
+    conv, throat = _col(P, "wall_thickness_convergent"), _col(P, "wall_thickness_throat")
+    start, end = _col(P, "wall_thickness_div_start"), _col(P, "wall_thickness_div_end")
+    return np.where(t < 0.2, conv + (throat - conv) * (t / 0.2), start + (end - start) * ((t - 0.2) / 0.8))
+
+
+def pitch_at_x(x, L, P):
+    t = np.clip(x / L, 0.0, 1.0)
+    p0, p1, p2 = _col(P, "pitch_throat"), _col(P, "pitch_mid"), _col(P, "pitch_exit")
+    return np.where(t < 0.3, p0 + (p1 - p0) * (t / 0.3), p1 + (p2 - p1) * ((t - 0.3) / 0.7))
+
+
+_PROFILE_KEYS = ("throat_diameter", "exit_diameter", "convergent_angle", "divergent_angle")
+
+
+def radius_profile_points(P):
+    """Puntos (x, r) de radius_profile_points() de la macro, arrays (B, 5)."""
+    col = {k: np.atleast_1d(np.asarray(P[k], dtype=float)) for k in _PROFILE_KEYS}
+    throat_r = col["throat_diameter"] / 2.0
+    exit_r = col["exit_diameter"] / 2.0
+    conv_len = throat_r / np.tan(np.radians(col["convergent_angle"]))
+    div_end = throat_r + (exit_r - throat_r) / np.tan(np.radians(col["divergent_angle"]))
+    x = np.stack([-conv_len, 0.0 * conv_len, 0.35 * div_end, 0.7 * div_end, div_end], axis=1)
+    r = np.stack([exit_r, throat_r, throat_r + (exit_r - throat_r) * 0.35,
+                  throat_r + (exit_r - throat_r) * 0.7, exit_r], axis=1)
+    return x, r
+
+
+def _not_a_knot(u, y):
+    """Segundas derivadas del spline cúbico not-a-knot por filas: u, y (B, n), n >= 4."""
+    B, n = y.shape
+    h = np.diff(u, axis=1)
+    A = np.zeros((B, n, n))
+    rhs = np.zeros((B, n))
+    A[:, 0, 0], A[:, 0, 1], A[:, 0, 2] = h[:, 1], -(h[:, 0] + h[:, 1]), h[:, 0]
+    A[:, -1, -3], A[:, -1, -2], A[:, -1, -1] = h[:, -1], -(h[:, -2] + h[:, -1]), h[:, -2]
+    slope = np.diff(y, axis=1) / h
+    for i in range(1, n - 1):
+        A[:, i, i - 1], A[:, i, i], A[:, i, i + 1] = h[:, i - 1], 2.0 * (h[:, i - 1] + h[:, i]), h[:, i]
+        rhs[:, i] = 6.0 * (slope[:, i] - slope[:, i - 1])
+    return np.linalg.solve(A, rhs[..., None])[..., 0]
+
+
+def _spline_eval(u, y, m, t):
+    """Spline de _not_a_knot evaluado en t (M,) para cada fila -> (B, M)."""
+    i = np.clip((u[:, None, :] <= t[None, :, None]).sum(axis=2) - 1, 0, u.shape[1] - 2)   # (B, M)
+
+    def at(a, j):
+        return np.take_along_axis(a, j, axis=1)
+
+    u0, u1 = at(u, i), at(u, i + 1)
+    h = u1 - u0
+    a, b = u1 - t, t - u0
+    m0, m1 = at(m, i), at(m, i + 1)
+    return (m0 * a ** 3 + m1 * b ** 3) / (6.0 * h) \
+        + (at(y, i) / h - m0 * h / 6.0) * a + (at(y, i + 1) / h - m1 * h / 6.0) * b
+
+
+def profile_curve(P, samples=512):
+    """
+    Perfil r(x) de la macro muestreado: (xs, rs) arrays (B, samples).
+
+    Réplica de profile_bspline(): interpolación cúbica de OCC
+    (GeomAPI_Interpolate, parámetros por longitud de cuerda y sin nudos en
+    el segundo y penúltimo punto, es decir, not-a-knot) sobre los puntos de
+    radius_profile_points().
+    """
+    x, r = radius_profile_points(P)
+    chord = np.hypot(np.diff(x, axis=1), np.diff(r, axis=1))
+    u = np.concatenate([np.zeros((x.shape[0], 1)), np.cumsum(chord, axis=1)], axis=1)
+    u = u / u[:, -1:]
+    t = np.linspace(0.0, 1.0, samples)
+    return _spline_eval(u, x, _not_a_knot(u, x), t), _spline_eval(u, r, _not_a_knot(u, r), t)
+
+
+def profile_stations(P, n=400, profile=None):
+    """
+    Estaciones sobre el perfil de la macro: x [mm] (B, N) desde el inicio del
+    convergente hasta la salida, radio interior r [mm] y la coordenada s en
+    [0, L] con la que la macro evalúa espesor y paso.
+
+    profile: None (réplica de la B-spline de la macro), el resultado de
+    profile_radius_function() de la macro (r_of_x, x0, x1) o un par de
+    arrays (x, r) denso, p. ej. un contorno de Rao.
+    """
+    L = _col(P, "nozzle_length")
+    u = np.linspace(0.0, 1.0, n)
+    if profile is None:
+        # Sin lotes en la geometría del perfil basta con una curva
+        single = all(np.ndim(P[k]) == 0 or np.all(np.asarray(P[k]) == np.asarray(P[k]).flat[0])
+                     for k in _PROFILE_KEYS)
+        Pp = {k: np.asarray(P[k], dtype=float).flat[0] for k in _PROFILE_KEYS} if single else P
+        xs, rs = profile_curve(Pp, max(512, 4 * n))
+        x = xs[:, :1] + u * (xs[:, -1:] - xs[:, :1])
+        r = np.stack([np.interp(x[i], xs[i], rs[i]) for i in range(xs.shape[0])])
+    elif callable(profile[0]):
+        r_of_x, x0, x1 = profile
+        x = (x0 + u * (x1 - x0))[None, :]
+        r = np.array([[r_of_x(v) for v in x[0]]])
+    else:
+        px, pr = (np.asarray(a, dtype=float) for a in profile)
+        x = (px[0] + u * (px[-1] - px[0]))[None, :]
+        r = np.interp(x, px, pr)
+    B = max(L.shape[0], x.shape[0])
+    x, r = np.broadcast_to(x, (B, n)), np.broadcast_to(r, (B, n))
+    s = np.broadcast_to(u * L, (B, n))
+    return x, r, s
+
+
+def coolant_properties(T, c):
+    """
+    Propiedades del refrigerante (agua líquida) a T [K]: (rho, mu, k, Pr).
+
+    mu de Vogel (log10 mu = A + 247.8 / (T - 140)) escalada para valer
+    mu_coolant a T_ref_coolant; rho y k lineales en T desde sus valores de
+    referencia.
+    """
+    dT = T - c["T_ref_coolant"]
+    mu = c["mu_coolant"] * 10.0 ** (247.8 / (T - 140.0) - 247.8 / (c["T_ref_coolant"] - 140.0))
+    rho = c["rho_coolant"] * (1.0 - c["beta_coolant"] * dT)
+    k = c["k_coolant"] * (1.0 + c["dk_coolant"] * dT)
+    return rho, mu, k, mu * c["cp_coolant"] / k
+
+
+# ========================
+# Gas caliente
+# ========================
+def bartz_h(Dt, Pc, c_star, cp, mu, Pr, area_ratio, sigma, Rc=None):
+    """Coeficiente de Bartz [W/m²/K]; Dt y Rc en m."""
+    Rc = 1.5 * Dt / 2.0 if Rc is None else Rc
+    return (0.026 / Dt ** 0.2 * (mu ** 0.2 * cp / Pr ** 0.6) * (Pc / c_star) ** 0.8
+            * (Dt / Rc) ** 0.1 * (1.0 / area_ratio) ** 0.9 * sigma)
+
+
+def bartz_sigma(Tw_over_Tc, M, k, w=0.6):
+    f = 1.0 + 0.5 * (k - 1.0) * M ** 2
+    return 1.0 / ((0.5 * Tw_over_Tc * f + 0.5) ** (0.8 - w / 5.0) * f ** (w / 5.0))
+
+
+# ========================
+# Solver
+# ========================
+def solve(P=None, n_stations=400, conditions=None, iterations=4, profile=None, limits=None, **overrides):
+    """
+    Marcha axial para un lote de diseños.
+
+    P          : parámetros base (macro); overrides: claves de P con arrays (B,)
+    conditions : sobrescribe DEFAULT_CONDITIONS (escalares o (B,))
+    iterations : pasadas de corrección de sigma de Bartz con la T de pared
+                 (y del caudal dimensionado con coolant_dT)
+    profile    : perfil de profile_stations() (por defecto, el de la macro)
+    limits     : sobrescribe DEFAULT_LIMITS
+
+    Devuelve dict con perfiles (B, N) y resúmenes (B,): pico de temperatura
+    de pared del lado gas y su posición, calor total, salida del refrigerante,
+    caída de presión, alturas de canal por tramo con el flag channel_clamped,
+    violations (channel_fit, coolant_velocity, pressure_drop) y feasible.
+    """
+    base = dict(P if P is not None else nozzle_model.load_nozzle_params())
+    base.update(overrides)
+    c = dict(DEFAULT_CONDITIONS)
+    c.update(conditions or {})
+    if c["coolant_fraction"] is None:
+        c["coolant_fraction"] = np.nan
+    lim = dict(DEFAULT_LIMITS)
+    lim.update(limits or {})
+    # Todo a arrays (B,): los escalares se difunden al tamaño del lote
+    keys = list(base) + list(c)
+    arrays = np.broadcast_arrays(*[np.atleast_1d(np.asarray(base[k], dtype=float)) for k in base],
+                                 *[np.atleast_1d(np.asarray(c[k], dtype=float)) for k in c])
+    if arrays[0].ndim != 1:
+        raise ValueError("Los parámetros en lote deben ser arrays 1-D (B,)")
+    B = arrays[0].shape[0]
+    Pb = dict(zip(keys[:len(base)], arrays[:len(base)]))
+    cb = {k: v[:, None] for k, v in zip(keys[len(base):], arrays[len(base):])}
+
+    x, r, s = profile_stations(Pb, n_stations, profile)             # (B, N) mm
+    L = Pb["nozzle_length"][:, None]
+    # Garganta sónica en el radio mínimo del perfil interpolado
+    jt = np.argmin(r, axis=1)[:, None]
+    throat_r = np.take_along_axis(r, jt, axis=1)
+    supersonic = np.arange(r.shape[1])[None, :] > jt
+    k, R, Tc, Pc = cb["k"], cb["R"], cb["Tc"], cb["Pc"]
+
+    # Flujo isentrópico
+    area_ratio = (r / throat_r) ** 2
+    if np.all(k == k.flat[0]):
+        M = isentropic.table(k.flat[0]).mach(area_ratio, supersonic=supersonic)
+    else:
+        M = isentropic.mach_from_area_ratio(area_ratio, k, supersonic=supersonic)
+    T_static = Tc / (1.0 + 0.5 * (k - 1.0) * M ** 2)
+    cp_g = k * R / (k - 1.0)
+    Pr_g = 4.0 * k / (9.0 * k - 5.0)
+    mu_g = 1.184e-7 * (8314.46 / R) ** 0.5 * Tc ** 0.6                   # Bartz [kg/m/s]
+    recovery = Pr_g ** (1.0 / 3.0)
+    T_aw = T_static * (1.0 + recovery * 0.5 * (k - 1.0) * M ** 2)
+    c_star = np.sqrt(k * R * Tc) / k / (2.0 / (k + 1.0)) ** ((k + 1.0) / (2.0 * (k - 1.0)))
+    At = math.pi * (throat_r / 1000.0) ** 2
+    m_dot_gas = (Pc * At / c_star)[:, 0]
+
+    # Ligamento de channel_ligament(): el de garganta pasa al general en 0.1 L
+    lig_t = Pb["ligament_min_throat"][:, None]
+    lig = lig_t + (Pb["ligament_min_other"][:, None] - lig_t) * np.clip(np.abs(x) / (0.1 * L), 0.0, 1.0)
+    wall = wall_thickness_at_x(s, L, Pb)
+
+    # Tramos de channel_section(): desde la garganta hacia cada extremo
+    # mientras el hueco (pared - ligamento - cierre min_feature) admita un
+    # canal de min_feature, sin pasar de end_caps_thickness del borde
+    mf = Pb["min_feature"][:, None]
+    cap = Pb["end_caps_thickness"][:, None]
+    room = wall - lig - mf
+    div = x >= 0.0
+    stop = (room < mf) | (x > x[:, -1:] - cap) | (x < x[:, :1] + cap)
+    cooled = div & (np.cumsum(div & stop, axis=1) == 0)
+    cooled |= ~div & (np.cumsum((~div & stop)[:, ::-1], axis=1)[:, ::-1] == 0)
+
+    # Altura por tramo: channel_height recortada al menor hueco del tramo
+    H = Pb["channel_height"]
+    h_conv = np.minimum(H, np.where(cooled & ~div, room, np.inf).min(axis=1))
+    h_div = np.minimum(H, np.where(cooled & div, room, np.inf).min(axis=1))
+    h_ch = np.where(cooled, np.where(div, h_div[:, None], h_conv[:, None]), 0.0)
+
+    # Sección trapecial de channel_profile(): base b, techo interpolado a la
+    # altura recortada (las estaciones sin canal usan channel_height solo
+    # para no dividir por cero; quedan enmascaradas)
+    h_geo = np.where(cooled, h_ch, H[:, None])
+    b_ch = Pb["channel_base"][:, None]
+    top = b_ch + (Pb["channel_top"][:, None] - b_ch) * (h_geo / H[:, None])
+    A_ch = 0.5 * (b_ch + top) * h_geo / 1e6                              # (B, N) m²
+    side = np.sqrt(h_geo ** 2 + (0.5 * (top - b_ch)) ** 2)
+    Dh = 4.0 * A_ch / ((b_ch + top + 2.0 * side) / 1000.0)
+    n_par = 2.0 * Pb["num_helices"]                                      # hélices A y B
+    lig = lig / 1000.0
+
+    pitch = pitch_at_x(s, L, Pb) / 1000.0
+    r_ch = (r + lig * 1000.0 + 0.5 * h_geo) / 1000.0
+    helix = np.sqrt(1.0 + (2.0 * math.pi * r_ch / pitch) ** 2)           # longitud de canal por dx
+
+    dx = np.diff(x, axis=1) / 1000.0
+    dx = np.concatenate([dx[:, :1], dx], axis=1)
+    perimeter = 2.0 * math.pi * r / 1000.0
+
+    Dt = 2.0 * throat_r / 1000.0
+    cc = {k: v[:, 0] for k, v in cb.items()}
+    sized = np.isnan(cc["coolant_fraction"])
+    Tw = np.full_like(r, 800.0)
+    Q_est = None
+    N = r.shape[1]
+    for _ in range(max(1, iterations)):
+        sigma = bartz_sigma(Tw / Tc, M, k)
+        h_g = bartz_h(Dt, Pc, c_star, cp_g, mu_g, Pr_g, area_ratio, sigma)
+        # Caudal: fracción fija del gas o el que da coolant_dT con el calor
+        # de la pasada anterior (en la primera, con la pared a Tw)
+        if Q_est is None:
+            Q_est = (h_g * (T_aw - Tw) * perimeter * dx * cooled).sum(axis=1)
+        m_dot_c = np.where(sized, np.maximum(Q_est, 1.0) / (cc["cp_coolant"] * cc["coolant_dT"]),
+                           cc["coolant_fraction"] * m_dot_gas)
+        # Marcha en contracorriente: de la salida (N-1) hacia la cámara (0)
+        T_cool, q, dp, v, Re, Nu, h_c = (np.zeros_like(r) for _ in range(7))
+        Tcl = cc["T_coolant_in"].copy()
+        p_acc = np.zeros(B)
+        for j in range(N - 1, -1, -1):
+            on = cooled[:, j]
+            # Refrigerante a la temperatura de la estación
+            rho, mu, kc, Pr = coolant_properties(Tcl, cc)
+            vj = m_dot_c / (rho * n_par * A_ch[:, j])
+            Rej = rho * vj * Dh[:, j] / mu
+            Nuj = 0.023 * Rej ** 0.8 * Pr ** 0.4
+            hcj = Nuj * kc / Dh[:, j]
+            resist = 1.0 / h_g[:, j] + lig[:, j] / cc["k_wall"] + 1.0 / hcj
+            qj = np.where(on, (T_aw[:, j] - Tcl) / resist, 0.0)
+            v[:, j], Re[:, j], Nu[:, j], h_c[:, j] = (np.where(on, a, 0.0) for a in (vj, Rej, Nuj, hcj))
+            q[:, j] = qj
+            T_cool[:, j] = Tcl
+            dp[:, j] = p_acc
+            Tcl = Tcl + qj * perimeter[:, j] * dx[:, j] / (m_dot_c * cc["cp_coolant"])
+            ds = helix[:, j] * dx[:, j]
+            f_darcy = 0.316 * Rej ** -0.25
+            p_acc = p_acc + np.where(on, f_darcy * ds / Dh[:, j] * 0.5 * rho * vj ** 2, 0.0)
+        T_wg = T_aw - q / h_g
+        T_wc = T_wg - q * lig / cb["k_wall"]
+        Tw = T_wg
+        Q_est = (q * perimeter * dx).sum(axis=1)
+
+    # Pico en las estaciones refrigeradas (las demás quedan a T_aw y se
+    # informan con cooled / cooled_fraction)
+    T_pk = np.where(cooled | ~cooled.any(axis=1, keepdims=True), T_wg, -np.inf)
+    j = np.argmax(T_pk, axis=1)
+    x_peak, T_peak = _parabolic_peak(x, np.where(np.isfinite(T_pk), T_pk, T_wg), j)
+    v_max = v.max(axis=1)
+    violations = {
+        "channel_fit": ~cooled[np.arange(B), np.argmax(div, axis=1)],
+        "coolant_velocity": v_max > lim["max_coolant_velocity"],
+        "pressure_drop": p_acc > lim["max_pressure_drop_ratio"] * cc["Pc"],
+    }
+    return {
+        "x": x, "r": r, "mach": M, "area_ratio": area_ratio,
+        "T_aw": T_aw, "h_gas": h_g, "heat_flux": q,
+        "T_wall_gas": T_wg, "T_wall_coolant": T_wc, "T_coolant": T_cool,
+        "pressure_drop": dp, "wall_thickness": wall, "pitch": pitch * 1000.0,
+        "cooled": cooled, "channel_height": h_ch, "hydraulic_diameter": np.where(cooled, Dh * 1000.0, 0.0),
+        "coolant_velocity": v, "reynolds": Re, "nusselt": Nu, "h_coolant": h_c,
+        "max_coolant_velocity": v_max,
+        "channel_height_convergent": np.where(np.isfinite(h_conv), h_conv, 0.0),
+        "channel_height_divergent": np.where(np.isfinite(h_div), h_div, 0.0),
+        "channel_clamped": (np.minimum(h_conv, h_div) < H) & cooled.any(axis=1),
+        "cooled_fraction": (cooled * dx).sum(axis=1) / dx.sum(axis=1),
+        "peak_wall_temperature": T_peak, "peak_x": x_peak,
+        "peak_heat_flux": q.max(axis=1),
+        "total_heat": Q_est,
+        "coolant_outlet_temperature": Tcl,
+        "total_pressure_drop": p_acc,
+        "coolant_flow": m_dot_c,
+        "violations": violations,
+        "feasible": ~np.logical_or.reduce(list(violations.values())),
+    }
+
+
+def _parabolic_peak(x, y, j):
+    """Posición y valor del máximo con ajuste parabólico en (j-1, j, j+1)."""
+    B, N = y.shape
+    rows = np.arange(B)
+    jm = np.clip(j, 1, N - 2)
+    y0, y1, y2 = y[rows, jm - 1], y[rows, jm], y[rows, jm + 1]
+    denom = y0 - 2.0 * y1 + y2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d = np.where(np.abs(denom) > 1e-12, 0.5 * (y0 - y2) / denom, 0.0)
+    d = np.clip(d, -1.0, 1.0)
+    edge = (j == 0) | (j == N - 1)
+    dxs = x[rows, jm + 1] - x[rows, jm]
+    xp = np.where(edge, x[rows, j], x[rows, jm] + d * dxs)
+    yp = np.where(edge, y[rows, j], y1 - 0.25 * (y0 - y2) * d)
+    return xp, yp
+
+
+def print_summary(res, i=0):
+    print(f"Pico T pared (gas): {res['peak_wall_temperature'][i]:.0f} K en x = {res['peak_x'][i]:.1f} mm")
+    print(f"Flujo pico: {res['peak_heat_flux'][i]/1e6:.1f} MW/m², calor total {res['total_heat'][i]/1e3:.0f} kW")
+    print(f"Refrigerante: {res['coolant_flow'][i]:.2f} kg/s, v máx = {res['max_coolant_velocity'][i]:.1f} m/s, "
+          f"salida {res['coolant_outlet_temperature'][i]:.0f} K, dP = {res['total_pressure_drop'][i]/1e5:.2f} bar")
+    h_conv, h_div = res["channel_height_convergent"][i], res["channel_height_divergent"][i]
+    note = " (recortada)" if res["channel_clamped"][i] else ""
+    print(f"Canal: altura {h_conv:.2f} / {h_div:.2f} mm (convergente / divergente){note}, "
+          f"refrigerado {100 * res['cooled_fraction'][i]:.0f} % de la longitud")
+    bad = [k for k, v in res["violations"].items() if v[i]]
+    print("Factible" if res["feasible"][i] else f"No factible: {', '.join(bad)}")
+
+
+if __name__ == "__main__":
+    import time
+    P = nozzle_model.load_nozzle_params()
+    res = solve(P)
+    print_summary(res)
+    # Pared uniforme más gruesa con el canal que cabe en ella, 8 hélices y paso x10
+    walls = np.linspace(3.0, 8.0, 2000)
+    pitch = {k: 10.0 * P[k] for k in ("pitch_throat", "pitch_mid", "pitch_exit")}
+    t0 = time.perf_counter()
+    batch = solve(P, num_helices=8, wall_thickness_throat=walls, wall_thickness_convergent=walls,
+                  wall_thickness_div_start=walls, wall_thickness_div_end=walls,
+                  channel_height=walls - P["ligament_min_other"] - P["min_feature"], **pitch)
+    dt = time.perf_counter() - t0
+    print(f"{len(walls)} diseños × {batch['x'].shape[1]} estaciones en {dt:.2f} s, "
+          f"{int(batch['feasible'].sum())} factibles")
+    if batch["feasible"].any():
+        best = int(np.argmax(batch["feasible"]))
+        print(f"Pared más fina factible: {walls[best]:.2f} mm")
+        print_summary(batch, best)
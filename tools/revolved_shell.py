@@ -0,0 +1,659 @@
+# -*- coding: utf-8 -*-
+"""
+Cascos de revolución huecos sin makeOffsetShape.
+
+make_hollow_from_offset() (direct_Fssb.py, Destin1Tokamav.FCMacro y más de
+60 llamadas en el repo) hace makeOffsetShape(-t) sobre el fuselaje fusionado
+y, si falla, devuelve en silencio el sólido macizo. Los fuselajes son
+cuerpos de revolución en X, así que el casco se obtiene directamente del
+meridiano, una cadena de piezas ("line", p0, p1) / ("arc", p0, pm, p1) en
+el plano (x, r) con x no decreciente:
+
+- envelope()     : perfil exterior r(x) de la unión de tramos
+                   (x0, longitud, r0, r1), con escalones verticales;
+                   polyline() lo pasa a piezas.
+- inner_profile(): erosión exacta del meridiano por un disco de radio t
+                   (lo que hace el offset interior en 3D para un sólido de
+                   revolución). Cada recta aporta su paralela a distancia t,
+                   cada arco su concéntrico de radio R ∓ t y cada vértice un
+                   arco de radio t; el interior es el mínimo de todos.
+- shell_faces()  : caras meridionales exterior - interior construidas con
+                   rectas y arcos exactos (sin booleanas 2D).
+- revolved_shell(): las caras revolucionadas en UNA operación alrededor de X.
+
+tools/fuselage.py construye con esto los cascos de sus meridianos con
+empalmes.
+
+Para cuerpos que no son de revolución, thicken() usa makeThickness (y
+makeOffsetShape como segunda opción) midiendo tiempo y fallos en REPORT;
+print_report() los resume en vez de caer en silencio al sólido.
+
+Unidades: mm, eje de revolución X por el origen (como make_cyl_x/make_cone_x).
+"""
+
+import math
+import time
+
+import numpy as np
+
+# Registro de construcciones: {label, method, time_s, ok, error}
+REPORT = []
+
+
+# ========================
+# Meridiano
+# ========================
+def envelope(sections):
+    """
+    Perfil exterior de la unión de tramos cónicos (x0, longitud, r0, r1).
+
+    Devuelve (px, pr): polilínea desde (xmin, 0) hasta (xmax, 0) con los
+    escalones como segmentos verticales y los huecos sobre el eje.
+    """
+    secs = [(float(x0), float(x0) + float(L), float(r0), float(r1)) for x0, L, r0, r1 in sections]
+    if not secs:
+        raise ValueError("sin tramos")
+    xs = {a for a, b, _, _ in secs} | {b for a, b, _, _ in secs}
+    # Cruces entre tramos solapados
+    for i, (a1, b1, p1, q1) in enumerate(secs):
+        for a2, b2, p2, q2 in secs[i + 1:]:
+            lo, hi = max(a1, a2), min(b1, b2)
+            if hi <= lo:
+                continue
+            m1 = (q1 - p1) / (b1 - a1)
+            m2 = (q2 - p2) / (b2 - a2)
+            if m1 != m2:
+                xc = (p2 - m2 * a2 - p1 + m1 * a1) / (m1 - m2)
+                if lo < xc < hi:
+                    xs.add(xc)
+    xs = sorted(xs)
+
+    def r_at(x, side):
+        # side = -1: límite por la izquierda, +1: por la derecha
+        best = 0.0
+        for a, b, p, q in secs:
+            if (side < 0 and a < x <= b) or (side > 0 and a <= x < b):
+                best = max(best, p + (q - p) * (x - a) / (b - a))
+        return best
+
+    px, pr = [xs[0]], [0.0]
+    for x in xs:
+        for r in (r_at(x, -1), r_at(x, 1)):
+            if r != pr[-1] or x != px[-1]:
+                px.append(x)
+                pr.append(r)
+    if pr[-1] != 0.0:
+        px.append(xs[-1])
+        pr.append(0.0)
+    return np.array(px), np.array(pr)
+
+
+def polyline(px, pr):
+    """Piezas ("line", p0, p1) de la polilínea (px, pr)."""
+    pts = [(float(x), float(r)) for x, r in zip(px, pr)]
+    return [("line", a, b) for a, b in zip(pts, pts[1:])]
+
+
+def circle(p0, pm, p1):
+    """Centro (cx, cy) y radio de la circunferencia por tres puntos."""
+    ax, ay = p0
+    bx, by = pm
+    cx, cy = p1
+    d = 2.0 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+    ux = ((ax * ax + ay * ay) * (by - cy) + (bx * bx + by * by) * (cy - ay) + (cx * cx + cy * cy) * (ay - by)) / d
+    uy = ((ax * ax + ay * ay) * (cx - bx) + (bx * bx + by * by) * (ax - cx) + (cx * cx + cy * cy) * (bx - ax)) / d
+    return ux, uy, math.hypot(ax - ux, ay - uy)
+
+
+def _boundary(pieces):
+    """
+    Rectas (xa, ra, xb, rb, m) y arcos (xa, xb, cx, cy, R, s) del meridiano.
+
+    Las rectas verticales se reducen a su punto inferior (el único que
+    cuenta en la erosión de r(x)); s = +1 si el arco es el lado superior de
+    su circunferencia (centro debajo, convexo), -1 si es el inferior.
+    """
+    lines = np.array([(*p[1], *p[2]) for p in pieces if p[0] == "line"], dtype=float).reshape(-1, 4)
+    xa, ra, xb, rb = lines.T
+    vertical = xb == xa
+    low = np.minimum(ra, rb)
+    ra = np.where(vertical, low, ra)
+    rb = np.where(vertical, low, rb)
+    m = np.where(vertical, 0.0, (rb - ra) / np.where(vertical, 1.0, xb - xa))
+    arcs = []
+    for p in pieces:
+        if p[0] == "arc":
+            cx, cy, R = circle(*p[1:])
+            arcs.append((min(p[1][0], p[3][0]), max(p[1][0], p[3][0]), cx, cy, R, 1.0 if p[2][1] > cy else -1.0))
+    arcs = np.array(arcs, dtype=float).reshape(-1, 6)
+    return (xa, ra, xb, rb, m), tuple(arcs.T)
+
+
+def _arc_r(arcs, x):
+    ax0, ax1, cx, cy, R, s = arcs
+    return cy + s * np.sqrt(np.clip(R * R - (x - cx) ** 2, 0.0, None))
+
+
+def _arc_foot(arcs, x, t):
+    """
+    Valor del arco concéntrico (radio R - s·t) en x, o inf si su pie no cae en el arco.
+
+    El punto a distancia t del arco en la normal interior está en la
+    circunferencia de radio |R - s·t|; su pie es x' = cx + R (x - cx) / (R - s·t).
+    """
+    ax0, ax1, cx, cy, R, s = arcs
+    rho = R - s * t
+    ok = np.abs(rho) > 1e-12
+    safe = np.where(ok, rho, 1.0)
+    xf = cx + R * (x - cx) / safe
+    ok = ok & (xf >= ax0 - 1e-12) & (xf <= ax1 + 1e-12) & (np.abs(x - xf) <= t) & ((x - cx) ** 2 <= rho * rho)
+    val = cy + s * np.sign(rho) * np.sqrt(np.clip(rho * rho - (x - cx) ** 2, 0.0, None))
+    return np.where(ok, val, np.inf)
+
+
+def _pieces(x, bnd, t):
+    """
+    Valor del borde erosionado en x (N,) y pieza activa.
+
+    Para cada recta, min sobre x' de  r(x') - sqrt(t² - (x - x')²)  es
+    convexo en x': el mínimo está en el pie de la recta desplazada o, si
+    cae fuera, en un extremo (arco alrededor del vértice). En un arco el
+    mínimo está en el pie del concéntrico o en un extremo.
+    Devuelve (val, kind, idx, vx, vr): kind 0 = recta idx, 1 = arco
+    concéntrico idx, 2 = arco de radio t alrededor del vértice (vx, vr).
+    """
+    segs, arcs = bnd
+    xa, ra, xb, rb, m = segs
+    x = np.asarray(x, dtype=float)[:, None]
+    xf = x - m * t / np.sqrt(1.0 + m * m)
+    lo = np.maximum(xa, x - t)
+    hi = np.minimum(xb, x + t)
+    xp = np.clip(xf, lo, hi)
+    root = np.sqrt(np.clip(t * t - (x - xp) ** 2, 0.0, None))
+    val_l = np.where(hi >= lo, ra + m * (xp - xa) - root, np.inf)
+    # Arcos: concéntrico y los dos extremos
+    ax0, ax1 = arcs[0], arcs[1]
+    ends = []
+    for xe in (ax0, ax1):
+        re = _arc_r(arcs, xe)
+        ends.append(np.where(np.abs(x - xe) <= t, re - np.sqrt(np.clip(t * t - (x - xe) ** 2, 0.0, None)), np.inf))
+    val = np.concatenate([val_l, _arc_foot(arcs, x, t)] + ends, axis=1)
+    j = np.argmin(val, axis=1)
+    rows = np.arange(len(x))
+    nl, na = len(xa), len(ax0)
+    jl = np.minimum(j, nl - 1)
+    xpj = xp[rows, jl]
+    xfj = xf[rows, 0] if xf.shape[1] == 1 else xf[rows, jl]
+    on_line = (j < nl) & np.isclose(xpj, xfj, rtol=0.0, atol=1e-9) & (xb[jl] > xa[jl])
+    on_arc = (j >= nl) & (j < nl + na)
+    kind = np.where(on_line, 0, np.where(on_arc, 1, 2))
+    ja = np.where(j < nl, 0, (j - nl) % max(na, 1))
+    idx = np.where(j < nl, j, ja)
+    # Vértice: extremo de recta (punto recortado) o de arco
+    vx, vr = xpj, ra[jl] + m[jl] * (xpj - xa[jl])
+    if na:
+        arc_x = np.where(j < nl + 2 * na, ax0[ja], ax1[ja])
+        vx = np.where(j < nl, vx, arc_x)
+        vr = np.where(j < nl, vr, _arc_r(tuple(c[ja] for c in arcs), arc_x))
+    vx = np.where(kind == 2, vx, np.nan)
+    vr = np.where(kind == 2, vr, np.nan)
+    return val[rows, j], kind, idx, vx, vr
+
+
+def _piece_value(piece, x, bnd, t):
+    """Valor de una pieza en x; inf fuera de su dominio (pie fuera de la pieza o |x - xv| > t)."""
+    kind, a, b = piece
+    segs, arcs = bnd
+    if kind == "line":
+        xa, ra, xb, _, m = (s[a] for s in segs)
+        xf = x - m * t / math.sqrt(1.0 + m * m)
+        if xf < xa - 1e-12 or xf > xb + 1e-12:
+            return math.inf
+        return ra + m * (x - xa) - t * math.sqrt(1.0 + m * m)
+    if kind == "carc":
+        return float(_arc_foot(tuple(c[a:a + 1] for c in arcs), np.array([x]), t)[0])
+    if abs(x - a) > t:
+        return math.inf
+    return b - math.sqrt(max(t * t - (x - a) ** 2, 0.0))
+
+
+def _piece_of(kind, idx, vx, vr, i):
+    if kind[i] == 0:
+        return ("line", int(idx[i]), None)
+    if kind[i] == 1:
+        return ("carc", int(idx[i]), None)
+    return ("arc", round(float(vx[i]), 9), round(float(vr[i]), 9))
+
+
+def _piece_data(piece, bnd):
+    """Datos autónomos de la pieza interior: recta (xa, ra, m), arco (xv, rv), concéntrico (cx, cy, R, s)."""
+    kind, a, b = piece
+    segs, arcs = bnd
+    if kind == "line":
+        return (float(segs[0][a]), float(segs[1][a]), float(segs[4][a]))
+    if kind == "carc":
+        return tuple(float(c[a]) for c in arcs[2:])
+    return (a, b)
+
+
+def piece_radius(kind, x, data, t):
+    """Radio interior de una pieza de inner_profile() en x."""
+    if kind == "line":
+        xa, ra, m = data
+        return ra + m * (x - xa) - t * math.sqrt(1.0 + m * m)
+    if kind == "carc":
+        cx, cy, R, s = data
+        rho = R - s * t
+        return cy + s * math.copysign(1.0, rho) * math.sqrt(max(rho * rho - (x - cx) ** 2, 0.0))
+    xv, rv = data
+    return rv - math.sqrt(max(t * t - (x - xv) ** 2, 0.0))
+
+
+def _bisect(pred, a, b, iters=60):
+    """Frontera entre pred(a) y not pred(b)."""
+    for _ in range(iters):
+        c = 0.5 * (a + b)
+        if pred(c):
+            a = c
+        else:
+            b = c
+    return 0.5 * (a + b)
+
+
+def _extent(pieces):
+    xs = [p[k][0] for p in pieces for k in (1, -1)]
+    return min(xs), max(xs)
+
+
+def _vertices(pieces):
+    return np.array([p[k][0] for p in pieces for k in range(1, len(p))], dtype=float)
+
+
+def inner_profile(pieces, t, n=4096, x_range=None):
+    """
+    Borde interior del casco de espesor t como lista de cadenas.
+
+    pieces : meridiano exterior (polyline() o piezas con arcos)
+    x_range: tramo (x0, x1) en el que se busca el interior (por defecto el
+             del meridiano; fuselage lo acota para tubos abiertos)
+
+    Cada cadena es una lista de piezas (kind, x_start, x_end, datos) con
+    kind "line" (datos (xa, ra, m) de la recta exterior), "carc" (datos
+    (cx, cy, R, s) del arco exterior; radio R - s·t) o "arc" (datos =
+    vértice (xv, rv), radio t), ordenadas en x; piece_radius() da su r(x).
+    Las cadenas de un meridiano cerrado empiezan y acaban sobre el eje.
+    """
+    t = float(t)
+    bnd = _boundary(pieces)
+    xmin, xmax = x_range if x_range is not None else _extent(pieces)
+    px = _vertices(pieces)
+    extra = np.concatenate([px, px - t, px + t])
+    grid = np.unique(np.clip(np.concatenate([np.linspace(xmin, xmax, n), extra]), xmin, xmax))
+    val, kind, idx, vx, vr = _pieces(grid, bnd, t)
+
+    def solid_part(x):
+        return float(_pieces(np.array([x]), bnd, t)[0][0]) <= 0.0
+
+    chains = []
+    current = None
+    for i in range(len(grid)):
+        inside = val[i] > 0.0
+        piece = _piece_of(kind, idx, vx, vr, i)
+        if inside and current is None:
+            # Entrada: el interior aparece entre grid[i-1] y grid[i]
+            x0 = _bisect(solid_part, grid[i - 1], grid[i]) if i > 0 else grid[i]
+            current = [[piece, x0]]
+        elif inside:
+            last = current[-1][0]
+            if piece != last:
+                # Cambio de pieza: última x en la que la anterior sigue siendo mínima
+                xs = _bisect(lambda x: _piece_value(last, x, bnd, t) <= _piece_value(piece, x, bnd, t),
+                             grid[i - 1], grid[i])
+                current[-1].append(xs)
+                current.append([piece, xs])
+        elif current is not None:
+            x1 = _bisect(lambda x: not solid_part(x), grid[i - 1], grid[i])
+            current[-1].append(x1)
+            chains.append(current)
+            current = None
+    if current is not None:
+        current[-1].append(grid[-1])
+        chains.append(current)
+
+    out = []
+    for chain in chains:
+        pieces_in = []
+        start = chain[0][1]
+        for piece, xs, xe in chain:
+            # Las piezas degeneradas se descartan y la siguiente empieza en su lugar
+            if xe - start <= 1e-9:
+                continue
+            pieces_in.append((piece[0], float(start), float(xe), _piece_data(piece, bnd)))
+            start = xe
+        if pieces_in:
+            out.append(pieces_in)
+    return out
+
+
+def outer_radius(pieces, x):
+    """r exterior (N,) del meridiano en x (0 fuera de él)."""
+    x = np.atleast_1d(np.asarray(x, dtype=float))
+    r = np.zeros_like(x)
+    for p in pieces:
+        if p[0] == "line":
+            (xa, ra), (xb, rb) = p[1], p[2]
+            if xb > xa:
+                inside = (x >= xa) & (x <= xb)
+                r = np.where(inside, np.maximum(r, ra + (rb - ra) * (x - xa) / (xb - xa)), r)
+        else:
+            arcs = tuple(np.array([v]) for v in _boundary([p])[1])
+            inside = (x >= arcs[0]) & (x <= arcs[1])
+            r = np.where(inside, np.maximum(r, _arc_r(arcs, x)), r)
+    return r
+
+
+def inner_radius(pieces, t, x):
+    """r interior (N,) en x; <= 0 donde el casco es macizo."""
+    return _pieces(np.atleast_1d(np.asarray(x, dtype=float)), _boundary(pieces), float(t))[0]
+
+
+def _line_sq(r0, r1, a, b):
+    # ∫ r² dx de una recta de r0 (en a) a r1 (en b)
+    return (b - a) * (r0 * r0 + r0 * r1 + r1 * r1) / 3.0
+
+
+def _circle_sq(cx, cy, R, s, a, b):
+    # ∫ (cy + s·sqrt(R² - (x - cx)²))² dx entre a y b
+    def F(x):
+        u = max(-R, min(R, x - cx))
+        q = 0.5 * (u * math.sqrt(max(R * R - u * u, 0.0)) + R * R * math.asin(u / R))
+        return (cy * cy + R * R) * u - u ** 3 / 3.0 + 2.0 * cy * s * q
+    return F(b) - F(a)
+
+
+def solid_volume(pieces, x_range=None):
+    """π ∫ r² dx exacto del meridiano exterior (entre x_range si se da)."""
+    x0, x1 = x_range if x_range is not None else _extent(pieces)
+    total = 0.0
+    for p in pieces:
+        if p[0] == "line":
+            (xa, ra), (xb, rb) = p[1], p[2]
+            a, b = max(xa, x0), min(xb, x1)
+            if b > a:
+                m = (rb - ra) / (xb - xa)
+                total += _line_sq(ra + m * (a - xa), ra + m * (b - xa), a, b)
+        else:
+            xa, xb, cx, cy, R, s = (float(v[0]) for v in _boundary([p])[1])
+            a, b = max(xa, x0), min(xb, x1)
+            if b > a:
+                total += _circle_sq(cx, cy, R, s, a, b)
+    return math.pi * total
+
+
+def chain_volume(chains, t):
+    """π ∫ r² dx exacto bajo las cadenas de inner_profile()."""
+    total = 0.0
+    for chain in chains:
+        for kind, a, b, data in chain:
+            if kind == "line":
+                total += _line_sq(piece_radius(kind, a, data, t), piece_radius(kind, b, data, t), a, b)
+            elif kind == "carc":
+                cx, cy, R, s = data
+                rho = R - s * t
+                total += _circle_sq(cx, cy, abs(rho), s * math.copysign(1.0, rho), a, b)
+            else:
+                total += _circle_sq(data[0], data[1], t, -1.0, a, b)
+    return math.pi * total
+
+
+def shell_volume(pieces, t=None, n=4096, x_range=None):
+    """
+    Volumen del casco (o del sólido con t None) en mm³.
+
+    Exacto: el exterior se integra pieza a pieza y el interior sobre las
+    rectas y arcos de inner_profile().
+    """
+    volume = solid_volume(pieces, x_range)
+    if t:
+        volume -= chain_volume(inner_profile(pieces, t, n, x_range), float(t))
+    return volume
+
+
+# ========================
+# Geometría OCC
+# ========================
+def _components(pieces):
+    """Partir el meridiano en tramos separados por contactos con el eje."""
+    comps = []
+    start = 0
+    for i, p in enumerate(pieces):
+        if p[-1][1] == 0.0:
+            if i > start:
+                comps.append(pieces[start:i + 1])
+            start = i + 1
+    return comps
+
+
+def outer_edges(pieces):
+    """Aristas OCC de piezas ("line", p0, p1) / ("arc", p0, pm, p1) en el plano XY (y = r)."""
+    import Part
+    from FreeCAD import Vector
+    edges = []
+    for piece in pieces:
+        pts = [Vector(p[0], p[1], 0) for p in piece[1:]]
+        if piece[0] == "line":
+            edges.append(Part.LineSegment(*pts).toShape())
+        else:
+            edges.append(Part.Arc(*pts).toShape())
+    return edges
+
+
+def chain_edges(chain, t, axis=True):
+    """
+    Aristas de una cadena de inner_profile(), con uniones verticales donde hay salto.
+
+    axis: la cadena empieza y acaba sobre el eje (meridiano cerrado); si no,
+    va de su primer a su último punto.
+    """
+    import Part
+    from FreeCAD import Vector
+
+    def point(kind, x, data):
+        return Vector(x, max(piece_radius(kind, x, data, t), 0.0), 0)
+
+    kind, xs, _, data = chain[0]
+    last = Vector(xs, 0, 0) if axis else point(kind, xs, data)
+    edges = []
+    for kind, xs, xe, data in chain:
+        p0, p1 = point(kind, xs, data), point(kind, xe, data)
+        if (p0 - last).Length > 1e-7:
+            edges.append(Part.LineSegment(last, p0).toShape())
+        if kind == "line":
+            edges.append(Part.LineSegment(p0, p1).toShape())
+        else:
+            edges.append(Part.Arc(p0, point(kind, 0.5 * (xs + xe), data), p1).toShape())
+        last = p1
+    if axis:
+        end = Vector(chain[-1][2], 0, 0)
+        if (end - last).Length > 1e-7:
+            edges.append(Part.LineSegment(last, end).toShape())
+    return edges
+
+
+def meridian_faces(pieces, t, n=4096, chains=None):
+    """
+    Caras meridionales (plano XY, y = r) del casco de un meridiano cerrado, una por componente.
+
+    chains: cadenas de inner_profile(pieces, t) ya calculadas.
+    """
+    import Part
+    from FreeCAD import Vector
+    chains = inner_profile(pieces, t, n) if chains is None else chains
+    faces = []
+    for comp in _components(pieces):
+        x_start, x_end = _extent(comp)
+        inner = [c for c in chains if x_start <= c[0][1] and c[-1][2] <= x_end]
+        edges = outer_edges(comp)
+        x_axis = x_end
+        for chain in reversed(inner):
+            cx0, cx1 = chain[0][1], chain[-1][2]
+            if x_axis - cx1 > 1e-9:
+                edges.append(Part.LineSegment(Vector(x_axis, 0, 0), Vector(cx1, 0, 0)).toShape())
+            edges.extend(chain_edges(chain, t))
+            x_axis = cx0
+        if x_axis - x_start > 1e-9:
+            edges.append(Part.LineSegment(Vector(x_axis, 0, 0), Vector(x_start, 0, 0)).toShape())
+        faces.append(Part.Face(Part.Wire(Part.__sortEdges__(edges))))
+    return faces
+
+
+def shell_faces(sections, t, n=4096):
+    """Caras meridionales del casco de la unión de tramos cónicos, sin booleanas."""
+    return meridian_faces(polyline(*envelope(sections)), t, n)
+
+
+def revolve_faces(faces, angle=360.0):
+    """Caras meridionales revolucionadas alrededor de X en una sola operación."""
+    import Part
+    from FreeCAD import Vector
+    shape = faces[0] if len(faces) == 1 else Part.makeCompound(faces)
+    return shape.revolve(Vector(0, 0, 0), Vector(1, 0, 0), angle)
+
+
+def revolved_shell(sections, t, n=4096):
+    """Casco hueco de espesor t de la unión de tramos cónicos, en una sola revolución."""
+    return revolve_faces(shell_faces(sections, t, n))
+
+
+def fuselage_sections(P, keys=(("nose_len", "nose_base_d", 0.0), ("mid_len", "mid_d", None),
+                                 ("rear_len", "rear_d", None)), x0=0.0):
+    """
+    Tramos (x0, L, r0, r1) de un fuselaje nariz/medio/popa de parámetros P.
+
+    keys: (clave de longitud, clave de diámetro, diámetro final o None si es
+    cilíndrico). Por defecto el cono de nariz va de nose_base_d a 0 como en
+    make_cone_x(P["nose_base_d"], 0.0, ...).
+    """
+    sections = []
+    x = float(x0)
+    for len_key, d_key, d_end in keys:
+        L = float(P[len_key])
+        r0 = float(P[d_key]) / 2.0
+        r1 = r0 if d_end is None else float(d_end) / 2.0
+        sections.append((x, L, r0, r1))
+        x += L
+    return sections
+
+
+# ========================
+# Cuerpos no revolucionados
+# ========================
+def _record(label, method, t0, ok, error=None):
+    REPORT.append({"label": label, "method": method, "time_s": time.perf_counter() - t0,
+                   "ok": ok, "error": error})
+
+
+def hollow(sections, t, label="Shell", fallback_shape=None):
+    """revolved_shell() con registro en REPORT; si falla, thicken() sobre fallback_shape."""
+    t0 = time.perf_counter()
+    try:
+        shape = revolved_shell(sections, t)
+        _record(label, "revolve", t0, True)
+        return shape
+    except Exception as e:
+        _record(label, "revolve", t0, False, str(e))
+        if fallback_shape is None:
+            raise
+        return thicken(fallback_shape, t, label)
+
+
+def thicken(shape, t, label="Shell", faces=(), tolerance=0.01):
+    """
+    Hueco de espesor t para sólidos arbitrarios.
+
+    makeThickness (quitando faces, vacío = cerrado) y, si falla,
+    makeOffsetShape(-t) + cut. Si ambos fallan se devuelve el sólido
+    macizo, pero el fallo queda en REPORT.
+    """
+    t0 = time.perf_counter()
+    try:
+        result = shape.makeThickness(list(faces), -t, tolerance, False, False, 0, 2)
+        if result.isNull() or not result.isValid():
+            raise RuntimeError("makeThickness inválido")
+        _record(label, "makeThickness", t0, True)
+        return result
+    except Exception as e:
+        _record(label, "makeThickness", t0, False, str(e))
+    t0 = time.perf_counter()
+    try:
+        inner = shape.makeOffsetShape(-t, tolerance, join=2, fill=True)
+        result = shape.cut(inner)
+        _record(label, "makeOffsetShape", t0, True)
+        return result
+    except Exception as e:
+        _record(label, "makeOffsetShape", t0, False, str(e))
+    return shape
+
+
+def print_report(report=None):
+    report = REPORT if report is None else report
+    for r in report:
+        status = "ok" if r["ok"] else f"FALLO ({r['error']})"
+        print(f"{r['label']:<20} {r['method']:<16} {r['time_s']*1e3:8.1f} ms  {status}")
+    failed = sum(not r["ok"] for r in report)
+    print(f"{len(report)} construcciones, {failed} fallos")
+
+
+def benchmark(sections, t, repeats=3):
+    """Tiempo y volumen de revolved_shell frente a fusión + makeOffsetShape + cut."""
+    import Part
+    from FreeCAD import Vector, Placement, Rotation
+    ref = shell_volume(polyline(*envelope(sections)), t)
+
+    def fused():
+        solids = []
+        for x0, L, r0, r1 in sections:
+            s = Part.makeCone(r0, r1, L) if r0 != r1 else Part.makeCylinder(r0, L)
+            s.Placement = Placement(Vector(x0, 0, 0), Rotation(Vector(0, 1, 0), 90))
+            solids.append(s)
+        out = solids[0]
+        for s in solids[1:]:
+            out = out.fuse(s)
+        return out
+
+    def offset():
+        body = fused()
+        return body.cut(body.makeOffsetShape(-t, 0.01, join=2, fill=True))
+
+    rows = []
+    for name, build in (("revolve", lambda: revolved_shell(sections, t)), ("offset", offset)):
+        best, shape, err = float("inf"), None, None
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            try:
+                shape = build()
+            except Exception as e:
+                err = str(e)
+                break
+            best = min(best, time.perf_counter() - t0)
+        rows.append({"method": name, "time_s": best, "error": err,
+                     "volume_error": (shape.Volume / ref - 1.0) if shape is not None else None,
+                     "faces": len(shape.Faces) if shape is not None else 0})
+    return rows
+
+
+if __name__ == "__main__":
+    # Fuselaje de Destin1Tokamav (nariz 800/600, medio 1400/900, popa 800/1200, t = 10)
+    P = {"nose_len": 800.0, "nose_base_d": 600.0, "mid_len": 1400.0, "mid_d": 900.0,
+         "rear_len": 800.0, "rear_d": 1200.0}
+    secs = fuselage_sections(P)
+    px, pr = envelope(secs)
+    pieces = polyline(px, pr)
+    t0 = time.perf_counter()
+    chains = inner_profile(pieces, 10.0)
+    dt = time.perf_counter() - t0
+    print(f"Meridiano exterior: {len(px)} vértices; interior: {len(chains)} cadenas, "
+          f"{sum(len(c) for c in chains)} piezas en {dt*1e3:.1f} ms")
+    for c in chains:
+        print("  " + ", ".join(f"{k}[{a:.1f}..{b:.1f}]" for k, a, b, _ in c))
+    print(f"Volumen del casco: {shell_volume(pieces, 10.0)/1e9:.4f} m³")
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Tabla de materiales de blindaje compartida por las herramientas de análisis.
+
+Las macros (TankBlackRadiation, SistemaPropulsionCilindrico...) definen su
+propio MATERIALS con 'rho' en kg/m³, pero algunas claves usadas en
+P["rad_materials"] (CARBON, POLYETHYLENE, HYDROGEN_RICH, LITHIUM_HYDRIDE)
+no aparecen en la tabla. Aquí se completan con valores de referencia; los
+valores de la macro siempre tienen prioridad.
+
+rho    : densidad [kg/m³]
+mu_rho : coeficiente de atenuación másico [cm²/g] (referencia gamma 1 MeV)
+"""
+
+DEFAULT_SHIELD_MATERIALS = {
+    'LEAD': {'name': 'Lead', 'rho': 11340.0, 'mu_rho': 0.071},
+    'TUNGSTEN': {'name': 'Tungsten', 'rho': 19300.0, 'mu_rho': 0.0657},
+    'BORON': {'name': 'Boron Carbide', 'rho': 2500.0, 'mu_rho': 0.0627},
+    'WATER': {'name': 'Water', 'rho': 1000.0, 'mu_rho': 0.0707},
+    'CARBON': {'name': 'Graphite', 'rho': 1800.0, 'mu_rho': 0.0636},
+    'CARBON_FIBER': {'name': 'Carbon Fiber Composite', 'rho': 1600.0, 'mu_rho': 0.0636},
+    'CARBON_CARBON': {'name': 'Carbon-Carbon', 'rho': 1800.0, 'mu_rho': 0.0636},
+    'POLYETHYLENE': {'name': 'HDPE', 'rho': 950.0, 'mu_rho': 0.0727},
+    'HYDROGEN_RICH': {'name': 'Hydrogen-rich polymer', 'rho': 940.0, 'mu_rho': 0.073},
+    'LITHIUM_HYDRIDE': {'name': 'Lithium Hydride', 'rho': 780.0, 'mu_rho': 0.0695},
+    'TITANIUM': {'name': 'Ti-6Al-4V', 'rho': 4430.0, 'mu_rho': 0.0589},
+    'ALUMINUM': {'name': 'Aluminum 6061', 'rho': 2700.0, 'mu_rho': 0.0615},
+    'STEEL': {'name': 'Stainless Steel', 'rho': 8000.0, 'mu_rho': 0.0599},
+}
+
+
+def resolve_materials(macro_materials=None):
+    """Fusionar la tabla MATERIALS de una macro sobre los valores por defecto."""
+    table = {k: dict(v) for k, v in DEFAULT_SHIELD_MATERIALS.items()}
+    for key, props in (macro_materials or {}).items():
+        table.setdefault(key, {}).update(props)
+    return table
+
+
+def density_g_cm3(table, key, default=1000.0):
+    """Densidad de un material en g/cm³ (las tablas usan kg/m³)."""
+    return table.get(key, {}).get('rho', default) / 1000.0
+
+
+def mass_attenuation(table, key, default=0.065):
+    """Coeficiente de atenuación másico mu/rho [cm²/g]."""
+    return table.get(key, {}).get('mu_rho', default)
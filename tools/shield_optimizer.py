@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Optimizador analítico de blindajes concéntricos multicapa.
+
+Los blindajes de make_radiation_shields (TankBlackRadiation.py) y de
+MultiLayerRadiationShield.build (SistemaPropulsionCilindrico.py) quedan
+definidos por radio interior, longitud, número de capas, grosores y orden de
+materiales. Aquí se modelan sin geometría OCC:
+
+- masa   : suma de anillos  rho * pi * (r_out² - r_in²) * L
+- blindaje: profundidad óptica radial  tau = sum(mu_rho * rho * t),
+            transmisión = exp(-tau)
+
+La búsqueda recorre órdenes de materiales y grosores con candidatos
+vectorizados (cientos de miles por segundo): cada candidato se proyecta
+sobre la restricción de atenuación y las rondas siguientes remuestrean
+alrededor de los mejores (método de entropía cruzada). Solo el diseño
+elegido se envía al constructor de geometría.
+
+Unidades: mm, kg, mu_rho en cm²/g.
+"""
+
+import itertools
+import math
+import os
+import time
+
+import numpy as np
+
+from macro_params import load_macro_params
+from shield_materials import resolve_materials
+
+TANK_MACRO = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "ISS", "Station_modules", "Station",
+    "reactor_BLUE", "renewable_hydrogen", "solar_panels", "macros", "TankBlackRadiation.py")
+
+
+class ShieldStackProblem:
+    """Pila de anillos concéntricos sobre un cilindro de radio inner_radius."""
+
+    def __init__(self, inner_radius, length, materials, n_layers=None, t_min=2.0, t_max=200.0,
+                 target_transmission=1e-3, material_table=None, fixed_order=False):
+        self.inner_radius = float(inner_radius)
+        self.length = float(length)
+        self.materials = list(materials)
+        self.n_layers = int(n_layers or len(self.materials))
+        if self.n_layers > len(self.materials):
+            raise ValueError("n_layers mayor que el número de materiales disponibles")
+        self.t_min = float(t_min)
+        self.t_max = float(t_max)
+        if not 0.0 < target_transmission < 1.0:
+            raise ValueError("target_transmission debe estar entre 0 y 1")
+        self.target_transmission = float(target_transmission)
+        self.fixed_order = fixed_order
+        table = resolve_materials(material_table)
+        self.rho = np.array([table[m]['rho'] for m in self.materials])           # kg/m³
+        # mu_rho [cm²/g] * rho [g/cm³] = 1/cm  ->  /10 = 1/mm
+        self.k = np.array([table[m]['mu_rho'] * table[m]['rho'] / 1000.0 / 10.0 for m in self.materials])
+
+    @property
+    def required_depth(self):
+        return -math.log(self.target_transmission)
+
+    def orders(self, max_orders=5040, rng=None):
+        """Órdenes candidatos (índices en self.materials), forma (M, n_layers)."""
+        n = self.n_layers
+        if self.fixed_order:
+            return np.arange(n)[None, :]
+        total = math.perm(len(self.materials), n)
+        if total <= max_orders:
+            return np.array(list(itertools.permutations(range(len(self.materials)), n)))
+        rng = rng or np.random.default_rng()
+        keys = rng.random((max_orders, len(self.materials)))
+        return np.argsort(keys, axis=1)[:, :n]
+
+    def evaluate(self, order, t):
+        """Masa [kg] y profundidad óptica de cada candidato (arrays (N,))."""
+        rho = self.rho[order]
+        r_in = self.inner_radius + np.cumsum(t, axis=1) - t
+        vol = math.pi * ((r_in + t) ** 2 - r_in ** 2) * self.length     # mm³
+        mass = (vol * rho).sum(axis=1) / 1e9
+        depth = (self.k[order] * t).sum(axis=1)
+        return mass, depth
+
+    def project(self, order, t):
+        """
+        Escalar los grosores (por encima de t_min) para que la restricción
+        quede activa. Devuelve (t_proyectado, factible).
+        """
+        k = self.k[order]
+        base = (k * self.t_min).sum(axis=1)
+        var = (k * (t - self.t_min)).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s = np.where(var > 0, (self.required_depth - base) / var, np.inf)
+            s = np.clip(s, 0.0, None)[:, None]
+            tp = self.t_min + s * (t - self.t_min)
+        ok = np.isfinite(tp).all(axis=1) & (tp <= self.t_max + 1e-9).all(axis=1)
+        return np.where(np.isfinite(tp), tp, self.t_max), ok
+
+    def design(self, order, t):
+        mass, depth = self.evaluate(order[None, :], t[None, :])
+        return {
+            "materials": [self.materials[i] for i in order],
+            "thicknesses": [float(v) for v in t],
+            "mass_kg": float(mass[0]),
+            "optical_depth": float(depth[0]),
+            "transmission": float(math.exp(-depth[0])),
+            "outer_radius": float(self.inner_radius + t.sum()),
+        }
+
+
+def optimize_shield_stack(problem, n_candidates=100000, rounds=8, elite_frac=0.02,
+                          max_orders=5040, seed=0):
+    """Minimizar masa con transmisión <= objetivo. Devuelve el mejor diseño."""
+    rng = np.random.default_rng(seed)
+    orders = problem.orders(max_orders, rng)
+    n = problem.n_layers
+    lo, hi = problem.t_min, problem.t_max
+    n_elite = max(8, int(n_candidates * elite_frac))
+
+    best = None
+    evaluated = 0
+    t0 = time.perf_counter()
+    elite_order, elite_t = None, None
+    for rnd in range(rounds):
+        if elite_order is None:
+            order = orders[rng.integers(0, len(orders), n_candidates)]
+            t = rng.uniform(lo, hi, (n_candidates, n))
+        else:
+            pick = rng.integers(0, len(elite_order), n_candidates)
+            order = elite_order[pick].copy()
+            # Mutación del orden: intercambio de dos capas en una fracción de candidatos
+            if not problem.fixed_order and n > 1:
+                swap = rng.random(n_candidates) < 0.2
+                a = rng.integers(0, n, n_candidates)
+                b = rng.integers(0, n, n_candidates)
+                rows = np.flatnonzero(swap)
+                va, vb = order[rows, a[rows]], order[rows, b[rows]]
+                order[rows, a[rows]], order[rows, b[rows]] = vb, va
+            sigma = (hi - lo) * 0.25 * (0.6 ** rnd)
+            t = np.clip(elite_t[pick] + rng.normal(0.0, sigma, (n_candidates, n)), lo, hi)
+
+        t, ok = problem.project(order, t)
+        mass, _ = problem.evaluate(order, t)
+        evaluated += n_candidates
+        mass = np.where(ok, mass, np.inf)
+        if not np.isfinite(mass).any():
+            continue
+        idx = np.argpartition(mass, min(n_elite, len(mass) - 1))[:n_elite]
+        idx = idx[np.isfinite(mass[idx])]
+        elite_order, elite_t = order[idx], t[idx]
+        i = idx[np.argmin(mass[idx])]
+        if best is None or mass[i] < best[0]:
+            best = (mass[i], order[i].copy(), t[i].copy())
+
+    elapsed = time.perf_counter() - t0
+    if best is None:
+        raise ValueError("Ningún candidato cumple el objetivo de atenuación dentro de [t_min, t_max]")
+    result = problem.design(best[1], best[2])
+    result["evaluated"] = evaluated
+    result["candidates_per_s"] = evaluated / elapsed if elapsed > 0 else float("inf")
+    return result
+
+
+# ========================
+# Integración con las macros
+# ========================
+def problem_from_macro(path=TANK_MACRO, overrides=None, **kwargs):
+    """
+    Problema a partir de P/MATERIALS de una macro (TankBlackRadiation por defecto).
+    `overrides` completa P cuando la macro no define hull_outer_d/total_length.
+    Devuelve (problem, baseline) con el diseño actual como referencia.
+    """
+    params = load_macro_params(path, ["P", "MATERIALS"])
+    P = dict(params.get("P", {}))
+    P.update(overrides or {})
+    n = int(P["rad_shield_layers"])
+    mats = list(P["rad_materials"])[:n]
+    mats += ["LEAD"] * (n - len(mats))
+    t_layer = float(P["rad_layer_t"])
+    kwargs.setdefault("t_min", max(float(P.get("min_wall_t", 2.0)), 1.0))
+    kwargs.setdefault("t_max", 4.0 * t_layer)
+    problem = ShieldStackProblem(P["hull_outer_d"] / 2.0, P["total_length"], mats,
+                                 material_table=params.get("MATERIALS"), **kwargs)
+    ts = list(P.get("rad_layer_ts") or [])[:n]
+    ts += [t_layer] * (n - len(ts))
+    baseline = problem.design(np.arange(n), np.asarray(ts, dtype=float))
+    return problem, baseline
+
+
+def apply_design(P, design):
+    """Escribir el diseño en el diccionario P de la macro."""
+    P["rad_materials"] = list(design["materials"])
+    P["rad_layer_ts"] = list(design["thicknesses"])
+    P["rad_shield_layers"] = len(design["materials"])
+    return P
+
+
+def build_shield_layers(design, P, doc=None, materials=None):
+    """Construir en FreeCAD solo las capas del diseño elegido (eje X, como la macro)."""
+    import FreeCAD as App
+    import Part
+    doc = doc or App.ActiveDocument
+    L = P["total_length"]
+    r_in = P["hull_outer_d"] / 2.0
+    objs = []
+    for i, (mat, t) in enumerate(zip(design["materials"], design["thicknesses"])):
+        outer = Part.makeCylinder(r_in + t, L)
+        inner = Part.makeCylinder(r_in, L + 100.0)
+        inner.translate(App.Vector(0, 0, -50.0))
+        layer = outer.cut(inner)
+        layer.Placement = App.Placement(App.Vector(0, 0, 0), App.Rotation(App.Vector(0, 1, 0), 90))
+        obj = doc.addObject("Part::Feature", f"Rad_Shield_Layer_{i+1}")
+        obj.Shape = layer
+        obj.addProperty("App::PropertyString", "MaterialKey", "Material", "Clave en MATERIALS")
+        obj.MaterialKey = mat
+        if materials and mat in materials and 'color' in materials[mat]:
+            obj.ViewObject.ShapeColor = materials[mat]['color']
+        objs.append(obj)
+        r_in += t
+    doc.recompute()
+    return objs
+
+
+def print_design(label, d):
+    layers = ", ".join(f"{m}:{t:.1f}" for m, t in zip(d["materials"], d["thicknesses"]))
+    print(f"{label}: masa {d['mass_kg']:.0f} kg, transmisión {d['transmission']:.2e}, capas [{layers}]")
+
+
+if __name__ == "__main__":
+    problem, baseline = problem_from_macro(target_transmission=1e-3)
+    print_design("Actual", baseline)
+    best = optimize_shield_stack(problem)
+    print_design("Óptimo", best)
+    print(f"Candidatos evaluados: {best['evaluated']} ({best['candidates_per_s']:.0f}/s)")
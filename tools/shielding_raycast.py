@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+"""
+Análisis de blindaje por trazado de rayos (densidad areal g/cm²).
+
+Teselado del ensamblaje con etiqueta de material por objeto, BVH en NumPy y
+lanzamiento de miles de rayos desde puntos de dosis (Cockpit, Crew_Quarters_*,
+módulos de habitación). Para cada rayo se acumula la longitud recorrida dentro
+de cada sólido (regla de paridad entrada/salida) y se convierte a g/cm² con la
+densidad del material. Los lotes de rayos se procesan en paralelo.
+
+Salida por punto de dosis: densidad areal media, mínima y máxima, desglose por
+material y mapa direccional (theta, phi).
+
+Unidades: mm en la geometría, g/cm² en los resultados.
+Uso en FreeCAD tras ejecutar TankBlackRadiation.py o SistemaPropulsionCilindrico.py:
+
+    import shielding_raycast as sr
+    results = sr.analyze_document(App.ActiveDocument, macro_path=".../TankBlackRadiation.py")
+    sr.write_report(results, "shielding_report.json")
+"""
+
+import fnmatch
+import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import numpy as np
+
+from macro_params import load_macro_params
+from shield_materials import resolve_materials, density_g_cm3
+
+DOSE_POINT_PATTERNS = ("Cockpit", "Crew_Quarters_*", "Habitation_Module_*")
+# Objetos que son la fusión de todo el ensamblaje (duplicarían el blindaje)
+ASSEMBLY_LABELS = ("TankBlackRadiation_Spaceship", "Modular_Space_Station_ISS_Style")
+
+_EPS = 1e-12
+
+
+# ========================
+# Direcciones y utilidades
+# ========================
+def fibonacci_directions(n):
+    """n direcciones unitarias casi uniformes sobre la esfera (N, 3)."""
+    i = np.arange(n, dtype=float) + 0.5
+    z = 1.0 - 2.0 * i / n
+    r = np.sqrt(np.clip(1.0 - z * z, 0.0, 1.0))
+    phi = i * math.pi * (3.0 - math.sqrt(5.0))
+    return np.column_stack((r * np.cos(phi), r * np.sin(phi), z))
+
+
+def directional_map(directions, values, n_theta=18, n_phi=36):
+    """Promedio de `values` por celda (theta polar desde +Z, phi azimut)."""
+    theta = np.arccos(np.clip(directions[:, 2], -1.0, 1.0))
+    phi = np.mod(np.arctan2(directions[:, 1], directions[:, 0]), 2.0 * math.pi)
+    it = np.minimum((theta / math.pi * n_theta).astype(int), n_theta - 1)
+    ip = np.minimum((phi / (2.0 * math.pi) * n_phi).astype(int), n_phi - 1)
+    cell = it * n_phi + ip
+    total = np.bincount(cell, weights=values, minlength=n_theta * n_phi)
+    count = np.bincount(cell, minlength=n_theta * n_phi)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        grid = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+    return grid.reshape(n_theta, n_phi)
+
+
+# ========================
+# BVH de triángulos
+# ========================
+class TriangleBVH:
+    """BVH plano (arrays) sobre triángulos con etiqueta de malla."""
+
+    def __init__(self, v0, v1, v2, tags, leaf_size=8):
+        v0, v1, v2 = (np.asarray(a, dtype=float) for a in (v0, v1, v2))
+        tags = np.asarray(tags, dtype=np.int64)
+        lo = np.minimum(np.minimum(v0, v1), v2)
+        hi = np.maximum(np.maximum(v0, v1), v2)
+        order = self._build((lo + hi) * 0.5, lo, hi, leaf_size)
+        self.v0 = v0[order]
+        self.e1 = v1[order] - self.v0
+        self.e2 = v2[order] - self.v0
+        self.tags = tags[order]
+
+    def _build(self, centroids, lo, hi, leaf_size):
+        n = len(centroids)
+        order = np.arange(n)
+        bmin, bmax, left, right, start, count = [], [], [], [], [], []
+        stack = [(0, n, -1, 0)]
+        while stack:
+            s, e, parent, side = stack.pop()
+            idx = order[s:e]
+            nid = len(bmin)
+            bmin.append(lo[idx].min(axis=0))
+            bmax.append(hi[idx].max(axis=0))
+            left.append(-1)
+            right.append(-1)
+            start.append(s)
+            count.append(0)
+            if parent >= 0:
+                (left if side == 0 else right)[parent] = nid
+            c = centroids[idx]
+            ext = c.max(axis=0) - c.min(axis=0)
+            axis = int(np.argmax(ext))
+            if e - s <= leaf_size or ext[axis] <= 0.0:
+                count[nid] = e - s
+                continue
+            mid = (e - s) // 2
+            part = np.argpartition(c[:, axis], mid)
+            order[s:e] = idx[part]
+            stack.append((s + mid, e, nid, 1))
+            stack.append((s, s + mid, nid, 0))
+        self.bmin = np.array(bmin)
+        self.bmax = np.array(bmax)
+        self.left = np.array(left, dtype=np.int64)
+        self.right = np.array(right, dtype=np.int64)
+        self.start = np.array(start, dtype=np.int64)
+        self.count = np.array(count, dtype=np.int64)
+        return order
+
+    def intersect_all(self, origins, directions):
+        """
+        Todas las intersecciones t > 0 de cada rayo.
+        Devuelve (ray_idx, tag, t) como arrays 1-D.
+        """
+        origins = np.asarray(origins, dtype=float)
+        d = np.asarray(directions, dtype=float)
+        d = np.where(np.abs(d) < 1e-30, 1e-30, d)
+        inv = 1.0 / d
+        ray = np.arange(len(origins))
+        node = np.zeros(len(origins), dtype=np.int64)
+        out_r, out_tag, out_t = [], [], []
+        while ray.size:
+            o, iv = origins[ray], inv[ray]
+            t1 = (self.bmin[node] - o) * iv
+            t2 = (self.bmax[node] - o) * iv
+            tnear = np.minimum(t1, t2).max(axis=1)
+            tfar = np.maximum(t1, t2).min(axis=1)
+            keep = (tfar >= np.maximum(tnear, 0.0))
+            ray, node = ray[keep], node[keep]
+            leaf = self.count[node] > 0
+            if leaf.any():
+                lr, ln = ray[leaf], node[leaf]
+                cnt = self.count[ln]
+                rr = np.repeat(lr, cnt)
+                tri = np.repeat(self.start[ln] - (np.cumsum(cnt) - cnt), cnt) + np.arange(cnt.sum())
+                t, hit = self._moller_trumbore(origins[rr], directions[rr], tri)
+                out_r.append(rr[hit])
+                out_tag.append(self.tags[tri[hit]])
+                out_t.append(t[hit])
+            inner = ~leaf
+            ray = np.concatenate((ray[inner], ray[inner]))
+            node = np.concatenate((self.left[node[inner]], self.right[node[inner]]))
+        if not out_r:
+            empty = np.zeros(0)
+            return empty.astype(np.int64), empty.astype(np.int64), empty
+        return np.concatenate(out_r), np.concatenate(out_tag), np.concatenate(out_t)
+
+    def _moller_trumbore(self, o, d, tri):
+        v0, e1, e2 = self.v0[tri], self.e1[tri], self.e2[tri]
+        p = np.cross(d, e2)
+        det = np.einsum("ij,ij->i", e1, p)
+        ok = np.abs(det) > _EPS
+        inv_det = 1.0 / np.where(ok, det, 1.0)
+        s = o - v0
+        u = np.einsum("ij,ij->i", s, p) * inv_det
+        q = np.cross(s, e1)
+        v = np.einsum("ij,ij->i", d, q) * inv_det
+        t = np.einsum("ij,ij->i", e2, q) * inv_det
+        hit = ok & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (t > 1e-9)
+        return t, hit
+
+
+def path_lengths(ray_idx, tag, t, n_rays, n_tags, tol=1e-6):
+    """
+    Longitud recorrida por cada rayo dentro de cada malla cerrada (n_rays, n_tags).
+    Regla de paridad: con un número impar de cortes el origen está dentro.
+    """
+    out = np.zeros((n_rays, n_tags))
+    if ray_idx.size == 0:
+        return out
+    order = np.lexsort((t, tag, ray_idx))
+    r, g, t = ray_idx[order], tag[order], t[order]
+    same = np.r_[False, (r[1:] == r[:-1]) & (g[1:] == g[:-1])]
+    # Cortes duplicados en aristas compartidas por dos triángulos
+    dup = same & np.r_[False, (t[1:] - t[:-1]) < tol]
+    r, g, t, same = r[~dup], g[~dup], t[~dup], same[~dup]
+    first = ~np.r_[False, (r[1:] == r[:-1]) & (g[1:] == g[:-1])]
+    group = np.cumsum(first) - 1
+    starts = np.flatnonzero(first)
+    n = np.diff(np.r_[starts, len(r)])
+    rank = np.arange(len(r)) - starts[group]
+    sign = np.where((rank + n[group]) % 2 == 1, 1.0, -1.0)
+    np.add.at(out, (r, g), sign * t)
+    return out
+
+
+# ========================
+# Escena
+# ========================
+class ShieldingScene:
+    """Mallas cerradas etiquetadas con material."""
+
+    def __init__(self, materials=None):
+        self.materials = resolve_materials(materials)
+        self.labels: list = []
+        self.mesh_materials: list = []
+        self._tris: list = []
+        self._bvh = None
+
+    def add_mesh(self, label, material, points, facets):
+        pts = np.asarray(points, dtype=float).reshape(-1, 3)
+        fac = np.asarray(facets, dtype=np.int64).reshape(-1, 3)
+        if fac.size == 0:
+            return
+        self.labels.append(label)
+        self.mesh_materials.append(material)
+        self._tris.append(pts[fac])
+        self._bvh = None
+
+    @property
+    def bvh(self):
+        if self._bvh is None:
+            tris = np.concatenate(self._tris)
+            tags = np.concatenate([np.full(len(tr), i) for i, tr in enumerate(self._tris)])
+            self._bvh = TriangleBVH(tris[:, 0], tris[:, 1], tris[:, 2], tags)
+        return self._bvh
+
+    def densities(self):
+        """Densidad g/cm³ de cada malla."""
+        return np.array([density_g_cm3(self.materials, m) for m in self.mesh_materials])
+
+    @classmethod
+    def from_document(cls, doc, materials=None, rad_materials=None, deflection=None,
+                      skip=ASSEMBLY_LABELS, material_of=None, lod=None, lod_level=1):
+        """
+        Teselar los Part::Feature de un documento con material conocido.
+
+        lod: mesh_lod.LODCache opcional; se usa su nivel lod_level (cacheado en
+        disco por hash de forma) en lugar de teselar de nuevo.
+        """
+        scene = cls(materials)
+        resolver = material_of or (lambda o: default_material_of(o, rad_materials))
+        for obj in doc.Objects:
+            if obj.Label in skip or not hasattr(obj, "Shape") or obj.Shape.isNull():
+                continue
+            if not obj.Shape.Solids:
+                continue
+            mat = resolver(obj)
+            if mat is None:
+                continue
+            if lod is not None:
+                pts, facets = lod.get(obj.Shape).level(lod_level)
+                scene.add_mesh(obj.Label, mat, pts, facets)
+                continue
+            defl = deflection or max(0.5, obj.Shape.BoundBox.DiagonalLength * 2e-3)
+            pts, facets = obj.Shape.tessellate(defl)
+            scene.add_mesh(obj.Label, mat, [(p.x, p.y, p.z) for p in pts], facets)
+        return scene
+
+
+def default_material_of(obj, rad_materials=None):
+    """Material de un objeto: propiedad MaterialKey, mapa Material o etiqueta."""
+    key = getattr(obj, "MaterialKey", None)
+    if key:
+        return key
+    mat = getattr(obj, "Material", None)
+    if isinstance(mat, dict) and mat.get("Name"):
+        return mat["Name"]
+    if obj.Label.startswith("Rad_Shield_Layer_") and rad_materials:
+        i = int(obj.Label.rsplit("_", 1)[1]) - 1
+        return rad_materials[i] if i < len(rad_materials) else "LEAD"
+    return None
+
+
+# ========================
+# Análisis
+# ========================
+_WORKER_SCENE = None
+
+
+def _init_worker(bvh):
+    global _WORKER_SCENE
+    _WORKER_SCENE = bvh
+
+
+def _trace_batch(args):
+    origins, directions, offset = args
+    r, g, t = _WORKER_SCENE.intersect_all(origins, directions)
+    return r + offset, g, t
+
+
+def trace_rays(bvh, origins, directions, batch_size=4096, workers=None, use_processes=False):
+    """Intersecciones de todos los rayos, por lotes en paralelo."""
+    n = len(origins)
+    batches = [(origins[s:s + batch_size], directions[s:s + batch_size], s)
+               for s in range(0, n, batch_size)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(batches) == 1:
+        _init_worker(bvh)
+        parts = [_trace_batch(b) for b in batches]
+    elif use_processes:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(bvh,)) as ex:
+            parts = list(ex.map(_trace_batch, batches))
+    else:
+        _init_worker(bvh)
+        with ThreadPoolExecutor(workers) as ex:
+            parts = list(ex.map(_trace_batch, batches))
+    if not parts:
+        empty = np.zeros(0)
+        return empty.astype(np.int64), empty.astype(np.int64), empty
+    return tuple(np.concatenate(p) for p in zip(*parts))
+
+
+def analyze_dose_points(scene, dose_points, n_rays=2000, n_theta=18, n_phi=36,
+                        batch_size=4096, workers=None, use_processes=False):
+    """
+    dose_points: lista de dicts {'label', 'point': (x, y, z), 'exclude': [labels]}
+    Devuelve una lista de resultados (uno por punto de dosis).
+    """
+    dirs = fibonacci_directions(n_rays)
+    n_pts, n_mesh = len(dose_points), len(scene.labels)
+    origins = np.repeat(np.asarray([dp["point"] for dp in dose_points], dtype=float), n_rays, axis=0)
+    directions = np.tile(dirs, (n_pts, 1))
+
+    r, g, t = trace_rays(scene.bvh, origins, directions, batch_size, workers, use_processes)
+
+    excluded = np.zeros((n_pts, n_mesh), dtype=bool)
+    index = {lab: i for i, lab in enumerate(scene.labels)}
+    for k, dp in enumerate(dose_points):
+        for lab in dp.get("exclude", ()):
+            if lab in index:
+                excluded[k, index[lab]] = True
+    keep = ~excluded[r // n_rays, g]
+    lengths = path_lengths(r[keep], g[keep], t[keep], len(origins), n_mesh)
+
+    # mm -> cm, g/cm³ -> g/cm²
+    areal = lengths * 0.1 * scene.densities()[None, :]
+    mats = sorted(set(scene.mesh_materials))
+    mat_cols = {m: np.array([mm == m for mm in scene.mesh_materials]) for m in mats}
+
+    results = []
+    for k, dp in enumerate(dose_points):
+        block = areal[k * n_rays:(k + 1) * n_rays]
+        total = block.sum(axis=1)
+        results.append({
+            "label": dp["label"],
+            "point": tuple(float(c) for c in dp["point"]),
+            "n_rays": n_rays,
+            "mean_areal_density": float(total.mean()),
+            "min_areal_density": float(total.min()),
+            "max_areal_density": float(total.max()),
+            "by_material": {m: float(block[:, cols].sum(axis=1).mean()) for m, cols in mat_cols.items()},
+            "directions": dirs,
+            "areal_density": total,
+            "map": directional_map(dirs, total, n_theta, n_phi),
+        })
+    return results
+
+
+def find_dose_points(doc, patterns=DOSE_POINT_PATTERNS):
+    """Centro de cada compartimento cuyo Label coincide con los patrones."""
+    points = []
+    for obj in doc.Objects:
+        if not hasattr(obj, "Shape") or obj.Shape.isNull():
+            continue
+        if not any(fnmatch.fnmatch(obj.Label, p) for p in patterns):
+            continue
+        c = obj.Shape.BoundBox.Center
+        # Compartimentos macizos (cajas): el punto está dentro del propio sólido
+        inside = obj.Shape.isInside(c, 1e-6, True)
+        points.append({"label": obj.Label, "point": (c.x, c.y, c.z),
+                       "exclude": [obj.Label] if inside else []})
+    return points
+
+
+def analyze_document(doc, macro_path=None, patterns=DOSE_POINT_PATTERNS, n_rays=2000, lod=None, **kwargs):
+    """Análisis completo de un documento FreeCAD ya construido por una macro (lod: mesh_lod.LODCache)."""
+    materials, rad_materials = None, None
+    if macro_path:
+        params = load_macro_params(macro_path, ["P", "MATERIALS"])
+        materials = params.get("MATERIALS")
+        rad_materials = params.get("P", {}).get("rad_materials")
+    scene = ShieldingScene.from_document(doc, materials, rad_materials, lod=lod)
+    dose_points = find_dose_points(doc, patterns)
+    if not dose_points:
+        raise ValueError("No se encontraron puntos de dosis en el documento")
+    return analyze_dose_points(scene, dose_points, n_rays=n_rays, **kwargs)
+
+
+def write_report(results, path):
+    """Guardar resultados en JSON (arrays como listas)."""
+    out = []
+    for res in results:
+        out.append({k: (v.tolist() if isinstance(v, np.ndarray) else v) for k, v in res.items()})
+    with open(path, "w") as f:
+        json.dump(out, f, indent=1)
+    return path
+
+
+def print_summary(results):
+    for res in results:
+        mats = ", ".join(f"{m}={v:.1f}" for m, v in res["by_material"].items() if v > 0)
+        print(f"{res['label']}: media {res['mean_areal_density']:.1f} g/cm² "
+              f"(min {res['min_areal_density']:.1f}, max {res['max_areal_density']:.1f}) [{mats}]")
+
+
+if __name__ == "__main__":
+    import FreeCAD as App
+    results = analyze_document(App.ActiveDocument)
+    print_summary(results)
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Exportación STEP con estructura de producto e instancias compartidas.
+
+Part.export([assembly], P["step_path"]) y la ruta export_as_single_compound
+de SateliteTest04 escriben un único sólido fusionado o una lista plana: los
+tornillos, propulsores y celdas repetidos se duplican enteros (de ahí STEP
+de 86k líneas como Metallic_Spacecraft_Optic_Reactor.step). Aquí:
+
+- Se recorren los contenedores App::Part (SPACECRAFT y los LAYERS de
+  SolarWaterWall, Ship/Body/Reactor de Destin1Tokamav...) y se reproduce
+  la jerarquía como ensamblajes STEP (NEXT_ASSEMBLY_USAGE_OCCURRENCE).
+- Las piezas idénticas se agrupan por clave de geometría:
+    1. sha1 del BREP sin su Placement (piezas colocadas con place()),
+    2. opcionalmente, la misma forma desplazada: nº de vértices, aristas y
+       caras, volumen, área y vértices relativos al centro de masas
+       (geometría "horneada" con translate o makeCylinder(..., pnt)).
+  Cada grupo se escribe UNA vez como prototipo y el resto son App::Link a
+  él con su colocación: el escritor XCAF de Import.export comparte la
+  representación y solo añade transformaciones.
+
+La exportación se hace sobre un documento temporal, sin tocar el original.
+
+Uso en FreeCAD con tools/ en sys.path:
+    import step_assembly
+    stats = step_assembly.export_step([root], "Solar_Barge.step")
+"""
+
+import hashlib
+import os
+import time
+
+CONTAINER_TYPES = ("App::Part", "App::DocumentObjectGroup")
+
+# Redondeo [mm] de las firmas por traslación
+SIGNATURE_DIGITS = 4
+
+
+# ========================
+# Claves de geometría
+# ========================
+def placement_free_key(shape):
+    """sha1 del BREP de la forma con su Placement anulado."""
+    import FreeCAD as App
+    s = shape.copy()
+    s.Placement = App.Placement()
+    return hashlib.sha1(s.exportBrepToString().encode("utf-8")).hexdigest()
+
+
+def translation_signature(shape, digits=SIGNATURE_DIGITS):
+    """
+    (firma, centro): firma invariante a traslaciones de la forma ya colocada.
+
+    Dos formas con la misma firma son la misma pieza desplazada centro_b - centro_a.
+    """
+    c = shape.CenterOfMass if shape.Solids else shape.BoundBox.Center
+    pts = sorted((round(v.Point.x - c.x, digits), round(v.Point.y - c.y, digits), round(v.Point.z - c.z, digits))
+                 for v in shape.Vertexes)
+    head = (len(shape.Vertexes), len(shape.Edges), len(shape.Faces),
+            round(shape.Volume, 2), round(shape.Area, 2))
+    return hashlib.sha1(repr((head, pts)).encode("utf-8")).hexdigest(), c
+
+
+# ========================
+# Árbol
+# ========================
+def _children(obj):
+    return [o for o in getattr(obj, "Group", []) if o is not None]
+
+
+def _is_container(obj):
+    return obj.TypeId in CONTAINER_TYPES
+
+
+def _leaves(objs):
+    for o in objs:
+        if _is_container(o):
+            yield from _leaves(_children(o))
+        elif hasattr(o, "Shape") and not o.Shape.isNull():
+            yield o
+
+
+def instance_groups(objs, by_translation=True):
+    """
+    {clave: [(obj, colocación)]} de las hojas del árbol.
+
+    Cada grupo comparte la geometría del primer miembro sin su Placement
+    (prototipo); la colocación de cada miembro lo sitúa dentro de su
+    contenedor padre, que es donde irá su App::Link.
+    """
+    import FreeCAD as App
+    groups = {}
+    by_sig = {}
+    for o in _leaves(objs):
+        shape = o.Shape
+        key = "brep:" + placement_free_key(shape)
+        if key in groups:
+            groups[key].append((o, shape.Placement))
+            continue
+        if by_translation:
+            sig, c = translation_signature(shape)
+            if sig in by_sig:
+                # Misma pieza desplazada d respecto al primer miembro del grupo
+                gkey, c0, pl0 = by_sig[sig]
+                d = c - c0
+                groups[gkey].append((o, App.Placement(pl0.Base + d, pl0.Rotation)))
+                continue
+            by_sig[sig] = (key, c, shape.Placement)
+        groups[key] = [(o, shape.Placement)]
+    return groups
+
+
+# ========================
+# Documento de exportación
+# ========================
+def build_export_document(objs, name="STEP_Assembly", by_translation=True):
+    """
+    Documento temporal con la jerarquía de contenedores y App::Link a prototipos.
+
+    Devuelve (doc, raíces, estadísticas).
+    """
+    import FreeCAD as App
+    groups = instance_groups(objs, by_translation)
+    where = {}
+    for key, members in groups.items():
+        for o, pl in members:
+            where[o.Name] = (key, pl)
+
+    src_doc = objs[0].Document
+    doc = App.newDocument(name, hidden=True) if _supports_hidden() else App.newDocument(name)
+    protos = {}
+    stats = {"leaves": 0, "unique": 0, "links": 0}
+
+    proto_group = doc.addObject("App::DocumentObjectGroup", "Prototypes")
+
+    def prototype(key, members):
+        if key in protos:
+            return protos[key]
+        o0 = members[0][0]
+        shape = o0.Shape.copy()
+        shape.Placement = App.Placement()
+        p = doc.addObject("Part::Feature", o0.Label + "_proto")
+        p.Shape = shape
+        proto_group.addObject(p)
+        protos[key] = p
+        stats["unique"] += 1
+        return p
+
+    def copy(o, parent):
+        if _is_container(o):
+            c = doc.addObject("App::Part", o.Name)
+            c.Label = o.Label
+            # DocumentObjectGroup no tiene Placement: se queda la identidad
+            if hasattr(o, "Placement"):
+                c.Placement = o.Placement
+            for ch in _children(o):
+                copy(ch, c)
+            if parent is not None:
+                parent.addObject(c)
+            return c
+        if not (hasattr(o, "Shape") and not o.Shape.isNull()):
+            return None
+        stats["leaves"] += 1
+        key, pl = where[o.Name]
+        members = groups[key]
+        if len(members) == 1:
+            f = doc.addObject("Part::Feature", o.Name)
+            f.Label = o.Label
+            f.Shape = o.Shape.copy()
+            stats["unique"] += 1
+        else:
+            f = doc.addObject("App::Link", o.Name)
+            f.Label = o.Label
+            f.LinkedObject = prototype(key, members)
+            f.Placement = pl
+            stats["links"] += 1
+        if parent is not None:
+            parent.addObject(f)
+        return f
+
+    roots = [r for r in (copy(o, None) for o in objs) if r is not None]
+    doc.recompute()
+    stats["source"] = src_doc.Name if src_doc is not None else None
+    return doc, roots, stats
+
+
+def _supports_hidden():
+    import FreeCAD as App
+    try:
+        return tuple(int(x) for x in App.Version()[:2]) >= (0, 19)
+    except Exception:
+        return False
+
+
+def export_step(objs, path, name=None, by_translation=True):
+    """
+    STEP con ensamblajes e instancias compartidas de `objs` (contenedores u hojas).
+
+    Una lista plana de hojas se envuelve en un App::Part llamado `name`.
+    Devuelve estadísticas: hojas, representaciones únicas, enlaces, bytes y tiempo.
+    """
+    import FreeCAD as App
+    import Import
+    t0 = time.perf_counter()
+    objs = [o for o in objs if o is not None]
+    wrap = name or os.path.splitext(os.path.basename(path))[0]
+    doc, roots, stats = build_export_document(objs, "STEP_" + wrap.replace(" ", "_"), by_translation)
+    try:
+        if not all(_is_container(o) for o in objs):
+            top = doc.addObject("App::Part", wrap)
+            for r in roots:
+                top.addObject(r)
+            roots = [top]
+            doc.recompute()
+        Import.export(roots, path)
+    finally:
+        App.closeDocument(doc.Name)
+    stats["bytes"] = os.path.getsize(path) if os.path.exists(path) else 0
+    stats["time_s"] = round(time.perf_counter() - t0, 3)
+    return stats
+
+
+def print_stats(stats):
+    print(f"STEP: {stats['leaves']} piezas, {stats['unique']} representaciones, "
+          f"{stats['links']} instancias enlazadas, {stats['bytes'] / 1024:.0f} KB ({stats['time_s']:.2f} s)")
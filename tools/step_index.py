@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""
+Lector STEP (ISO-10303-21) en Python puro sobre un fichero mapeado en memoria.
+
+Para saber el producto, cuántas caras tiene o la extensión de un STEP del
+repositorio (HexSat_Metallic_Fusion_Realistic.step, Unified_Advanced_Spaceship.step...)
+hoy hay que cargarlo en OCC con Part.read / Import.insert. Aquí:
+
+- El fichero se abre con mmap (solo lectura): nada se copia a memoria
+  salvo lo que se consulta.
+- Las consultas de resumen (productos, conteos de entidades, caja de los
+  CARTESIAN_POINT) se resuelven con búsquedas de bytes sobre el mapa, sin
+  construir el índice ni el B-rep.
+- index() construye, solo si se pide, el índice id -> (inicio, fin) de
+  cada entidad "#id = TIPO(...);" y entity(id) tokeniza esa entidad a
+  demanda (cadenas, números, #referencias, .ENUM., $, *, listas y
+  parámetros tipados).
+
+La caja envolvente sale de las coordenadas crudas de los puntos 3D, en la
+unidad del fichero y sin aplicar las transformaciones de ensamblaje.
+
+Uso (FreeCAD no hace falta):
+    import step_index
+    with step_index.StepFile("Unified_Advanced_Spaceship.step") as s:
+        print(s.products(), s.counts(["ADVANCED_FACE"]), s.bbox())
+    step_index.print_table(step_index.scan_repo("."))
+"""
+
+import mmap
+import os
+import re
+import subprocess
+import time
+
+import numpy as np
+
+# Entidades de topología que se cuentan en el resumen
+SUMMARY_TYPES = ("MANIFOLD_SOLID_BREP", "BREP_WITH_VOIDS", "CLOSED_SHELL", "OPEN_SHELL", "ADVANCED_FACE")
+
+_ENTITY = re.compile(rb"(?:^|\n)\s*#(\d+)\s*=\s*\(?\s*([A-Z][A-Z0-9_]*)?")
+_PRODUCT = re.compile(rb"PRODUCT\('((?:[^']|'')*)'")
+# Solo puntos 3D (los 2D de las curvas paramétricas no entran en la caja)
+_POINT3 = re.compile(rb"CARTESIAN_POINT\('[^']*',\(([^,)]*,[^,)]*,[^,)]*)\)\)")
+_UNIT = re.compile(rb"LENGTH_UNIT\(\)\s*NAMED_UNIT\(\*\)\s*SI_UNIT\(([.A-Z$]*),\.METRE\.\)")
+_HEADER = re.compile(rb"(FILE_DESCRIPTION|FILE_NAME|FILE_SCHEMA)\s*\((.*?)\);\s*(?=FILE_|ENDSEC)", re.S)
+
+_PREFIX = {"$": 1.0, ".MILLI.": 1e-3, ".CENTI.": 1e-2, ".DECI.": 1e-1, ".KILO.": 1e3, ".MICRO.": 1e-6}
+
+
+# ========================
+# Tokenizador de parámetros
+# ========================
+class Typed:
+    """Parámetro tipado TIPO(valor) o entidad compleja (A() B() ...)."""
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __repr__(self):
+        return f"{self.name}{tuple(self.args)!r}"
+
+
+class Ref(int):
+    """Referencia #id a otra entidad."""
+
+    def __repr__(self):
+        return f"#{int(self)}"
+
+
+class Enum(str):
+    """Valor enumerado .NOMBRE. (también .T. / .F.)."""
+
+    def __repr__(self):
+        return f".{self}."
+
+
+def parse_params(text):
+    """
+    Lista de parámetros de 'TIPO(a,b,...)' o de una entidad compleja '(A(...)B(...))'.
+
+    Cadenas -> str (con '' resuelto), números -> float/int, #n -> Ref,
+    .X. -> Enum, $ -> None, * -> "*", listas -> list, TIPO(x) -> Typed.
+    """
+    s = text.decode("latin-1") if isinstance(text, (bytes, bytearray, memoryview)) else text
+    pos = 0
+    n = len(s)
+
+    def skip():
+        nonlocal pos
+        while pos < n and s[pos] in " \t\r\n":
+            pos += 1
+
+    def value():
+        nonlocal pos
+        skip()
+        c = s[pos]
+        if c == "'":
+            out = []
+            pos += 1
+            while True:
+                j = s.index("'", pos)
+                out.append(s[pos:j])
+                if j + 1 < n and s[j + 1] == "'":
+                    out.append("'")
+                    pos = j + 2
+                else:
+                    pos = j + 1
+                    return "".join(out)
+        if c == "#":
+            j = pos + 1
+            while j < n and s[j].isdigit():
+                j += 1
+            r, pos = Ref(int(s[pos + 1:j])), j
+            return r
+        if c == "(":
+            return group()
+        if c == "$":
+            pos += 1
+            return None
+        if c == "*":
+            pos += 1
+            return "*"
+        if c == ".":
+            j = s.index(".", pos + 1)
+            e, pos = Enum(s[pos + 1:j]), j + 1
+            return e
+        if c.isalpha() or c == "_":
+            j = pos
+            while j < n and (s[j].isalnum() or s[j] == "_"):
+                j += 1
+            name = s[pos:j]
+            pos = j
+            skip()
+            return Typed(name, group())
+        j = pos
+        while j < n and s[j] not in ",) \t\r\n":
+            j += 1
+        tok, pos = s[pos:j], j
+        try:
+            return int(tok)
+        except ValueError:
+            return float(tok)
+
+    def group():
+        nonlocal pos
+        pos += 1  # "("
+        items = []
+        skip()
+        if pos < n and s[pos] == ")":
+            pos += 1
+            return items
+        while True:
+            items.append(value())
+            skip()
+            c = s[pos]
+            pos += 1
+            if c == ")":
+                return items
+            if c != ",":
+                # Entidad compleja: A(...) B(...) sin comas
+                pos -= 1
+
+    skip()
+    if s[pos] == "(":
+        # (A(...) B(...)): lista de Typed
+        return group()
+    return value().args
+
+
+# ========================
+# Fichero
+# ========================
+class StepFile:
+    """Fichero STEP mapeado en memoria con consultas perezosas."""
+
+    def __init__(self, path):
+        self.path = path
+        self._fh = open(path, "rb")
+        size = os.fstat(self._fh.fileno()).st_size
+        self.size = size
+        self.mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._data = self.mm.find(b"DATA;")
+        self._offsets = None
+
+    def close(self):
+        if isinstance(self.mm, mmap.mmap):
+            self.mm.close()
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Cabecera ---
+    def header(self):
+        """{"FILE_DESCRIPTION"|"FILE_NAME"|"FILE_SCHEMA": parámetros}."""
+        end = self.mm.find(b"ENDSEC;")
+        out = {}
+        for m in _HEADER.finditer(self.mm[:max(end + 7, 0)]):
+            try:
+                out[m.group(1).decode()] = parse_params(b"(" + m.group(2) + b")")
+            except (ValueError, IndexError):
+                out[m.group(1).decode()] = m.group(2).decode("latin-1")
+        return out
+
+    def unit_scale(self):
+        """Metros por unidad de longitud del fichero (1e-3 para mm); None si no se declara."""
+        m = _UNIT.search(self.mm)
+        return _PREFIX.get(m.group(1).decode(), None) if m else None
+
+    # --- Resumen sin índice ---
+    def count(self, entity_type):
+        """Nº de entidades de un tipo (búsqueda literal de 'TIPO(')."""
+        needle = entity_type.encode() + b"("
+        n, i = 0, self.mm.find(needle, self._data)
+        while i >= 0:
+            # Descarta sufijos de otro tipo (p. ej. FACE en ADVANCED_FACE)
+            c = self.mm[i - 1:i]
+            if not (c.isalnum() or c == b"_"):
+                n += 1
+            i = self.mm.find(needle, i + len(needle))
+        return n
+
+    def counts(self, types=SUMMARY_TYPES):
+        return {t: self.count(t) for t in types}
+
+    def products(self):
+        """Nombres (id) de las entidades PRODUCT, en orden de aparición."""
+        out = []
+        for m in _PRODUCT.finditer(self.mm, max(self._data, 0)):
+            if self.mm[m.start() - 1:m.start()] in (b" ", b"=", b"\n", b"("):
+                out.append(m.group(1).replace(b"''", b"'").decode("latin-1"))
+        return out
+
+    def points(self):
+        """Array (n, 3) de las coordenadas de todos los CARTESIAN_POINT 3D."""
+        groups = _POINT3.findall(self.mm)
+        if not groups:
+            return np.empty((0, 3))
+        return np.fromstring(b",".join(groups).decode("ascii"), sep=",").reshape(-1, 3)
+
+    def bbox(self):
+        """(min xyz, max xyz) de los puntos 3D en unidades del fichero; None si no hay."""
+        p = self.points()
+        if not len(p):
+            return None
+        return p.min(axis=0), p.max(axis=0)
+
+    def summary(self):
+        t0 = time.perf_counter()
+        bb = self.bbox()
+        c = self.counts()
+        return {
+            "file": self.path,
+            "bytes": self.size,
+            "products": self.products(),
+            "solids": c["MANIFOLD_SOLID_BREP"] + c["BREP_WITH_VOIDS"],
+            "shells": c["CLOSED_SHELL"] + c["OPEN_SHELL"],
+            "open_shells": c["OPEN_SHELL"],
+            "faces": c["ADVANCED_FACE"],
+            "unit_m": self.unit_scale(),
+            "bbox": None if bb is None else (bb[0].tolist(), bb[1].tolist()),
+            "scan_s": round(time.perf_counter() - t0, 4),
+        }
+
+    # --- Índice de entidades ---
+    def index(self):
+        """{id: (inicio, fin)} del texto 'TIPO(...)' de cada entidad (se construye una vez)."""
+        if self._offsets is None:
+            starts = [(int(m.group(1)), m.end(1)) for m in _ENTITY.finditer(self.mm, max(self._data, 0))]
+            end_data = self.mm.find(b"ENDSEC;", max(self._data, 0))
+            offsets = {}
+            for k, (eid, s) in enumerate(starts):
+                e = starts[k + 1][1] if k + 1 < len(starts) else end_data
+                # Hasta el ';' final de la entidad
+                offsets[eid] = (s, self.mm.rfind(b";", s, e) if e > s else e)
+            self._offsets = offsets
+        return self._offsets
+
+    def raw(self, eid):
+        s, e = self.index()[eid]
+        text = self.mm[s:e]
+        return text[text.index(b"=") + 1:].strip()
+
+    def entity_type(self, eid):
+        t = self.raw(eid)
+        m = re.match(rb"\(?\s*([A-Z][A-Z0-9_]*)", t)
+        return m.group(1).decode() if m else None
+
+    def entity(self, eid):
+        """(tipo, parámetros) de #eid; las entidades complejas dan tipo None y una lista de Typed."""
+        t = self.raw(eid)
+        if t.startswith(b"("):
+            return None, parse_params(t)
+        return self.entity_type(eid), parse_params(t)
+
+    def entity_counts(self):
+        """Histograma {tipo: n} de todas las entidades (recorre el fichero entero)."""
+        hist = {}
+        for m in _ENTITY.finditer(self.mm, max(self._data, 0)):
+            name = (m.group(2) or b"").decode()
+            hist[name] = hist.get(name, 0) + 1
+        return dict(sorted(hist.items(), key=lambda kv: -kv[1]))
+
+
+# ========================
+# Repositorio
+# ========================
+def repo_step_files(root="."):
+    """Ficheros .step/.stp bajo root (los versionados en git si es un repositorio)."""
+    try:
+        out = subprocess.run(["git", "ls-files"], cwd=root, capture_output=True, text=True, check=True).stdout
+        files = [os.path.join(root, f) for f in out.splitlines()]
+    except (OSError, subprocess.CalledProcessError):
+        files = [os.path.join(d, f) for d, _, fs in os.walk(root) for f in fs]
+    return sorted(f for f in files if f.lower().endswith((".step", ".stp")) and os.path.isfile(f))
+
+
+def scan(paths):
+    rows = []
+    for p in paths:
+        with StepFile(p) as s:
+            rows.append(s.summary())
+    return rows
+
+
+def scan_repo(root="."):
+    return scan(repo_step_files(root))
+
+
+def print_table(rows):
+    print(f"{'Fichero':<44}{'KB':>8}{'Sól.':>6}{'Lám.':>6}{'Caras':>8}  {'Extensión (unid. fichero)':<28}Producto")
+    for r in rows:
+        name = os.path.basename(r["file"])
+        name = name if len(name) <= 42 else name[:39] + "..."
+        if r["bbox"]:
+            ext = "x".join(f"{hi - lo:.4g}" for lo, hi in zip(*r["bbox"]))
+        else:
+            ext = "-"
+        prod = r["products"][0] if r["products"] else "-"
+        print(f"{name:<44}{r['bytes'] / 1024:>8.0f}{r['solids']:>6}{r['shells']:>6}{r['faces']:>8}  {ext:<28}{prod}")
+    print(f"{len(rows)} ficheros, {sum(r['bytes'] for r in rows) / 2**20:.1f} MB, "
+          f"{sum(r['faces'] for r in rows)} caras")
+
+
+if __name__ == "__main__":
+    import sys
+    root = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    t0 = time.perf_counter()
+    rows = scan_repo(root)
+    dt = time.perf_counter() - t0
+    print_table(rows)
+    print(f"Escaneo: {dt:.3f} s")
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Deflexión de teselado adaptada al tamaño de cada pieza, con presupuesto de triángulos.
+
+params['mesh_deflection'] = 0.1 (hallTrust) y deflection=0.3
+(RocketCooledNozzle.export_stl) son absolutas: en una estación de 73 m
+(station_length) 0.1 mm da mallas de gigabytes y en rasgos de 2 mm un valor
+grueso pierde el detalle. Aquí cada pieza recibe:
+
+- deflexión lineal relativa a la diagonal de su caja envolvente
+  (relative * diag), acotada por [min_deflection, max_deflection] y por una
+  fracción del rasgo más pequeño (arista más corta) para no borrarlo;
+- deflexión angular tal que la cuerda sobre el rasgo más pequeño (radio
+  feature/2) tenga la misma flecha: a = sqrt(8 d / r), acotada;
+- presupuesto de triángulos: si la malla lo supera se engrosa la deflexión
+  y se vuelve a teselar (hasta max_passes).
+
+report() resume triángulos, vértices y memoria por pieza (arrays en RAM y
+tamaño del STL binario).
+
+Uso con mesh_export (la política es un callable (nombre, forma) -> ajustes):
+    import mesh_export, tessellation_policy as tp
+    policy = tp.TessellationPolicy(relative=5e-4, budget=2_000_000)
+    mesh_export.export_parts(parts, "./STL/", deflection=policy)
+"""
+
+import math
+
+import numpy as np
+
+# Bytes por vértice (3 float64) y por triángulo (3 uint32) en memoria; 50 por triángulo en STL binario
+VERTEX_BYTES = 24
+TRIANGLE_BYTES = 12
+STL_TRIANGLE_BYTES = 50
+
+
+class TessellationPolicy:
+    """Ajustes de teselado por pieza a partir de su tamaño y su rasgo más pequeño."""
+
+    def __init__(self, relative=1e-3, min_deflection=0.01, max_deflection=50.0,
+                 feature_fraction=0.1, min_angular=math.radians(2.0), max_angular=math.radians(28.5),
+                 budget=1_000_000, max_passes=4, overrides=None):
+        self.relative = relative
+        self.min_deflection = min_deflection
+        self.max_deflection = max_deflection
+        self.feature_fraction = feature_fraction
+        self.min_angular = min_angular
+        self.max_angular = max_angular
+        self.budget = budget
+        self.max_passes = max_passes
+        # {nombre: dict parcial} para fijar ajustes de piezas concretas
+        self.overrides = dict(overrides or {})
+
+    def settings(self, diagonal, feature=None):
+        """dict {"linear", "angular", "budget", "max_deflection", "max_passes"} para una pieza."""
+        d = self.relative * diagonal
+        if feature and feature > 0:
+            d = min(d, self.feature_fraction * feature)
+        d = min(max(d, self.min_deflection), self.max_deflection)
+        r = 0.5 * feature if feature and feature > 0 else 0.5 * diagonal
+        a = math.sqrt(8.0 * d / r) if r > 0 else self.max_angular
+        a = min(max(a, self.min_angular), self.max_angular)
+        return {"linear": d, "angular": a, "budget": self.budget,
+                "max_deflection": self.max_deflection, "max_passes": self.max_passes}
+
+    def __call__(self, name, shape):
+        bb = shape.BoundBox
+        s = self.settings(bb.DiagonalLength, smallest_feature(shape))
+        s.update(self.overrides.get(name, {}))
+        return s
+
+
+def smallest_feature(shape, tol=1e-6):
+    """Longitud de la arista más corta (aprox. del rasgo más pequeño) [mm]; None si no hay aristas."""
+    lengths = [e.Length for e in shape.Edges if e.Length > tol]
+    return min(lengths) if lengths else None
+
+
+def mesh(shape, linear, angular=None, recompute=False):
+    """
+    (vértices, triángulos) con MeshPart (lineal + angular) o, si no está, shape.tessellate().
+
+    OCC guarda la triangulación en la forma y la reutiliza si es más fina
+    que la pedida: con recompute=True se rehace (tessellate(d, True) o
+    MeshPart sobre una copia sin malla).
+    """
+    if angular is not None:
+        try:
+            import MeshPart
+            m = MeshPart.meshFromShape(Shape=shape.copy() if recompute else shape, LinearDeflection=linear,
+                                       AngularDeflection=angular, Relative=False)
+            pts, facets = m.Topology
+            v = np.array([(p.x, p.y, p.z) for p in pts], dtype=np.float64).reshape(-1, 3)
+            return v, np.array(facets, dtype=np.uint32).reshape(-1, 3)
+        except ImportError:
+            pass
+    pts, facets = shape.tessellate(linear, True) if recompute else shape.tessellate(linear)
+    v = np.array([(p.x, p.y, p.z) for p in pts], dtype=np.float64).reshape(-1, 3)
+    return v, np.array(facets, dtype=np.uint32).reshape(-1, 3)
+
+
+def tessellate(shape, settings):
+    """
+    Teselar respetando el presupuesto de triángulos.
+
+    El número de triángulos va aproximadamente como 1/d en superficies de
+    doble curvatura: si se pasa, d *= (n / budget) (al menos x1.5) y se repite.
+    Devuelve (vértices, triángulos, deflexión usada, pasadas).
+    """
+    d = float(settings["linear"])
+    angular = settings.get("angular")
+    budget = settings.get("budget")
+    d_max = settings.get("max_deflection", float("inf"))
+    passes = 0
+    while True:
+        passes += 1
+        # Desde la segunda pasada la deflexión es más gruesa: hay que rehacer la malla
+        v, t = mesh(shape, d, angular, recompute=passes > 1)
+        if not budget or len(t) <= budget or passes >= settings.get("max_passes", 4) or d >= d_max:
+            return v, t, d, passes
+        factor = max(1.5, len(t) / budget)
+        d = min(d * factor, d_max)
+        if angular is not None:
+            angular = min(angular * math.sqrt(factor), math.radians(60.0))
+
+
+def memory_row(name, n_vertices, n_triangles, deflection=None, passes=None):
+    return {"name": name, "triangles": int(n_triangles), "vertices": int(n_vertices),
+            "ram_bytes": int(n_vertices * VERTEX_BYTES + n_triangles * TRIANGLE_BYTES),
+            "stl_bytes": int(84 + n_triangles * STL_TRIANGLE_BYTES),
+            "deflection": deflection, "passes": passes}
+
+
+def report(parts, policy=None):
+    """Teselar cada (nombre, objeto o forma) según la política y devolver filas de memoria."""
+    policy = policy or TessellationPolicy()
+    rows = []
+    for name, part in parts:
+        shape = part.Shape if hasattr(part, "Shape") else part
+        v, t, d, passes = tessellate(shape, policy(name, shape))
+        rows.append(memory_row(name, len(v), len(t), d, passes))
+    return rows
+
+
+def print_report(rows):
+    print(f"{'Pieza':<28}{'Defl. mm':>10}{'Triáng.':>11}{'RAM MB':>9}{'STL MB':>9}{'Pasadas':>9}")
+    for r in rows:
+        print(f"{r['name']:<28}{r['deflection'] or 0:>10.3g}{r['triangles']:>11}"
+              f"{r['ram_bytes'] / 2**20:>9.2f}{r['stl_bytes'] / 2**20:>9.2f}{r['passes'] or 0:>9}")
+    tri = sum(r["triangles"] for r in rows)
+    ram = sum(r["ram_bytes"] for r in rows)
+    print(f"Total {tri} triángulos, {ram / 2**20:.1f} MB en memoria")
+
+
+if __name__ == "__main__":
+    # Ajustes para piezas de tamaños muy distintos (diagonal, rasgo mínimo) [mm]
+    policy = TessellationPolicy(relative=5e-4, budget=2_000_000)
+    for label, diag, feat in [("Estación 73 m", 73000.0 * 1.05, 150.0), ("Tobera", 900.0, 1.2),
+                              ("Ánodo Hall", 120.0, 2.0), ("Pasador", 12.0, 2.0)]:
+        s = policy.settings(diag, feat)
+        print(f"{label:<16} lineal {s['linear']:.3g} mm, angular {math.degrees(s['angular']):.1f}°")
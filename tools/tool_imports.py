@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+Importación opcional de los módulos de tools/ desde las macros.
+
+Las macros tienen que seguir funcionando copiadas fuera del repositorio, con
+su construcción propia cuando no hay tools/. Cada una solo añade tools/ a
+sys.path (relativo a su __file__) y pide aquí lo que usa:
+
+    import os, sys
+    _TOOLS_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(globals().get("__file__", "."))), "..", "..", "..", "tools"))
+    if os.path.isdir(_TOOLS_DIR) and _TOOLS_DIR not in sys.path:
+        sys.path.append(_TOOLS_DIR)
+    try:
+        from tool_imports import optional
+    except ImportError:
+        optional = None
+    fuselage = optional("fuselage") if optional else None
+    mesh_export, tessellation_policy = optional("mesh_export", "tessellation_policy") if optional else (None, None)
+"""
+
+import importlib
+
+
+def optional(*names):
+    """
+    El módulo (o la tupla de módulos) de tools/ con esos nombres.
+
+    Un grupo se usa junto: si alguno no se puede importar, todos son None.
+    """
+    try:
+        mods = tuple(importlib.import_module(n) for n in names)
+    except ImportError:
+        mods = (None,) * len(names)
+    return mods[0] if len(names) == 1 else mods
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Lectura de pilas de capas (TPS y escudos solares) desde los parámetros de las macros.
+
+Cada capa es un dict:
+    {'name', 'material', 't' [mm], 'rho' [kg/m³], 'k' [W/m/K], 'cp' [J/kg/K]}
+en orden desde la cara expuesta al Sol hacia el interior.
+
+Macros soportadas:
+- SondaParkerProbe.py      : Al2O3 / W / C-C / espuma / C-C (TPS_*, MAT_*)
+- TestSolarFlares.FCMacro  : disco TPS C/C (TPS["tps_t"]) + casco Al (P["hull_t"])
+- EscudosRadiacion.FCMacro : disco TPS frontal (P["front_tps_t"])
+- ParkerSondaSpar.FCMacro  : misma pila que SondaParkerProbe (escala menor)
+- EscudoSolarParkerProbe.FCMacro : recubrimiento / C-C / espuma / C-C (coat_th, face_th, foam_th)
+"""
+
+import os
+
+from macro_params import load_macro_params, parse_quantity
+
+_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SONDA_PARKER = os.path.join(_ROOT, "SHIELDS_DOS", "shields_sun", "macros", "SondaParkerProbe.py")
+SOLAR_FLARES = os.path.join(_ROOT, "SHIELDS", "solar_parker_shield", "radiation", "TestSolarFlares.FCMacro")
+ESCUDOS_RADIACION = os.path.join(_ROOT, "SHIELDS", "solar_parker_shield", "radiation", "EscudosRadiacion.FCMacro")
+PARKER_SPAR = os.path.join(_ROOT, "Carbon_shields", "python", "parameters", "ParkerSondaSpar.FCMacro")
+ESCUDO_SOLAR = os.path.join(_ROOT, "Carbon_shields", "python", "parameters", "EscudoSolarParkerProbe.FCMacro")
+
+# Propiedades térmicas por defecto cuando la macro solo da densidad
+_THERMAL_DEFAULTS = {
+    'AL2O3': (30.0, 880.0),
+    'TUNGSTEN': (170.0, 134.0),
+    'CARBON_CARBON': (5.0, 710.0),
+    'CARBON_FOAM': (5.0, 710.0),
+    'ALUMINUM': (150.0, 900.0),
+    'STEEL': (16.0, 500.0),
+}
+
+_NAME_TO_KEY = (
+    ("alumina", 'AL2O3'), ("al2o3", 'AL2O3'), ("tungsten", 'TUNGSTEN'),
+    ("foam", 'CARBON_FOAM'), ("carbon-carbon", 'CARBON_CARBON'), ("c/c", 'CARBON_CARBON'),
+    ("aa-", 'ALUMINUM'), ("al ", 'ALUMINUM'), ("ss-", 'STEEL'), ("steel", 'STEEL'),
+)
+
+
+def material_key(name):
+    """Clave de tabla (AL2O3, TUNGSTEN...) a partir del nombre de material de la macro."""
+    low = str(name).lower()
+    for frag, key in _NAME_TO_KEY:
+        if frag in low:
+            return key
+    return str(name).upper().replace(" ", "_")
+
+
+def make_layer(name, t, matdict, k_key="k"):
+    """Capa a partir de un dict de material estilo set_material (strings con unidades)."""
+    key = material_key(matdict.get("Name", matdict.get("name", name)))
+    k_def, cp_def = _THERMAL_DEFAULTS.get(key, (10.0, 800.0))
+    rho = parse_quantity(matdict.get("Density", matdict.get("rho")), 1000.0)
+    return {
+        "name": name,
+        "material": key,
+        "t": float(t),
+        "rho": rho,
+        "k": parse_quantity(matdict.get(k_key, matdict.get("k")), k_def),
+        "cp": parse_quantity(matdict.get("Cp", matdict.get("cp")), cp_def),
+    }
+
+
+def _ortho_dict(name, rho, *args, kx=None, ky=None, kz=None, cp=None, **kwargs):
+    # Réplica mínima de ortho_dict() de SondaParkerProbe.py
+    d = {"Name": name, "Density": f"{rho} kg/m^3"}
+    for key, val in (("kX", kx), ("kY", ky), ("kZ", kz)):
+        if val is not None:
+            d[key] = f"{val} W/m/K"
+    if cp is not None:
+        d["Cp"] = f"{cp} J/kg/K"
+    return d
+
+
+def parker_tps_stack(path=SONDA_PARKER):
+    """Pila TPS de SondaParkerProbe.py (el eje Z atraviesa el espesor -> kZ)."""
+    v = load_macro_params(path, calls={"ortho_dict": _ortho_dict})
+    return [
+        make_layer("TPS_Al2O3", v["TPS_COAT_AL2O3"], v["MAT_AL2O3"]),
+        make_layer("TPS_W", v["TPS_COAT_W"], v["MAT_W"]),
+        make_layer("TPS_CC_Solar", v["TPS_CC_FACE"], v["MAT_CC_ORTHO"], k_key="kZ"),
+        make_layer("TPS_Foam", v["TPS_FOAM"], v["MAT_FOAM"]),
+        make_layer("TPS_CC_Shadow", v["TPS_CC_FACE"], v["MAT_CC_ORTHO"], k_key="kZ"),
+    ]
+
+
+def solar_flares_stack(path=SOLAR_FLARES):
+    """Disco TPS C/C y casco de aluminio de TestSolarFlares.FCMacro."""
+    v = load_macro_params(path, ["P", "TPS", "MAT"])
+    return [
+        make_layer("TPS_Disk", v["TPS"]["tps_t"], v["MAT"]["CC"]),
+        make_layer("Hull", v["P"]["hull_t"], v["MAT"]["AL"]),
+    ]
+
+
+def escudos_radiacion_stack(path=ESCUDOS_RADIACION):
+    """Disco TPS frontal de EscudosRadiacion.FCMacro (material C/C asumido)."""
+    v = load_macro_params(path, ["P"])
+    return [make_layer("Front_TPS", v["P"]["front_tps_t"], {"Name": "Carbon-Carbon", "Density": 1800.0})]
+
+
+def escudo_solar_stack(path=ESCUDO_SOLAR):
+    """Escudo de EscudoSolarParkerProbe.FCMacro (la macro no asigna materiales)."""
+    v = load_macro_params(path, ["coat_th", "face_th", "foam_th"])
+    cc = {"Name": "Carbon-Carbon", "Density": 1700.0}
+    return [
+        make_layer("Coating", v["coat_th"], {"Name": "Alumina coating", "Density": 3900.0}),
+        make_layer("Front_CC", v["face_th"], cc),
+        make_layer("Core_Foam", v["foam_th"], {"Name": "Carbon foam", "Density": 180.0}),
+        make_layer("Back_CC", v["face_th"], cc),
+    ]
+
+
+def total_thickness(stack):
+    return sum(layer["t"] for layer in stack)
+
+
+def thickness_sweep(stack, layer, values):
+    """Variantes de una pila cambiando el espesor de una capa (por nombre o índice)."""
+    j = layer if isinstance(layer, int) else [l["name"] for l in stack].index(layer)
+    out = []
+    for v in values:
+        st = [dict(l) for l in stack]
+        st[j]["t"] = float(v)
+        out.append(st)
+    return out
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Conducción transitoria 1-D multicapa para el sándwich TPS (volúmenes finitos).
+
+La pila se lee de SondaParkerProbe.py (tps_stack.parker_tps_stack): capas
+TPS_Al2O3 / TPS_W / TPS_CC_Solar / TPS_Foam / TPS_CC_Shadow con k, Cp y
+densidad de los MAT_* de la macro.
+
+Esquema:
+- Euler implícito; la radiación de ambas caras se linealiza en cada paso
+  (T⁴ ≈ 4T*³T - 3T*⁴), así el sistema sigue siendo tridiagonal.
+- Cara solar : alpha * q(t) - eps_front * sigma * (T⁴ - T_space⁴)
+- Cara trasera: eps_back * sigma * (T⁴ - T_back_env⁴)
+- Conductancia entre celdas por media armónica (interfaces entre materiales).
+- Algoritmo de Thomas vectorizado sobre el lote: cada fila es una pareja
+  (pila, historia de flujo), todas con la misma malla de celdas.
+
+Unidades: capas en mm, k [W/m/K], rho [kg/m³], cp [J/kg/K], flujo [W/m²],
+temperaturas en K.
+"""
+
+import numpy as np
+
+import tps_stack
+
+SIGMA = 5.670374419e-8
+SOLAR_CONSTANT = 1361.0            # W/m² a 1 AU
+PERIHELION_FLUX = 650e3            # W/m² (~0.046 AU, perihelio tipo Parker)
+
+DEFAULT_OPTICS = {
+    "alpha": 0.6,                  # absortancia solar del recubrimiento blanco
+    "eps_front": 0.9,
+    "eps_back": 0.8,
+    "T_space": 3.0,
+    "T_back_env": 3.0,
+}
+
+
+# ========================
+# Malla
+# ========================
+def build_grid(stacks, max_dz=5.0, min_cells=1):
+    """
+    Malla común a todas las pilas (mismo número de capas).
+
+    Cada capa j recibe n_j = max(min_cells, ceil(t_max_j / max_dz)) celdas,
+    con t_max_j el mayor espesor de esa capa en el lote; así todas las filas
+    comparten forma (S, N). Devuelve dict con dz [m], k, C = rho*cp*dz,
+    centros x [m] y el índice de la primera celda de cada capa.
+    """
+    n_layers = len(stacks[0])
+    if any(len(st) != n_layers for st in stacks):
+        raise ValueError("Todas las pilas del lote deben tener el mismo número de capas")
+    t = np.array([[layer["t"] for layer in st] for st in stacks], dtype=float)      # (S, L) mm
+    prop = {key: np.array([[layer[key] for layer in st] for st in stacks], dtype=float)
+            for key in ("k", "rho", "cp")}
+    n_cells = np.maximum(min_cells, np.ceil(t.max(axis=0) / max_dz)).astype(int)       # (L,)
+    layer_of_cell = np.repeat(np.arange(n_layers), n_cells)
+    # Espesor nulo -> celda de 1 µm: capacidad despreciable, conductancia muy alta
+    dz = np.maximum(t[:, layer_of_cell] / n_cells[layer_of_cell] * 1e-3, 1e-6)     # (S, N) m
+    k = prop["k"][:, layer_of_cell]
+    C = prop["rho"][:, layer_of_cell] * prop["cp"][:, layer_of_cell] * dz
+    return {
+        "dz": dz,
+        "k": k,
+        "C": C,
+        "x": np.cumsum(dz, axis=1) - dz / 2.0,
+        "layer_start": np.concatenate(([0], np.cumsum(n_cells)[:-1])),
+        "layer_names": [layer["name"] for layer in stacks[0]],
+    }
+
+
+def conductances(grid):
+    """Conductancia por unidad de área entre celdas i e i+1 [W/m²/K], forma (S, N-1)."""
+    dz, k = grid["dz"], grid["k"]
+    return 1.0 / (dz[:, :-1] / (2.0 * k[:, :-1]) + dz[:, 1:] / (2.0 * k[:, 1:]))
+
+
+# ========================
+# Algoritmo de Thomas en lote
+# ========================
+def thomas(a, b, c, d):
+    """
+    Resolver sistemas tridiagonales por filas.
+    a: subdiagonal (S, N) (a[:, 0] ignorado), b: diagonal, c: superdiagonal
+    (c[:, -1] ignorado), d: término independiente. Devuelve x (S, N).
+    """
+    # Trabajar con (N, S) contiguo: cada paso del barrido opera sobre una fila
+    a, b, c, d = (np.ascontiguousarray(v.T) for v in (a, b, c, d))
+    n = b.shape[0]
+    cp = np.empty_like(b)
+    dp = np.empty_like(b)
+    cp[0] = c[0] / b[0]
+    dp[0] = d[0] / b[0]
+    for i in range(1, n):
+        m = b[i] - a[i] * cp[i - 1]
+        cp[i] = c[i] / m
+        dp[i] = (d[i] - a[i] * dp[i - 1]) / m
+    x = np.empty_like(b)
+    x[-1] = dp[-1]
+    for i in range(n - 2, -1, -1):
+        x[i] = dp[i] - cp[i] * x[i + 1]
+    return x.T
+
+
+# ========================
+# Historias de flujo
+# ========================
+def step_flux(q, n_steps, ramp_steps=0):
+    """Flujo constante q [W/m²] con rampa lineal opcional al inicio, forma (n_steps,)."""
+    f = np.full(n_steps, float(q))
+    if ramp_steps > 0:
+        f[:ramp_steps] *= np.linspace(0.0, 1.0, ramp_steps, endpoint=False)
+    return f
+
+
+def product_cases(stacks, fluxes):
+    """Producto cartesiano pilas × historias de flujo -> (pilas, flujos (S*F, n_steps))."""
+    fluxes = np.atleast_2d(np.asarray(fluxes, dtype=float))
+    cases = [st for st in stacks for _ in range(len(fluxes))]
+    return cases, np.tile(fluxes, (len(stacks), 1))
+
+
+# ========================
+# Solver
+# ========================
+def solve_transient(stacks, flux, dt, T0=293.15, optics=None, max_dz=5.0,
+                    save_every=0, newton_iters=1):
+    """
+    Integrar la conducción transitoria de un lote de pilas.
+
+    stacks : lista de pilas (tps_stack) con el mismo número de capas
+    flux   : (n_steps,) común o (S, n_steps) por fila [W/m²] en la cara solar
+    dt     : paso de tiempo [s]
+    optics : sobrescribe DEFAULT_OPTICS (valores escalares o arrays (S,))
+    save_every : cada cuántos pasos guardar el perfil completo (0 = solo el final)
+
+    Devuelve dict con front_T/back_T (S, n_steps+1), perfiles guardados,
+    picos y la malla.
+    """
+    grid = build_grid(stacks, max_dz=max_dz)
+    S, N = grid["dz"].shape
+    opt = dict(DEFAULT_OPTICS)
+    opt.update(optics or {})
+    alpha, eps_f, eps_b = (np.broadcast_to(np.asarray(opt[k], dtype=float), (S,))
+                           for k in ("alpha", "eps_front", "eps_back"))
+    flux = np.broadcast_to(np.asarray(flux, dtype=float), (S, np.shape(flux)[-1]))
+    n_steps = flux.shape[1]
+
+    G = conductances(grid)
+    C_dt = grid["C"] / dt
+    a = np.zeros((S, N))
+    c = np.zeros((S, N))
+    a[:, 1:] = -G
+    c[:, :-1] = -G
+    b0 = C_dt.copy()
+    b0[:, 1:] += G
+    b0[:, :-1] += G
+    rad_space = eps_f * SIGMA * opt["T_space"] ** 4
+    rad_env = eps_b * SIGMA * opt["T_back_env"] ** 4
+
+    T = np.broadcast_to(np.asarray(T0, dtype=float), (S, N)).copy()
+    front = np.empty((S, n_steps + 1))
+    back = np.empty((S, n_steps + 1))
+    front[:, 0], back[:, 0] = T[:, 0], T[:, -1]
+    saved, saved_t = [], []
+    if save_every:
+        saved.append(T.copy())
+        saved_t.append(0.0)
+
+    for n in range(n_steps):
+        T_old = T
+        T_lin = T
+        for _ in range(max(1, newton_iters)):
+            b = b0.copy()
+            d = C_dt * T_old
+            # Cara solar
+            hf = 4.0 * eps_f * SIGMA * T_lin[:, 0] ** 3
+            b[:, 0] += hf
+            d[:, 0] += alpha * flux[:, n] + rad_space + 3.0 * eps_f * SIGMA * T_lin[:, 0] ** 4
+            # Cara trasera
+            hb = 4.0 * eps_b * SIGMA * T_lin[:, -1] ** 3
+            b[:, -1] += hb
+            d[:, -1] += rad_env + 3.0 * eps_b * SIGMA * T_lin[:, -1] ** 4
+            T_lin = thomas(a, b, c, d)
+        T = T_lin
+        front[:, n + 1], back[:, n + 1] = T[:, 0], T[:, -1]
+        if save_every and (n + 1) % save_every == 0:
+            saved.append(T.copy())
+            saved_t.append((n + 1) * dt)
+
+    return {
+        "time": np.arange(n_steps + 1) * dt,
+        "front_T": front,
+        "back_T": back,
+        "front_peak": front.max(axis=1),
+        "back_peak": back.max(axis=1),
+        "profiles": np.array(saved).transpose(1, 0, 2) if saved else T[:, None, :],
+        "profile_time": np.array(saved_t) if saved else np.array([n_steps * dt]),
+        "final_T": T,
+        "grid": grid,
+    }
+
+
+def steady_state(stacks, q, optics=None, max_dz=5.0, iters=40, T_guess=None):
+    """
+    Perfil estacionario (S, N) para un flujo constante q (escalar o (S,)).
+    Pasos implícitos con dt muy grande: cada paso equivale a una iteración
+    de Newton sobre el balance estacionario.
+    """
+    q = np.broadcast_to(np.asarray(q, dtype=float), (len(stacks),))
+    opt = dict(DEFAULT_OPTICS)
+    opt.update(optics or {})
+    if T_guess is None:
+        T_guess = np.maximum(radiative_equilibrium(q, opt["alpha"], opt["eps_front"]), 200.0)[:, None]
+    flux = np.repeat(q[:, None], iters, axis=1)
+    return solve_transient(stacks, flux, 1e12, T0=T_guess, optics=opt, max_dz=max_dz)["final_T"]
+
+
+def radiative_equilibrium(q, alpha=DEFAULT_OPTICS["alpha"], eps=DEFAULT_OPTICS["eps_front"]):
+    """Temperatura de equilibrio de una cara aislada [K] (referencia rápida)."""
+    return (alpha * q / (eps * SIGMA)) ** 0.25
+
+
+def to_celsius(T):
+    return np.asarray(T) - 273.15
+
+
+def print_summary(stacks, res, labels=None):
+    for i in range(len(stacks)):
+        label = labels[i] if labels else f"pila {i}"
+        print(f"{label}: cara solar máx {to_celsius(res['front_peak'][i]):.0f} °C, "
+              f"cara trasera máx {to_celsius(res['back_peak'][i]):.0f} °C, "
+              f"espesor {tps_stack.total_thickness(stacks[i]):.1f} mm")
+
+
+if __name__ == "__main__":
+    import time
+    base = tps_stack.parker_tps_stack()
+    q_eq = radiative_equilibrium(PERIHELION_FLUX)
+    print(f"Equilibrio radiativo cara solar: {to_celsius(q_eq):.0f} °C (README ≈ 1370 °C)")
+    variants = tps_stack.thickness_sweep(base, "TPS_Foam", np.linspace(50.0, 320.0, 256))
+    dt, hours = 30.0, 48.0
+    flux = step_flux(PERIHELION_FLUX, int(hours * 3600 / dt), ramp_steps=60)
+    t0 = time.perf_counter()
+    res = solve_transient(variants, flux, dt)
+    elapsed = time.perf_counter() - t0
+    print(f"{len(variants)} pilas × {len(flux)} pasos en {elapsed:.2f} s")
+    idx = [0, len(variants) // 2, len(variants) - 1]
+    print_summary([variants[i] for i in idx],
+                  {k: res[k][idx] for k in ("front_peak", "back_peak")},
+                  [f"espuma {variants[i][3]['t']:.0f} mm" for i in idx])